@@ -10,6 +10,8 @@ from pathlib import Path
 from django.conf import settings
 from django.core.management.base import BaseCommand
 
+from konote.seeding import SeedSpec, seed
+
 
 class Command(BaseCommand):
     help = "Seed database with metric library, default terminology, and feature toggles."
@@ -51,23 +53,20 @@ class Command(BaseCommand):
         with open(seed_file, "r", encoding="utf-8") as f:
             metrics = json.load(f)
 
-        created = 0
-        for m in metrics:
-            _, was_created = MetricDefinition.objects.get_or_create(
-                name=m["name"],
-                defaults={
-                    "definition": m["definition"],
-                    "category": m["category"],
-                    "is_library": True,
-                    "is_enabled": True,
-                    "min_value": m.get("min_value"),
-                    "max_value": m.get("max_value"),
-                    "unit": m.get("unit", ""),
-                },
-            )
-            if was_created:
-                created += 1
-        self.stdout.write(f"  Metrics: {created} created, {len(metrics) - created} already existed.")
+        result = seed(SeedSpec(MetricDefinition, key=("name",), rows=[
+            {
+                "name": m["name"],
+                "definition": m["definition"],
+                "category": m["category"],
+                "is_library": True,
+                "is_enabled": True,
+                "min_value": m.get("min_value"),
+                "max_value": m.get("max_value"),
+                "unit": m.get("unit", ""),
+            }
+            for m in metrics
+        ]))
+        self.stdout.write(f"  {result.summary('Metrics')}")
 
     def _seed_feature_toggles(self):
         from apps.admin_settings.models import FeatureToggle
@@ -87,14 +86,10 @@ class Command(BaseCommand):
             ("messaging_sms", False),
             ("messaging_email", True),
         ]
-        created = 0
-        for key, enabled in defaults:
-            _, was_created = FeatureToggle.objects.get_or_create(
-                feature_key=key, defaults={"is_enabled": enabled}
-            )
-            if was_created:
-                created += 1
-        self.stdout.write(f"  Feature toggles: {created} created.")
+        result = seed(SeedSpec(FeatureToggle, key=("feature_key",), rows=[
+            {"feature_key": key, "is_enabled": enabled} for key, enabled in defaults
+        ]))
+        self.stdout.write(f"  {result.summary('Feature toggles')}")
 
         # In demo mode, enable features so all workflows are demonstrable
         if settings.DEMO_MODE:
@@ -123,14 +118,10 @@ class Command(BaseCommand):
             "document_storage_provider": "google_drive",
             "document_storage_url_template": "https://drive.google.com/drive/search?q={record_id}",
         }
-        created = 0
-        for key, value in defaults.items():
-            _, was_created = InstanceSetting.objects.get_or_create(
-                setting_key=key, defaults={"setting_value": value}
-            )
-            if was_created:
-                created += 1
-        self.stdout.write(f"  Instance settings: {created} created.")
+        result = seed(SeedSpec(InstanceSetting, key=("setting_key",), rows=[
+            {"setting_key": key, "setting_value": value} for key, value in defaults.items()
+        ]))
+        self.stdout.write(f"  {result.summary('Instance settings')}")
 
     def _cleanup_old_demo_data(self):
         """Remove old demo data so it can be re-seeded cleanly.
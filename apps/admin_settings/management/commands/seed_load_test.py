@@ -0,0 +1,429 @@
+"""
+Generate a large synthetic agency for load and performance testing.
+
+seed_demo_data builds a small, hand-written demo world. This command builds
+a big, generated one — by default 5 programs, 100,000 participants, a
+million progress notes (each with a target entry and a metric value),
+groups with session attendance, meetings, and audit rows. Everything is
+created with bulk inserts and batch encryption, and the same --seed always
+produces the same agency.
+
+Examples:
+    python manage.py seed_load_test                      # full size
+    python manage.py seed_load_test --clients 2000 --notes 20000
+    python manage.py seed_load_test --reset              # remove, then rebuild
+
+All participants and staff accounts are flagged as demo data, so they
+never appear to real users. Only runs when DEMO_MODE is enabled.
+
+Audit rows are append-only and are not removed by --reset.
+"""
+import random
+import time
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from apps.clients.birth_year import birth_year_token
+from konote.encryption import encrypt_many
+
+RECORD_PREFIX = "LOAD-"
+PROGRAM_PREFIX = "Load Test Program"
+USER_PREFIX = "loadtest-"
+METRIC_PREFIX = "Load test scale"
+
+FIRST_NAMES = [
+    "Aaliyah", "Aarav", "Amara", "Andre", "Ayesha", "Benjamin", "Chloe",
+    "Daniel", "Deepa", "Elijah", "Emma", "Fatima", "Gabriel", "Hana",
+    "Isabelle", "Jamal", "Jordan", "Kai", "Lena", "Liam", "Lucas", "Maya",
+    "Mohammed", "Nadia", "Noah", "Olivia", "Priya", "Quinn", "Rosa",
+    "Samuel", "Sofia", "Taylor", "Thanh", "Uma", "Victor", "Wei", "Yara",
+    "Zoe", "Émilie", "François",
+]
+LAST_NAMES = [
+    "Ahmed", "Beaulieu", "Bouchard", "Brown", "Chen", "Cote", "Das",
+    "Dubois", "Fraser", "Gagnon", "Garcia", "Grant", "Hassan", "Ibrahim",
+    "Kaur", "Khan", "Lam", "Lee", "MacDonald", "Martin", "Nguyen", "Okafor",
+    "Osei", "Patel", "Pelletier", "Roy", "Santos", "Singh", "Smith",
+    "Tremblay", "Wang", "Williams", "Wilson", "Wong", "Yusuf", "Zhang",
+]
+NOTE_PHRASES = [
+    "Met to review progress on housing goals.",
+    "Discussed the job search and upcoming interviews.",
+    "Participant reported feeling more settled this week.",
+    "Reviewed the budget and rent payment plan.",
+    "Followed up on the referral to the food bank.",
+    "Talked through a stressful conflict with a landlord.",
+    "Practised interview questions together.",
+    "Completed the intake paperwork for the program.",
+    "Participant missed the last appointment and we rescheduled.",
+    "Connected with the family doctor about medication.",
+    "Celebrated a small win with the resume.",
+    "Planned next steps for the school enrolment.",
+    "Checked in about sleep and stress levels.",
+    "Explored volunteer opportunities in the neighbourhood.",
+    "Reviewed safety plan and emergency contacts.",
+]
+STATUSES = [("active", 70), ("inactive", 15), ("discharged", 15)]
+INTERACTION_TYPES = ["session", "session", "session", "phone", "group", "collateral"]
+AUDIT_ACTIONS = [("view", "clients"), ("view", "notes"), ("create", "notes"), ("update", "clients")]
+
+
+class Command(BaseCommand):
+    help = "Generate a large, reproducible synthetic agency for load and performance testing."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--programs", type=int, default=5, help="Number of programs (default: 5)")
+        parser.add_argument("--clients", type=int, default=100_000, help="Number of participants (default: 100000)")
+        parser.add_argument(
+            "--notes", type=int, default=1_000_000,
+            help="Total progress notes; each gets one target entry and one metric value (default: 1000000)",
+        )
+        parser.add_argument("--groups", type=int, default=10, help="Groups per program (default: 10)")
+        parser.add_argument("--sessions", type=int, default=40, help="Sessions per group (default: 40)")
+        parser.add_argument("--meetings", type=int, default=20_000, help="Scheduled meetings (default: 20000)")
+        parser.add_argument("--audit-rows", type=int, default=200_000, help="Audit log rows (default: 200000)")
+        parser.add_argument(
+            "--duplicate-rate", type=float, default=0.01,
+            help="Share of participants created as likely duplicates, for the merge scan (default: 0.01)",
+        )
+        parser.add_argument("--seed", type=int, default=42, help="Random seed (default: 42)")
+        parser.add_argument("--batch-size", type=int, default=5000, help="Rows per bulk insert (default: 5000)")
+        parser.add_argument(
+            "--reset", action="store_true",
+            help="Delete previously generated load-test data before seeding.",
+        )
+
+    def handle(self, *args, **options):
+        if not settings.DEMO_MODE:
+            raise CommandError("DEMO_MODE is not enabled. Load-test data is only generated on demo instances.")
+        if options["programs"] < 1 or options["clients"] < 1:
+            raise CommandError("--programs and --clients must be at least 1.")
+
+        from apps.clients.models import ClientFile
+
+        if options["reset"]:
+            self._reset()
+        elif ClientFile.objects.filter(record_id__startswith=RECORD_PREFIX).exists():
+            raise CommandError("Load-test data already exists. Use --reset to rebuild it.")
+
+        self.rng = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+        self.now = timezone.now()
+        started = time.perf_counter()
+
+        with transaction.atomic():
+            programs = self._timed("programs and staff", self._create_programs_and_staff, options["programs"])
+            metrics = self._timed("metric definitions", self._create_metrics)
+            clients = self._timed(
+                "participants", self._create_clients,
+                options["clients"], programs, options["duplicate_rate"],
+            )
+            targets = self._timed("plans", self._create_plans, clients, metrics)
+            self._timed("progress notes", self._create_notes, options["notes"], clients, targets)
+            self._timed("groups", self._create_groups, programs, clients, options["groups"], options["sessions"])
+            self._timed("meetings", self._create_meetings, options["meetings"], clients)
+        self._timed("audit rows", self._create_audit_rows, options["audit_rows"], clients)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Load-test agency ready in {time.perf_counter() - started:.1f}s."
+        ))
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _timed(self, label, fn, *args):
+        start = time.perf_counter()
+        result = fn(*args)
+        self.stdout.write(f"  {label}: {time.perf_counter() - start:.1f}s")
+        return result
+
+    def _batches(self, items):
+        for i in range(0, len(items), self.batch_size):
+            yield items[i:i + self.batch_size]
+
+    def _random_past(self, days):
+        return self.now - timedelta(days=self.rng.randint(0, days), minutes=self.rng.randint(0, 1439))
+
+    def _note_text(self):
+        return " ".join(self.rng.sample(NOTE_PHRASES, self.rng.randint(2, 5)))
+
+    def _reset(self):
+        from apps.auth_app.models import User
+        from apps.clients.models import ClientFile
+        from apps.groups.models import Group
+        from apps.plans.models import MetricDefinition
+        from apps.programs.models import Program
+
+        with transaction.atomic():
+            # Participants first: their notes PROTECT the staff accounts.
+            deleted, _ = ClientFile.objects.filter(record_id__startswith=RECORD_PREFIX).delete()
+            Group.objects.filter(program__name__startswith=PROGRAM_PREFIX).delete()
+            User.objects.filter(username__startswith=USER_PREFIX).delete()
+            Program.objects.filter(name__startswith=PROGRAM_PREFIX).delete()
+            MetricDefinition.objects.filter(name__startswith=METRIC_PREFIX).delete()
+        self.stdout.write(f"  Removed previous load-test data ({deleted} rows).")
+
+    # ------------------------------------------------------------------
+    # Builders
+    # ------------------------------------------------------------------
+
+    def _create_programs_and_staff(self, count):
+        from apps.auth_app.models import User
+        from apps.programs.models import Program, UserProgramRole
+
+        programs = Program.objects.bulk_create([
+            Program(name=f"{PROGRAM_PREFIX} {i + 1}", description="Generated by seed_load_test.")
+            for i in range(count)
+        ])
+        # One worker per program, one manager and one executive across all.
+        self.workers = {}
+        roles = []
+        for program in programs:
+            worker = User.objects.create_user(
+                username=f"{USER_PREFIX}worker-{program.pk}",
+                display_name=f"Load Worker {program.pk}", is_demo=True,
+            )
+            self.workers[program.pk] = worker
+            roles.append(UserProgramRole(user=worker, program=program, role="staff"))
+        for username, role in (("manager", "program_manager"), ("executive", "executive")):
+            user = User.objects.create_user(
+                username=f"{USER_PREFIX}{username}",
+                display_name=f"Load {username.title()}", is_demo=True,
+            )
+            roles.extend(UserProgramRole(user=user, program=p, role=role) for p in programs)
+        User.objects.create_user(
+            username=f"{USER_PREFIX}admin", display_name="Load Admin", is_demo=True, is_admin=True,
+        )
+        UserProgramRole.objects.bulk_create(roles)
+        return programs
+
+    def _create_metrics(self):
+        from apps.plans.models import MetricDefinition
+
+        return MetricDefinition.objects.bulk_create([
+            MetricDefinition(
+                name=f"{METRIC_PREFIX} {i + 1}",
+                definition="Generated 1-10 scale for load testing.",
+                category="general", min_value=1, max_value=10, unit="score",
+            )
+            for i in range(3)
+        ])
+
+    def _client_identity(self):
+        birth = date(1940, 1, 1) + timedelta(days=self.rng.randint(0, 25000))
+        phone = ""
+        if self.rng.random() < 0.7:
+            phone = f"{self.rng.choice(['416', '514', '604', '613', '780'])}555{self.rng.randint(0, 9999):04d}"
+        return {
+            "first_name": self.rng.choice(FIRST_NAMES),
+            "last_name": self.rng.choice(LAST_NAMES),
+            "birth_date": str(birth),
+            "phone": phone,
+        }
+
+    def _create_clients(self, count, programs, duplicate_rate):
+        from apps.clients.models import ClientFile, ClientProgramEnrolment
+
+        statuses, weights = zip(*STATUSES)
+        identities = []
+        for i in range(count):
+            if identities and self.rng.random() < duplicate_rate:
+                identities.append(dict(self.rng.choice(identities)))  # Likely duplicate record
+            else:
+                identities.append(self._client_identity())
+
+        clients = []
+        for start, batch in zip(range(0, count, self.batch_size), self._batches(identities)):
+            encrypted = {
+                field: encrypt_many([row[field] for row in batch])
+                for field in ("first_name", "last_name", "birth_date", "phone")
+            }
+            objs = [
+                ClientFile(
+                    record_id=f"{RECORD_PREFIX}{start + i + 1:06d}",
+                    _first_name_encrypted=encrypted["first_name"][i],
+                    _last_name_encrypted=encrypted["last_name"][i],
+                    _birth_date_encrypted=encrypted["birth_date"][i],
+                    birth_year_token=birth_year_token(row["birth_date"]),
+                    _phone_encrypted=encrypted["phone"][i],
+                    has_phone=bool(row["phone"]),
+                    status=self.rng.choices(statuses, weights)[0],
+                    is_demo=True,
+                )
+                for i, row in enumerate(batch)
+            ]
+            clients.extend(ClientFile.objects.bulk_create(objs))
+
+        # Every participant is in one program; about one in ten is in two.
+        enrolments = []
+        self.client_programs = {}
+        for client in clients:
+            program = self.rng.choice(programs)
+            self.client_programs[client.pk] = program
+            enrolments.append(ClientProgramEnrolment(client_file=client, program=program))
+            if len(programs) > 1 and self.rng.random() < 0.1:
+                other = self.rng.choice([p for p in programs if p.pk != program.pk])
+                enrolments.append(ClientProgramEnrolment(client_file=client, program=other))
+        for batch in self._batches(enrolments):
+            ClientProgramEnrolment.objects.bulk_create(batch)
+        return clients
+
+    def _create_plans(self, clients, metrics):
+        """One section and one target (with one metric) per participant."""
+        from apps.plans.models import PlanSection, PlanTarget, PlanTargetMetric
+
+        targets = {}
+        for batch in self._batches(clients):
+            sections = PlanSection.objects.bulk_create([
+                PlanSection(client_file=c, name="Goals", program=self.client_programs[c.pk])
+                for c in batch
+            ])
+            names = encrypt_many(["Build stability"] * len(batch))
+            created = PlanTarget.objects.bulk_create([
+                PlanTarget(plan_section=s, client_file=c, _name_encrypted=name)
+                for s, c, name in zip(sections, batch, names)
+            ])
+            metric_for = {}
+            for target in created:
+                metric_for[target.pk] = self.rng.choice(metrics)
+                targets[target.client_file_id] = (target, metric_for[target.pk])
+            PlanTargetMetric.objects.bulk_create([
+                PlanTargetMetric(plan_target=t, metric_def=metric_for[t.pk]) for t in created
+            ])
+        return targets
+
+    def _create_notes(self, total, clients, targets):
+        """Spread notes over participants, each with a target entry and metric value."""
+        from apps.notes.models import MetricValue, ProgressNote, ProgressNoteTarget
+
+        per_client, extra = divmod(total, len(clients))
+        pending = []
+
+        def flush():
+            texts = encrypt_many([self._note_text() for _ in pending])
+            notes = ProgressNote.objects.bulk_create([
+                ProgressNote(
+                    client_file=client,
+                    note_type=self.rng.choice(["quick", "full"]),
+                    interaction_type=self.rng.choice(INTERACTION_TYPES),
+                    author=self.workers[self.client_programs[client.pk].pk],
+                    author_program=self.client_programs[client.pk],
+                    _notes_text_encrypted=text,
+                    backdate=self._random_past(730),
+                )
+                for client, text in zip(pending, texts)
+            ])
+            entries = ProgressNoteTarget.objects.bulk_create([
+                ProgressNoteTarget(
+                    progress_note=note,
+                    plan_target=targets[note.client_file_id][0],
+                    progress_descriptor=self.rng.choice(["harder", "holding", "shifting", "good_place"]),
+                )
+                for note in notes
+            ])
+            MetricValue.objects.bulk_create([
+                MetricValue(
+                    progress_note_target=entry,
+                    metric_def=targets[note.client_file_id][1],
+                    value=str(self.rng.randint(1, 10)),
+                )
+                for note, entry in zip(notes, entries)
+            ])
+            pending.clear()
+
+        for i, client in enumerate(clients):
+            pending.extend([client] * (per_client + (1 if i < extra else 0)))
+            if len(pending) >= self.batch_size:
+                flush()
+        if pending:
+            flush()
+
+    def _create_groups(self, programs, clients, groups_per_program, sessions_per_group):
+        from apps.groups.models import Group, GroupMembership, GroupSession, GroupSessionAttendance
+
+        by_program = {}
+        for client in clients:
+            by_program.setdefault(self.client_programs[client.pk].pk, []).append(client)
+
+        for program in programs:
+            members_pool = by_program.get(program.pk, [])
+            if not members_pool:
+                continue
+            groups = Group.objects.bulk_create([
+                Group(name=f"Load Group {program.pk}-{i + 1}", group_type="group", program=program)
+                for i in range(groups_per_program)
+            ])
+            for group in groups:
+                chosen = self.rng.sample(members_pool, min(12, len(members_pool)))
+                memberships = GroupMembership.objects.bulk_create([
+                    GroupMembership(group=group, client_file=c) for c in chosen
+                ])
+                sessions = GroupSession.objects.bulk_create([
+                    GroupSession(
+                        group=group,
+                        session_date=(self.now - timedelta(weeks=w)).date(),
+                        facilitator=self.workers[program.pk],
+                    )
+                    for w in range(sessions_per_group)
+                ])
+                GroupSessionAttendance.objects.bulk_create([
+                    GroupSessionAttendance(group_session=s, membership=m, present=self.rng.random() < 0.8)
+                    for s in sessions for m in memberships
+                ])
+
+    def _create_meetings(self, count, clients):
+        from apps.events.models import Event, Meeting
+
+        for start in range(0, count, self.batch_size):
+            size = min(self.batch_size, count - start)
+            chosen = [self.rng.choice(clients) for _ in range(size)]
+            events = Event.objects.bulk_create([
+                Event(
+                    client_file=c,
+                    title="Meeting",
+                    start_timestamp=self.now + timedelta(days=self.rng.randint(-180, 60), hours=self.rng.randint(9, 16)),
+                    author_program=self.client_programs[c.pk],
+                )
+                for c in chosen
+            ])
+            meetings = Meeting.objects.bulk_create([
+                Meeting(
+                    event=e,
+                    duration_minutes=self.rng.choice([30, 45, 60]),
+                    status="completed" if e.start_timestamp < self.now else "scheduled",
+                )
+                for e in events
+            ])
+            Attendees = Meeting.attendees.through
+            Attendees.objects.bulk_create([
+                Attendees(meeting_id=m.pk, user_id=self.workers[self.client_programs[c.pk].pk].pk)
+                for m, c in zip(meetings, chosen)
+            ])
+
+    def _create_audit_rows(self, count, clients):
+        from apps.audit.models import AuditLog
+
+        workers = list(self.workers.values())
+        for start in range(0, count, self.batch_size):
+            size = min(self.batch_size, count - start)
+            rows = []
+            for _ in range(size):
+                worker = self.rng.choice(workers)
+                client = self.rng.choice(clients)
+                action, resource_type = self.rng.choice(AUDIT_ACTIONS)
+                rows.append(AuditLog(
+                    event_timestamp=self._random_past(365),
+                    user_id=worker.pk,
+                    user_display=worker.display_name,
+                    action=action,
+                    resource_type=resource_type,
+                    resource_id=client.pk,
+                    program_id=self.client_programs[client.pk].pk,
+                    is_demo_context=True,
+                ))
+            AuditLog.objects.using("audit").bulk_create(rows)
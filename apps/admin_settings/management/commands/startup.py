@@ -0,0 +1,194 @@
+"""
+Run the container startup steps, skipping work whose inputs haven't changed.
+
+Usage:
+    python manage.py startup          # Run changed steps (entrypoint.sh)
+    python manage.py startup --force  # Run every step
+
+entrypoint.sh used to start a new Python process for each of migrate (twice),
+lockdown_audit_db, seed, clearsessions, check_translations and startup_check,
+and each did its full work on every container start. They now run in one
+process, and steps that are safe to skip record a fingerprint of their
+inputs in StartupFingerprint once they succeed:
+
+    migrate, migrate audit   skipped when there are no unapplied migrations
+    seed                     seed commands and seeds/ files, DEMO_MODE,
+                             DEMO_EMAIL_BASE, applied migrations (and the
+                             date in demo mode, so demo data still resets daily)
+    check_translations       locale and template files (path, size, mtime)
+
+lockdown_audit_db, clearsessions and startup_check always run. Lockdown is
+a few GRANT/REVOKE statements, and its real input is the audit database's
+current privileges, which a restored or recreated audit database resets
+without changing anything recorded here. clearsessions depends on the
+clock, and security checks are never skipped. A failed step records
+nothing, so it runs again on the next start.
+"""
+import hashlib
+import os
+import traceback
+from datetime import date
+from importlib import import_module
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import call_command, get_commands
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.db.migrations.executor import MigrationExecutor
+from django.db.migrations.recorder import MigrationRecorder
+
+# Commands whose source defines what seed creates.
+SEED_COMMANDS = (
+    "seed",
+    "seed_demo_data",
+    "seed_event_types",
+    "seed_intake_fields",
+    "seed_note_templates",
+    "update_demo_client_fields",
+)
+
+
+def fingerprint(*parts):
+    """sha256 over the repr of each part."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(repr(part).encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def file_contents(paths):
+    """[(name, sha256 of contents)] for files, in a stable order."""
+    return [
+        (Path(path).name, hashlib.sha256(Path(path).read_bytes()).hexdigest())
+        for path in sorted(paths)
+    ]
+
+
+def file_stats(*roots):
+    """[(relative path, size, mtime)] for every file under the roots."""
+    stats = []
+    for root in roots:
+        root = Path(root)
+        if not root.exists():
+            continue
+        for path in sorted(root.rglob("*")):
+            if path.is_file() and "__pycache__" not in path.parts:
+                st = path.stat()
+                stats.append((str(path.relative_to(root)), st.st_size, st.st_mtime_ns))
+    return stats
+
+
+def applied_migrations(database):
+    return sorted(MigrationRecorder(connections[database]).applied_migrations())
+
+
+def command_path(name):
+    return import_module(f"{get_commands()[name]}.management.commands.{name}").__file__
+
+
+class Command(BaseCommand):
+    help = "Run migrations, seeding and startup checks, skipping steps whose inputs are unchanged."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force", action="store_true",
+            help="Run every step even if its inputs are unchanged.",
+        )
+
+    def handle(self, *args, **options):
+        force = options["force"]
+
+        self._migrate("default", force)
+        self._migrate("audit", force)
+
+        self._step(
+            "lockdown_audit_db", None, force,
+            warning="Audit lockdown failed (see error above). Audit logs may not be write-protected.",
+        )
+        self._step(
+            "seed", self._seed_inputs, force,
+            warning="Seed failed (see error above). App will start but may be missing data.",
+        )
+        self._step(
+            "clearsessions", None, force,
+            warning="Session sweep failed (non-blocking)",
+        )
+        self._step(
+            "check_translations", self._translation_inputs, force,
+            warning="Translation issues detected (non-blocking — app will start)",
+        )
+
+        # Blocking: a failed security check stops startup.
+        self.stdout.write("\nRunning security checks...")
+        self._call("startup_check")
+
+    # ------------------------------------------------------------------
+    # Steps
+    # ------------------------------------------------------------------
+
+    def _migrate(self, database, force):
+        label = "audit migrations" if database == "audit" else "migrations"
+        executor = MigrationExecutor(connections[database])
+        plan = executor.migration_plan(executor.loader.graph.leaf_nodes())
+        if not plan and not force:
+            self.stdout.write(f"No {label} to apply — skipped.")
+            return
+        self.stdout.write(f"Running {label}...")
+        call_command("migrate", database=database, interactive=False, stdout=self.stdout)
+
+    def _step(self, name, inputs, force, warning):
+        """Run a non-blocking command unless its inputs match the last success."""
+        from apps.admin_settings.models import StartupFingerprint
+
+        current = inputs() if inputs else None
+        if current and not force:
+            recorded = StartupFingerprint.objects.filter(step=name).values_list(
+                "fingerprint", flat=True,
+            ).first()
+            if recorded == current:
+                self.stdout.write(f"\n{name}: inputs unchanged — skipped.")
+                return
+
+        self.stdout.write(f"\nRunning {name}...")
+        try:
+            self._call(name)
+        except (Exception, SystemExit):
+            self.stderr.write(traceback.format_exc())
+            self.stdout.write(self.style.WARNING(f"WARNING: {warning}"))
+            return
+        if current:
+            StartupFingerprint.objects.update_or_create(
+                step=name, defaults={"fingerprint": current},
+            )
+
+    def _call(self, name):
+        """call_command, treating sys.exit(0) as a normal return."""
+        try:
+            call_command(name, stdout=self.stdout, stderr=self.stderr)
+        except SystemExit as exc:
+            if exc.code not in (0, None):
+                raise
+
+    # ------------------------------------------------------------------
+    # Step inputs
+    # ------------------------------------------------------------------
+
+    def _seed_inputs(self):
+        seeds_dir = Path(settings.BASE_DIR) / "seeds"
+        return fingerprint(
+            file_contents(command_path(name) for name in SEED_COMMANDS),
+            file_contents(p for p in seeds_dir.rglob("*") if p.is_file() and "__pycache__" not in p.parts),
+            settings.DEMO_MODE,
+            os.environ.get("DEMO_EMAIL_BASE", ""),
+            date.today() if settings.DEMO_MODE else None,
+            applied_migrations("default"),
+        )
+
+    def _translation_inputs(self):
+        base = Path(settings.BASE_DIR)
+        return fingerprint(
+            file_contents([command_path("check_translations")]),
+            file_stats(*settings.LOCALE_PATHS, base / "templates"),
+        )
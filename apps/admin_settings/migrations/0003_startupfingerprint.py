@@ -0,0 +1,25 @@
+# Generated by Django 5.1.15 on 2026-10-18 21:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_settings', '0002_add_french_terminology'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StartupFingerprint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('step', models.CharField(max_length=50, unique=True)),
+                ('fingerprint', models.CharField(max_length=64)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'startup_fingerprints',
+            },
+        ),
+    ]
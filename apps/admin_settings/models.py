@@ -158,3 +158,21 @@ class InstanceSetting(models.Model):
             return cls.objects.get(setting_key=key).setting_value
         except cls.DoesNotExist:
             return default
+
+
+class StartupFingerprint(models.Model):
+    """Hash of a startup step's inputs, recorded when the step last succeeded.
+
+    The startup command skips a step while its inputs still hash the same.
+    """
+
+    step = models.CharField(max_length=50, unique=True)
+    fingerprint = models.CharField(max_length=64)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        app_label = "admin_settings"
+        db_table = "startup_fingerprints"
+
+    def __str__(self):
+        return f"{self.step}: {self.fingerprint[:12]}"
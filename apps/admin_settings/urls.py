@@ -12,6 +12,7 @@ urlpatterns = [
     path("instance/", views.instance_settings, name="instance_settings"),
     path("messaging/", views.messaging_settings, name="messaging_settings"),
     path("diagnose-charts/", views.diagnose_charts, name="diagnose_charts"),
+    path("performance/", views.performance_report, name="performance_report"),
     path("demo-directory/", views.demo_directory, name="demo_directory"),
     # Report template management
     path("report-templates/", report_template_views.report_template_list, name="report_template_list"),
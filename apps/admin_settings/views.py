@@ -1,4 +1,5 @@
 """Admin settings views: dashboard, terminology, features, instance settings."""
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import redirect, render
@@ -362,6 +363,29 @@ def _is_numeric(value):
         return False
 
 
+# --- Performance Report ---
+
+@login_required
+@admin_required
+def performance_report(request):
+    """Per-view query counts and latency gathered by ProfilingMiddleware.
+
+    Totals are kept in memory by each worker process, so this shows the
+    worker that served the page, since it started (or was last reset).
+    """
+    from konote.profiling import reset_view_stats, view_report
+
+    if request.method == "POST":
+        reset_view_stats()
+        messages.success(request, _("Performance statistics reset."))
+        return redirect("admin_settings:performance_report")
+
+    return render(request, "admin_settings/performance_report.html", {
+        "profiling_enabled": getattr(settings, "PROFILING_ENABLED", False),
+        "rows": view_report(),
+    })
+
+
 # --- Demo Account Directory ---
 
 @login_required
@@ -176,10 +176,10 @@ def check_dead_permission_keys(app_configs, **kwargs):
         "note.delete",              # Admin-only destructive action
         "client.delete",            # Admin erasure workflow
         "plan.delete",              # Admin-only destructive action
-        "alert.view",               # Middleware _CLIENT_SCOPED_KEYS + client detail page (implicit)
-        "consent.view",             # Middleware _CLIENT_SCOPED_KEYS (field-level display)
-        "intake.view",              # Middleware _CLIENT_SCOPED_KEYS (no standalone decorator yet)
-        "intake.edit",              # Middleware _CLIENT_SCOPED_KEYS (no standalone decorator yet)
+        "alert.view",               # Middleware redirect via CLIENT_SCOPED_KEYS + client detail page (implicit)
+        "consent.view",             # Middleware redirect via CLIENT_SCOPED_KEYS (field-level display)
+        "intake.view",              # Middleware redirect via CLIENT_SCOPED_KEYS (no standalone decorator yet)
+        "intake.edit",              # Middleware redirect via CLIENT_SCOPED_KEYS (no standalone decorator yet)
         "meeting.view",             # meeting_list shows user's own meetings (implicit)
         "communication.view",       # Timeline integration — guarded by event.view on the events tab
     }
@@ -2,6 +2,7 @@
 import logging
 from functools import wraps
 
+from asgiref.sync import iscoroutinefunction, sync_to_async
 from django.http import HttpResponseForbidden
 from django.template.response import TemplateResponse
 from django.utils.translation import gettext as _
@@ -148,6 +149,8 @@ def requires_permission(permission_key, get_program_fn=None, get_client_fn=None,
                      check entirely. Use for report/export views where admins
                      need access even without a program role.
 
+    Works on async views too; the permission queries then run in a thread.
+
     Usage:
         @requires_permission("note.create", _get_program_from_client)
         def note_create(request, client_id):
@@ -178,113 +181,129 @@ def requires_permission(permission_key, get_program_fn=None, get_client_fn=None,
             f"checks, which is unsafe for client-scoped views."
         )
 
-    def decorator(view_func):
-        @wraps(view_func)
-        def wrapper(request, *args, **kwargs):
-            # Admin bypass — admin is NOT a program role, so the matrix
-            # has no entry for them. Views that should be accessible to
-            # admins (e.g. report generation) opt in with allow_admin=True.
-            # SAFETY: This skips ClientAccessBlock, so allow_admin must
-            # never be used on client-scoped views (enforced above).
-            if allow_admin and getattr(request.user, "is_admin", False):
-                return view_func(request, *args, **kwargs)
-
-            # --- Determine the user's role ---
-            user_role = None
-
-            if get_program_fn is not None:
-                # Program-scoped: get role in the specific program
-                from apps.programs.models import UserProgramRole
-                try:
-                    program = get_program_fn(request, *args, **kwargs)
-                except Exception as e:
-                    return _render_403(
-                        request,
-                        f"Unable to determine program for this resource: {str(e)}"
-                    )
-
-                # Check ClientAccessBlock (DV safety)
-                block_response = _check_client_access_block(
-                    request, get_client_fn, args, kwargs
-                )
-                if block_response is not None:
-                    return block_response
-
-                role_obj = UserProgramRole.objects.filter(
-                    user=request.user,
-                    program=program,
-                    status="active"
-                ).first()
-
-                if not role_obj:
-                    return _render_403(
-                        request,
-                        _("You do not have access to this program.")
-                    )
-
-                user_role = role_obj.role
-                request.user_program_role = role_obj.role
-            else:
-                # No program in URL — use highest role across all programs
-                # Check ClientAccessBlock if client function provided
-                block_response = _check_client_access_block(
-                    request, get_client_fn, args, kwargs
-                )
-                if block_response is not None:
-                    return block_response
-
-                user_role = _get_user_highest_role_any(request.user)
-                if user_role is not None:
-                    request.user_program_role = user_role
-
-            if user_role is None:
+    def check(request, *args, **kwargs):
+        """Return a 403 response if access is denied, or None to allow."""
+        # Admin bypass — admin is NOT a program role, so the matrix
+        # has no entry for them. Views that should be accessible to
+        # admins (e.g. report generation) opt in with allow_admin=True.
+        # SAFETY: This skips ClientAccessBlock, so allow_admin must
+        # never be used on client-scoped views (enforced above).
+        if allow_admin and getattr(request.user, "is_admin", False):
+            return None
+
+        # --- Determine the user's role ---
+        user_role = None
+
+        if get_program_fn is not None:
+            # Program-scoped: get role in the specific program
+            from apps.programs.models import UserProgramRole
+            try:
+                program = get_program_fn(request, *args, **kwargs)
+            except Exception as e:
                 return _render_403(
                     request,
-                    _("You do not have any program roles.")
+                    f"Unable to determine program for this resource: {str(e)}"
                 )
 
-            # --- Check the matrix ---
-            level = can_access(user_role, permission_key)
+            # Check ClientAccessBlock (DV safety)
+            block_response = _check_client_access_block(
+                request, get_client_fn, args, kwargs
+            )
+            if block_response is not None:
+                return block_response
+
+            role_obj = UserProgramRole.objects.filter(
+                user=request.user,
+                program=program,
+                status="active"
+            ).first()
 
-            if level == DENY:
+            if not role_obj:
                 return _render_403(
                     request,
-                    _("Access denied. Your role does not have permission for this action.")
+                    _("You do not have access to this program.")
                 )
 
-            if level in (ALLOW, SCOPED):
-                return view_func(request, *args, **kwargs)
+            user_role = role_obj.role
+            request.user_program_role = role_obj.role
+        else:
+            # No program in URL — use highest role across all programs
+            # Check ClientAccessBlock if client function provided
+            block_response = _check_client_access_block(
+                request, get_client_fn, args, kwargs
+            )
+            if block_response is not None:
+                return block_response
 
-            if level == GATED:
-                # Future: check for documented justification.
-                # For now, treat as ALLOW with a log warning.
-                logger.warning(
-                    "GATED permission '%s' treated as ALLOW for user %s (role=%s). "
-                    "Justification UI not yet implemented.",
-                    permission_key, request.user.pk, user_role,
-                )
-                return view_func(request, *args, **kwargs)
-
-            if level == PER_FIELD:
-                # Future: delegate to field-level check.
-                # For now, treat as ALLOW with a log warning.
-                logger.warning(
-                    "PER_FIELD permission '%s' treated as ALLOW for user %s (role=%s). "
-                    "Field-level check not yet implemented.",
-                    permission_key, request.user.pk, user_role,
-                )
-                return view_func(request, *args, **kwargs)
+            user_role = _get_user_highest_role_any(request.user)
+            if user_role is not None:
+                request.user_program_role = user_role
 
-            # Unknown level — fail closed
-            logger.error(
-                "Unknown permission level '%s' for key '%s', role '%s'. Denying access.",
-                level, permission_key, user_role,
+        if user_role is None:
+            return _render_403(
+                request,
+                _("You do not have any program roles.")
             )
+
+        # --- Check the matrix ---
+        level = can_access(user_role, permission_key)
+
+        if level == DENY:
             return _render_403(
                 request,
-                _("Access denied. Unable to determine permission level.")
+                _("Access denied. Your role does not have permission for this action.")
             )
 
+        if level in (ALLOW, SCOPED):
+            return None
+
+        if level == GATED:
+            # Future: check for documented justification.
+            # For now, treat as ALLOW with a log warning.
+            logger.warning(
+                "GATED permission '%s' treated as ALLOW for user %s (role=%s). "
+                "Justification UI not yet implemented.",
+                permission_key, request.user.pk, user_role,
+            )
+            return None
+
+        if level == PER_FIELD:
+            # Future: delegate to field-level check.
+            # For now, treat as ALLOW with a log warning.
+            logger.warning(
+                "PER_FIELD permission '%s' treated as ALLOW for user %s (role=%s). "
+                "Field-level check not yet implemented.",
+                permission_key, request.user.pk, user_role,
+            )
+            return None
+
+        # Unknown level — fail closed
+        logger.error(
+            "Unknown permission level '%s' for key '%s', role '%s'. Denying access.",
+            level, permission_key, user_role,
+        )
+        return _render_403(
+            request,
+            _("Access denied. Unable to determine permission level.")
+        )
+
+    def decorator(view_func):
+        if iscoroutinefunction(view_func):
+            # Async views (ASGI): run the permission queries in a thread.
+            @wraps(view_func)
+            async def async_wrapper(request, *args, **kwargs):
+                denied = await sync_to_async(check)(request, *args, **kwargs)
+                if denied is not None:
+                    return denied
+                return await view_func(request, *args, **kwargs)
+            return async_wrapper
+
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            denied = check(request, *args, **kwargs)
+            if denied is not None:
+                return denied
+            return view_func(request, *args, **kwargs)
         return wrapper
     return decorator
 
@@ -19,7 +19,8 @@ Full rotation process:
 Models and fields affected:
     - auth_app.User: _email_encrypted
     - clients.ClientFile: _first_name_encrypted, _middle_name_encrypted,
-      _last_name_encrypted, _birth_date_encrypted
+      _last_name_encrypted, _birth_date_encrypted (birth_year_token, which
+      is keyed on the same key, is recomputed under the new key)
     - clients.ClientDetailValue: _value_encrypted (all rows, not just sensitive)
     - notes.ProgressNote: _notes_text_encrypted, _summary_encrypted,
       _participant_reflection_encrypted
@@ -30,6 +31,8 @@ from cryptography.fernet import Fernet, InvalidToken
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
 
+from apps.clients.birth_year import birth_year_token
+
 
 # Registry of (model_class, [encrypted_field_names])
 def _get_encrypted_models():
@@ -119,6 +122,7 @@ class Command(BaseCommand):
 
                 for obj in model_class.objects.all().iterator():
                     fields_changed = False
+                    update_fields = list(field_names)
 
                     for field_name in field_names:
                         raw = getattr(obj, field_name)
@@ -137,6 +141,11 @@ class Command(BaseCommand):
                             if not dry_run:
                                 setattr(obj, field_name, new_value)
                                 fields_changed = True
+                                if field_name == "_birth_date_encrypted":
+                                    obj.birth_year_token = birth_year_token(
+                                        old_fernet.decrypt(raw).decode("utf-8"), key=new_key,
+                                    )
+                                    update_fields.append("birth_year_token")
                         except InvalidToken:
                             error_count += 1
                             self.stderr.write(
@@ -149,7 +158,7 @@ class Command(BaseCommand):
                     if fields_changed and not dry_run:
                         # Save only the encrypted columns to avoid triggering
                         # auto_now or other side-effects on unrelated fields.
-                        obj.save(update_fields=field_names)
+                        obj.save(update_fields=update_fields)
                         re_encrypted_count += 1
                     elif dry_run and not error_count:
                         # In dry-run mode, count rows that have at least one
@@ -5,9 +5,14 @@ Every permission check in the codebase should reference this file.
 
 Enforcement layers:
 - @requires_permission("key") decorator reads from can_access()
-- {% has_permission "key" %} template tag reads from can_access()
+- {% has_permission "key" %} template tag reads from is_allowed()
 - @admin_required is a SEPARATE system — admin keys here are documentation only
+
+The matrix is compiled once at import (see COMPILED_ROLES) so per-request
+checks are single lookups into frozen, precomputed structures.
 """
+from dataclasses import dataclass
+from types import MappingProxyType
 
 from apps.auth_app.constants import ROLE_RANK
 
@@ -396,6 +401,66 @@ ALL_PERMISSION_KEYS = frozenset(
     for key in role_perms.keys()
 )
 
+# Permission keys that represent individual client-scoped data access.
+# If ALL of these are DENY for a user's highest role, that user cannot see
+# individual client data and ProgramAccessMiddleware redirects them to the
+# executive dashboard.
+CLIENT_SCOPED_KEYS = (
+    "client.view_name", "client.view_contact", "client.view_safety",
+    "client.view_clinical", "client.edit", "client.create",
+    "note.view", "note.create", "note.edit",
+    "plan.view", "plan.edit",
+    "event.view", "event.create",
+    "alert.view", "alert.create",
+    "group.view_roster", "group.view_detail", "group.manage_members",
+    "consent.view", "consent.manage",
+    "intake.view", "intake.edit",
+)
+
+
+# --- Compiled matrix (built once at import) ---
+
+# One bit per permission key.
+PERMISSION_BITS = MappingProxyType({
+    key: 1 << index for index, key in enumerate(sorted(ALL_PERMISSION_KEYS))
+})
+
+
+@dataclass(frozen=True)
+class CompiledRole:
+    """A role's row of the matrix, precomputed for per-request checks."""
+
+    levels: MappingProxyType        # permission key -> level
+    allowed: int                    # bitset of keys that are not DENY
+    template_permissions: MappingProxyType  # "note_view" -> bool, for templates
+    all_client_denied: bool         # DENY on every CLIENT_SCOPED_KEYS entry
+
+
+def _compile_role(role_perms):
+    allowed = 0
+    for key, level in role_perms.items():
+        if level != DENY:
+            allowed |= PERMISSION_BITS[key]
+    return CompiledRole(
+        levels=MappingProxyType(dict(role_perms)),
+        allowed=allowed,
+        # Keys use underscores so templates can access e.g. user_permissions.note_view
+        template_permissions=MappingProxyType({
+            key.replace(".", "_"): level != DENY for key, level in role_perms.items()
+        }),
+        all_client_denied=all(
+            role_perms.get(key, DENY) == DENY for key in CLIENT_SCOPED_KEYS
+        ),
+    )
+
+
+COMPILED_ROLES = MappingProxyType({
+    role: _compile_role(role_perms) for role, role_perms in PERMISSIONS.items()
+})
+
+# Unknown roles are denied everything.
+_NO_ROLE = _compile_role({})
+
 
 def can_access(role, permission):
     """Check if a role has a given permission.
@@ -407,7 +472,22 @@ def can_access(role, permission):
     Returns:
         Permission level: DENY, ALLOW, SCOPED, GATED, or PER_FIELD
     """
-    return PERMISSIONS.get(role, {}).get(permission, DENY)
+    return COMPILED_ROLES.get(role, _NO_ROLE).levels.get(permission, DENY)
+
+
+def is_allowed(role, permission):
+    """Return True if a role's level for a permission is anything but DENY."""
+    return bool(COMPILED_ROLES.get(role, _NO_ROLE).allowed & PERMISSION_BITS.get(permission, 0))
+
+
+def template_permissions(role):
+    """Read-only {"note_view": True, ...} for a role, shared across requests."""
+    return COMPILED_ROLES.get(role, _NO_ROLE).template_permissions
+
+
+def all_client_permissions_denied(role):
+    """True if a role is DENY for every client-scoped permission."""
+    return COMPILED_ROLES.get(role, _NO_ROLE).all_client_denied
 
 
 def get_permission_summary(role):
@@ -8,7 +8,7 @@ Usage in templates:
 from django import template
 
 from apps.auth_app.constants import ROLE_RANK
-from apps.auth_app.permissions import DENY, can_access
+from apps.auth_app.permissions import is_allowed
 
 register = template.Library()
 
@@ -53,5 +53,4 @@ def has_permission(context, permission_key):
     elif highest_role == "":
         return False
 
-    level = can_access(highest_role, permission_key)
-    return level != DENY
+    return is_allowed(highest_role, permission_key)
@@ -6,3 +6,6 @@ class ClientsConfig(AppConfig):
     name = "apps.clients"
     label = "clients"
     verbose_name = "Clients"
+
+    def ready(self):
+        import apps.clients.signals  # noqa: F401
@@ -0,0 +1,78 @@
+"""Keyed birth-year tokens for demographic reports.
+
+Reports bucket participants by age, which used to mean decrypting every
+birth date on every run. Each ClientFile now also stores
+birth_year_token: a keyed HMAC of the birth year only (e.g. "1990"). The
+HMAC key is derived from the current FIELD_ENCRYPTION_KEY, so the token
+reveals nothing to someone who has SECRET_KEY alone, and the exact date
+of birth stays encrypted.
+
+Reports read the tokens with an ordinary query and map them back to a
+year through a table of every year since 1900, built in memory under the
+current key. A birth year gives two possible ages on any date (before
+and after the birthday); when both fall in the same age bin, the bin is
+known without decryption. Only participants whose two possible ages
+straddle a bin edge, and any without a current token, need their birth
+date decrypted.
+
+rotate_encryption_key re-keys the tokens along with the ciphertext. The
+refresh_birth_years command (daily) backfills tokens for rows written
+without the model setter.
+"""
+from datetime import date
+from functools import lru_cache
+
+from django.conf import settings
+from django.utils.crypto import salted_hmac
+
+_KEY_SALT = "konote.clients.birth_year"
+FIRST_YEAR = 1900
+
+
+def _secret():
+    """The current (first) field-encryption key."""
+    keys = [k.strip() for k in (settings.FIELD_ENCRYPTION_KEY or "").split(",") if k.strip()]
+    if not keys:
+        raise ValueError("FIELD_ENCRYPTION_KEY is not set.")
+    return keys[0]
+
+
+def _token(year, secret):
+    return salted_hmac(_KEY_SALT, f"{year:04d}", secret=secret).hexdigest()[:16]
+
+
+def _parse(birth_date):
+    if isinstance(birth_date, str):
+        try:
+            return date.fromisoformat(birth_date)
+        except ValueError:
+            return None
+    return birth_date or None
+
+
+def birth_year_token(birth_date, key=None):
+    """Token for a birth date (date or YYYY-MM-DD string); "" if missing.
+
+    key is the field-encryption key to token under; defaults to the
+    current one.
+    """
+    parsed = _parse(birth_date)
+    if parsed is None:
+        return ""
+    return _token(parsed.year, key or _secret())
+
+
+@lru_cache(maxsize=4)
+def _token_table(secret, last_year):
+    return {_token(year, secret): year for year in range(FIRST_YEAR, last_year + 1)}
+
+
+def decode_tokens():
+    """{token: year} for every year from 1900 to this year."""
+    return _token_table(_secret(), date.today().year)
+
+
+def possible_ages(year, as_of):
+    """(age if the birthday has passed, age if not) at as_of."""
+    age = as_of.year - year
+    return age, age - 1
@@ -0,0 +1,152 @@
+"""Bulk loading and saving of client custom field values (EAV).
+
+An agency can have 60+ intake fields. Loading or saving them one
+ClientDetailValue at a time costs one query per field, so these helpers
+work on the whole set at once:
+
+- get_field_schema(): active groups and fields, cached under a version
+  stamp that is bumped when an admin edits a group or field (see
+  apps/clients/signals.py).
+- load_custom_values(): one query for all of a client's values,
+  decrypting sensitive ones in a single pass.
+- save_custom_values(): one query to read existing rows, then
+  bulk_create / bulk_update for new and changed values. Bulk writes
+  skip signals, so it bumps the funder report "clients" version itself.
+"""
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from konote.encryption import decrypt_field, encrypt_field
+
+from .models import ClientDetailValue, CustomFieldGroup, CustomFieldSchemaVersion
+
+SCHEMA_CACHE_KEY = "custom_field_schema"
+SCHEMA_CACHE_SECONDS = 300
+
+
+def get_field_schema():
+    """Return active groups with their active fields, in display order.
+
+    Returns a list of {"group": CustomFieldGroup, "fields": [CustomFieldDefinition]}.
+    Groups without active fields are included with an empty list.
+
+    Front desk access is decided from this schema, so the cache key carries
+    the version stamp from the database: an edit committed in one worker
+    is seen by every worker on its next request, not after the TTL.
+    """
+    cache_key = f"{SCHEMA_CACHE_KEY}_{schema_version()}"
+    schema = cache.get(cache_key)
+    if schema is None:
+        groups = CustomFieldGroup.objects.filter(status="active").prefetch_related("fields")
+        schema = [
+            {
+                "group": group,
+                "fields": [fd for fd in group.fields.all() if fd.status == "active"],
+            }
+            for group in groups
+        ]
+        cache.set(cache_key, schema, SCHEMA_CACHE_SECONDS)
+    return schema
+
+
+def schema_version():
+    """Current version stamp of the custom field schema ("0" until first bumped)."""
+    version = CustomFieldSchemaVersion.objects.values_list("version", flat=True).first()
+    return version or "0"
+
+
+def invalidate_field_schema():
+    """Bump the schema version once the edit commits, for every worker."""
+
+    def bump():
+        CustomFieldSchemaVersion.objects.update_or_create(
+            pk=1, defaults={"version": uuid.uuid4().hex},
+        )
+
+    transaction.on_commit(bump)
+
+
+def load_custom_values(client, field_defs):
+    """Return {field_def_id: value} for the given fields, in one query.
+
+    Sensitive values are decrypted; fields with no stored value are
+    absent from the result.
+    """
+    defs_by_id = {fd.pk: fd for fd in field_defs}
+    if not defs_by_id:
+        return {}
+    rows = ClientDetailValue.objects.filter(
+        client_file=client, field_def_id__in=defs_by_id,
+    ).values_list("field_def_id", "value", "_value_encrypted")
+    values = {}
+    for field_def_id, plain, encrypted in rows:
+        if defs_by_id[field_def_id].is_sensitive:
+            values[field_def_id] = decrypt_field(encrypted)
+        else:
+            values[field_def_id] = plain
+    return values
+
+
+def save_custom_values(client, values_by_field):
+    """Persist {field_def: value} for a client with bulk writes.
+
+    Unchanged values are left alone, so updated_at only moves for fields
+    that actually changed. Sensitive values are encrypted; a changed
+    sensitive value is detected by comparing decrypted text.
+
+    Returns (created_count, updated_count).
+    """
+    if not values_by_field:
+        return 0, 0
+    existing = {
+        cdv.field_def_id: cdv
+        for cdv in ClientDetailValue.objects.filter(
+            client_file=client, field_def__in=list(values_by_field),
+        )
+    }
+    now = timezone.now()
+    to_create, to_update = [], []
+    for field_def, value in values_by_field.items():
+        cdv = existing.get(field_def.pk)
+        if cdv is None:
+            cdv = ClientDetailValue(client_file=client, field_def=field_def)
+            _assign(cdv, field_def, value)
+            to_create.append(cdv)
+            continue
+        # A value stored under the other sensitivity setting counts as changed,
+        # so toggling is_sensitive migrates the row on its next save.
+        if field_def.is_sensitive:
+            unchanged = not cdv.value and decrypt_field(cdv._value_encrypted) == value
+        else:
+            unchanged = not cdv._value_encrypted and cdv.value == value
+        if unchanged:
+            continue
+        _assign(cdv, field_def, value)
+        cdv.updated_at = now
+        to_update.append(cdv)
+
+    if to_create:
+        ClientDetailValue.objects.bulk_create(to_create)
+    if to_update:
+        ClientDetailValue.objects.bulk_update(
+            to_update, ["value", "_value_encrypted", "updated_at"],
+        )
+    if to_create or to_update:
+        # Bulk writes skip the post_save receivers that invalidate reports.
+        from apps.reports.report_cache import bump_data_version
+
+        bump_data_version("clients")
+    return len(to_create), len(to_update)
+
+
+def _assign(cdv, field_def, value):
+    """Same storage rule as ClientDetailValue.set_value, without re-fetching field_def."""
+    if field_def.is_sensitive:
+        cdv._value_encrypted = encrypt_field(value)
+        cdv.value = ""
+    else:
+        cdv.value = value
+        cdv._value_encrypted = b""
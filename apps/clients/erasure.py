@@ -298,6 +298,7 @@ def _anonymise_client_pii(client, erasure_code):
     client._middle_name_encrypted = b""
     client._last_name_encrypted = b""
     client._birth_date_encrypted = b""
+    client.birth_year_token = ""
     client.record_id = erasure_code
     client.status = "discharged"
     client.is_anonymised = True
@@ -324,12 +325,15 @@ def _purge_narrative_content(client):
     """
     from apps.events.models import Alert, Event
     from apps.notes.models import ProgressNote, ProgressNoteTarget
+    from apps.notes.quote_index import WORDS_NONE
 
     # Blank progress note text
     ProgressNote.objects.filter(client_file=client).update(
         _notes_text_encrypted=b"",
         _summary_encrypted=b"",
         _participant_reflection_encrypted=b"",
+        reflection_bucket=WORDS_NONE,
+        reflection_hash="",
     )
 
     # Blank target-level notes
@@ -0,0 +1,67 @@
+"""
+Refresh the keyed birth-year tokens that age reports read.
+
+Usage:
+    python manage.py refresh_birth_years            # Fix missing or stale tokens
+    python manage.py refresh_birth_years --all      # Recompute every token
+    python manage.py refresh_birth_years --dry-run  # Count without saving
+
+Intended to run as a daily scheduled task (cron, Railway cron, etc.).
+Tokens are set whenever a birth date is saved through the model, and
+rotate_encryption_key re-keys them, but rows written another way (bulk
+imports, raw SQL, restores) need refreshing. Until then, reports still
+get exact ages by decrypting those birth dates, just more slowly.
+"""
+from django.core.management.base import BaseCommand
+
+from apps.clients.birth_year import birth_year_token, decode_tokens
+
+BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = "Backfill and re-key the birth-year tokens used by demographic reports."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all", action="store_true",
+            help="Recompute every token, not just missing or stale ones.",
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true",
+            help="Count tokens that would change without saving.",
+        )
+
+    def handle(self, *args, **options):
+        from apps.clients.models import ClientFile
+
+        valid = decode_tokens()
+        dry_run = options["dry_run"]
+        checked = updated = 0
+        changed = []
+
+        clients = ClientFile.objects.only("pk", "_birth_date_encrypted", "birth_year_token")
+        for client in clients.iterator(chunk_size=BATCH_SIZE):
+            # Tokens in the current table are up to date; skip the decryption.
+            if not options["all"] and (client.birth_year_token in valid or (
+                not client.birth_year_token and not client._birth_date_encrypted
+            )):
+                continue
+            checked += 1
+            token = birth_year_token(client.birth_date)
+            if token != client.birth_year_token:
+                client.birth_year_token = token
+                changed.append(client)
+                updated += 1
+            if len(changed) >= BATCH_SIZE:
+                if not dry_run:
+                    ClientFile.objects.bulk_update(changed, ["birth_year_token"])
+                changed = []
+
+        if changed and not dry_run:
+            ClientFile.objects.bulk_update(changed, ["birth_year_token"])
+
+        verb = "Would update" if dry_run else "Updated"
+        self.stdout.write(self.style.SUCCESS(
+            f"Checked {checked} birth date(s). {verb} {updated} token(s)."
+        ))
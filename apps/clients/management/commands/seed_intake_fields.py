@@ -20,6 +20,7 @@ Run with: python manage.py seed_intake_fields
 from django.core.management.base import BaseCommand
 
 from apps.clients.models import CustomFieldDefinition, CustomFieldGroup
+from konote.seeding import SeedSpec, seed
 
 
 # Field groups and their fields
@@ -446,37 +447,30 @@ class Command(BaseCommand):
     help = "Seed default intake custom fields for Canadian nonprofit community services."
 
     def handle(self, *args, **options):
-        # No early-return guard — get_or_create handles idempotency.
+        # No early-return guard — seed() only creates what is missing.
         # A guard here caused a production outage when the DB had groups but
         # no field definitions. Every startup must ensure all fields exist.
 
-        groups_created = 0
-        fields_created = 0
-
-        for group_title, group_sort_order, fields in INTAKE_FIELD_GROUPS:
-            # Create or get the group
-            # Youth/recreation groups are archived by default — agencies can reactivate if needed
-            initial_status = "archived" if group_title in ARCHIVED_BY_DEFAULT else "active"
-            group, was_group_created = CustomFieldGroup.objects.get_or_create(
-                title=group_title,
-                defaults={"sort_order": group_sort_order, "status": initial_status},
-            )
-            if was_group_created:
-                groups_created += 1
-
-            # Create fields within the group
+        # Youth/recreation groups are archived by default — agencies can reactivate if needed
+        groups = seed(SeedSpec(CustomFieldGroup, key=("title",), rows=[
+            {
+                "title": group_title,
+                "sort_order": group_sort_order,
+                "status": "archived" if group_title in ARCHIVED_BY_DEFAULT else "active",
+            }
+            for group_title, group_sort_order, _fields in INTAKE_FIELD_GROUPS
+        ]))
+
+        field_rows = []
+        for group_title, _group_sort_order, fields in INTAKE_FIELD_GROUPS:
+            group = groups.objects[(group_title,)]
             for field_idx, field_data in enumerate(fields):
                 # Unpack with optional validation_type (8th element)
-                name = field_data[0]
-                input_type = field_data[1]
-                is_required = field_data[2]
-                is_sensitive = field_data[3]
-                front_desk_access = field_data[4]
-                placeholder = field_data[5]
-                options = field_data[6]
+                name, input_type, is_required, is_sensitive, front_desk_access, placeholder, options = field_data[:7]
                 validation_type = field_data[7] if len(field_data) > 7 else "none"
-
-                defaults = {
+                field_rows.append({
+                    "group": group,
+                    "name": name,
                     "input_type": input_type,
                     "is_required": is_required,
                     "is_sensitive": is_sensitive,
@@ -485,19 +479,15 @@ class Command(BaseCommand):
                     "options_json": options if options else [],
                     "sort_order": field_idx * 10,
                     "status": "active",
-                }
-                # Only set validation_type if explicitly specified,
-                # otherwise let model.save() auto-detect it.
-                if validation_type != "none":
-                    defaults["validation_type"] = validation_type
-
-                _, was_field_created = CustomFieldDefinition.objects.get_or_create(
-                    group=group,
-                    name=name,
-                    defaults=defaults,
-                )
-                if was_field_created:
-                    fields_created += 1
+                    # "none" lets detect_validation_type() pick one from the name.
+                    "validation_type": validation_type,
+                })
+        fields = seed(SeedSpec(
+            CustomFieldDefinition,
+            key=("group", "name"),
+            rows=field_rows,
+            prepare=CustomFieldDefinition.detect_validation_type,
+        ))
 
         # Fix stale data from earlier seeds
         fixups = 0
@@ -632,7 +622,8 @@ class Command(BaseCommand):
 
         self.stdout.write(
             self.style.SUCCESS(
-                f"  Intake fields: {groups_created} groups and {fields_created} fields created."
+                f"  Intake fields: {len(groups.created)} groups and {len(fields.created)} fields created "
+                f"({len(groups.unchanged)} groups and {len(fields.unchanged)} fields unchanged)."
             )
         )
         self.stdout.write("  Note: Youth/recreation field groups (Parent/Guardian, Health & Safety, Program Consents)")
@@ -375,6 +375,7 @@ def execute_merge(kept, archived, pii_choices, field_resolutions, user, ip_addre
                 kept.last_name = archived.last_name
             elif field_name == "birth_date":
                 kept._birth_date_encrypted = archived._birth_date_encrypted
+                kept.birth_year_token = archived.birth_year_token
             elif field_name == "phone":
                 kept._phone_encrypted = archived._phone_encrypted
     kept.save()
@@ -497,6 +498,7 @@ def execute_merge(kept, archived, pii_choices, field_resolutions, user, ip_addre
     archived._middle_name_encrypted = b""
     archived._last_name_encrypted = b""
     archived._birth_date_encrypted = b""
+    archived.birth_year_token = ""
     archived._phone_encrypted = b""
     archived.status = "discharged"
     archived.is_anonymised = True
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.15 on 2026-10-18 21:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0021_province_field_select_other'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='clientfile',
+            name='birth_year_token',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=16),
+        ),
+    ]
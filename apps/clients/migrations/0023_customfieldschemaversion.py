@@ -0,0 +1,24 @@
+# Generated by Django 5.1.15 on 2026-10-18 23:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0022_clientfile_birth_year_token'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CustomFieldSchemaVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.CharField(max_length=32)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'custom_field_schema_versions',
+            },
+        ),
+    ]
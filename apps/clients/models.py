@@ -6,6 +6,8 @@ from django.utils.translation import gettext_lazy as _
 
 from konote.encryption import decrypt_field, encrypt_field
 
+from .birth_year import birth_year_token
+
 
 class ClientFileQuerySet(models.QuerySet):
     """Custom queryset for ClientFile with demo/real filtering."""
@@ -54,6 +56,8 @@ class ClientFile(models.Model):
     _middle_name_encrypted = models.BinaryField(default=b"", blank=True)
     _last_name_encrypted = models.BinaryField(default=b"")
     _birth_date_encrypted = models.BinaryField(default=b"", blank=True)
+    # Keyed token of the birth year for age reports (see birth_year.py)
+    birth_year_token = models.CharField(max_length=16, default="", blank=True, db_index=True)
     _phone_encrypted = models.BinaryField(default=b"", blank=True)
 
     record_id = models.CharField(max_length=100, default="", blank=True)
@@ -145,6 +149,7 @@ class ClientFile(models.Model):
     @birth_date.setter
     def birth_date(self, value):
         self._birth_date_encrypted = encrypt_field(str(value) if value else "")
+        self.birth_year_token = birth_year_token(value)
 
     @property
     def phone(self):
@@ -418,13 +423,34 @@ class CustomFieldDefinition(models.Model):
         return self.name
 
     def save(self, *args, **kwargs):
-        # Auto-detect validation type on first save if not explicitly set
+        self.detect_validation_type()
+        super().save(*args, **kwargs)
+
+    def detect_validation_type(self):
+        """Auto-detect validation type from the field name if not explicitly set."""
         if not self.validation_type or self.validation_type == "none":
             from .validators import detect_validation_type
             detected = detect_validation_type(self.name)
             if detected != "none":
                 self.validation_type = detected
-        super().save(*args, **kwargs)
+
+
+class CustomFieldSchemaVersion(models.Model):
+    """Version stamp for the cached custom field schema (a single row).
+
+    Kept in the database so every worker process drops its cached schema
+    as soon as an admin's edit commits — see apps/clients/custom_fields.py.
+    """
+
+    version = models.CharField(max_length=32)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        app_label = "clients"
+        db_table = "custom_field_schema_versions"
+
+    def __str__(self):
+        return self.version[:12]
 
 
 class ClientDetailValue(models.Model):
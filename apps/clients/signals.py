@@ -0,0 +1,12 @@
+"""Cache invalidation signals for the custom field schema."""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .custom_fields import invalidate_field_schema
+from .models import CustomFieldDefinition, CustomFieldGroup
+
+
+@receiver([post_save, post_delete], sender=CustomFieldGroup)
+@receiver([post_save, post_delete], sender=CustomFieldDefinition)
+def invalidate_custom_field_schema(sender, **kwargs):
+    invalidate_field_schema()
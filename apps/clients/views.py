@@ -17,8 +17,9 @@ from apps.notes.models import ProgressNote
 from apps.programs.models import Program, UserProgramRole
 
 from .forms import ClientContactForm, ClientFileForm, ConsentRecordForm, CustomFieldDefinitionForm, CustomFieldGroupForm, CustomFieldValuesForm
+from .custom_fields import get_field_schema, load_custom_values, save_custom_values
 from .helpers import get_client_tab_counts, get_document_folder_url
-from .models import ClientDetailValue, ClientFile, ClientProgramEnrolment, CustomFieldGroup
+from .models import ClientFile, ClientProgramEnrolment, CustomFieldGroup
 from .validators import (
     normalize_phone_number, normalize_postal_code,
     validate_phone_number, validate_postal_code,
@@ -497,6 +498,20 @@ def client_detail(request, client_id):
     return render(request, "clients/detail.html", context)
 
 
+def _visible_field_schema(is_receptionist, front_desk_levels):
+    """Cached field schema, narrowed to what front desk staff may see/edit."""
+    schema = get_field_schema()
+    if not is_receptionist:
+        return schema
+    return [
+        {
+            "group": entry["group"],
+            "fields": [fd for fd in entry["fields"] if fd.front_desk_access in front_desk_levels],
+        }
+        for entry in schema
+    ]
+
+
 def _get_custom_fields_context(client, user_role, hide_empty=False):
     """Build custom fields context for display/edit templates.
 
@@ -509,22 +524,16 @@ def _get_custom_fields_context(client, user_role, hide_empty=False):
     Returns a dict with custom_data, has_editable_fields, client, and is_receptionist (front desk flag).
     """
     is_receptionist = user_role == "receptionist"
-    groups = CustomFieldGroup.objects.filter(status="active").prefetch_related("fields")
+    schema = _visible_field_schema(is_receptionist, ("view", "edit"))
+    values = load_custom_values(client, [fd for entry in schema for fd in entry["fields"]])
     custom_data = []
     has_editable_fields = False
 
-    for group in groups:
-        if is_receptionist:
-            fields = group.fields.filter(status="active", front_desk_access__in=["view", "edit"])
-        else:
-            fields = group.fields.filter(status="active")
+    for entry in schema:
+        group = entry["group"]
         field_values = []
-        for field_def in fields:
-            try:
-                cdv = ClientDetailValue.objects.get(client_file=client, field_def=field_def)
-                value = cdv.get_value()
-            except ClientDetailValue.DoesNotExist:
-                value = ""
+        for field_def in entry["fields"]:
+            value = values.get(field_def.pk, "")
             is_editable = not is_receptionist or field_def.front_desk_access == "edit"
             if is_editable:
                 has_editable_fields = True
@@ -592,19 +601,11 @@ def client_save_custom_fields(request, client_id):
     is_receptionist = user_role == "receptionist"
 
     if request.method == "POST":
-        groups = CustomFieldGroup.objects.filter(status="active").prefetch_related("fields")
-
         # Get field definitions the user can edit
-        if is_receptionist:
-            editable_field_defs = [
-                fd for group in groups
-                for fd in group.fields.filter(status="active", front_desk_access="edit")
-            ]
-        else:
-            editable_field_defs = [
-                fd for group in groups
-                for fd in group.fields.filter(status="active")
-            ]
+        editable_field_defs = [
+            fd for entry in _visible_field_schema(is_receptionist, ("edit",))
+            for fd in entry["fields"]
+        ]
 
         # Block if no editable fields
         if not editable_field_defs:
@@ -614,6 +615,7 @@ def client_save_custom_fields(request, client_id):
         if form.is_valid():
             # Validate and normalise Canadian-specific fields (I18N5, I18N5b)
             validation_errors = []
+            values_to_save = {}
             for field_def in editable_field_defs:
                 raw_value = form.cleaned_data.get(f"custom_{field_def.pk}", "")
                 # For select_other: if "Other" was chosen, use the free-text value
@@ -634,11 +636,9 @@ def client_save_custom_fields(request, client_id):
                     except Exception as e:
                         validation_errors.append(f"{field_def.name}: {e.message}")
                         continue
-                cdv, _created = ClientDetailValue.objects.get_or_create(
-                    client_file=client, field_def=field_def,
-                )
-                cdv.set_value(raw_value)
-                cdv.save()
+                values_to_save[field_def] = raw_value
+            # Valid fields are saved even when others fail validation
+            save_custom_values(client, values_to_save)
             if validation_errors:
                 for err in validation_errors:
                     messages.error(request, err)
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.15 on 2026-10-18 20:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communications', '0003_communication_outcome'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='systemhealthcheck',
+            name='channel',
+            field=models.CharField(choices=[('sms', 'SMS'), ('email', 'Email'), ('ai', 'AI assistant')], max_length=10, unique=True),
+        ),
+    ]
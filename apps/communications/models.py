@@ -139,7 +139,9 @@ class Communication(models.Model):
 class SystemHealthCheck(models.Model):
     """Tracks messaging channel health for staff-visible banners and alert emails.
 
-    One row per channel (sms, email). Updated on every send attempt.
+    One row per channel (sms, email, ai). Updated on every send attempt.
+    The "ai" row is fed by the outbound circuit breaker (konote/transport.py)
+    and only appears on admin screens — it never triggers reminder banners.
     Staff see yellow/red banners on the meeting dashboard when something is wrong.
     Admin gets an alert email after 24h of sustained failures.
     """
@@ -147,8 +149,12 @@ class SystemHealthCheck(models.Model):
     CHANNEL_CHOICES = [
         ("sms", _("SMS")),
         ("email", _("Email")),
+        ("ai", _("AI assistant")),
     ]
 
+    # Channels that carry client reminders (banners + alert emails).
+    MESSAGING_CHANNELS = ("sms", "email")
+
     channel = models.CharField(max_length=10, choices=CHANNEL_CHOICES, unique=True)
     last_success_at = models.DateTimeField(null=True, blank=True)
     last_failure_at = models.DateTimeField(null=True, blank=True)
@@ -9,12 +9,18 @@ from datetime import date, timedelta
 
 from django.conf import settings
 from django.core import signing
-from django.core.mail import send_mail
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.translation import gettext as _
 
 from apps.communications.models import Communication, SystemHealthCheck
+from konote.transport import (
+    CircuitOpenError,
+    get_breaker,
+    get_twilio_client,
+    is_provider_failure,
+    send_pooled_mail,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -219,23 +225,33 @@ def send_sms(phone_number, message_body):
         return False, _("SMS is not configured")
 
     try:
-        from twilio.rest import Client as TwilioClient
+        client = get_twilio_client()
+    except ImportError:
+        logger.error("twilio package not installed")
+        return False, _("SMS service not available — twilio package not installed")
 
-        client = TwilioClient(
-            settings.TWILIO_ACCOUNT_SID,
-            settings.TWILIO_AUTH_TOKEN,
-        )
+    # While Twilio is down, fail fast instead of waiting on a timeout per
+    # reminder. Still counts as a failed send for the health banner.
+    breaker = get_breaker("twilio")
+    if not breaker.allow():
+        plain_error = PLAIN_LANGUAGE_ERRORS["TwilioRestException"]
+        SystemHealthCheck.record_failure("sms", plain_error)
+        return False, plain_error
+
+    try:
         message = client.messages.create(
             body=message_body,
             from_=settings.TWILIO_FROM_NUMBER,
             to=phone_number,
         )
+        breaker.record_success()
         SystemHealthCheck.record_success("sms")
         return True, message.sid
-    except ImportError:
-        logger.error("twilio package not installed")
-        return False, _("SMS service not available — twilio package not installed")
     except Exception as e:
+        if is_provider_failure(e):
+            breaker.record_failure(str(e)[:255])
+        else:
+            breaker.record_success()
         plain_error = translate_error(e)
         logger.warning("SMS send failed: %s", str(e))
         SystemHealthCheck.record_failure("sms", plain_error)
@@ -245,19 +261,26 @@ def send_sms(phone_number, message_body):
 def send_email_message(to_email, subject, body_text, body_html=None):
     """Send an email using Django's configured SMTP backend.
 
+    Reuses a pooled SMTP connection, so a batch of reminders logs in to
+    the relay once instead of once per message.
+
     Returns (success, error_message_or_none).
     """
     try:
-        send_mail(
+        send_pooled_mail(
             subject=subject,
             message=body_text,
             from_email=settings.DEFAULT_FROM_EMAIL,
             recipient_list=[to_email],
             html_message=body_html,
-            fail_silently=False,
         )
         SystemHealthCheck.record_success("email")
         return True, None
+    except CircuitOpenError:
+        logger.warning("Email send skipped — mail server marked unavailable")
+        error_msg = _("Email service is temporarily unavailable — please try again later")
+        SystemHealthCheck.record_failure("email", "Mail server unavailable (circuit open)")
+        return False, error_msg
     except Exception as e:
         masked = to_email.split("@")[0][:2] + "***@" + to_email.split("@")[1] if "@" in to_email else "***"
         logger.warning("Email send failed to %s: %s", masked, str(e))
@@ -468,7 +491,10 @@ def check_and_send_health_alert():
 
     now = timezone.now()
 
-    for health in SystemHealthCheck.objects.filter(consecutive_failures__gte=3):
+    for health in SystemHealthCheck.objects.filter(
+        channel__in=SystemHealthCheck.MESSAGING_CHANNELS,
+        consecutive_failures__gte=3,
+    ):
         if not health.last_failure_at:
             continue
 
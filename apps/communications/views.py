@@ -2,11 +2,12 @@
 import json
 from datetime import date
 
+from asgiref.sync import sync_to_async
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.core import signing
 from django.http import HttpResponseForbidden
-from django.shortcuts import get_object_or_404, redirect, render
+from django.shortcuts import aget_object_or_404, redirect, render
 from django.utils import timezone
 from django.utils.translation import gettext as _
 
@@ -145,26 +146,15 @@ def communication_log(request, client_id):
 # Send Reminder Preview — staff previews message before sending
 # ---------------------------------------------------------------------------
 
-@login_required
-@requires_permission("communication.log", _get_program_from_client)
-def send_reminder_preview(request, client_id, event_id):
-    """Preview a reminder before sending.
+def _reminder_channel(client):
+    """Pick the channel a reminder would go out on.
 
-    GET: Returns the preview partial showing the exact message text,
-         channel, and masked recipient info.
-    POST: Sends the reminder and returns the updated meeting status partial.
+    Returns (channel, allowed, reason).
     """
-    client = get_client_or_403(request, client_id)
-    if client is None:
-        return HttpResponseForbidden(_("You do not have access to this client."))
-
-    event = get_object_or_404(Event, pk=event_id, client_file=client)
-    meeting = get_object_or_404(Meeting, event=event)
+    from .services import can_send
 
     channel = getattr(client, "preferred_contact_method", "none")
 
-    from .services import can_send, render_message_template, send_reminder
-
     # Determine the actual channel to check
     check_channel = "sms" if channel in ("sms", "both") else "email"
     allowed, reason = can_send(client, check_channel)
@@ -175,34 +165,43 @@ def send_reminder_preview(request, client_id, event_id):
         allowed, reason = can_send(client, alt_channel)
         if allowed:
             check_channel = alt_channel
+    return check_channel, allowed, reason
 
-    if request.method == "POST":
-        send_succeeded = False
-        if not allowed:
-            messages.error(request, reason)
+
+def _send_reminder_and_render(request, meeting, allowed, reason):
+    """Send the reminder (POST) and return the updated meeting status partial."""
+    from .services import send_reminder
+
+    send_succeeded = False
+    if not allowed:
+        messages.error(request, reason)
+    else:
+        note_form = PersonalNoteForm(request.POST)
+        if note_form.is_valid():
+            personal_note = note_form.cleaned_data["personal_note"]
         else:
-            note_form = PersonalNoteForm(request.POST)
-            if note_form.is_valid():
-                personal_note = note_form.cleaned_data["personal_note"]
-            else:
-                personal_note = ""
-                messages.warning(request, _("Your personal note was too long and was not included."))
-            success, send_reason = send_reminder(meeting, logged_by=request.user, personal_note=personal_note)
-            if success:
-                messages.success(request, _("Reminder sent."))
-                send_succeeded = True
-            else:
-                messages.error(request, send_reason)
-
-        # Return updated meeting status partial
-        meeting.refresh_from_db()
-        response = render(request, "events/_meeting_status.html", {"meeting": meeting})
-        # UXP2: trigger success toast so HTMX shows a confirmation (WCAG 4.1.3)
-        if send_succeeded:
-            response["HX-Trigger"] = json.dumps({"showSuccess": str(_("Reminder sent."))})
-        return response
+            personal_note = ""
+            messages.warning(request, _("Your personal note was too long and was not included."))
+        success, send_reason = send_reminder(meeting, logged_by=request.user, personal_note=personal_note)
+        if success:
+            messages.success(request, _("Reminder sent."))
+            send_succeeded = True
+        else:
+            messages.error(request, send_reason)
+
+    # Return updated meeting status partial
+    meeting.refresh_from_db()
+    response = render(request, "events/_meeting_status.html", {"meeting": meeting})
+    # UXP2: trigger success toast so HTMX shows a confirmation (WCAG 4.1.3)
+    if send_succeeded:
+        response["HX-Trigger"] = json.dumps({"showSuccess": str(_("Reminder sent."))})
+    return response
+
+
+def _render_reminder_preview(request, client, meeting, check_channel, allowed, reason):
+    """Render the preview partial with the exact message and masked recipient."""
+    from .services import render_message_template
 
-    # GET: show preview
     preview_text = ""
     if allowed:
         template_key = "reminder_sms" if check_channel == "sms" else "reminder_email_body"
@@ -235,6 +234,36 @@ def send_reminder_preview(request, client_id, event_id):
     })
 
 
+@login_required
+@requires_permission("communication.log", _get_program_from_client)
+async def send_reminder_preview(request, client_id, event_id):
+    """Preview a reminder before sending.
+
+    GET: Returns the preview partial showing the exact message text,
+         channel, and masked recipient info.
+    POST: Sends the reminder and returns the updated meeting status partial.
+
+    Async so that, under ASGI, waiting on Twilio or the mail server does
+    not hold a worker.
+    """
+    client = await sync_to_async(get_client_or_403)(request, client_id)
+    if client is None:
+        return HttpResponseForbidden(_("You do not have access to this client."))
+
+    event = await aget_object_or_404(Event, pk=event_id, client_file=client)
+    meeting = await aget_object_or_404(Meeting, event=event)
+
+    check_channel, allowed, reason = await sync_to_async(_reminder_channel)(client)
+
+    if request.method == "POST":
+        return await sync_to_async(_send_reminder_and_render)(request, meeting, allowed, reason)
+
+    # GET: show preview
+    return await sync_to_async(_render_reminder_preview)(
+        request, client, meeting, check_channel, allowed, reason,
+    )
+
+
 # ---------------------------------------------------------------------------
 # Email Unsubscribe — public endpoint, no login required
 # ---------------------------------------------------------------------------
@@ -6,3 +6,6 @@ class EventsConfig(AppConfig):
     name = "apps.events"
     label = "events"
     verbose_name = "Events & Alerts"
+
+    def ready(self):
+        import apps.events.signals  # noqa: F401
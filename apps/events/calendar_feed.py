@@ -0,0 +1,142 @@
+"""iCal feed generation with per-token caching.
+
+Calendar apps poll the feed every few minutes, but a user's meetings
+rarely change between polls. The rendered .ics is cached per token and
+invalidated by a version stamp on the token row that signals bump
+whenever a meeting, its event, its attendee list, or the client's name
+changes. The stamp lives in the database, and the view reads the token
+on every poll anyway, so a change made through any worker process is
+seen by all of them. Bumps run once the writing transaction commits.
+
+Cached entries carry an ETag and Last-Modified so well-behaved clients
+get a 304 with no body at all.
+"""
+import hashlib
+import uuid
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from .models import CalendarFeedToken, Meeting
+
+# Invalidation is signal-driven, so the TTL only bounds staleness if a
+# change slips past the signals (e.g. a raw SQL update).
+FEED_CACHE_SECONDS = 60 * 60 * 6
+
+# last_accessed_at is informational ("is this feed still in use?"), so one
+# write per window is enough — not one per poll.
+ACCESS_WRITE_INTERVAL = timedelta(minutes=15)
+
+
+def invalidate_calendar_feeds(user_ids):
+    """Drop cached feeds for the given users, on commit (called from signals)."""
+    user_ids = {uid for uid in user_ids if uid}
+    if not user_ids:
+        return
+    transaction.on_commit(
+        lambda: CalendarFeedToken.objects.filter(user_id__in=user_ids).update(
+            feed_version=uuid.uuid4().hex,
+        )
+    )
+
+
+def touch_last_accessed(feed_token):
+    """Record feed access, writing at most once per ACCESS_WRITE_INTERVAL."""
+    now = timezone.now()
+    last = feed_token.last_accessed_at
+    if last and now - last < ACCESS_WRITE_INTERVAL:
+        return
+    CalendarFeedToken.objects.filter(pk=feed_token.pk).update(last_accessed_at=now)
+    feed_token.last_accessed_at = now
+
+
+def _client_initials(client):
+    initials = ""
+    first_name = client.first_name
+    if first_name:
+        initials += first_name[0].upper()
+    last_name = client.last_name
+    if last_name:
+        initials += last_name[0].upper()
+    return initials
+
+
+def build_feed(user):
+    """Render the user's scheduled meetings as iCal bytes.
+
+    PRIVACY: Only initials + record_id go in the summary — NO full names,
+    NO phone numbers. Initials are computed once per client, so a client
+    with many meetings is decrypted once per build.
+    """
+    from icalendar import Calendar as ICalCalendar, Event as ICalEvent
+
+    meetings = (
+        Meeting.objects.filter(
+            attendees=user,
+            status="scheduled",
+        )
+        .select_related("event", "event__client_file")
+        .order_by("event__start_timestamp")
+    )
+
+    cal = ICalCalendar()
+    cal.add("prodid", "-//KoNote//Calendar Feed//EN")
+    cal.add("version", "2.0")
+    cal.add("calscale", "GREGORIAN")
+    cal.add("x-wr-calname", "KoNote Meetings")
+
+    generated_at = timezone.now()
+    initials_by_client = {}
+
+    for meeting in meetings:
+        ical_event = ICalEvent()
+
+        client = meeting.event.client_file
+        if client.pk not in initials_by_client:
+            initials_by_client[client.pk] = _client_initials(client)
+        initials = initials_by_client[client.pk]
+        record_id = client.record_id or ""
+        summary_parts = ["Meeting"]
+        if initials:
+            summary_parts.append(initials)
+        if record_id:
+            summary_parts.append(f"({record_id})")
+        ical_event.add("summary", " ".join(summary_parts))
+
+        ical_event.add("dtstart", meeting.event.start_timestamp)
+        if meeting.duration_minutes:
+            ical_event.add("dtend", meeting.event.start_timestamp + timedelta(minutes=meeting.duration_minutes))
+        else:
+            # Default to 1 hour if no duration specified
+            ical_event.add("dtend", meeting.event.start_timestamp + timedelta(hours=1))
+
+        if meeting.location:
+            ical_event.add("location", meeting.location)
+
+        ical_event.add("uid", f"meeting-{meeting.pk}@konote")
+        ical_event.add("dtstamp", generated_at)
+
+        cal.add_component(ical_event)
+
+    return cal.to_ical(), generated_at
+
+
+def get_feed(feed_token):
+    """Return (ical_bytes, etag, last_modified) for a token, cached.
+
+    Raises ImportError if the icalendar library is not installed.
+    """
+    # Keyed on the row id, not the token: the token is a bearer secret.
+    cache_key = f"calendar_feed_{feed_token.pk}_{feed_token.feed_version}"
+    cached = cache.get(cache_key)
+    if cached is None:
+        ical, generated_at = build_feed(feed_token.user)
+        cached = {
+            "ical": ical,
+            "etag": f'"{hashlib.sha256(ical).hexdigest()[:32]}"',
+            "last_modified": generated_at.replace(microsecond=0),
+        }
+        cache.set(cache_key, cached, FEED_CACHE_SECONDS)
+    return cached["ical"], cached["etag"], cached["last_modified"]
@@ -2,6 +2,7 @@
 from django.core.management.base import BaseCommand
 
 from apps.events.models import EventType
+from konote.seeding import SeedSpec, seed
 
 
 DEFAULTS = [
@@ -17,18 +18,9 @@ class Command(BaseCommand):
     help = "Create default event types (Intake, Discharge, Crisis, Referral, Follow-up)."
 
     def handle(self, *args, **options):
-        created_count = 0
-        for item in DEFAULTS:
-            obj, created = EventType.objects.get_or_create(
-                name=item["name"],
-                defaults={
-                    "description": item["description"],
-                    "colour_hex": item["colour_hex"],
-                },
-            )
-            if created:
-                created_count += 1
-                self.stdout.write(f"  Created: {obj.name}")
-            else:
-                self.stdout.write(f"  Already exists: {obj.name}")
-        self.stdout.write(self.style.SUCCESS(f"Done. {created_count} event type(s) created."))
+        result = seed(SeedSpec(EventType, key=("name",), rows=DEFAULTS))
+        for obj in result.created:
+            self.stdout.write(f"  Created: {obj.name}")
+        for obj in result.unchanged:
+            self.stdout.write(f"  Already exists: {obj.name}")
+        self.stdout.write(self.style.SUCCESS(f"Done. {len(result.created)} event type(s) created."))
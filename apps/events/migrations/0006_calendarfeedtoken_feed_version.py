@@ -0,0 +1,18 @@
+# Generated by Django 5.1.15 on 2026-10-18 22:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0005_eventtype_owning_program'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='calendarfeedtoken',
+            name='feed_version',
+            field=models.CharField(blank=True, default='', max_length=32),
+        ),
+    ]
@@ -209,6 +209,9 @@ class CalendarFeedToken(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     last_accessed_at = models.DateTimeField(null=True, blank=True)
     is_active = models.BooleanField(default=True)
+    # Changed whenever the user's feed content changes; part of the feed's
+    # cache key (see apps/events/calendar_feed.py).
+    feed_version = models.CharField(max_length=32, blank=True, default="")
 
     class Meta:
         app_label = "events"
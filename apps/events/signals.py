@@ -0,0 +1,55 @@
+"""Cache invalidation signals for calendar feeds."""
+from django.db.models.signals import m2m_changed, post_save, pre_delete
+from django.dispatch import receiver
+
+from apps.clients.models import ClientFile
+
+from .calendar_feed import invalidate_calendar_feeds
+from .models import Event, Meeting
+
+
+def _attendee_ids(meetings):
+    return Meeting.attendees.through.objects.filter(
+        meeting__in=meetings,
+    ).values_list("user_id", flat=True)
+
+
+@receiver([post_save, pre_delete], sender=Meeting)
+def invalidate_feeds_on_meeting_change(sender, instance, **kwargs):
+    """Status, location or duration changed, or the meeting is going away.
+
+    pre_delete (not post_delete) so the attendee rows still exist.
+    """
+    invalidate_calendar_feeds(_attendee_ids([instance.pk]))
+
+
+@receiver(post_save, sender=Event)
+def invalidate_feeds_on_event_change(sender, instance, created, **kwargs):
+    """A rescheduled event moves its meeting in the feed."""
+    if created:
+        return  # A brand-new event has no meeting or attendees yet
+    invalidate_calendar_feeds(_attendee_ids(Meeting.objects.filter(event=instance)))
+
+
+@receiver(m2m_changed, sender=Meeting.attendees.through)
+def invalidate_feeds_on_attendee_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """Adding or removing an attendee changes that user's feed."""
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if reverse:
+        # user.meetings.add(...) — instance is the user
+        invalidate_calendar_feeds([instance.pk])
+    elif action == "pre_clear":
+        invalidate_calendar_feeds(_attendee_ids([instance.pk]))
+    else:
+        invalidate_calendar_feeds(pk_set or [])
+
+
+@receiver(post_save, sender=ClientFile)
+def invalidate_feeds_on_client_change(sender, instance, created, **kwargs):
+    """Initials and record ID appear in meeting summaries."""
+    if created:
+        return
+    invalidate_calendar_feeds(_attendee_ids(
+        Meeting.objects.filter(event__client_file=instance, status="scheduled")
+    ))
@@ -0,0 +1,153 @@
+"""Unified client timeline — events, progress notes and communications.
+
+The three sources are merged in SQL with a UNION ordered on
+(effective date, entry type, id), so only one page of keys comes back from
+the database. Pagination is keyset-based: the cursor is the key of the last
+entry shown, and each source is pre-filtered to rows strictly "older" than
+it, which lets the (client_file, date) indexes do the work instead of an
+OFFSET scan. Only the objects on the visible page are then loaded in full.
+"""
+from django.db.models import CharField, F, Q, Value
+from django.utils.dateparse import parse_datetime
+
+PAGE_SIZE = 20
+
+# Sort order within one timestamp — must match the descending sort below.
+ENTRY_TYPES = ("communication", "event", "note")
+
+FILTER_TYPES = {
+    "all": ENTRY_TYPES,
+    "notes": ("note",),
+    "events": ("event",),
+    "communications": ("communication",),
+}
+
+
+def encode_cursor(date, entry_type, pk):
+    return f"{date.isoformat()}|{entry_type}|{pk}"
+
+
+def decode_cursor(raw):
+    """Return (date, entry_type, pk) or None for a missing/garbled cursor."""
+    if not raw:
+        return None
+    try:
+        date_str, entry_type, pk = raw.split("|")
+        date = parse_datetime(date_str)
+        pk = int(pk)
+    except (ValueError, TypeError):
+        return None
+    if date is None or entry_type not in ENTRY_TYPES:
+        return None
+    return date, entry_type, pk
+
+
+def _before_cursor(entry_type, cursor):
+    """Keyset condition for one source: rows that sort after the cursor.
+
+    The type is constant within a source, so the three-part tuple
+    comparison collapses to a plain date/pk comparison per source.
+    """
+    date, cursor_type, pk = cursor
+    if entry_type < cursor_type:
+        return Q(entry_date__lte=date)
+    if entry_type > cursor_type:
+        return Q(entry_date__lt=date)
+    return Q(entry_date__lt=date) | Q(entry_date=date, pk__lt=pk)
+
+
+def _source_querysets(client, program_q):
+    from apps.communications.models import Communication
+    from apps.notes.models import ProgressNote
+
+    from .models import Event
+
+    return {
+        "event": Event.objects.filter(client_file=client).filter(program_q).annotate(
+            entry_date=F("start_timestamp"),
+        ),
+        "note": ProgressNote.objects.filter(client_file=client).filter(program_q).annotate(
+            entry_date=F("effective_date"),
+        ),
+        "communication": Communication.objects.filter(client_file=client).filter(program_q).annotate(
+            entry_date=F("created_at"),
+        ),
+    }
+
+
+def _hydrate(entry_type, ids):
+    from apps.communications.models import Communication
+    from apps.notes.models import ProgressNote
+
+    from .models import Event
+
+    if entry_type == "event":
+        qs = Event.objects.select_related("event_type", "author_program")
+    elif entry_type == "note":
+        qs = ProgressNote.objects.select_related("author", "author_program")
+    else:
+        qs = Communication.objects.select_related("logged_by", "author_program")
+    return qs.in_bulk(ids)
+
+
+def _entry_date(entry_type, obj):
+    if entry_type == "event":
+        return obj.start_timestamp
+    if entry_type == "note":
+        return obj.effective_date
+    return obj.created_at
+
+
+def get_timeline_page(client, program_q, filter_type="all", cursor=None, page_size=PAGE_SIZE):
+    """Return (entries, next_cursor) for one page of the client timeline.
+
+    entries is a list of {"type", "date", "obj"} dicts, newest first.
+    next_cursor is None when there are no older entries.
+    """
+    entry_types = FILTER_TYPES.get(filter_type, ENTRY_TYPES)
+    sources = _source_querysets(client, program_q)
+
+    keyed = []
+    for entry_type in entry_types:
+        qs = sources[entry_type]
+        if cursor:
+            qs = qs.filter(_before_cursor(entry_type, cursor))
+        keyed.append(
+            qs.annotate(
+                entry_type=Value(entry_type, output_field=CharField()),
+                entry_id=F("pk"),
+            )
+            .values_list("entry_date", "entry_type", "entry_id")
+            .order_by()
+        )
+
+    combined = keyed[0].union(*keyed[1:], all=True) if len(keyed) > 1 else keyed[0]
+    keys = list(combined.order_by("-entry_date", "-entry_type", "-entry_id")[:page_size + 1])
+
+    has_more = len(keys) > page_size
+    keys = keys[:page_size]
+
+    ids_by_type = {}
+    for _, entry_type, pk in keys:
+        ids_by_type.setdefault(entry_type, []).append(pk)
+    objects = {
+        entry_type: _hydrate(entry_type, ids)
+        for entry_type, ids in ids_by_type.items()
+    }
+
+    entries = []
+    for _, entry_type, pk in keys:
+        obj = objects[entry_type].get(pk)
+        if obj is None:
+            continue  # Deleted between the key query and hydration
+        entries.append({
+            "type": entry_type,
+            "date": _entry_date(entry_type, obj),
+            "obj": obj,
+        })
+
+    next_cursor = None
+    if has_more and entries:
+        last = entries[-1]
+        next_cursor = encode_cursor(last["date"], last["type"], last["obj"].pk)
+    return entries, next_cursor
@@ -3,6 +3,7 @@ import secrets
 from datetime import timedelta
 from urllib.parse import urlparse, urlunparse
 
+from asgiref.sync import sync_to_async
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.db.models import Q
@@ -10,6 +11,8 @@ from django.http import HttpResponse, HttpResponseForbidden
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
 from django.utils.translation import gettext as _
 
 from apps.clients.models import ClientFile, ClientProgramEnrolment
@@ -20,11 +23,13 @@ from apps.programs.access import (
     get_program_from_client,
     get_user_program_ids,
 )
-from django_ratelimit.decorators import ratelimit
+from konote.async_utils import async_ratelimit
 
 from apps.auth_app.decorators import admin_required, requires_permission, requires_permission_global
 from apps.programs.models import Program, UserProgramRole
 
+from .calendar_feed import get_feed, touch_last_accessed
+from .timeline import decode_cursor, get_timeline_page
 from .forms import (
     AlertCancelForm, AlertForm, AlertRecommendCancelForm, AlertReviewRecommendationForm,
     EventForm, EventTypeForm, MeetingEditForm, MeetingQuickCreateForm,
@@ -166,12 +171,8 @@ def event_list(request, client_id):
         "author_program",
     ).prefetch_related("cancellation_recommendations")
 
-    # Build combined timeline entries
-    from apps.notes.models import ProgressNote
     from apps.communications.models import Communication
 
-    notes = ProgressNote.objects.filter(client_file=client).filter(program_q).select_related("author", "author_program")
-
     # Communications — filter by user's accessible programs (same as events/notes)
     communications = (
         Communication.objects.filter(client_file=client)
@@ -179,45 +180,11 @@ def event_list(request, client_id):
         .select_related("logged_by", "author_program")
     )
 
-    timeline = []
-    for event in events:
-        timeline.append({
-            "type": "event",
-            "date": event.start_timestamp,
-            "obj": event,
-        })
-    for note in notes:
-        timeline.append({
-            "type": "note",
-            "date": note.effective_date,
-            "obj": note,
-        })
-    for comm in communications:
-        timeline.append({
-            "type": "communication",
-            "date": comm.created_at,
-            "obj": comm,
-        })
-    # Sort newest first
-    timeline.sort(key=lambda x: x["date"], reverse=True)
-
-    # Timeline filtering (UXP5)
+    # Timeline filtering (UXP5) and "Show more" pagination — 20 entries per
+    # page, merged and paged in SQL (see apps/events/timeline.py)
     filter_type = request.GET.get("filter", "all")
-    if filter_type == "notes":
-        timeline = [e for e in timeline if e["type"] == "note"]
-    elif filter_type == "events":
-        timeline = [e for e in timeline if e["type"] == "event"]
-    elif filter_type == "communications":
-        timeline = [e for e in timeline if e["type"] == "communication"]
-
-    # Pagination — 20 entries per page with "Show more"
-    page_size = 20
-    try:
-        offset = int(request.GET.get("offset", 0))
-    except (ValueError, TypeError):
-        offset = 0
-    has_more = len(timeline) > offset + page_size
-    timeline = timeline[offset:offset + page_size]
+    cursor = decode_cursor(request.GET.get("cursor", ""))
+    timeline, next_cursor = get_timeline_page(client, program_q, filter_type, cursor)
 
     # Recent communications for the quick-log section
     recent_communications = communications.order_by("-created_at")[:5]
@@ -231,9 +198,9 @@ def event_list(request, client_id):
         "active_tab": "events",
         "show_program_ui": program_ctx["show_program_ui"],
         "active_filter": filter_type,
-        "has_more": has_more,
-        "next_offset": offset + page_size,
-        "is_append": offset > 0,
+        "has_more": next_cursor is not None,
+        "next_cursor": next_cursor,
+        "is_append": cursor is not None,
     }
     # HTMX partial response — return just the timeline entries for filter/pagination
     if request.headers.get("HX-Request") and "filter" in request.GET:
@@ -654,7 +621,10 @@ def meeting_list(request):
     flags = FeatureToggle.get_all_flags()
     if flags.get("messaging_sms") or flags.get("messaging_email"):
         now_time = timezone.now()
-        for health in SystemHealthCheck.objects.filter(consecutive_failures__gt=0):
+        for health in SystemHealthCheck.objects.filter(
+            channel__in=SystemHealthCheck.MESSAGING_CHANNELS,
+            consecutive_failures__gt=0,
+        ):
             if not health.last_failure_at:
                 continue
             hours_since = (now_time - health.last_failure_at).total_seconds() / 3600
@@ -715,82 +685,45 @@ def meeting_status_update(request, event_id):
 # Calendar Feed (iCal / .ics)
 # ---------------------------------------------------------------------------
 
-@ratelimit(key="user_or_ip", rate="60/h", block=True)
-def calendar_feed(request, token):
-    """Public .ics endpoint — token-based auth, no login required.
-
-    PRIVACY: Only include initials + record_id in summary — NO full names,
-    NO phone numbers. Rate limited to 60 requests/hour.
-    """
+def _load_feed(token):
+    """Return (ical, etag, last_modified) for an active token; raise Http404 otherwise."""
     feed_token = CalendarFeedToken.objects.filter(token=token, is_active=True).select_related("user").first()
     if not feed_token:
         from django.http import Http404
         raise Http404
 
-    # Update last accessed timestamp
-    feed_token.last_accessed_at = timezone.now()
-    feed_token.save(update_fields=["last_accessed_at"])
+    touch_last_accessed(feed_token)
+    return get_feed(feed_token)
 
-    # Get the user's scheduled meetings
-    meetings = (
-        Meeting.objects.filter(
-            attendees=feed_token.user,
-            status="scheduled",
-        )
-        .select_related("event", "event__client_file")
-        .order_by("event__start_timestamp")
-    )
 
-    # Build iCal output
+@async_ratelimit(key="user_or_ip", rate="60/h", block=True)
+async def calendar_feed(request, token):
+    """Public .ics endpoint — token-based auth, no login required.
+
+    PRIVACY: Only include initials + record_id in summary — NO full names,
+    NO phone numbers. Rate limited to 60 requests/hour.
+
+    Async because calendar apps poll it constantly; under ASGI the polls
+    are served without tying up a worker each.
+    """
     try:
-        from icalendar import Calendar as ICalCalendar, Event as ICalEvent
+        ical, etag, last_modified = await sync_to_async(_load_feed)(token)
     except ImportError:
         return HttpResponse(
             "iCalendar library not installed.", status=503, content_type="text/plain"
         )
 
-    cal = ICalCalendar()
-    cal.add("prodid", "-//KoNote//Calendar Feed//EN")
-    cal.add("version", "2.0")
-    cal.add("calscale", "GREGORIAN")
-    cal.add("x-wr-calname", "KoNote Meetings")
-
-    for meeting in meetings:
-        ical_event = ICalEvent()
-
-        # PRIVACY: use initials + record_id only — no full names
-        client = meeting.event.client_file
-        initials = ""
-        if hasattr(client, "first_name") and client.first_name:
-            initials += client.first_name[0].upper()
-        if hasattr(client, "last_name") and client.last_name:
-            initials += client.last_name[0].upper()
-        record_id = getattr(client, "record_id", "") or ""
-        summary_parts = ["Meeting"]
-        if initials:
-            summary_parts.append(initials)
-        if record_id:
-            summary_parts.append(f"({record_id})")
-        ical_event.add("summary", " ".join(summary_parts))
-
-        ical_event.add("dtstart", meeting.event.start_timestamp)
-        if meeting.duration_minutes:
-            ical_event.add("dtend", meeting.event.start_timestamp + timedelta(minutes=meeting.duration_minutes))
-        else:
-            # Default to 1 hour if no duration specified
-            ical_event.add("dtend", meeting.event.start_timestamp + timedelta(hours=1))
-
-        if meeting.location:
-            ical_event.add("location", meeting.location)
-
-        ical_event.add("uid", f"meeting-{meeting.pk}@konote")
-        ical_event.add("dtstamp", timezone.now())
-
-        cal.add_component(ical_event)
-
-    response = HttpResponse(cal.to_ical(), content_type="text/calendar")
+    response = HttpResponse(ical, content_type="text/calendar")
     response["Content-Disposition"] = 'attachment; filename="konote-meetings.ics"'
-    return response
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified.timestamp())
+    response["Cache-Control"] = "private, no-cache"
+
+    # Calendar apps send If-None-Match / If-Modified-Since — answer 304
+    # when nothing changed since their last poll.
+    return get_conditional_response(
+        request, etag=etag, last_modified=int(last_modified.timestamp()), response=response,
+    )
 
 
 @login_required
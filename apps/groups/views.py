@@ -1,19 +1,16 @@
 """Group views: list, detail, session logging, membership, milestones, outcomes, reports."""
-import csv
-import io
-from collections import OrderedDict
 from datetime import date as dt_date, timedelta
 
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.db import models, transaction
-from django.db.models import Count
-from django.http import HttpResponse, HttpResponseForbidden
+from django.db.models import Count, Q
+from django.http import HttpResponseForbidden
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
 from django.utils.translation import gettext as _
 
-from apps.reports.csv_utils import sanitise_csv_row, sanitise_filename
+from apps.reports.csv_utils import sanitise_filename, stream_csv_response
 
 from django.urls import reverse
 
@@ -238,20 +235,24 @@ def session_log(request, group_id):
                 session.notes = form.cleaned_data["notes"]
                 session.save()
 
-                # 2. Record attendance and highlights for each member
+                # 2. Record attendance and highlights for all members at once
+                attendance, highlights = [], []
                 for member, present, highlight_notes in attendance_form.get_attendance_data():
-                    GroupSessionAttendance.objects.create(
+                    attendance.append(GroupSessionAttendance(
                         group_session=session,
                         membership=member,
                         present=present,
-                    )
+                    ))
                     if highlight_notes:
                         highlight = GroupSessionHighlight(
                             group_session=session,
                             membership=member,
                         )
                         highlight.notes = highlight_notes
-                        highlight.save()
+                        highlights.append(highlight)
+                GroupSessionAttendance.objects.bulk_create(attendance)
+                if highlights:
+                    GroupSessionHighlight.objects.bulk_create(highlights)
 
             messages.success(request, _("Session logged."))
             return redirect("groups:group_detail", group_id=group.pk)
@@ -452,6 +453,88 @@ def outcome_create(request, group_id):
     })
 
 
+def _attendance_rows(group, session_list):
+    """Build member x session attendance rows for the report.
+
+    Present/total counts come from one grouped query and the matrix cells
+    from one flat values query, so no attendance objects are built. Names
+    are decrypted once per member from a single membership query.
+
+    Returns rows sorted by attendance rate (most absent first), members
+    with no attendance in range last:
+      [{"name", "sessions": [True/False/None per session], "present", "total", "rate"}]
+    """
+    attendance_qs = GroupSessionAttendance.objects.filter(group_session__in=session_list)
+    totals = {
+        row["membership_id"]: row
+        for row in attendance_qs.values("membership_id").annotate(
+            present_count=Count("pk", filter=Q(present=True)),
+            total_count=Count("pk"),
+        )
+    }
+    cells = {}  # {membership_id: {session_id: present_bool}}
+    for membership_id, session_id, present in attendance_qs.values_list(
+        "membership_id", "group_session_id", "present",
+    ):
+        cells.setdefault(membership_id, {})[session_id] = present
+
+    # All members of the group, plus anyone who attended but has since moved
+    memberships = GroupMembership.objects.filter(
+        Q(group=group) | Q(pk__in=list(totals)),
+    ).select_related("client_file").only(
+        "member_name",
+        "client_file___first_name_encrypted",
+        "client_file___preferred_name_encrypted",
+        "client_file___last_name_encrypted",
+    ).order_by("pk")
+
+    rows = []
+    for m in memberships:
+        stats = totals.get(m.pk)
+        present = stats["present_count"] if stats else 0
+        total = stats["total_count"] if stats else 0
+        member_cells = cells.get(m.pk, {})
+        rows.append({
+            "name": m.display_name,
+            "sessions": [member_cells.get(s.pk) for s in session_list],  # True, False, or None (not recorded)
+            "present": present,
+            "total": total,
+            "rate": round(present / total * 100) if total else None,  # None = no sessions in range
+        })
+
+    # Sort: members with attendance data first (by rate ascending), then members with no data
+    rows.sort(key=lambda r: (r["rate"] is None, r["rate"] if r["rate"] is not None else 0))
+    return rows
+
+
+def _attendance_csv_rows(group, session_list, rows, date_from, date_to):
+    """Yield the attendance report as CSV rows (header comments first)."""
+    yield [f"# {_('Attendance Report')}: {group.name}"]
+    yield [f"# {_('Date range')}: {date_from} — {date_to}"]
+    yield [f"# {_('Total sessions')}: {len(session_list)}"]
+    yield []
+
+    # Column headers
+    yield [_("Member")] + [str(s.session_date) for s in session_list] + [_("Present"), _("Total"), _("Rate %")]
+
+    # Data rows
+    for row in rows:
+        csv_row = [row["name"]]
+        for present in row["sessions"]:
+            if present is True:
+                csv_row.append(_("Yes"))
+            elif present is False:
+                csv_row.append(_("No"))
+            else:
+                csv_row.append("—")
+        csv_row.extend([
+            row["present"],
+            row["total"],
+            f"{row['rate']}%" if row["rate"] is not None else "—",
+        ])
+        yield csv_row
+
+
 # ---------------------------------------------------------------------------
 # 11. Attendance report
 # ---------------------------------------------------------------------------
@@ -496,120 +579,17 @@ def attendance_report(request, group_id):
         .order_by("session_date")
     )
 
-    # Get all attendance records for these sessions
-    attendance_qs = (
-        GroupSessionAttendance.objects.filter(group_session__in=sessions)
-        .select_related("membership", "membership__client_file", "group_session")
-    )
-
-    # Build the matrix: {membership_id: {session_id: present_bool}}
-    # Also track member info and totals
-    members_data = OrderedDict()  # {membership_id: {"name": str, "sessions": {}, "present": 0, "total": 0}}
     session_list = list(sessions)
+    rows = _attendance_rows(group, session_list)
 
-    # Initialise from all active + any historically-attending members
-    all_memberships = GroupMembership.objects.filter(
-        group=group,
-    ).select_related("client_file")
-
-    for m in all_memberships:
-        members_data[m.pk] = {
-            "name": m.display_name,
-            "sessions": {},
-            "present": 0,
-            "total": 0,
-        }
-
-    # Fill in attendance data
-    for att in attendance_qs:
-        mid = att.membership_id
-        if mid not in members_data:
-            members_data[mid] = {
-                "name": att.membership.display_name,
-                "sessions": {},
-                "present": 0,
-                "total": 0,
-            }
-        members_data[mid]["sessions"][att.group_session_id] = att.present
-        members_data[mid]["total"] += 1
-        if att.present:
-            members_data[mid]["present"] += 1
-
-    # Calculate attendance rates and sort by rate (ascending = most absent first)
-    for mid, data in members_data.items():
-        if data["total"] > 0:
-            data["rate"] = round(data["present"] / data["total"] * 100)
-        else:
-            data["rate"] = None  # No sessions in range
-
-    # Sort: members with attendance data first (by rate ascending), then members with no data
-    sorted_members = sorted(
-        members_data.items(),
-        key=lambda x: (x[1]["rate"] is None, x[1]["rate"] if x[1]["rate"] is not None else 0),
-    )
-
-    # Build rows for template/CSV
-    rows = []
-    for mid, data in sorted_members:
-        row_sessions = []
-        for s in session_list:
-            present = data["sessions"].get(s.pk)
-            row_sessions.append(present)  # True, False, or None (not recorded)
-        rows.append({
-            "name": data["name"],
-            "sessions": row_sessions,
-            "present": data["present"],
-            "total": data["total"],
-            "rate": data["rate"],
-        })
-
-    # CSV export
+    # CSV export — streamed, since long date ranges make for wide, long files
     if request.GET.get("format") == "csv":
-        csv_buffer = io.StringIO()
-        writer = csv.writer(csv_buffer)
-
-        # Header comment rows
-        writer.writerow(sanitise_csv_row(
-            [f"# {_('Attendance Report')}: {group.name}"]
-        ))
-        writer.writerow(sanitise_csv_row(
-            [f"# {_('Date range')}: {date_from_parsed} — {date_to_parsed}"]
-        ))
-        writer.writerow(sanitise_csv_row(
-            [f"# {_('Total sessions')}: {len(session_list)}"]
-        ))
-        writer.writerow([])
-
-        # Column headers
-        header = [_("Member")]
-        for s in session_list:
-            header.append(str(s.session_date))
-        header.extend([_("Present"), _("Total"), _("Rate %")])
-        writer.writerow(sanitise_csv_row(header))
-
-        # Data rows
-        for row in rows:
-            csv_row = [row["name"]]
-            for present in row["sessions"]:
-                if present is True:
-                    csv_row.append(_("Yes"))
-                elif present is False:
-                    csv_row.append(_("No"))
-                else:
-                    csv_row.append("—")
-            csv_row.extend([
-                row["present"],
-                row["total"],
-                f"{row['rate']}%" if row["rate"] is not None else "—",
-            ])
-            writer.writerow(sanitise_csv_row(csv_row))
-
-        content = csv_buffer.getvalue()
         safe_name = sanitise_filename(group.name.replace(" ", "_"))
         filename = f"attendance_{safe_name}_{date_from_parsed}_{date_to_parsed}.csv"
-        response = HttpResponse(content, content_type="text/csv")
-        response["Content-Disposition"] = f'attachment; filename="{filename}"'
-        return response
+        return stream_csv_response(
+            _attendance_csv_rows(group, session_list, rows, date_from_parsed, date_to_parsed),
+            filename,
+        )
 
     return render(request, "groups/attendance_report.html", {
         "group": group,
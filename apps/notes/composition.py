@@ -0,0 +1,124 @@
+"""Building and saving full progress notes in bulk.
+
+A client with 15 plan targets and 4 metrics each used to cost one
+PlanTargetMetric query per target to build the form, then one INSERT per
+target entry and per metric value to save it. These helpers work on the
+whole note at once:
+
+- build_target_forms(): one query for active targets and one prefetch
+  for all their metrics.
+- get_template_defaults(): template → default interaction type map for
+  the note form, in one query.
+- save_target_entries(): bulk_create of target entries, then of all
+  metric values. Call inside the note's transaction.
+"""
+from django.db.models import Prefetch
+
+from apps.plans.models import PlanTarget, PlanTargetMetric
+from apps.reports.report_cache import bump_data_version
+
+from .forms import MetricValueForm, TargetNoteForm
+from .models import MetricValue, ProgressNoteTarget, ProgressNoteTemplate
+
+
+def build_target_forms(client, post_data=None):
+    """Build TargetNoteForm + MetricValueForms for each active plan target.
+
+    Returns a list of dicts:
+      [{"target": PlanTarget, "note_form": TargetNoteForm, "metric_forms": [MetricValueForm, ...]}]
+    """
+    targets = (
+        PlanTarget.objects.filter(client_file=client, status="default")
+        .select_related("plan_section")
+        .prefetch_related(Prefetch(
+            "plantargetmetric_set",
+            queryset=PlanTargetMetric.objects.select_related("metric_def").order_by("sort_order"),
+            to_attr="ordered_metrics",
+        ))
+        .order_by("plan_section__sort_order", "sort_order")
+    )
+    target_forms = []
+    for target in targets:
+        prefix = f"target_{target.pk}"
+        note_form = TargetNoteForm(
+            post_data,
+            prefix=prefix,
+            initial={"target_id": target.pk},
+        )
+        metric_forms = []
+        for ptm in target.ordered_metrics:
+            m_prefix = f"metric_{target.pk}_{ptm.metric_def.pk}"
+            mf = MetricValueForm(
+                post_data,
+                prefix=m_prefix,
+                metric_def=ptm.metric_def,
+                initial={"metric_def_id": ptm.metric_def.pk},
+            )
+            metric_forms.append(mf)
+        target_forms.append({
+            "target": target,
+            "note_form": note_form,
+            "metric_forms": metric_forms,
+        })
+    return target_forms
+
+
+def get_template_defaults():
+    """Return {template_id (str): default_interaction_type} for active templates."""
+    return {
+        str(pk): interaction_type
+        for pk, interaction_type in ProgressNoteTemplate.objects.filter(
+            status="active",
+        ).values_list("pk", "default_interaction_type")
+    }
+
+
+def save_target_entries(note, target_forms):
+    """Persist target entries and metric values for a saved note.
+
+    Targets with nothing entered are skipped. Uses two INSERTs in total
+    (one per table) however many targets and metrics the note has.
+    Bulk inserts skip model signals, so this bumps the funder report
+    "notes" version itself; the note's own save has already invalidated
+    its Outcome Insights months.
+
+    Returns (target_entry_count, metric_value_count).
+    """
+    entries = []
+    pending_values = []  # (entry index, metric_def_id, value)
+    for tf in target_forms:
+        nf = tf["note_form"]
+        notes_text = nf.cleaned_data.get("notes", "")
+        client_words = nf.cleaned_data.get("client_words", "")
+        progress_descriptor = nf.cleaned_data.get("progress_descriptor", "")
+        # Check if any data was entered for this target
+        has_metrics = any(
+            mf.cleaned_data.get("value", "") for mf in tf["metric_forms"]
+        )
+        if not notes_text and not has_metrics and not client_words and not progress_descriptor:
+            continue  # Skip targets with no data entered
+
+        entries.append(ProgressNoteTarget(
+            progress_note=note,
+            plan_target_id=nf.cleaned_data["target_id"],
+            notes=notes_text,
+            client_words=client_words,
+            progress_descriptor=progress_descriptor,
+        ))
+        for mf in tf["metric_forms"]:
+            val = mf.cleaned_data.get("value", "")
+            if val:
+                pending_values.append((len(entries) - 1, mf.cleaned_data["metric_def_id"], val))
+
+    if not entries:
+        return 0, 0
+    # Primary keys come back from the INSERT (RETURNING on PostgreSQL/SQLite)
+    ProgressNoteTarget.objects.bulk_create(entries)
+    values = [
+        MetricValue(progress_note_target=entries[i], metric_def_id=metric_def_id, value=val)
+        for i, metric_def_id, val in pending_values
+    ]
+    if values:
+        MetricValue.objects.bulk_create(values)
+    bump_data_version("notes")
+    return len(entries), len(values)
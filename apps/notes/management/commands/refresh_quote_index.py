@@ -0,0 +1,92 @@
+"""
+Classify participant quotes for Outcome Insights.
+
+Usage:
+    python manage.py refresh_quote_index            # Classify unclassified rows
+    python manage.py refresh_quote_index --all      # Reclassify every row
+    python manage.py refresh_quote_index --dry-run  # Count without saving
+
+Quote text is classified (word-count bucket and keyed hash) whenever it is
+saved through the model, but rows written before this existed, or by raw
+updates, need backfilling. Run once after upgrading, then daily. Use --all
+after a SECRET_KEY change so the hashes are re-keyed. Until then,
+collect_quotes() checks unclassified rows by decrypting them, just more
+slowly.
+"""
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from apps.notes.quote_index import classify
+
+BATCH_SIZE = 1000
+
+# model name -> (encrypted field, decrypted property, bucket, hash) per quote field
+QUOTE_FIELDS = {
+    "ProgressNoteTarget": [
+        ("_client_words_encrypted", "client_words", "client_words_bucket", "client_words_hash"),
+    ],
+    "ProgressNote": [
+        ("_participant_reflection_encrypted", "participant_reflection",
+         "reflection_bucket", "reflection_hash"),
+        ("_participant_suggestion_encrypted", "participant_suggestion",
+         "suggestion_bucket", "suggestion_hash"),
+    ],
+}
+
+
+class Command(BaseCommand):
+    help = "Backfill and re-key the quote buckets and hashes used by Outcome Insights."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all", action="store_true",
+            help="Reclassify every row, not just unclassified ones.",
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true",
+            help="Count rows that would change without saving.",
+        )
+
+    def handle(self, *args, **options):
+        from apps.notes import models
+
+        verb = "Would update" if options["dry_run"] else "Updated"
+        for model_name, fields in QUOTE_FIELDS.items():
+            model = getattr(models, model_name)
+            checked, updated = self._refresh(model, fields, options["all"], options["dry_run"])
+            self.stdout.write(self.style.SUCCESS(
+                f"{model_name}: checked {checked} row(s). {verb} {updated}."
+            ))
+
+    def _refresh(self, model, fields, refresh_all, dry_run):
+        rows = model.objects.all()
+        if not refresh_all:
+            unclassified = Q()
+            for _encrypted, _prop, bucket, _digest in fields:
+                unclassified |= Q(**{f"{bucket}__isnull": True})
+            rows = rows.filter(unclassified)
+        only = ["pk"] + [name for encrypted, _, bucket, digest in fields for name in (encrypted, bucket, digest)]
+        update_fields = [name for _, _, bucket, digest in fields for name in (bucket, digest)]
+
+        checked = updated = 0
+        changed = []
+        for row in rows.only(*only).iterator(chunk_size=BATCH_SIZE):
+            checked += 1
+            is_changed = False
+            for _encrypted, prop, bucket, digest in fields:
+                new = classify(getattr(row, prop))
+                if new != (getattr(row, bucket), getattr(row, digest)):
+                    setattr(row, bucket, new[0])
+                    setattr(row, digest, new[1])
+                    is_changed = True
+            if is_changed:
+                changed.append(row)
+                updated += 1
+            if len(changed) >= BATCH_SIZE:
+                if not dry_run:
+                    model.objects.bulk_update(changed, update_fields)
+                changed = []
+
+        if changed and not dry_run:
+            model.objects.bulk_update(changed, update_fields)
+        return checked, updated
@@ -2,6 +2,7 @@
 from django.core.management.base import BaseCommand
 
 from apps.notes.models import ProgressNoteTemplate, ProgressNoteTemplateSection
+from konote.seeding import SeedSpec, seed
 
 
 # Default templates with their sections
@@ -62,26 +63,27 @@ class Command(BaseCommand):
     help = "Create default note templates (Standard session, Brief check-in, etc.)."
 
     def handle(self, *args, **options):
-        created_count = 0
+        templates = seed(SeedSpec(
+            ProgressNoteTemplate,
+            key=("name",),
+            rows=[{"name": item["name"], "status": "active"} for item in DEFAULTS],
+        ))
+
+        # Sections are only added to new templates, so agencies' edits stand.
+        new_names = {template.name for template in templates.created}
+        ProgressNoteTemplateSection.objects.bulk_create([
+            ProgressNoteTemplateSection(template=templates.objects[(item["name"],)], **section)
+            for item in DEFAULTS if item["name"] in new_names
+            for section in item["sections"]
+        ])
+
         for item in DEFAULTS:
-            template, created = ProgressNoteTemplate.objects.get_or_create(
-                name=item["name"],
-                defaults={"status": "active"},
-            )
-            if created:
-                created_count += 1
-                self.stdout.write(f"  Created template: {template.name}")
-                # Create sections for new templates
-                for section_data in item["sections"]:
-                    ProgressNoteTemplateSection.objects.create(
-                        template=template,
-                        name=section_data["name"],
-                        section_type=section_data["section_type"],
-                        sort_order=section_data["sort_order"],
-                    )
-                    self.stdout.write(f"    - {section_data['name']}")
+            if item["name"] in new_names:
+                self.stdout.write(f"  Created template: {item['name']}")
+                for section in item["sections"]:
+                    self.stdout.write(f"    - {section['name']}")
             else:
-                self.stdout.write(f"  Already exists: {template.name}")
+                self.stdout.write(f"  Already exists: {item['name']}")
         self.stdout.write(
-            self.style.SUCCESS(f"Done. {created_count} note template(s) created.")
+            self.style.SUCCESS(f"Done. {len(templates.created)} note template(s) created.")
         )
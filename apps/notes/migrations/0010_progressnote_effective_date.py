@@ -0,0 +1,44 @@
+# Generated by Django 5.1.15 on 2026-10-18 22:10
+
+import apps.notes.models
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def backfill_effective_date(apps, schema_editor):
+    """Copy backdate, or created_at if there is none, into effective_date."""
+    ProgressNote = apps.get_model('notes', 'ProgressNote')
+    ProgressNote.objects.update(effective_date=Coalesce('backdate', 'created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notes', '0009_progressnotetemplate_owning_program'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='progressnote',
+            name='effective_date',
+            field=apps.notes.models.EffectiveDateField(editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_effective_date, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='progressnote',
+            name='effective_date',
+            field=apps.notes.models.EffectiveDateField(editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='progressnote',
+            index=models.Index(fields=['client_file', 'effective_date'], name='note_client_effective_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='progressnote',
+            index=models.Index(fields=['author_program', 'status', 'effective_date'], name='note_program_status_eff_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='progressnote',
+            index=models.Index(fields=['author', 'follow_up_date', 'follow_up_completed_at'], name='note_author_follow_up_idx'),
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.1.15 on 2026-10-18 22:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """Add quote word-count buckets and text hashes.
+
+    Buckets are added without a default first so existing rows stay null
+    (not yet classified — refresh_quote_index fills them in), then given
+    a default of 0 (empty) for new rows.
+    """
+
+    dependencies = [
+        ('notes', '0010_progressnote_effective_date'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='progressnote',
+            name='reflection_bucket',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='progressnote',
+            name='reflection_hash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=16),
+        ),
+        migrations.AddField(
+            model_name='progressnote',
+            name='suggestion_bucket',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='progressnote',
+            name='suggestion_hash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=16),
+        ),
+        migrations.AddField(
+            model_name='progressnotetarget',
+            name='client_words_bucket',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='progressnotetarget',
+            name='client_words_hash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=16),
+        ),
+        migrations.AlterField(
+            model_name='progressnote',
+            name='reflection_bucket',
+            field=models.PositiveSmallIntegerField(blank=True, default=0, editable=False, null=True),
+        ),
+        migrations.AlterField(
+            model_name='progressnote',
+            name='suggestion_bucket',
+            field=models.PositiveSmallIntegerField(blank=True, default=0, editable=False, null=True),
+        ),
+        migrations.AlterField(
+            model_name='progressnotetarget',
+            name='client_words_bucket',
+            field=models.PositiveSmallIntegerField(blank=True, default=0, editable=False, null=True),
+        ),
+    ]
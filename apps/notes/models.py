@@ -5,6 +5,8 @@ from django.utils.translation import gettext_lazy as _
 
 from konote.encryption import decrypt_field, encrypt_field
 
+from .quote_index import WORDS_NONE, classify
+
 
 class ProgressNoteTemplate(models.Model):
     """Defines the structure of a full progress note."""
@@ -81,6 +83,21 @@ class ProgressNoteTemplateMetric(models.Model):
         ordering = ["sort_order"]
 
 
+class EffectiveDateField(models.DateTimeField):
+    """Stored copy of a note's backdate, or created_at if there is none.
+
+    Kept in sync on every save (including bulk_create). Declare it after
+    created_at: fields are pre-saved in order, so auto_now_add has already
+    filled created_at by the time this one runs. Queryset update() calls
+    that change backdate or created_at must set it themselves.
+    """
+
+    def pre_save(self, model_instance, add):
+        value = model_instance.backdate or model_instance.created_at
+        setattr(model_instance, self.attname, value)
+        return value
+
+
 class ProgressNote(models.Model):
     """A progress note recorded against a client."""
 
@@ -125,6 +142,17 @@ class ProgressNote(models.Model):
     suggestion_priority = models.CharField(
         max_length=20, choices=SUGGESTION_PRIORITY_CHOICES, default="", blank=True,
     )
+    # Plaintext word-count bucket and keyed text hash for the two quote
+    # fields, so insights can pick quotes without decrypting (see
+    # quote_index.py). A null bucket means the row predates classification.
+    reflection_bucket = models.PositiveSmallIntegerField(
+        null=True, blank=True, default=WORDS_NONE, editable=False,
+    )
+    reflection_hash = models.CharField(max_length=16, default="", blank=True, editable=False)
+    suggestion_bucket = models.PositiveSmallIntegerField(
+        null=True, blank=True, default=WORDS_NONE, editable=False,
+    )
+    suggestion_hash = models.CharField(max_length=16, default="", blank=True, editable=False)
 
     @property
     def notes_text(self):
@@ -152,6 +180,7 @@ class ProgressNote(models.Model):
     @participant_reflection.setter
     def participant_reflection(self, value):
         self._participant_reflection_encrypted = encrypt_field(value)
+        self.reflection_bucket, self.reflection_hash = classify(value)
 
     @property
     def participant_suggestion(self):
@@ -161,6 +190,7 @@ class ProgressNote(models.Model):
     @participant_suggestion.setter
     def participant_suggestion(self, value):
         self._participant_suggestion_encrypted = encrypt_field(value)
+        self.suggestion_bucket, self.suggestion_hash = classify(value)
 
     ENGAGEMENT_CHOICES = [
         ("", "---------"),
@@ -189,11 +219,28 @@ class ProgressNote(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # The date this note is for (backdate if set, otherwise created_at).
+    # Stored so date filters and timelines can use an index.
+    effective_date = EffectiveDateField(editable=False)
 
     class Meta:
         app_label = "notes"
         db_table = "progress_notes"
         ordering = ["-created_at"]
+        indexes = [
+            # Client timeline, notes tab and per-client date ranges
+            models.Index(fields=["client_file", "effective_date"], name="note_client_effective_idx"),
+            # Program reports: active notes by author program in a date range
+            models.Index(
+                fields=["author_program", "status", "effective_date"],
+                name="note_program_status_eff_idx",
+            ),
+            # Worker dashboard: my open follow-ups due by date
+            models.Index(
+                fields=["author", "follow_up_date", "follow_up_completed_at"],
+                name="note_author_follow_up_idx",
+            ),
+        ]
 
     def __str__(self):
         # Build date portion
@@ -217,12 +264,6 @@ class ProgressNote(models.Model):
 
         return f"{self.get_interaction_type_display()} - {date_str}"
 
-    @property
-    def effective_date(self):
-        """The date this note is for (backdate if set, otherwise created_at)."""
-        from django.utils import timezone
-        return self.backdate or self.created_at or timezone.now()
-
 
 class ProgressNoteTarget(models.Model):
     """Notes and metrics recorded for a specific plan target within a progress note."""
@@ -239,6 +280,11 @@ class ProgressNoteTarget(models.Model):
     plan_target = models.ForeignKey("plans.PlanTarget", on_delete=models.CASCADE, related_name="note_entries")
     _notes_encrypted = models.BinaryField(default=b"", blank=True)
     _client_words_encrypted = models.BinaryField(default=b"", blank=True)
+    # Word-count bucket and keyed hash of client_words (see quote_index.py)
+    client_words_bucket = models.PositiveSmallIntegerField(
+        null=True, blank=True, default=WORDS_NONE, editable=False,
+    )
+    client_words_hash = models.CharField(max_length=16, default="", blank=True, editable=False)
     progress_descriptor = models.CharField(
         max_length=20, choices=PROGRESS_DESCRIPTOR_CHOICES, default="", blank=True,
     )
@@ -261,6 +307,7 @@ class ProgressNoteTarget(models.Model):
     @client_words.setter
     def client_words(self, value):
         self._client_words_encrypted = encrypt_field(value)
+        self.client_words_bucket, self.client_words_hash = classify(value)
 
     class Meta:
         app_label = "notes"
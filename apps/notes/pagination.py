@@ -0,0 +1,116 @@
+"""Keyset pagination for a client's notes tab.
+
+Notes are listed newest first on (effective_date, id). The cursor is the
+key of the last note shown, so each "Show more" request is a range scan on
+the (client_file, effective_date) index instead of an OFFSET that re-reads
+every earlier page. Only the notes on the page are loaded, and their text
+is decrypted only when the cards render.
+
+Search has to decrypt to find matches, but it scans forward from the
+cursor in batches, reading only the encrypted text columns, and stops as
+soon as it has a page of matches rather than decrypting the client's whole
+history up front.
+"""
+from django.db.models import Prefetch, Q
+from django.utils.dateparse import parse_datetime
+
+PAGE_SIZE = 25
+SEARCH_BATCH_SIZE = 100
+
+# Totals above this are shown as "more than 1000" so the count stays cheap.
+COUNT_LIMIT = 1000
+
+# The fields _search_notes_in_memory() reads on each note.
+SEARCH_FIELDS = (
+    "effective_date",
+    "_notes_text_encrypted",
+    "_summary_encrypted",
+    "_participant_reflection_encrypted",
+)
+
+
+def encode_cursor(note):
+    return f"{note.effective_date.isoformat()}|{note.pk}"
+
+
+def decode_cursor(raw):
+    """Return (effective_date, pk) or None for a missing/garbled cursor."""
+    if not raw:
+        return None
+    try:
+        date_str, pk = raw.split("|")
+        date = parse_datetime(date_str)
+        pk = int(pk)
+    except (ValueError, TypeError):
+        return None
+    if date is None:
+        return None
+    return date, pk
+
+
+def _older_than(cursor):
+    date, pk = cursor
+    return Q(effective_date__lt=date) | Q(effective_date=date, pk__lt=pk)
+
+
+def count_notes(notes):
+    """Return (count, capped) for a note queryset, counting at most COUNT_LIMIT."""
+    count = notes.order_by()[:COUNT_LIMIT + 1].count()
+    return min(count, COUNT_LIMIT), count > COUNT_LIMIT
+
+
+def get_note_page(notes, cursor=None, search=None, page_size=PAGE_SIZE):
+    """Return (notes, next_cursor) for one page of notes, newest first.
+
+    notes is the filtered ProgressNote queryset, with whatever
+    select_related/prefetch_related the cards need. search, if given, takes
+    a list of notes and returns the ones that match, in order.
+    next_cursor is None when there are no older notes.
+    """
+    notes = notes.order_by("-effective_date", "-pk")
+    if cursor:
+        notes = notes.filter(_older_than(cursor))
+
+    if search is None:
+        page = list(notes[:page_size + 1])
+    else:
+        page = _search_page(notes, search, page_size + 1)
+
+    next_cursor = encode_cursor(page[page_size - 1]) if len(page) > page_size else None
+    return page[:page_size], next_cursor
+
+
+def _search_page(notes, search, limit):
+    """Scan notes in batches until `limit` matches are found, then load those."""
+    from .models import ProgressNoteTarget
+
+    scan = (
+        notes.select_related(None)
+        .prefetch_related(None)
+        .prefetch_related(Prefetch(
+            "target_entries",
+            queryset=ProgressNoteTarget.objects.only("progress_note_id", "_notes_encrypted"),
+        ))
+        .only(*SEARCH_FIELDS)
+    )
+    matches = []
+    batch_cursor = None
+    while len(matches) < limit:
+        batch_qs = scan.filter(_older_than(batch_cursor)) if batch_cursor else scan
+        batch = list(batch_qs[:SEARCH_BATCH_SIZE])
+        matches.extend(search(batch))
+        if len(batch) < SEARCH_BATCH_SIZE:
+            break
+        batch_cursor = (batch[-1].effective_date, batch[-1].pk)
+    matches = matches[:limit]
+
+    # Reload just the matches with everything the cards display.
+    loaded = notes.in_bulk([note.pk for note in matches])
+    page = []
+    for match in matches:
+        note = loaded.get(match.pk)
+        if note is None:
+            continue  # Deleted between the scan and the reload
+        note.search_snippet = match.search_snippet
+        page.append(note)
+    return page
@@ -0,0 +1,58 @@
+"""Write-time classification of participant quotes for Outcome Insights.
+
+collect_quotes() surfaces participant words of at least 10 words (5 for
+suggestions), each distinct text once. Checking that used to mean
+decrypting several times more text than it returned. Each quote field now
+has two plaintext companions, set by the model setter:
+
+- a word-count bucket (WORDS_NONE, WORDS_SHORT, WORDS_MEDIUM, WORDS_LONG);
+- a keyed hash of the normalised text: an HMAC under SECRET_KEY, opaque
+  without the key, that only tells whether two texts are the same.
+
+collect_quotes() picks eligible, unseen candidates from these columns and
+decrypts only what it returns. Rows with no bucket yet (written before
+this, or by raw updates) are still checked by decrypting them; the
+refresh_quote_index command backfills them and re-keys the hashes after a
+SECRET_KEY change.
+"""
+from django.utils.crypto import salted_hmac
+
+_KEY_SALT = "konote.notes.quote_index"
+
+# Minimum words for collect_quotes() to use a text.
+QUOTE_MIN_WORDS = 10
+SUGGESTION_MIN_WORDS = 5
+
+WORDS_NONE = 0    # Empty
+WORDS_SHORT = 1   # Under SUGGESTION_MIN_WORDS
+WORDS_MEDIUM = 2  # Long enough for a suggestion, not a quote
+WORDS_LONG = 3    # QUOTE_MIN_WORDS or more
+
+
+def normalise(text):
+    return (text or "").strip().lower()
+
+
+def word_bucket(text):
+    """Word-count bucket for a text."""
+    count = len((text or "").split())
+    if count == 0:
+        return WORDS_NONE
+    if count < SUGGESTION_MIN_WORDS:
+        return WORDS_SHORT
+    if count < QUOTE_MIN_WORDS:
+        return WORDS_MEDIUM
+    return WORDS_LONG
+
+
+def text_hash(text):
+    """Keyed hash of the normalised text; "" if empty."""
+    normalised = normalise(text)
+    if not normalised:
+        return ""
+    return salted_hmac(_KEY_SALT, normalised).hexdigest()[:16]
+
+
+def classify(text):
+    """Return (word_bucket, text_hash) for a text."""
+    return word_bucket(text), text_hash(text)
@@ -3,13 +3,12 @@
 import datetime
 
 import logging
+from functools import partial
 
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.core.paginator import Paginator
 from django.db import transaction
-from django.db.models import Count, DateTimeField
-from django.db.models.functions import Coalesce
+from django.db.models import Count
 from django.http import HttpResponseForbidden
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
@@ -22,7 +21,7 @@ from django.db.models import Q
 
 from apps.auth_app.decorators import program_role_required, requires_permission
 from apps.clients.models import ClientFile
-from apps.plans.models import PlanTarget, PlanTargetMetric
+from apps.plans.models import PlanTarget
 from apps.programs.access import (
     build_program_display_context,
     get_author_program,
@@ -30,8 +29,10 @@ from apps.programs.access import (
     get_program_from_client,
     get_user_program_ids,
 )
-from .forms import FullNoteForm, MetricValueForm, NoteCancelForm, QuickNoteForm, TargetNoteForm
-from .models import MetricValue, ProgressNote, ProgressNoteTarget, ProgressNoteTemplate
+from .composition import build_target_forms, get_template_defaults, save_target_entries
+from .forms import FullNoteForm, NoteCancelForm, QuickNoteForm
+from .models import ProgressNote, ProgressNoteTarget
+from .pagination import count_notes, decode_cursor, get_note_page
 
 
 # Use shared access helpers from apps.programs.access
@@ -81,45 +82,6 @@ def _check_client_consent(client):
     return client.consent_given_at is not None
 
 
-def _build_target_forms(client, post_data=None):
-    """Build TargetNoteForm + MetricValueForms for each active plan target.
-
-    Returns a list of dicts:
-      [{"target": PlanTarget, "note_form": TargetNoteForm, "metric_forms": [MetricValueForm, ...]}]
-    """
-    targets = (
-        PlanTarget.objects.filter(client_file=client, status="default")
-        .select_related("plan_section")
-        .order_by("plan_section__sort_order", "sort_order")
-    )
-    target_forms = []
-    for target in targets:
-        prefix = f"target_{target.pk}"
-        note_form = TargetNoteForm(
-            post_data,
-            prefix=prefix,
-            initial={"target_id": target.pk},
-        )
-        # Get metrics assigned to this target
-        ptm_qs = PlanTargetMetric.objects.filter(plan_target=target).select_related("metric_def").order_by("sort_order")
-        metric_forms = []
-        for ptm in ptm_qs:
-            m_prefix = f"metric_{target.pk}_{ptm.metric_def.pk}"
-            mf = MetricValueForm(
-                post_data,
-                prefix=m_prefix,
-                metric_def=ptm.metric_def,
-                initial={"metric_def_id": ptm.metric_def.pk},
-            )
-            metric_forms.append(mf)
-        target_forms.append({
-            "target": target,
-            "note_form": note_form,
-            "metric_forms": metric_forms,
-        })
-    return target_forms
-
-
 def _search_notes_in_memory(notes_list, query):
     """Search encrypted note content in memory.
 
@@ -169,7 +131,7 @@ def _get_search_snippet(text, query, context_chars=80):
 @login_required
 @requires_permission("note.view", _get_program_from_client)
 def note_list(request, client_id):
-    """Notes timeline for a client with filtering and pagination."""
+    """Notes timeline for a client with filtering and "Show more" pagination."""
     client = _get_client_or_403(request, client_id)
     if client is None:
         return HttpResponseForbidden("You do not have access to this client.")
@@ -179,8 +141,8 @@ def note_list(request, client_id):
     user_program_ids = get_user_program_ids(request.user, active_ids)
     program_ctx = build_program_display_context(request.user, active_ids)
 
-    # Annotate with computed effective_date for filtering and ordering
-    # (backdate if set, otherwise created_at), plus target count for display.
+    # Filter and order on the stored effective_date (backdate if set,
+    # otherwise created_at).
     # prefetch target_entries→plan_target so cards can show target chips (3 queries total)
     # Filter by user's accessible programs — workers only see notes from their programs
     notes = (
@@ -188,10 +150,6 @@ def note_list(request, client_id):
         .filter(Q(author_program_id__in=user_program_ids) | Q(author_program__isnull=True))
         .select_related("author", "author_program", "template")
         .prefetch_related("target_entries__plan_target")
-        .annotate(
-            _effective_date=Coalesce("backdate", "created_at", output_field=DateTimeField()),
-            target_count=Count("target_entries"),
-        )
     )
 
     # Filters — interaction type replaces the old quick/full type filter
@@ -207,12 +165,16 @@ def note_list(request, client_id):
         notes = notes.filter(interaction_type=interaction_filter)
     if date_from:
         try:
-            notes = notes.filter(_effective_date__date__gte=datetime.date.fromisoformat(date_from))
+            notes = notes.filter(effective_date__gte=timezone.make_aware(
+                datetime.datetime.combine(datetime.date.fromisoformat(date_from), datetime.time.min)
+            ))
         except ValueError:
             pass
     if date_to:
         try:
-            notes = notes.filter(_effective_date__date__lte=datetime.date.fromisoformat(date_to))
+            notes = notes.filter(effective_date__lte=timezone.make_aware(
+                datetime.datetime.combine(datetime.date.fromisoformat(date_to), datetime.time.max)
+            ))
         except ValueError:
             pass
     if author_filter == "mine":
@@ -223,19 +185,23 @@ def note_list(request, client_id):
         except (ValueError, TypeError):
             pass
 
-    notes = notes.order_by("-_effective_date", "-created_at")
+    # Keyset pagination on (effective_date, id) — see apps/notes/pagination.py.
+    # Text search decrypts and filters in memory (encrypted fields can't be
+    # searched in SQL), one batch at a time until the page is full.
+    cursor = decode_cursor(request.GET.get("cursor", ""))
+    search = partial(_search_notes_in_memory, query=search_query) if search_query else None
+    page_notes, next_cursor = get_note_page(notes, cursor, search)
 
-    # Text search — decrypt and filter in memory (encrypted fields can't be
-    # searched in SQL). Only triggered when a search query is present so the
-    # default path remains a fast SQL-only query.
-    if search_query:
-        notes_list = list(notes)
-        notes_list = _search_notes_in_memory(notes_list, search_query)
-        paginator = Paginator(notes_list, 25)
-    else:
-        paginator = Paginator(notes, 25)
+    # Total for the first page only, capped so it stays cheap on long
+    # histories. Search totals would mean decrypting everything, so skip them.
+    total_count = total_capped = None
+    if cursor is None and not search_query:
+        total_count, total_capped = count_notes(notes)
 
-    page = paginator.get_page(request.GET.get("page"))
+    # Query string for the "Show more" link — current filters, new cursor
+    params = request.GET.copy()
+    params.pop("cursor", None)
+    params.pop("page", None)
 
     # Count active filters for the filter bar indicator
     active_filter_count = sum([
@@ -254,7 +220,11 @@ def note_list(request, client_id):
     ]
     context = {
         "client": client,
-        "page": page,
+        "notes": page_notes,
+        "next_cursor": next_cursor,
+        "filter_querystring": params.urlencode(),
+        "total_count": total_count,
+        "total_capped": total_capped,
         "filter_interaction": interaction_filter,
         "interaction_choices": ProgressNote.INTERACTION_TYPE_CHOICES,
         "filter_date_from": date_from,
@@ -269,6 +239,9 @@ def note_list(request, client_id):
         "show_program_ui": program_ctx["show_program_ui"],
         "accessible_programs": program_ctx["accessible_programs"],
     }
+    # HTMX "Show more" — return just the next page of cards
+    if request.headers.get("HX-Request") and cursor is not None:
+        return render(request, "notes/_note_list_page.html", context)
     if request.headers.get("HX-Request"):
         return render(request, "notes/_tab_notes.html", context)
     return render(request, "notes/note_list.html", context)
@@ -344,7 +317,7 @@ def note_create(request, client_id):
 
     if request.method == "POST":
         form = FullNoteForm(request.POST)
-        target_forms = _build_target_forms(client, request.POST)
+        target_forms = build_target_forms(client, request.POST)
 
         # Validate all forms
         all_valid = form.is_valid()
@@ -383,34 +356,7 @@ def note_create(request, client_id):
                 note.save()
 
                 # Create target entries and metric values
-                for tf in target_forms:
-                    nf = tf["note_form"]
-                    notes_text = nf.cleaned_data.get("notes", "")
-                    client_words = nf.cleaned_data.get("client_words", "")
-                    progress_descriptor = nf.cleaned_data.get("progress_descriptor", "")
-                    # Check if any data was entered for this target
-                    has_metrics = any(
-                        mf.cleaned_data.get("value", "") for mf in tf["metric_forms"]
-                    )
-                    if not notes_text and not has_metrics and not client_words and not progress_descriptor:
-                        continue  # Skip targets with no data entered
-
-                    pnt = ProgressNoteTarget(
-                        progress_note=note,
-                        plan_target_id=nf.cleaned_data["target_id"],
-                        notes=notes_text,
-                        client_words=client_words,
-                        progress_descriptor=progress_descriptor,
-                    )
-                    pnt.save()
-                    for mf in tf["metric_forms"]:
-                        val = mf.cleaned_data.get("value", "")
-                        if val:
-                            MetricValue.objects.create(
-                                progress_note_target=pnt,
-                                metric_def_id=mf.cleaned_data["metric_def_id"],
-                                value=val,
-                            )
+                save_target_entries(note, target_forms)
 
                 # Auto-complete any pending follow-ups from this author for this client
                 ProgressNote.objects.filter(
@@ -426,12 +372,10 @@ def note_create(request, client_id):
             return redirect("notes:note_list", client_id=client.pk)
     else:
         form = FullNoteForm(initial={"session_date": timezone.localdate()})
-        target_forms = _build_target_forms(client)
+        target_forms = build_target_forms(client)
 
     # Build template → default_interaction_type mapping for JS auto-fill
-    template_defaults = {}
-    for tmpl in ProgressNoteTemplate.objects.filter(status="active"):
-        template_defaults[str(tmpl.pk)] = tmpl.default_interaction_type
+    template_defaults = get_template_defaults()
 
     # Breadcrumbs: Clients > [Client Name] > Notes > New Note
     breadcrumbs = [
@@ -11,18 +11,22 @@ Two middleware classes:
    from the session and attaches it to ``request.participant_user``.
    Also verifies the participant's account is still active and their
    client file has not been discharged or erased.
+
+Both are MiddlewareMixin hooks. Under ASGI, MiddlewareMixin awaits the
+rest of the chain directly and runs the hooks through sync_to_async.
 """
 import logging
 
 from django.conf import settings
 from django.http import HttpResponse
+from django.utils.deprecation import MiddlewareMixin
 
 from .models import ParticipantUser
 
 logger = logging.getLogger(__name__)
 
 
-class DomainEnforcementMiddleware:
+class DomainEnforcementMiddleware(MiddlewareMixin):
     """Route enforcement: portal paths on portal domain, staff paths on staff domain.
 
     When ``PORTAL_DOMAIN`` and ``STAFF_DOMAIN`` are configured in settings,
@@ -34,10 +38,7 @@ class DomainEnforcementMiddleware:
     allowing the portal to work at ``/my/`` on the main domain.
     """
 
-    def __init__(self, get_response):
-        self.get_response = get_response
-
-    def __call__(self, request):
+    def process_request(self, request):
         host = request.get_host().split(":")[0]
         portal_domain = getattr(settings, "PORTAL_DOMAIN", "")
         staff_domain = getattr(settings, "STAFF_DOMAIN", "")
@@ -49,10 +50,10 @@ class DomainEnforcementMiddleware:
         if staff_domain and host == staff_domain and request.path.startswith("/my/"):
             return HttpResponse("Not Found", status=404, content_type="text/plain")
 
-        return self.get_response(request)
+        return None
 
 
-class PortalAuthMiddleware:
+class PortalAuthMiddleware(MiddlewareMixin):
     """Load the authenticated participant from the session.
 
     For requests to portal paths (``/my/``), this middleware reads the
@@ -72,17 +73,12 @@ class PortalAuthMiddleware:
     so that the session is available.
     """
 
-    def __init__(self, get_response):
-        self.get_response = get_response
-
-    def __call__(self, request):
+    def process_request(self, request):
         if request.path.startswith("/my/"):
             request.participant_user = self._load_participant(request)
         else:
             request.participant_user = None
 
-        return self.get_response(request)
-
     def _load_participant(self, request):
         """Load and validate the participant from the session.
 
@@ -25,7 +25,7 @@ def _to_float(value: str) -> float | None:
 
 
 def _build_date_filter(date_from: date | None, date_to: date | None) -> Q:
-    """Build a Q filter for effective date range (backdate or created_at)."""
+    """Build a Q filter on the stored effective date (backdate or created_at)."""
     if not date_from and not date_to:
         return Q()
 
@@ -39,20 +39,11 @@ def _build_date_filter(date_from: date | None, date_to: date | None) -> Q:
     )
 
     if date_from_dt and date_to_dt:
-        return (
-            Q(backdate__range=(date_from_dt, date_to_dt))
-            | Q(backdate__isnull=True, created_at__range=(date_from_dt, date_to_dt))
-        )
+        return Q(effective_date__range=(date_from_dt, date_to_dt))
     elif date_from_dt:
-        return (
-            Q(backdate__gte=date_from_dt)
-            | Q(backdate__isnull=True, created_at__gte=date_from_dt)
-        )
+        return Q(effective_date__gte=date_from_dt)
     else:  # date_to_dt only
-        return (
-            Q(backdate__lte=date_to_dt)
-            | Q(backdate__isnull=True, created_at__lte=date_to_dt)
-        )
+        return Q(effective_date__lte=date_to_dt)
 
 
 ComparisonType = Literal["gte", "lte", "eq", "range"]
@@ -231,8 +222,7 @@ def get_program_achievement_rate(
             continue
 
         client_id = mv.progress_note_target.progress_note.client_file_id
-        note = mv.progress_note_target.progress_note
-        effective_dt = note.backdate or note.created_at
+        effective_dt = mv.progress_note_target.progress_note.effective_date
 
         if client_id not in client_values:
             client_values[client_id] = []
@@ -343,8 +333,7 @@ def get_achievement_summary(
 
         metric_id = mv.metric_def_id
         client_id = mv.progress_note_target.progress_note.client_file_id
-        note = mv.progress_note_target.progress_note
-        effective_dt = note.backdate or note.created_at
+        effective_dt = mv.progress_note_target.progress_note.effective_date
 
         if metric_id not in metric_client_values:
             metric_client_values[metric_id] = {}
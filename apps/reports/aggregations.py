@@ -31,7 +31,7 @@ def _to_float(value: str) -> float | None:
 
 
 def _build_date_filter(date_from: date | None, date_to: date | None) -> Q:
-    """Build a Q filter for effective date range (backdate or created_at)."""
+    """Build a Q filter on the stored effective date (backdate or created_at)."""
     if not date_from and not date_to:
         return Q()
 
@@ -45,20 +45,11 @@ def _build_date_filter(date_from: date | None, date_to: date | None) -> Q:
     )
 
     if date_from_dt and date_to_dt:
-        return (
-            Q(backdate__range=(date_from_dt, date_to_dt))
-            | Q(backdate__isnull=True, created_at__range=(date_from_dt, date_to_dt))
-        )
+        return Q(effective_date__range=(date_from_dt, date_to_dt))
     elif date_from_dt:
-        return (
-            Q(backdate__gte=date_from_dt)
-            | Q(backdate__isnull=True, created_at__gte=date_from_dt)
-        )
+        return Q(effective_date__gte=date_from_dt)
     else:  # date_to_dt only
-        return (
-            Q(backdate__lte=date_to_dt)
-            | Q(backdate__isnull=True, created_at__lte=date_to_dt)
-        )
+        return Q(effective_date__lte=date_to_dt)
 
 
 def metric_stats(metric_values_qs: QuerySet[MetricValue]) -> dict[str, Any]:
@@ -241,8 +232,7 @@ def aggregate_metrics(
         elif group_by == "client":
             key = str(mv.progress_note_target.progress_note.client_file_id)
         elif group_by == "date":
-            note = mv.progress_note_target.progress_note
-            effective = note.backdate or note.created_at
+            effective = mv.progress_note_target.progress_note.effective_date
             key = effective.strftime("%Y-%m-%d") if effective else "unknown"
         else:
             key = "all"
@@ -0,0 +1,274 @@
+"""Single-pass demographic breakdown engine.
+
+A report run can ask for several breakdowns (age range, funder age bins,
+one or more custom fields) across several metrics. Grouping each
+metric × breakdown separately decrypts every client's birth date and
+reloads custom field values over and over.
+
+This module splits the work in two:
+
+1. DemographicLookup resolves each client's demographic attributes once
+   per report run — age bins come from keyed birth-year tokens, with
+   decryption only near a bin edge, and custom field values are loaded
+   with one query per field — and caches them.
+2. aggregate_breakdowns() walks the metric values once and drops each
+   value into every (breakdown, metric, group) cell it belongs to.
+
+Small-cell suppression is left to the caller and applied to the final
+cell counts, as before.
+"""
+from collections import defaultdict
+from datetime import date
+from typing import Any, Iterable
+
+from apps.clients.birth_year import decode_tokens, possible_ages
+from apps.clients.models import ClientDetailValue, ClientFile, CustomFieldDefinition
+
+from .aggregations import _stats_from_list
+from .demographics import AGE_RANGES, UNKNOWN, _age_bin, _age_on, _apply_category_merge, _option_labels
+
+
+class BreakdownSpec:
+    """One way of splitting clients into demographic groups.
+
+    Args:
+        key: Unique key for this breakdown within a report run.
+        source_type: "age" or "custom_field".
+        field: CustomFieldDefinition (custom_field breakdowns only).
+        bins: List of (min_age, max_age, label) tuples (age only;
+              defaults to AGE_RANGES).
+        merge_categories: Funder category merge map (custom_field only).
+        label: Display label for the breakdown section.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        source_type: str,
+        field: CustomFieldDefinition | None = None,
+        bins: list[tuple[int, int, str]] | None = None,
+        merge_categories: dict[str, list[str]] | None = None,
+        label: str = "",
+    ):
+        self.key = key
+        self.source_type = source_type
+        self.field = field
+        self.bins = bins or (AGE_RANGES if source_type == "age" else None)
+        self.merge_categories = merge_categories or None
+        self.label = label
+
+    @classmethod
+    def from_grouping(cls, grouping_type: str, grouping_field: CustomFieldDefinition | None = None):
+        """Build a spec from the legacy group-by dropdown (age_range / custom_field)."""
+        if grouping_type == "age_range":
+            return cls("grouping", "age")
+        if grouping_type == "custom_field" and grouping_field:
+            return cls("grouping", "custom_field", field=grouping_field)
+        return None
+
+    @classmethod
+    def from_template_breakdown(cls, breakdown):
+        """Build a spec from a DemographicBreakdown row, or None if unusable."""
+        key = f"breakdown_{breakdown.pk}"
+        if breakdown.source_type == "age":
+            bins = [(b["min"], b["max"], b["label"]) for b in breakdown.bins_json or []]
+            return cls(key, "age", bins=bins or None, label=breakdown.label)
+        if breakdown.source_type == "custom_field" and breakdown.custom_field:
+            return cls(
+                key, "custom_field", field=breakdown.custom_field,
+                merge_categories=breakdown.merge_categories_json, label=breakdown.label,
+            )
+        return None
+
+    def label_order(self) -> list[str]:
+        """Preferred display order of group labels (unlisted labels sort after)."""
+        if self.source_type == "age":
+            order = [label for _, _, label in self.bins]
+        elif self.merge_categories:
+            order = list(self.merge_categories) + ["Other"]
+        else:
+            order = list(_option_labels(self.field).values())
+        return order + [UNKNOWN]
+
+    def sort_labels(self, labels: Iterable[str]) -> list[str]:
+        order = {label: i for i, label in enumerate(self.label_order())}
+        unknown_rank = order[UNKNOWN]
+        return sorted(
+            labels,
+            key=lambda label: (
+                order.get(label, unknown_rank - 0.5),
+                label if label not in order else "",
+            ),
+        )
+
+
+class DemographicLookup:
+    """Each client's demographic attributes, resolved once per report run."""
+
+    def __init__(self, client_ids: Iterable[int], as_of_date: date | None = None):
+        self.client_ids = list(dict.fromkeys(client_ids))
+        self.as_of_date = as_of_date or date.today()
+        self._birth_years: dict[int, int | None] | None = None
+        self._ages: dict[int, int | None] = {}
+        self._field_values: dict[int, dict[int, str]] = {}
+        self._labels: dict[tuple, dict[int, str]] = {}
+
+    def birth_years(self) -> dict[int, int | None]:
+        """Birth year for every client that exists, from the keyed tokens.
+
+        None where the token is missing or stale (apps/clients/birth_year.py).
+        """
+        if self._birth_years is None:
+            table = decode_tokens()
+            self._birth_years = {
+                pk: table.get(token)
+                for pk, token in ClientFile.objects.filter(
+                    pk__in=self.client_ids,
+                ).values_list("pk", "birth_year_token")
+            }
+        return self._birth_years
+
+    def exact_ages(self, client_ids: Iterable[int]) -> dict[int, int | None]:
+        """Age in years at as_of_date, decrypting each birth date at most once."""
+        missing = [pk for pk in client_ids if pk not in self._ages]
+        if missing:
+            self._ages.update(dict.fromkeys(missing))
+            for client in ClientFile.objects.filter(
+                pk__in=missing,
+            ).exclude(_birth_date_encrypted=b"").only("pk", "_birth_date_encrypted"):
+                self._ages[client.pk] = _age_on(client.birth_date, self.as_of_date)
+        return {pk: self._ages[pk] for pk in client_ids}
+
+    def age_labels(self, bins) -> dict[int, str]:
+        """Age bin at as_of_date for every client that exists.
+
+        A birth year leaves two possible ages. Birth dates are only
+        decrypted when those fall in different bins, or the token is
+        missing or stale.
+        """
+        labels: dict[int, str] = {}
+        undecided = []
+        for pk, year in self.birth_years().items():
+            if year is not None:
+                older, younger = (_age_bin(age, bins) for age in possible_ages(year, self.as_of_date))
+                if older == younger:
+                    labels[pk] = older
+                    continue
+            undecided.append(pk)
+        for pk, age in self.exact_ages(undecided).items():
+            labels[pk] = _age_bin(age, bins)
+        return labels
+
+    def field_values(self, field: CustomFieldDefinition) -> dict[int, str]:
+        """Display values of one custom field for every client that has one."""
+        if field.pk not in self._field_values:
+            option_labels = _option_labels(field)
+            values = {}
+            for cv in ClientDetailValue.objects.filter(
+                client_file_id__in=self.client_ids, field_def=field,
+            ).only("client_file_id", "value", "_value_encrypted"):
+                cv.field_def = field  # Avoid a per-row query in get_value()
+                raw_value = cv.get_value()  # Handles decryption if sensitive
+                values[cv.client_file_id] = option_labels.get(raw_value, raw_value) if raw_value else ""
+            self._field_values[field.pk] = values
+        return self._field_values[field.pk]
+
+    def labels_for(self, spec: BreakdownSpec) -> dict[int, str]:
+        """Map client_id → group label for a breakdown.
+
+        Age breakdowns only cover clients that exist; custom field
+        breakdowns cover every requested client (missing → "Unknown").
+        """
+        cache_key = (
+            spec.source_type,
+            tuple(spec.bins) if spec.bins else None,
+            spec.field.pk if spec.field else None,
+            repr(sorted((spec.merge_categories or {}).items())),
+        )
+        if cache_key in self._labels:
+            return self._labels[cache_key]
+
+        if spec.source_type == "age":
+            labels = self.age_labels(spec.bins)
+        elif spec.source_type == "custom_field" and spec.field:
+            values = self.field_values(spec.field)
+            labels = {cid: values.get(cid) or UNKNOWN for cid in self.client_ids}
+            if spec.merge_categories:
+                merged = _apply_category_merge(self.group_labels(labels), spec.merge_categories)
+                labels = {cid: label for label, ids in merged.items() for cid in ids}
+        else:
+            labels = {}
+
+        self._labels[cache_key] = labels
+        return labels
+
+    @staticmethod
+    def group_labels(labels: dict[int, str]) -> dict[str, list[int]]:
+        groups: dict[str, list[int]] = defaultdict(list)
+        for cid, label in labels.items():
+            groups[label].append(cid)
+        return dict(groups)
+
+    def group(self, spec: BreakdownSpec) -> dict[str, list[int]]:
+        """Group client IDs by a breakdown: {label: [client_id, ...]}."""
+        return self.group_labels(self.labels_for(spec))
+
+
+def _empty_stats() -> dict[str, Any]:
+    return {"count": 0, "valid_count": 0, "avg": None, "min": None, "max": None, "sum": None}
+
+
+def aggregate_breakdowns(
+    metric_values,
+    specs: list[BreakdownSpec],
+    as_of_date: date | None = None,
+    lookup: DemographicLookup | None = None,
+) -> dict[str, dict[int, dict[str, dict[str, Any]]]]:
+    """Aggregate metric values for every breakdown and metric in one pass.
+
+    Args:
+        metric_values: Iterable of MetricValue with
+                       progress_note_target__progress_note selected.
+        specs: The breakdowns to compute.
+        as_of_date: Age calculation date (ignored if lookup is given).
+        lookup: Reuse an existing DemographicLookup for this report run.
+
+    Returns:
+        {spec.key: {metric_def_id: {group_label: stats}}}, where stats has
+        count, valid_count, avg, min, max, sum and client_ids. Group labels
+        are in display order.
+    """
+    rows = [
+        (mv.progress_note_target.progress_note.client_file_id, mv)
+        for mv in metric_values
+    ]
+    if lookup is None:
+        lookup = DemographicLookup((cid for cid, _ in rows), as_of_date)
+    label_maps = {spec.key: lookup.labels_for(spec) for spec in specs}
+
+    cells: dict[tuple, list] = defaultdict(list)
+    cell_clients: dict[tuple, set] = defaultdict(set)
+    for cid, mv in rows:
+        for spec in specs:
+            label = label_maps[spec.key].get(cid)
+            if label is None:
+                continue  # Client no longer exists (age breakdowns)
+            cell = (spec.key, mv.metric_def_id, label)
+            cells[cell].append(mv)
+            cell_clients[cell].add(cid)
+
+    results: dict[str, dict[int, dict[str, dict[str, Any]]]] = {spec.key: {} for spec in specs}
+    by_metric: dict[tuple, list[str]] = defaultdict(list)
+    for spec_key, metric_id, label in cells:
+        by_metric[(spec_key, metric_id)].append(label)
+
+    specs_by_key = {spec.key: spec for spec in specs}
+    for (spec_key, metric_id), labels in by_metric.items():
+        groups = {}
+        for label in specs_by_key[spec_key].sort_labels(labels):
+            cell = (spec_key, metric_id, label)
+            stats = _stats_from_list(cells[cell]) if cells[cell] else _empty_stats()
+            stats["client_ids"] = cell_clients[cell]
+            groups[label] = stats
+        results[spec_key][metric_id] = groups
+    return results
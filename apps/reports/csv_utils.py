@@ -10,9 +10,15 @@ treat them as plain text rather than formulas.
 
 Filename sanitisation strips characters that could be used for path traversal
 or header injection in Content-Disposition headers.
+
+stream_csv_response() writes sanitised rows to the client as they are
+produced, for exports too long to build in memory first.
 """
+import csv
 import re
 
+from django.http import StreamingHttpResponse
+
 
 # Characters that trigger formula execution in spreadsheet applications
 _FORMULA_PREFIXES = ("=", "+", "-", "@")
@@ -71,3 +77,29 @@ def sanitise_filename(raw_name):
     # Keep only safe characters
     cleaned = re.sub(r"[^A-Za-z0-9_.\-]", "", str(raw_name))
     return cleaned or "export"
+
+
+class _EchoBuffer:
+    """File-like object whose write() hands the line back to csv.writer's caller."""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv_response(rows, filename):
+    """Stream rows as a CSV attachment, sanitising each row on the way out.
+
+    Args:
+        rows: Iterable of row lists; may be a generator.
+        filename: Already-sanitised download filename.
+
+    Returns:
+        StreamingHttpResponse with text/csv content.
+    """
+    writer = csv.writer(_EchoBuffer())
+    response = StreamingHttpResponse(
+        (writer.writerow(sanitise_csv_row(row)) for row in rows),
+        content_type="text/csv",
+    )
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
@@ -1,11 +1,13 @@
 """Demographic grouping utilities for report aggregation.
 
 Provides functions to group clients by demographics:
-- Age range (calculated from encrypted birth_date)
+- Age range (from keyed birth-year tokens; see apps/clients/birth_year.py)
 - Custom field values (from EAV system)
 
 These functions work with encrypted data by loading records into Python
 and filtering in memory. This approach is acceptable for up to ~2,000 clients.
+When a report needs several groupings, use the breakdown engine in
+breakdowns.py so each client is resolved once per run.
 """
 from collections import defaultdict
 from datetime import date
@@ -13,10 +15,13 @@ from typing import Any
 
 from django.db.models import QuerySet
 
-from apps.clients.models import ClientDetailValue, ClientFile, CustomFieldDefinition
+from apps.clients.models import CustomFieldDefinition
 from apps.notes.models import MetricValue
 
 
+UNKNOWN = "Unknown"
+
+
 # Age range buckets (standard demographic groupings)
 AGE_RANGES = [
     (0, 17, "0-17"),
@@ -85,42 +90,24 @@ def group_clients_by_age(
         Dict mapping age range labels to lists of client IDs.
         Example: {"25-34": [1, 2], "35-44": [3], "Unknown": [4]}
     """
-    groups: dict[str, list[int]] = defaultdict(list)
-
-    # Convert queryset to list if needed
-    if hasattr(client_ids, "values_list"):
-        client_ids = list(client_ids)
+    from .breakdowns import BreakdownSpec, DemographicLookup
 
     # Use custom bins if provided, otherwise default
-    if custom_bins:
-        bins = [(b["min"], b["max"], b["label"]) for b in custom_bins]
-    else:
-        bins = AGE_RANGES
-
-    # Load clients — encrypted birth_date requires Python access
-    clients = ClientFile.objects.filter(pk__in=client_ids)
-
-    for client in clients:
-        age_range = _find_age_bin(client.birth_date, as_of_date, bins)
-        groups[age_range].append(client.pk)
+    bins = [(b["min"], b["max"], b["label"]) for b in custom_bins] if custom_bins else AGE_RANGES
+    lookup = DemographicLookup(list(client_ids), as_of_date)
+    return lookup.group(BreakdownSpec("age", "age", bins=bins))
 
-    return dict(groups)
 
-
-def _find_age_bin(
-    birth_date: date | str | None,
-    as_of_date: date | None,
-    bins: list[tuple[int, int, str]],
-) -> str:
-    """Find the matching age bin label for a birth date."""
+def _age_on(birth_date: date | str | None, as_of_date: date | None) -> int | None:
+    """Age in whole years at as_of_date, or None if birth_date is missing/invalid."""
     if not birth_date:
-        return "Unknown"
+        return None
 
     if isinstance(birth_date, str):
         try:
             birth_date = date.fromisoformat(birth_date)
         except (ValueError, TypeError):
-            return "Unknown"
+            return None
 
     if as_of_date is None:
         as_of_date = date.today()
@@ -128,14 +115,28 @@ def _find_age_bin(
     age = as_of_date.year - birth_date.year
     if (as_of_date.month, as_of_date.day) < (birth_date.month, birth_date.day):
         age -= 1
+    return age
+
 
+def _age_bin(age: int | None, bins: list[tuple[int, int, str]]) -> str:
+    """Find the matching age bin label for an age in years."""
+    if age is None:
+        return "Unknown"
     for min_age, max_age, label in bins:
         if min_age <= age <= max_age:
             return label
-
     return "Unknown"
 
 
+def _find_age_bin(
+    birth_date: date | str | None,
+    as_of_date: date | None,
+    bins: list[tuple[int, int, str]],
+) -> str:
+    """Find the matching age bin label for a birth date."""
+    return _age_bin(_age_on(birth_date, as_of_date), bins)
+
+
 def group_clients_by_custom_field(
     client_ids: list[int] | QuerySet,
     field_definition: CustomFieldDefinition,
@@ -156,56 +157,26 @@ def group_clients_by_custom_field(
         For dropdown fields, uses option labels (not raw values).
         Clients without a value are grouped under "Unknown".
     """
-    groups: dict[str, list[int]] = defaultdict(list)
+    from .breakdowns import BreakdownSpec, DemographicLookup
 
-    # Convert queryset to list if needed
-    if hasattr(client_ids, "values_list"):
-        client_ids = list(client_ids)
+    spec = BreakdownSpec(
+        "custom_field", "custom_field", field=field_definition,
+        merge_categories=merge_categories,
+    )
+    return DemographicLookup(list(client_ids)).group(spec)
 
-    # Build lookup for dropdown options (value -> label)
+
+def _option_labels(field_definition: CustomFieldDefinition | None) -> dict[str, str]:
+    """Map stored dropdown values to their display labels (empty for non-dropdowns)."""
     option_labels = {}
-    if field_definition.input_type == "select" and field_definition.options_json:
+    if field_definition and field_definition.input_type == "select" and field_definition.options_json:
         for option in field_definition.options_json:
             if isinstance(option, dict):
                 option_labels[option.get("value", "")] = option.get("label", option.get("value", ""))
             else:
                 # Simple list of strings
                 option_labels[option] = option
-
-    # Get all values for this field for the given clients
-    values = ClientDetailValue.objects.filter(
-        client_file_id__in=client_ids,
-        field_def=field_definition,
-    ).select_related("field_def")
-
-    # Track which clients have values
-    clients_with_values = set()
-
-    for cv in values:
-        client_id = cv.client_file_id
-        raw_value = cv.get_value()  # Handles decryption if sensitive
-
-        if not raw_value:
-            groups["Unknown"].append(client_id)
-        else:
-            # Use option label for dropdowns, raw value otherwise
-            display_value = option_labels.get(raw_value, raw_value)
-            groups[display_value].append(client_id)
-
-        clients_with_values.add(client_id)
-
-    # Add clients without any value for this field to "Unknown"
-    for client_id in client_ids:
-        if client_id not in clients_with_values:
-            groups["Unknown"].append(client_id)
-
-    raw_groups = dict(groups)
-
-    # Apply category merging if provided
-    if merge_categories:
-        return _apply_category_merge(raw_groups, merge_categories)
-
-    return raw_groups
+    return option_labels
 
 
 def _apply_category_merge(
@@ -280,6 +251,8 @@ def aggregate_by_demographic(
         stats["client_ids"] = client_ids
         return {"All": stats}
 
+    from .breakdowns import BreakdownSpec, DemographicLookup
+
     # Get all unique client IDs from the metric values
     all_client_ids = set()
     client_metric_map: dict[int, list[MetricValue]] = defaultdict(list)
@@ -291,21 +264,21 @@ def aggregate_by_demographic(
         all_client_ids.add(client_id)
         client_metric_map[client_id].append(mv)
 
-    # Group clients by demographic
-    if grouping_type == "age_range":
-        client_groups = group_clients_by_age(list(all_client_ids), as_of_date)
-    elif grouping_type == "custom_field" and grouping_field:
-        client_groups = group_clients_by_custom_field(list(all_client_ids), grouping_field)
-    else:
+    spec = BreakdownSpec.from_grouping(grouping_type, grouping_field)
+    if spec is None:
         # Invalid grouping — return ungrouped
         stats = _stats_from_list(list(metric_values_qs))
         stats["client_ids"] = all_client_ids
         return {"All": stats}
 
+    # Group clients by demographic
+    client_groups = DemographicLookup(all_client_ids, as_of_date).group(spec)
+
     # Aggregate metric values for each demographic group
     results: dict[str, dict[str, Any]] = {}
 
-    for group_label, client_ids in client_groups.items():
+    for group_label in spec.sort_labels(client_groups):
+        client_ids = client_groups[group_label]
         # Collect all metric values for clients in this group
         group_values = []
         for client_id in client_ids:
@@ -17,7 +17,6 @@ Canadian spelling conventions used throughout (organisation, colour).
 from datetime import date
 from typing import Any
 
-from django.db.models import Q
 from django.utils import timezone
 
 from apps.admin_settings.models import InstanceSetting
@@ -26,7 +25,8 @@ from apps.notes.models import MetricValue, ProgressNote
 
 from .achievements import get_achievement_summary
 from .aggregations import count_clients_by_program, count_notes_by_program
-from .demographics import get_age_range, group_clients_by_age, group_clients_by_custom_field
+from .breakdowns import BreakdownSpec, DemographicLookup
+from .report_cache import cached_section
 from .utils import get_fiscal_year_range
 
 
@@ -83,6 +83,7 @@ def get_age_group_label(birth_date: date | str | None, as_of_date: date | None =
 def group_clients_by_age_buckets(
     client_ids: list[int],
     as_of_date: date | None = None,
+    lookup: DemographicLookup | None = None,
 ) -> dict[str, int]:
     """
     Group client IDs by age categories and return counts.
@@ -90,6 +91,8 @@ def group_clients_by_age_buckets(
     Args:
         client_ids: List of client IDs to group.
         as_of_date: Calculate ages as of this date (default: today).
+        lookup: Reuse the report run's DemographicLookup so birth dates
+                are only decrypted once.
 
     Returns:
         Dict mapping age group labels to counts.
@@ -102,11 +105,10 @@ def group_clients_by_age_buckets(
     if not client_ids:
         return counts
 
-    # Load clients to access encrypted birth_date
-    clients = ClientFile.objects.filter(pk__in=client_ids)
-
-    for client in clients:
-        age_group = get_age_group_label(client.birth_date, as_of_date)
+    if lookup is None:
+        lookup = DemographicLookup(client_ids, as_of_date)
+    spec = BreakdownSpec("funder_age", "age", bins=DEFAULT_AGE_GROUPS)
+    for age_group in lookup.labels_for(spec).values():
         counts[age_group] = counts.get(age_group, 0) + 1
 
     return counts
@@ -215,6 +217,95 @@ def generate_funder_report_data(
     if not organisation_name:
         organisation_name = InstanceSetting.get("agency_name", "Organisation Name")
 
+    # Each section is cached under its inputs and the version of the data
+    # it reads (see report_cache), so regenerating an unchanged report
+    # skips the queries and decryption entirely.
+    if user is None:
+        scope = "all"
+    else:
+        scope = "demo" if user.is_demo else "real"
+    period = (program.pk, date_from, date_to, scope)
+
+    service = cached_section(
+        "service", period, ("notes", "enrolments", "clients"),
+        lambda: _service_section(program, date_from, date_to, scope),
+    )
+    active_client_ids = service["active_client_ids"]
+    enrolled_client_ids = service["enrolled_client_ids"]
+
+    demographics = cached_section(
+        "demographics",
+        period + (report_template.pk if report_template else None,),
+        ("notes", "enrolments", "clients", "templates"),
+        lambda: _demographics_section(active_client_ids, date_to, report_template),
+    )
+    age_demographics = demographics["age_demographics"]
+    custom_demographic_sections = demographics["custom_demographic_sections"]
+
+    achievement_summary = cached_section(
+        "outcomes", (program.pk, date_from, date_to), ("notes", "enrolments", "outcomes"),
+        lambda: get_achievement_summary(
+            program,
+            date_from=date_from,
+            date_to=date_to,
+            use_latest=True,
+        ),
+    )
+
+    # Build primary outcome (first metric with a target, if any)
+    primary_outcome = None
+    secondary_outcomes = []
+
+    for metric_data in achievement_summary.get("by_metric", []):
+        if metric_data["has_target"]:
+            outcome_data = {
+                "name": metric_data["metric_name"],
+                "target_value": metric_data["target_value"],
+                "clients_measured": metric_data["total_clients"],
+                "clients_achieved": metric_data["clients_met_target"],
+                "achievement_rate": metric_data["achievement_rate"],
+            }
+            if primary_outcome is None:
+                primary_outcome = outcome_data
+            else:
+                secondary_outcomes.append(outcome_data)
+
+    return {
+        # Report metadata
+        "generated_at": timezone.now(),
+        "reporting_period": fiscal_year_label,
+        "date_from": date_from,
+        "date_to": date_to,
+
+        # Organisation information
+        "organisation_name": organisation_name,
+        "program_name": program.name,
+        "program_description": program.description or "",
+
+        # Service statistics
+        "total_individuals_served": service["total_individuals_served"],
+        "new_clients_this_period": service["new_clients"],
+        "total_contacts": service["total_contacts"],
+
+        # Demographics
+        "age_demographics": age_demographics,
+        "age_demographics_total": sum(age_demographics.values()),
+        "custom_demographic_sections": custom_demographic_sections,
+        "report_template_name": report_template.name if report_template else None,
+
+        # Outcomes
+        "primary_outcome": primary_outcome,
+        "secondary_outcomes": secondary_outcomes,
+        "achievement_summary": achievement_summary,
+
+        # Raw data for detailed views
+        "active_client_count": len(active_client_ids),
+        "enrolled_client_count": len(enrolled_client_ids),
+    }
+
+
+def _service_section(program, date_from, date_to, scope):
+    """Enrolment and activity counts, plus the client IDs later sections use."""
     # Get enrolled client IDs for the program
     enrolled_client_ids = list(
         ClientProgramEnrolment.objects.filter(
@@ -225,31 +316,13 @@ def generate_funder_report_data(
 
     # Security: Filter by user's demo status if user is provided
     # Demo users can only see demo clients; real users only real clients
-    if user is not None:
-        if user.is_demo:
+    if scope != "all":
+        if scope == "demo":
             accessible_ids = set(ClientFile.objects.demo().values_list("pk", flat=True))
         else:
             accessible_ids = set(ClientFile.objects.real().values_list("pk", flat=True))
         enrolled_client_ids = [cid for cid in enrolled_client_ids if cid in accessible_ids]
 
-    # Count unique clients with activity in the period
-    total_individuals_served = count_clients_by_program(
-        program,
-        date_from=date_from,
-        date_to=date_to,
-        active_only=True,
-    )
-
-    # Count new clients enrolled in the period
-    new_clients = get_new_clients_count(program, date_from, date_to)
-
-    # Count total progress notes (contacts) in the period
-    total_contacts = count_notes_by_program(
-        program,
-        date_from=date_from,
-        date_to=date_to,
-    )
-
     # Get clients who had activity in the period for demographics
     # (use same logic as count_clients_by_program but get IDs)
     from datetime import datetime, time
@@ -260,14 +333,38 @@ def generate_funder_report_data(
         ProgressNote.objects.filter(
             client_file_id__in=enrolled_client_ids,
             status="default",
-        ).filter(
-            Q(backdate__range=(date_from_dt, date_to_dt))
-            | Q(backdate__isnull=True, created_at__range=(date_from_dt, date_to_dt))
-        ).values_list("client_file_id", flat=True).distinct()
+        ).filter(effective_date__range=(date_from_dt, date_to_dt)).values_list("client_file_id", flat=True).distinct()
     )
 
+    return {
+        # Count unique clients with activity in the period
+        "total_individuals_served": count_clients_by_program(
+            program,
+            date_from=date_from,
+            date_to=date_to,
+            active_only=True,
+        ),
+        # Count new clients enrolled in the period
+        "new_clients": get_new_clients_count(program, date_from, date_to),
+        # Count total progress notes (contacts) in the period
+        "total_contacts": count_notes_by_program(
+            program,
+            date_from=date_from,
+            date_to=date_to,
+        ),
+        "enrolled_client_ids": enrolled_client_ids,
+        "active_client_ids": active_client_ids,
+    }
+
+
+def _demographics_section(active_client_ids, date_to, report_template):
+    """Age buckets plus any custom-field breakdowns from the report template."""
+    # Birth dates and custom field values are resolved once and shared by
+    # the default age buckets and every template breakdown.
+    lookup = DemographicLookup(active_client_ids, date_to)
+
     # Age demographics
-    age_demographics = group_clients_by_age_buckets(active_client_ids, date_to)
+    age_demographics = group_clients_by_age_buckets(active_client_ids, date_to, lookup=lookup)
 
     # If a report template is provided, use its breakdowns instead of defaults
     custom_demographic_sections = []
@@ -278,29 +375,24 @@ def generate_funder_report_data(
         ).select_related("custom_field").order_by("sort_order")
 
         for bd in breakdowns:
+            spec = BreakdownSpec.from_template_breakdown(bd)
+            if spec is None:
+                continue
             if bd.source_type == "age":
                 # Override default age demographics with funder-specific bins
-                custom_bins = bd.bins_json or None
-                if custom_bins:
-                    age_groups = group_clients_by_age(
-                        active_client_ids, date_to, custom_bins=custom_bins,
-                    )
-                    # Convert from {label: [ids]} to {label: count}
+                if bd.bins_json:
+                    age_groups = lookup.group(spec)
+                    # Convert from {label: [ids]} to {label: count}, keeping
+                    # every bin label even if its count is 0
                     age_demographics = {
-                        label: len(ids) for label, ids in age_groups.items()
+                        label: len(age_groups.get(label, []))
+                        for label in spec.sort_labels(set(age_groups) | {b["label"] for b in bd.bins_json})
                     }
-                    # Ensure all bin labels present even if count is 0
-                    for b in custom_bins:
-                        if b["label"] not in age_demographics:
-                            age_demographics[b["label"]] = 0
-            elif bd.source_type == "custom_field" and bd.custom_field:
+            else:
                 # Additional demographic breakdown by custom field
-                cf_groups = group_clients_by_custom_field(
-                    active_client_ids, bd.custom_field,
-                    merge_categories=bd.merge_categories_json or None,
-                )
+                cf_groups = lookup.group(spec)
                 cf_counts = {
-                    label: len(ids) for label, ids in cf_groups.items()
+                    label: len(cf_groups[label]) for label in spec.sort_labels(cf_groups)
                 }
                 custom_demographic_sections.append({
                     "label": bd.label,
@@ -308,63 +400,9 @@ def generate_funder_report_data(
                     "total": sum(cf_counts.values()),
                 })
 
-    # Get achievement summary for all metrics with data
-    achievement_summary = get_achievement_summary(
-        program,
-        date_from=date_from,
-        date_to=date_to,
-        use_latest=True,
-    )
-
-    # Build primary outcome (first metric with a target, if any)
-    primary_outcome = None
-    secondary_outcomes = []
-
-    for metric_data in achievement_summary.get("by_metric", []):
-        if metric_data["has_target"]:
-            outcome_data = {
-                "name": metric_data["metric_name"],
-                "target_value": metric_data["target_value"],
-                "clients_measured": metric_data["total_clients"],
-                "clients_achieved": metric_data["clients_met_target"],
-                "achievement_rate": metric_data["achievement_rate"],
-            }
-            if primary_outcome is None:
-                primary_outcome = outcome_data
-            else:
-                secondary_outcomes.append(outcome_data)
-
     return {
-        # Report metadata
-        "generated_at": timezone.now(),
-        "reporting_period": fiscal_year_label,
-        "date_from": date_from,
-        "date_to": date_to,
-
-        # Organisation information
-        "organisation_name": organisation_name,
-        "program_name": program.name,
-        "program_description": program.description or "",
-
-        # Service statistics
-        "total_individuals_served": total_individuals_served,
-        "new_clients_this_period": new_clients,
-        "total_contacts": total_contacts,
-
-        # Demographics
         "age_demographics": age_demographics,
-        "age_demographics_total": sum(age_demographics.values()),
         "custom_demographic_sections": custom_demographic_sections,
-        "report_template_name": report_template.name if report_template else None,
-
-        # Outcomes
-        "primary_outcome": primary_outcome,
-        "secondary_outcomes": secondary_outcomes,
-        "achievement_summary": achievement_summary,
-
-        # Raw data for detailed views
-        "active_client_count": len(active_client_ids),
-        "enrolled_client_count": len(enrolled_client_ids),
     }
 
 
@@ -0,0 +1,145 @@
+"""Monthly rollup of program-level Outcome Insights counts.
+
+get_structured_insights() used to run its grouped aggregations over a
+program's whole note history on every page load. The plaintext counts it
+needs (notes, participants, engagement, descriptors, suggestions) are now
+kept per (program, month) in InsightMonth rows, so any date range is a sum
+over whole-month rows plus a live count of the partial months at each end.
+
+Saving or cancelling a note, editing a target entry or changing an
+enrolment deletes the affected rows (see signals.py), and the next read
+rebuilds just those months. Rows older than ROLLUP_MAX_AGE are rebuilt too,
+which bounds staleness from writes that skip signals (bulk_create,
+queryset.update()).
+"""
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+ROLLUP_MAX_AGE = timedelta(hours=24)
+
+COUNT_FIELDS = (
+    "note_count",
+    "participant_ids",
+    "engagement_counts",
+    "descriptor_counts",
+    "suggestion_counts",
+)
+
+
+def month_of(value):
+    """First day of the local month containing a date or aware datetime."""
+    if isinstance(value, datetime):
+        value = timezone.localtime(value).date()
+    return value.replace(day=1)
+
+
+def _next_month(month):
+    return (month + timedelta(days=32)).replace(day=1)
+
+
+def _in_range(notes_qs, date_from, date_to):
+    return notes_qs.filter(effective_date__range=(
+        timezone.make_aware(datetime.combine(date_from, time.min)),
+        timezone.make_aware(datetime.combine(date_to, time.max)),
+    ))
+
+
+def program_notes(program):
+    """Active notes that count toward a program's insights."""
+    from apps.notes.models import ProgressNote
+
+    return ProgressNote.objects.filter(
+        status="default",
+        client_file__enrolments__program=program,
+        client_file__enrolments__status="enrolled",
+    )
+
+
+def _grouped(qs, field):
+    rows = qs.exclude(**{field: ""}).values(field).annotate(count=Count("id")).order_by()
+    return {row[field]: row["count"] for row in rows}
+
+
+def count_notes(notes_qs):
+    """Plaintext counts for a set of notes, as a dict of COUNT_FIELDS."""
+    from apps.notes.models import ProgressNoteTarget
+
+    targets_qs = ProgressNoteTarget.objects.filter(progress_note__in=notes_qs)
+    return {
+        "note_count": notes_qs.count(),
+        "participant_ids": sorted(
+            notes_qs.order_by().values_list("client_file_id", flat=True).distinct()
+        ),
+        "engagement_counts": _grouped(notes_qs, "engagement_observation"),
+        "descriptor_counts": _grouped(targets_qs, "progress_descriptor"),
+        "suggestion_counts": _grouped(notes_qs, "suggestion_priority"),
+    }
+
+
+def _rebuild(program, month):
+    from .models import InsightMonth
+
+    last_day = _next_month(month) - timedelta(days=1)
+    counts = count_notes(_in_range(program_notes(program), month, last_day))
+    InsightMonth.objects.update_or_create(program=program, month=month, defaults=counts)
+    return counts
+
+
+def monthly_counts(program, date_from, date_to):
+    """Return [(month, counts)] for a program over a date range, oldest first.
+
+    Whole months come from InsightMonth, rebuilding any that are missing or
+    stale; the partial months at either end are counted live.
+    """
+    from .models import InsightMonth
+
+    months = []
+    month = month_of(date_from)
+    while month <= date_to:
+        months.append(month)
+        month = _next_month(month)
+
+    whole = [m for m in months if m >= date_from and _next_month(m) - timedelta(days=1) <= date_to]
+    stored = {
+        row.month: {field: getattr(row, field) for field in COUNT_FIELDS}
+        for row in InsightMonth.objects.filter(
+            program=program,
+            month__in=whole,
+            computed_at__gte=timezone.now() - ROLLUP_MAX_AGE,
+        )
+    }
+
+    result = []
+    for month in months:
+        if month in whole:
+            counts = stored.get(month) or _rebuild(program, month)
+        else:
+            last_day = _next_month(month) - timedelta(days=1)
+            counts = count_notes(_in_range(
+                program_notes(program), max(month, date_from), min(last_day, date_to),
+            ))
+        result.append((month, counts))
+    return result
+
+
+def invalidate(program_ids, months):
+    """Drop the rollup rows for these programs and months.
+
+    Runs immediately, so later reads in the same transaction see the change,
+    and again on commit in case another request rebuilt a row from the
+    pre-commit data in the meantime.
+    """
+    from .models import InsightMonth
+
+    program_ids, months = list(program_ids), list(months)
+    if not program_ids or not months:
+        return
+
+    def drop():
+        InsightMonth.objects.filter(program_id__in=program_ids, month__in=months).delete()
+
+    drop()
+    transaction.on_commit(drop)
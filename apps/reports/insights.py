@@ -6,7 +6,10 @@ Two separate functions split by the encryption boundary:
                                 No decryption, no ceiling, milliseconds.
 
   collect_quotes()           — Decrypts text fields for quote surfacing.
-                                Capped at max_quotes, privacy-gated.
+                                Capped at max_quotes, privacy-gated. Picks
+                                candidates from plaintext word-count buckets
+                                and text hashes, so only returned quotes
+                                are decrypted.
 
 This split exists because all text fields are Fernet-encrypted and cannot
 be queried in SQL. Descriptor and engagement fields are plaintext, so we
@@ -14,14 +17,24 @@ aggregate those in the database for speed and unlimited scale.
 """
 import logging
 from collections import Counter, defaultdict
-from datetime import date
+from datetime import date, datetime, time
 
 from django.conf import settings
-from django.db.models import Count, DateTimeField, Q
-from django.db.models.functions import Coalesce, TruncMonth
+from django.db.models import Count, Q
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
 
 from apps.clients.models import ClientProgramEnrolment
 from apps.notes.models import ProgressNote, ProgressNoteTarget
+from apps.notes.quote_index import (
+    QUOTE_MIN_WORDS,
+    SUGGESTION_MIN_WORDS,
+    WORDS_LONG,
+    WORDS_MEDIUM,
+    text_hash,
+)
+
+from . import insight_rollup
 
 logger = logging.getLogger(__name__)
 
@@ -30,10 +43,19 @@ logger = logging.getLogger(__name__)
 MIN_PARTICIPANTS_FOR_QUOTES = 15
 
 
+def _start_of(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def _end_of(day):
+    return timezone.make_aware(datetime.combine(day, time.max))
+
+
 def get_structured_insights(program=None, client_file=None, date_from=None, date_to=None):
     """Aggregate descriptor and engagement data from plaintext fields via SQL.
 
-    No decryption is performed. No ceiling on note volume.
+    No decryption is performed. No ceiling on note volume. Program-level
+    date ranges are summed from the monthly rollup in insight_rollup.py.
 
     Args:
         program: Program instance (for program-level insights).
@@ -51,124 +73,71 @@ def get_structured_insights(program=None, client_file=None, date_from=None, date
           descriptor_trend: list of {month, harder, holding, shifting, good_place}
                            (all as percentages)
     """
-    # Build base note queryset — use effective date (backdate if set, else created_at)
-    # so backdated notes appear at their session date, not their entry date.
-    notes_qs = ProgressNote.objects.filter(status="default").annotate(
-        _effective_date=Coalesce("backdate", "created_at", output_field=DateTimeField()),
-    )
-    if client_file:
-        notes_qs = notes_qs.filter(client_file=client_file)
-    if program:
-        notes_qs = notes_qs.filter(
-            client_file__enrolments__program=program,
-            client_file__enrolments__status="enrolled",
-        )
-    if date_from:
-        notes_qs = notes_qs.filter(_effective_date__date__gte=date_from)
-    if date_to:
-        notes_qs = notes_qs.filter(_effective_date__date__lte=date_to)
-
-    # Basic counts
-    note_count = notes_qs.count()
-    participant_count = notes_qs.values("client_file_id").distinct().count()
-
-    # Distinct months
-    month_dates = (
-        notes_qs.annotate(month=TruncMonth("_effective_date"))
-        .values("month")
-        .distinct()
-    )
-    month_count = month_dates.count()
+    if program and not client_file and date_from and date_to:
+        # Program-level: sum the monthly rollup (see insight_rollup.py)
+        months = insight_rollup.monthly_counts(program, date_from, date_to)
+    else:
+        months = _live_monthly_counts(program, client_file, date_from, date_to)
+
+    note_count = sum(counts["note_count"] for _, counts in months)
+    participant_ids = set()
+    for _, counts in months:
+        participant_ids.update(counts["participant_ids"])
+    month_count = sum(1 for _, counts in months if counts["note_count"])
 
     # ── Engagement distribution (from ProgressNote.engagement_observation) ──
-    engagement_counts = (
-        notes_qs.exclude(engagement_observation="")
-        .values("engagement_observation")
-        .annotate(count=Count("id"))
-    )
-    engagement_total = sum(row["count"] for row in engagement_counts)
+    engagement_counts = _sum_counts(months, "engagement_counts")
+    engagement_total = sum(engagement_counts.values())
     engagement_labels = dict(ProgressNote.ENGAGEMENT_CHOICES)
     engagement_distribution = {}
-    for row in engagement_counts:
-        label = engagement_labels.get(row["engagement_observation"], row["engagement_observation"])
+    for value, count in sorted(engagement_counts.items()):
+        label = engagement_labels.get(value, value)
         if label == "---------":
             continue
-        pct = round(row["count"] / engagement_total * 100, 1) if engagement_total else 0
+        pct = round(count / engagement_total * 100, 1) if engagement_total else 0
         engagement_distribution[label] = pct
 
     # ── Descriptor distribution (from ProgressNoteTarget.progress_descriptor) ──
-    targets_qs = ProgressNoteTarget.objects.filter(
-        progress_note__in=notes_qs,
-    )
-    descriptor_counts = (
-        targets_qs.exclude(progress_descriptor="")
-        .values("progress_descriptor")
-        .annotate(count=Count("id"))
-    )
-    descriptor_total = sum(row["count"] for row in descriptor_counts)
+    descriptor_counts = _sum_counts(months, "descriptor_counts")
+    descriptor_total = sum(descriptor_counts.values())
     descriptor_labels = dict(ProgressNoteTarget.PROGRESS_DESCRIPTOR_CHOICES)
     descriptor_distribution = {}
-    for row in descriptor_counts:
-        label = descriptor_labels.get(row["progress_descriptor"], row["progress_descriptor"])
+    for value, count in sorted(descriptor_counts.items()):
+        label = descriptor_labels.get(value, value)
         if label == "---------":
             continue
-        pct = round(row["count"] / descriptor_total * 100, 1) if descriptor_total else 0
+        pct = round(count / descriptor_total * 100, 1) if descriptor_total else 0
         descriptor_distribution[label] = pct
 
     # ── Suggestion counts (from ProgressNote.suggestion_priority — plaintext) ──
-    suggestion_counts = (
-        notes_qs.exclude(suggestion_priority="")
-        .values("suggestion_priority")
-        .annotate(count=Count("id"))
-    )
     suggestion_labels = dict(ProgressNote.SUGGESTION_PRIORITY_CHOICES)
     suggestion_distribution = {}
     suggestion_total = 0
-    for row in suggestion_counts:
-        if not row["suggestion_priority"]:
+    for value, count in sorted(_sum_counts(months, "suggestion_counts").items()):
+        if not value:
             continue
-        label = suggestion_labels.get(row["suggestion_priority"], row["suggestion_priority"])
-        suggestion_distribution[label] = row["count"]
-        suggestion_total += row["count"]
+        label = suggestion_labels.get(value, value)
+        suggestion_distribution[label] = count
+        suggestion_total += count
 
     # ── Descriptor trend by month (percentages) ──
-    descriptor_by_month = (
-        targets_qs.exclude(progress_descriptor="")
-        .annotate(
-            _effective_date=Coalesce(
-                "progress_note__backdate", "progress_note__created_at",
-                output_field=DateTimeField(),
-            ),
-        )
-        .annotate(month=TruncMonth("_effective_date"))
-        .values("month", "progress_descriptor")
-        .annotate(count=Count("id"))
-        .order_by("month")
-    )
-
-    # Build monthly data
-    monthly_totals = defaultdict(int)
-    monthly_descriptors = defaultdict(lambda: defaultdict(int))
-    for row in descriptor_by_month:
-        month_str = row["month"].strftime("%Y-%m")
-        monthly_totals[month_str] += row["count"]
-        monthly_descriptors[month_str][row["progress_descriptor"]] += row["count"]
-
     descriptor_trend = []
-    for month_str in sorted(monthly_totals.keys()):
-        total = monthly_totals[month_str]
-        counts = monthly_descriptors[month_str]
+    for month, counts in months:
+        descriptors = counts["descriptor_counts"]
+        total = sum(descriptors.values())
+        if not total:
+            continue
         descriptor_trend.append({
-            "month": month_str,
-            "harder": round(counts.get("harder", 0) / total * 100, 1) if total else 0,
-            "holding": round(counts.get("holding", 0) / total * 100, 1) if total else 0,
-            "shifting": round(counts.get("shifting", 0) / total * 100, 1) if total else 0,
-            "good_place": round(counts.get("good_place", 0) / total * 100, 1) if total else 0,
+            "month": month.strftime("%Y-%m"),
+            "harder": round(descriptors.get("harder", 0) / total * 100, 1),
+            "holding": round(descriptors.get("holding", 0) / total * 100, 1),
+            "shifting": round(descriptors.get("shifting", 0) / total * 100, 1),
+            "good_place": round(descriptors.get("good_place", 0) / total * 100, 1),
         })
 
     return {
         "note_count": note_count,
-        "participant_count": participant_count,
+        "participant_count": len(participant_ids),
         "month_count": month_count,
         "descriptor_distribution": descriptor_distribution,
         "engagement_distribution": engagement_distribution,
@@ -178,6 +147,64 @@ def get_structured_insights(program=None, client_file=None, date_from=None, date
     }
 
 
+def _sum_counts(months, field):
+    total = Counter()
+    for _, counts in months:
+        total.update(counts[field])
+    return dict(total)
+
+
+def _live_monthly_counts(program, client_file, date_from, date_to):
+    """Per-month counts straight from the notes, in insight_rollup's layout.
+
+    Used for client-level insights and open-ended ranges, which are small
+    or rare enough not to need the rollup.
+    """
+    # Use effective date (backdate if set, else created_at) so backdated
+    # notes appear at their session date, not their entry date.
+    notes_qs = ProgressNote.objects.filter(status="default")
+    if client_file:
+        notes_qs = notes_qs.filter(client_file=client_file)
+    if program:
+        notes_qs = notes_qs.filter(
+            client_file__enrolments__program=program,
+            client_file__enrolments__status="enrolled",
+        )
+    if date_from:
+        notes_qs = notes_qs.filter(effective_date__gte=_start_of(date_from))
+    if date_to:
+        notes_qs = notes_qs.filter(effective_date__lte=_end_of(date_to))
+    notes_qs = notes_qs.annotate(month=TruncMonth("effective_date")).order_by()
+    targets_qs = ProgressNoteTarget.objects.filter(progress_note__in=notes_qs).annotate(
+        month=TruncMonth("progress_note__effective_date"),
+    ).order_by()
+
+    months = defaultdict(lambda: {
+        "note_count": 0,
+        "participant_ids": [],
+        "engagement_counts": {},
+        "descriptor_counts": {},
+        "suggestion_counts": {},
+    })
+    for row in notes_qs.values("month").annotate(count=Count("id")):
+        months[row["month"]]["note_count"] = row["count"]
+    for row in notes_qs.values("month", "client_file_id").distinct():
+        months[row["month"]]["participant_ids"].append(row["client_file_id"])
+    for field, qs, source in (
+        ("engagement_counts", notes_qs, "engagement_observation"),
+        ("suggestion_counts", notes_qs, "suggestion_priority"),
+        ("descriptor_counts", targets_qs, "progress_descriptor"),
+    ):
+        rows = qs.exclude(**{source: ""}).values("month", source).annotate(count=Count("id"))
+        for row in rows:
+            months[row["month"]][field][row[source]] = row["count"]
+
+    return [
+        (insight_rollup.month_of(month), counts)
+        for month, counts in sorted(months.items())
+    ]
+
+
 def collect_quotes(program=None, client_file=None, date_from=None, date_to=None,
                    max_quotes=50, include_dates=True):
     """Decrypt text fields and surface notable quotes.
@@ -216,12 +243,7 @@ def collect_quotes(program=None, client_file=None, date_from=None, date_to=None,
     # Build queryset for ProgressNoteTarget entries — use effective date
     targets_qs = ProgressNoteTarget.objects.filter(
         progress_note__status="default",
-    ).select_related("progress_note", "plan_target").annotate(
-        _effective_date=Coalesce(
-            "progress_note__backdate", "progress_note__created_at",
-            output_field=DateTimeField(),
-        ),
-    )
+    ).select_related("progress_note", "plan_target")
 
     if client_file:
         targets_qs = targets_qs.filter(progress_note__client_file=client_file)
@@ -231,40 +253,31 @@ def collect_quotes(program=None, client_file=None, date_from=None, date_to=None,
             progress_note__client_file__enrolments__status="enrolled",
         )
     if date_from:
-        targets_qs = targets_qs.filter(_effective_date__date__gte=date_from)
+        targets_qs = targets_qs.filter(progress_note__effective_date__gte=_start_of(date_from))
     if date_to:
-        targets_qs = targets_qs.filter(_effective_date__date__lte=date_to)
+        targets_qs = targets_qs.filter(progress_note__effective_date__lte=_end_of(date_to))
 
     # Order by most recent first
-    targets_qs = targets_qs.order_by("-_effective_date")
+    targets_qs = targets_qs.order_by("-progress_note__effective_date", "-pk")
 
-    # Collect quotes from client_words field
+    # Pick candidates from the plaintext word buckets and text hashes, then
+    # decrypt only those (see apps/notes/quote_index.py).
     quotes = []
-    seen_texts = set()
-
-    # Cap the number of records we load for decryption
-    max_records = max_quotes * 5  # Load extra to account for filtering
-    for entry in targets_qs[:max_records]:
-        if len(quotes) >= max_quotes:
-            break
-
-        # Decrypt client_words
-        text = entry.client_words
-        if not text:
+    seen_hashes = set()
+    max_records = max_quotes * 5  # Cap on candidate rows scanned
+
+    rows = targets_qs.filter(
+        _candidate_filter("client_words", "_client_words_encrypted", WORDS_LONG),
+    ).values_list("pk", "client_words_bucket", "client_words_hash")[:max_records]
+    entry_ids = _pick_candidates(rows, WORDS_LONG, seen_hashes, max_quotes)
+    entries = targets_qs.in_bulk(entry_ids)
+    for pk in entry_ids:
+        entry = entries.get(pk)
+        if entry is None:
             continue
-
-        text = text.strip()
-
-        # Filter: minimum 10 words for meaningful quotes
-        word_count = len(text.split())
-        if word_count < 10:
-            continue
-
-        # De-duplicate by normalised text
-        normalised = text.lower().strip()
-        if normalised in seen_texts:
+        text = (entry.client_words or "").strip()
+        if entry.client_words_bucket is None and not _unseen(text, QUOTE_MIN_WORDS, seen_hashes):
             continue
-        seen_texts.add(normalised)
 
         # Get target/goal name for context
         target_name = ""
@@ -285,9 +298,7 @@ def collect_quotes(program=None, client_file=None, date_from=None, date_to=None,
 
     # Also collect from participant_reflection and participant_suggestion on ProgressNote
     if len(quotes) < max_quotes:
-        notes_qs = ProgressNote.objects.filter(status="default").annotate(
-            _effective_date=Coalesce("backdate", "created_at", output_field=DateTimeField()),
-        )
+        notes_qs = ProgressNote.objects.filter(status="default")
         if client_file:
             notes_qs = notes_qs.filter(client_file=client_file)
         if program:
@@ -296,54 +307,103 @@ def collect_quotes(program=None, client_file=None, date_from=None, date_to=None,
                 client_file__enrolments__status="enrolled",
             )
         if date_from:
-            notes_qs = notes_qs.filter(_effective_date__date__gte=date_from)
+            notes_qs = notes_qs.filter(effective_date__gte=_start_of(date_from))
         if date_to:
-            notes_qs = notes_qs.filter(_effective_date__date__lte=date_to)
+            notes_qs = notes_qs.filter(effective_date__lte=_end_of(date_to))
+
+        notes_qs = notes_qs.order_by("-effective_date", "-pk")
+
+        # Per note: the reflection first, then the suggestion
+        rows = notes_qs.filter(
+            _candidate_filter("reflection", "_participant_reflection_encrypted", WORDS_LONG)
+            | _candidate_filter("suggestion", "_participant_suggestion_encrypted", WORDS_MEDIUM),
+        ).values_list(
+            "pk", "reflection_bucket", "reflection_hash", "suggestion_bucket", "suggestion_hash",
+        )[:max_records]
+        wanted = []  # (note pk, "reflection" | "suggestion")
+        for pk, r_bucket, r_hash, s_bucket, s_hash in rows:
+            if len(wanted) >= max_quotes - len(quotes):
+                break
+            if _claim(r_bucket, r_hash, WORDS_LONG, seen_hashes):
+                wanted.append((pk, "reflection"))
+            if len(wanted) >= max_quotes - len(quotes):
+                break
+            if _claim(s_bucket, s_hash, WORDS_MEDIUM, seen_hashes):
+                wanted.append((pk, "suggestion"))
+
+        notes = notes_qs.in_bulk({pk for pk, _ in wanted})
+        for pk, source in wanted:
+            note = notes.get(pk)
+            if note is None:
+                continue
+
+            if source == "reflection":
+                text = (note.participant_reflection or "").strip()
+                if note.reflection_bucket is None and not _unseen(text, QUOTE_MIN_WORDS, seen_hashes):
+                    continue
+                quote = {
+                    "text": text,
+                    "target_name": "",
+                    "note_id": note.pk,
+                }
+            else:
+                # Tagged as suggestion for the AI
+                suggestion = (note.participant_suggestion or "").strip()
+                if note.suggestion_bucket is None and not _unseen(
+                    suggestion, SUGGESTION_MIN_WORDS, seen_hashes,
+                ):
+                    continue
+                priority = note.suggestion_priority if note.suggestion_priority else ""
+                quote = {
+                    "text": suggestion,
+                    "target_name": "",
+                    "source": "suggestion",
+                    "priority": priority,
+                    "note_id": note.pk,
+                }
+            if include_dates:
+                quote["date"] = note.effective_date
+            quotes.append(quote)
 
-        notes_qs = notes_qs.order_by("-_effective_date")
+    return quotes
 
-        for note in notes_qs[:max_records]:
-            if len(quotes) >= max_quotes:
-                break
 
-            # Collect participant_reflection
-            text = note.participant_reflection
-            if text:
-                text = text.strip()
-                word_count = len(text.split())
-                normalised = text.lower().strip()
-                if word_count >= 10 and normalised not in seen_texts:
-                    seen_texts.add(normalised)
-                    quote = {
-                        "text": text,
-                        "target_name": "",
-                        "note_id": note.pk,
-                    }
-                    if include_dates:
-                        quote["date"] = note.effective_date
-                    quotes.append(quote)
-
-            if len(quotes) >= max_quotes:
-                break
+def _candidate_filter(prefix, encrypted_field, min_bucket):
+    """Rows whose text is long enough, or not classified yet and non-empty."""
+    return Q(**{f"{prefix}_bucket__gte": min_bucket}) | (
+        Q(**{f"{prefix}_bucket__isnull": True}) & ~Q(**{encrypted_field: b""})
+    )
 
-            # Collect participant_suggestion (tagged as suggestion for the AI)
-            suggestion = note.participant_suggestion
-            if suggestion:
-                suggestion = suggestion.strip()
-                word_count = len(suggestion.split())
-                normalised = suggestion.lower().strip()
-                if word_count >= 5 and normalised not in seen_texts:
-                    seen_texts.add(normalised)
-                    priority = note.suggestion_priority if note.suggestion_priority else ""
-                    quote = {
-                        "text": suggestion,
-                        "target_name": "",
-                        "source": "suggestion",
-                        "priority": priority,
-                        "note_id": note.pk,
-                    }
-                    if include_dates:
-                        quote["date"] = note.effective_date
-                    quotes.append(quote)
 
-    return quotes
+def _claim(bucket, digest, min_bucket, seen_hashes):
+    """Whether a text is a candidate, judged from its bucket and hash alone.
+
+    Claims the hash in seen_hashes. Unclassified texts (bucket None) are
+    candidates too; the caller checks them with _unseen() after decrypting.
+    """
+    if bucket is None:
+        return True
+    if bucket < min_bucket or digest in seen_hashes:
+        return False
+    seen_hashes.add(digest)
+    return True
+
+
+def _pick_candidates(rows, min_bucket, seen_hashes, limit):
+    """Up to `limit` IDs from (pk, bucket, hash) rows that _claim() accepts."""
+    picked = []
+    for pk, bucket, digest in rows:
+        if len(picked) >= limit:
+            break
+        if _claim(bucket, digest, min_bucket, seen_hashes):
+            picked.append(pk)
+    return picked
+
+
+def _unseen(text, min_words, seen_hashes):
+    """Check a decrypted, unclassified text: long enough and not seen yet."""
+    digest = text_hash(text)
+    if len(text.split()) < min_words or digest in seen_hashes:
+        return False
+    seen_hashes.add(digest)
+    return True
@@ -11,6 +11,7 @@ Usage:
 from django.core.management.base import BaseCommand
 
 from apps.reports.models import DemographicBreakdown, ReportTemplate
+from konote.seeding import SeedSpec, seed
 
 
 DEFAULT_PROFILE_NAME = "Standard Canadian Nonprofit"
@@ -28,18 +29,17 @@ class Command(BaseCommand):
     help = "Create a default report template with standard Canadian nonprofit age categories."
 
     def handle(self, *args, **options):
-        profile, created = ReportTemplate.objects.get_or_create(
-            name=DEFAULT_PROFILE_NAME,
-            defaults={
-                "description": (
-                    "Default age group categories commonly used in Canadian "
-                    "nonprofit funder reports. Adjust bins or create additional "
-                    "templates for funders with different requirements."
-                ),
-            },
-        )
-
-        if not created:
+        result = seed(SeedSpec(ReportTemplate, key=("name",), rows=[{
+            "name": DEFAULT_PROFILE_NAME,
+            "description": (
+                "Default age group categories commonly used in Canadian "
+                "nonprofit funder reports. Adjust bins or create additional "
+                "templates for funders with different requirements."
+            ),
+        }]))
+        profile = result.objects[(DEFAULT_PROFILE_NAME,)]
+
+        if not result.created:
             self.stdout.write(
                 self.style.WARNING(
                     f"Profile '{DEFAULT_PROFILE_NAME}' already exists (pk={profile.pk}). Skipping."
@@ -0,0 +1,34 @@
+# Generated by Django 5.1.15 on 2026-10-18 21:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('programs', '0008_funder_profiles'),
+        ('reports', '0007_alter_reporttemplate_name'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InsightMonth',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='First day of the month.')),
+                ('note_count', models.PositiveIntegerField(default=0)),
+                ('participant_ids', models.JSONField(default=list, help_text='Distinct client file IDs with notes this month. Kept as IDs, not a count, so participants can be de-duplicated across months.')),
+                ('engagement_counts', models.JSONField(default=dict)),
+                ('descriptor_counts', models.JSONField(default=dict)),
+                ('suggestion_counts', models.JSONField(default=dict)),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+                ('program', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='insight_months', to='programs.program')),
+            ],
+            options={
+                'db_table': 'insight_months',
+                'ordering': ['program', 'month'],
+                'constraints': [models.UniqueConstraint(fields=('program', 'month'), name='unique_insight_month')],
+            },
+        ),
+    ]
@@ -287,3 +287,55 @@ class InsightSummary(models.Model):
 
     def __str__(self):
         return f"Insight {self.cache_key} ({self.generated_at:%Y-%m-%d})"
+
+
+class InsightMonth(models.Model):
+    """One program's plaintext Outcome Insights counts for one month.
+
+    A rollup of active notes (by the client's current enrolment), keyed by
+    the first day of the local month. Rows are deleted when their data
+    changes and rebuilt on the next read — see apps/reports/insight_rollup.py.
+    """
+
+    program = models.ForeignKey(
+        "programs.Program", on_delete=models.CASCADE, related_name="insight_months",
+    )
+    month = models.DateField(help_text="First day of the month.")
+    note_count = models.PositiveIntegerField(default=0)
+    participant_ids = models.JSONField(
+        default=list,
+        help_text="Distinct client file IDs with notes this month. Kept as IDs, "
+                  "not a count, so participants can be de-duplicated across months.",
+    )
+    engagement_counts = models.JSONField(default=dict)
+    descriptor_counts = models.JSONField(default=dict)
+    suggestion_counts = models.JSONField(default=dict)
+    computed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "insight_months"
+        ordering = ["program", "month"]
+        constraints = [
+            models.UniqueConstraint(fields=["program", "month"], name="unique_insight_month"),
+        ]
+
+    def __str__(self):
+        return f"Insights {self.program_id} {self.month:%Y-%m}"
+
+
+class ReportDataVersion(models.Model):
+    """Version stamp for one data domain of the funder report section cache.
+
+    Kept in the database so every worker process sees a bump as soon as
+    it commits — see apps/reports/report_cache.py.
+    """
+
+    domain = models.CharField(max_length=30, unique=True)
+    version = models.CharField(max_length=32)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "report_data_versions"
+
+    def __str__(self):
+        return f"{self.domain}: {self.version[:12]}"
@@ -8,9 +8,12 @@ sending them to an external AI service.
 Two-pass approach:
   1. Regex patterns for structured PII (phones, emails, postal codes, SINs, addresses)
      — run FIRST so names embedded in emails aren't corrupted
-  2. Known names (client + staff) replaced with [NAME] using word-boundary matching
+  2. Known names (client + staff) replaced with [NAME] using word-boundary matching,
+     all names compiled into one pattern (NameScrubber)
 """
+import hashlib
 import re
+from functools import lru_cache
 
 
 # ── Regex patterns for Canadian PII ──────────────────────────────────────────
@@ -45,6 +48,75 @@ _ADDRESS_RE = re.compile(
 )
 
 
+# Longer "names" are data-entry noise; skipping them keeps the trie shallow.
+MAX_NAME_LENGTH = 200
+
+
+def _scrub_structured(text):
+    # Run FIRST so names embedded in emails like john@example.com aren't corrupted
+    result = _EMAIL_RE.sub("[EMAIL]", text)
+    result = _POSTAL_RE.sub("[POSTAL CODE]", result)
+    result = _SIN_RE.sub("[SIN]", result)
+    result = _ADDRESS_RE.sub("[ADDRESS]", result)
+    return _PHONE_RE.sub("[PHONE]", result)
+
+
+def _trie_pattern(node):
+    """Regex for a trie of names; longer continuations are tried first."""
+    ends_here = "" in node
+    branches = [
+        re.escape(char) + _trie_pattern(child)
+        for char, child in sorted(node.items())
+        if char
+    ]
+    if not branches:
+        return ""
+    if len(branches) == 1 and not ends_here:
+        return branches[0]
+    group = "(?:" + "|".join(branches) + ")"
+    # Greedy "?" tries the longer names before stopping here
+    return group + "?" if ends_here else group
+
+
+@lru_cache(maxsize=32)
+def _compile_names(names):
+    trie = {}
+    for name in names:
+        node = trie
+        for char in name:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    # Word-boundary match including possessives: "Hope" and "Hope's"
+    return re.compile(r"\b" + _trie_pattern(trie) + r"(?:'s)?\b", re.IGNORECASE)
+
+
+class NameScrubber:
+    """Scrubs structured PII and a fixed set of known names from any number of texts.
+
+    The names are compiled once into a single regex built from a trie of
+    the lower-cased names, so each text is scanned once and the engine
+    only follows name prefixes that actually occur, instead of running one
+    pattern per name. Longer names win, as with a longest-first loop, and
+    names under 2 characters (or over MAX_NAME_LENGTH) are ignored.
+    """
+
+    def __init__(self, known_names=None):
+        names = frozenset(
+            n.lower() for n in (known_names or ())
+            if n and 2 <= len(n) <= MAX_NAME_LENGTH
+        )
+        self._name_re = _compile_names(names) if names else None
+
+    def scrub(self, text):
+        """Return the text with PII replaced by placeholders."""
+        if not text:
+            return text
+        result = _scrub_structured(text)
+        if self._name_re:
+            result = self._name_re.sub("[NAME]", result)
+        return result
+
+
 def scrub_pii(text, known_names=None):
     """Remove PII from text before sending to an external AI service.
 
@@ -56,33 +128,70 @@ def scrub_pii(text, known_names=None):
 
     Returns:
         The scrubbed text with PII replaced by placeholders.
+
+    To scrub many texts with the same names, use NameScrubber (or
+    program_scrubber()) so the names are compiled once.
     """
-    if not text:
-        return text
+    return NameScrubber(known_names).scrub(text)
 
-    result = text
 
-    # Pass 1: Structured PII with specific patterns (run FIRST so names
-    # embedded in emails like john@example.com aren't corrupted)
-    result = _EMAIL_RE.sub("[EMAIL]", result)
-    result = _POSTAL_RE.sub("[POSTAL CODE]", result)
-    result = _SIN_RE.sub("[SIN]", result)
-    result = _ADDRESS_RE.sub("[ADDRESS]", result)
-    result = _PHONE_RE.sub("[PHONE]", result)
-
-    # Pass 2: Replace known names (longest first to avoid partial matches)
-    if known_names:
-        sorted_names = sorted(
-            (n for n in known_names if n and len(n) >= 2),
-            key=len,
-            reverse=True,
-        )
-        for name in sorted_names:
-            # Word-boundary match including possessives: "Hope" and "Hope's"
-            pattern = re.compile(
-                r"\b" + re.escape(name) + r"(?:'s)?\b",
-                re.IGNORECASE,
-            )
-            result = pattern.sub("[NAME]", result)
-
-    return result
+# ── Known names per program ──────────────────────────────────────────────────
+
+def program_known_names(program_id):
+    """Names of clients enrolled in a program and of all active staff."""
+    from apps.auth_app.models import User
+    from apps.clients.models import ClientFile, ClientProgramEnrolment
+
+    client_ids = (
+        ClientProgramEnrolment.objects.filter(program_id=program_id, status="enrolled")
+        .values_list("client_file_id", flat=True)
+    )
+    known_names = set()
+    for client in ClientFile.objects.filter(pk__in=client_ids):
+        for name in [client.first_name, client.last_name, client.preferred_name]:
+            if name and len(name) >= 2:
+                known_names.add(name)
+
+    for user in User.objects.filter(is_active=True):
+        display = getattr(user, "display_name", "")
+        if display and len(display) >= 2:
+            known_names.add(display)
+    return known_names
+
+
+def known_names_stamp(program_id):
+    """Fingerprint of the rows program_known_names() reads, taken from the database.
+
+    Covers which clients are enrolled, the latest client and staff updated_at,
+    and the number of active staff, so any worker process sees an
+    enrolment, rename, new account or deactivation on its next request.
+    """
+    from django.db.models import Count, Max
+
+    from apps.auth_app.models import User
+    from apps.clients.models import ClientFile, ClientProgramEnrolment
+
+    client_ids = sorted(
+        ClientProgramEnrolment.objects.filter(program_id=program_id, status="enrolled")
+        .values_list("client_file_id", flat=True)
+    )
+    clients = ClientFile.objects.filter(pk__in=client_ids).aggregate(latest=Max("updated_at"))
+    staff = User.objects.filter(is_active=True).aggregate(count=Count("pk"), latest=Max("updated_at"))
+    stamp = (client_ids, clients["latest"], staff["count"], staff["latest"])
+    return hashlib.sha256(repr(stamp).encode()).hexdigest()
+
+
+@lru_cache(maxsize=16)
+def _program_scrubber(program_id, stamp):
+    return NameScrubber(program_known_names(program_id))
+
+
+def program_scrubber(program):
+    """NameScrubber for a program's clients and staff, reused until their data changes.
+
+    Built once per process and known_names_stamp(), so the names are
+    decrypted and compiled once rather than on every insights request. The
+    stamp comes from the database rather than a cache, so a change made
+    through another worker can never leave a new name unscrubbed.
+    """
+    return _program_scrubber(program.pk, known_names_stamp(program.pk))
@@ -0,0 +1,68 @@
+"""Section cache for funder reports, keyed by data version.
+
+Managers regenerate the same fiscal year repeatedly, and each run decrypts
+every birth date and rebuilds the achievement summary. Each report section
+is cached under its inputs (program, date range, template, user scope) plus
+the version stamps of the data it reads:
+
+    service       notes, enrolments, clients
+    demographics  notes, enrolments, clients, templates
+    outcomes      notes, enrolments, outcomes
+
+Signals (apps/reports/signals.py) bump a domain's stamp whenever a row in
+it changes, so a new note recomputes every section but a renamed
+participant leaves the outcome section cached. Code that writes with
+bulk_create/bulk_update, which skips signals, bumps the stamp itself.
+
+Sections are cached per process, but the stamps live in the database
+(ReportDataVersion), so a write in one worker invalidates every worker.
+Bumps run once the writing transaction commits: bumping earlier would let
+a concurrent report cache pre-commit data under the new stamp.
+"""
+import hashlib
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+
+# Invalidation is signal-driven, so the TTL only bounds staleness if a
+# change slips past the signals (e.g. a raw SQL update).
+REPORT_CACHE_SECONDS = 60 * 60 * 6
+
+DOMAINS = ("notes", "enrolments", "clients", "outcomes", "templates")
+
+_MISSING = object()
+
+
+def data_version(domains):
+    """Combined version stamp for the given data domains."""
+    from .models import ReportDataVersion
+
+    versions = dict(
+        ReportDataVersion.objects.filter(domain__in=domains).values_list("domain", "version")
+    )
+    return "-".join(versions.get(domain, "0") for domain in domains)
+
+
+def bump_data_version(*domains):
+    """Invalidate every cached section that reads these domains, on commit."""
+    from .models import ReportDataVersion
+
+    def bump():
+        for domain in domains:
+            ReportDataVersion.objects.update_or_create(
+                domain=domain, defaults={"version": uuid.uuid4().hex},
+            )
+
+    transaction.on_commit(bump)
+
+
+def cached_section(name, inputs, domains, compute):
+    """Return compute(), cached under the section inputs and data version."""
+    digest = hashlib.sha256(repr(inputs).encode()).hexdigest()[:32]
+    cache_key = f"funder_report_{name}_{digest}_{data_version(domains)}"
+    result = cache.get(cache_key, _MISSING)
+    if result is _MISSING:
+        result = compute()
+        cache.set(cache_key, result, REPORT_CACHE_SECONDS)
+    return result
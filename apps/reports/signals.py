@@ -0,0 +1,82 @@
+"""Cache invalidation signals for funder report sections and insight rollups."""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.clients.models import ClientDetailValue, ClientFile, ClientProgramEnrolment, CustomFieldDefinition
+from apps.notes.models import MetricValue, ProgressNote, ProgressNoteTarget
+from apps.plans.models import MetricDefinition
+
+from . import insight_rollup
+from .models import DemographicBreakdown, ReportTemplate
+from .report_cache import bump_data_version
+
+
+@receiver([post_save, post_delete], sender=ProgressNote)
+@receiver([post_save, post_delete], sender=ProgressNoteTarget)
+@receiver([post_save, post_delete], sender=MetricValue)
+def invalidate_reports_on_note_change(sender, **kwargs):
+    bump_data_version("notes")
+
+
+@receiver([post_save, post_delete], sender=ClientProgramEnrolment)
+def invalidate_reports_on_enrolment_change(sender, **kwargs):
+    bump_data_version("enrolments")
+
+
+@receiver([post_save, post_delete], sender=ClientFile)
+@receiver([post_save, post_delete], sender=ClientDetailValue)
+def invalidate_reports_on_client_change(sender, **kwargs):
+    bump_data_version("clients")
+
+
+@receiver([post_save, post_delete], sender=MetricDefinition)
+def invalidate_reports_on_outcome_change(sender, **kwargs):
+    bump_data_version("outcomes")
+
+
+@receiver([post_save, post_delete], sender=ReportTemplate)
+@receiver([post_save, post_delete], sender=DemographicBreakdown)
+@receiver([post_save, post_delete], sender=CustomFieldDefinition)
+def invalidate_reports_on_template_change(sender, **kwargs):
+    bump_data_version("templates")
+
+
+def _client_program_ids(client_file_id):
+    return ClientProgramEnrolment.objects.filter(
+        client_file_id=client_file_id,
+    ).values_list("program_id", flat=True)
+
+
+# Notes are never re-dated after creation, so only the current month of a
+# saved note needs rebuilding.
+@receiver([post_save, post_delete], sender=ProgressNote)
+def invalidate_insights_on_note_change(sender, instance, **kwargs):
+    if instance.effective_date is None:
+        return
+    insight_rollup.invalidate(
+        _client_program_ids(instance.client_file_id),
+        [insight_rollup.month_of(instance.effective_date)],
+    )
+
+
+@receiver([post_save, post_delete], sender=ProgressNoteTarget)
+def invalidate_insights_on_target_entry_change(sender, instance, **kwargs):
+    note = ProgressNote.objects.filter(pk=instance.progress_note_id).values(
+        "client_file_id", "effective_date",
+    ).first()
+    if note is None:
+        return
+    insight_rollup.invalidate(
+        _client_program_ids(note["client_file_id"]),
+        [insight_rollup.month_of(note["effective_date"])],
+    )
+
+
+@receiver([post_save, post_delete], sender=ClientProgramEnrolment)
+def invalidate_insights_on_enrolment_change(sender, instance, **kwargs):
+    # Program insights count notes by current enrolment, so every month
+    # this client has notes in changes for the program.
+    months = ProgressNote.objects.filter(
+        client_file_id=instance.client_file_id,
+    ).datetimes("effective_date", "month")
+    insight_rollup.invalidate([instance.program_id], {insight_rollup.month_of(m) for m in months})
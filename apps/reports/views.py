@@ -28,14 +28,12 @@ from apps.programs.models import UserProgramRole
 from .achievements import get_achievement_summary, format_achievement_summary
 from .funder_report import generate_funder_report_data, generate_funder_report_csv_rows
 from .csv_utils import sanitise_csv_row, sanitise_filename
-from .demographics import (
-    aggregate_by_demographic, get_age_range, group_clients_by_age,
-    group_clients_by_custom_field, parse_grouping_choice,
-)
+from .breakdowns import BreakdownSpec, DemographicLookup, aggregate_breakdowns
+from .demographics import parse_grouping_choice
 from .models import DemographicBreakdown, ReportTemplate, SecureExportLink
 from .suppression import suppress_small_cell
 from .forms import FunderReportForm, MetricExportForm
-from .aggregations import aggregate_metrics, _stats_from_list
+from .aggregations import aggregate_metrics
 from .utils import (
     can_create_export,
     can_download_pii_export,
@@ -186,51 +184,11 @@ def _build_demographic_map(metric_values, grouping_type, grouping_field, as_of_d
     Returns:
         Dict mapping client_id to demographic group label.
     """
-    from apps.clients.models import ClientDetailValue, ClientFile
-
-    client_demographic_map = {}
-
-    # Collect all unique client IDs
-    client_ids = set()
-    for mv in metric_values:
-        client_ids.add(mv.progress_note_target.progress_note.client_file_id)
-
-    if grouping_type == "age_range":
-        # Load clients to access encrypted birth_date
-        clients = ClientFile.objects.filter(pk__in=client_ids)
-        for client in clients:
-            client_demographic_map[client.pk] = get_age_range(client.birth_date, as_of_date)
-
-    elif grouping_type == "custom_field" and grouping_field:
-        # Build option labels lookup for dropdown fields
-        option_labels = {}
-        if grouping_field.input_type == "select" and grouping_field.options_json:
-            for option in grouping_field.options_json:
-                if isinstance(option, dict):
-                    option_labels[option.get("value", "")] = option.get("label", option.get("value", ""))
-                else:
-                    option_labels[option] = option
-
-        # Get custom field values for all clients
-        values = ClientDetailValue.objects.filter(
-            client_file_id__in=client_ids,
-            field_def=grouping_field,
-        )
-
-        for cv in values:
-            raw_value = cv.get_value()
-            if not raw_value:
-                client_demographic_map[cv.client_file_id] = "Unknown"
-            else:
-                display_value = option_labels.get(raw_value, raw_value)
-                client_demographic_map[cv.client_file_id] = display_value
-
-        # Mark clients without a value as Unknown
-        for client_id in client_ids:
-            if client_id not in client_demographic_map:
-                client_demographic_map[client_id] = "Unknown"
-
-    return client_demographic_map
+    spec = BreakdownSpec.from_grouping(grouping_type, grouping_field)
+    if spec is None:
+        return {}
+    client_ids = {mv.progress_note_target.progress_note.client_file_id for mv in metric_values}
+    return DemographicLookup(client_ids, as_of_date).labels_for(spec)
 
 
 def _get_grouping_label(group_by_value, grouping_field):
@@ -367,10 +325,7 @@ def export_form(request):
     notes = ProgressNote.objects.filter(
         client_file_id__in=client_ids,
         status="default",
-    ).filter(
-        Q(backdate__range=(date_from_dt, date_to_dt))
-        | Q(backdate__isnull=True, created_at__range=(date_from_dt, date_to_dt))
-    )
+    ).filter(effective_date__range=(date_from_dt, date_to_dt))
 
     # Get the actual metric values
     metric_values = (
@@ -465,21 +420,39 @@ def export_form(request):
                 "max": stats.get("max", "N/A"),
             })
 
-        # Build demographic breakdown if grouping is enabled
-        demographic_aggregate_rows = []
+        # Demographic breakdowns — the legacy group-by and every report
+        # template breakdown are computed together in one pass, sharing
+        # one DemographicLookup so each client is resolved only once.
+        specs = []
+        grouping_spec = None
         if grouping_type != "none":
+            grouping_spec = BreakdownSpec.from_grouping(grouping_type, grouping_field)
+            if grouping_spec:
+                specs.append(grouping_spec)
+        template_specs = []
+        if report_template:
+            breakdowns = DemographicBreakdown.objects.filter(
+                report_template=report_template,
+            ).select_related("custom_field").order_by("sort_order")
+            for bd in breakdowns:
+                bd_spec = BreakdownSpec.from_template_breakdown(bd)
+                if bd_spec:
+                    template_specs.append(bd_spec)
+            specs.extend(template_specs)
+
+        breakdown_results = {}
+        if specs:
+            lookup = DemographicLookup(unique_clients, date_to)
+            breakdown_results = aggregate_breakdowns(metric_values, specs, lookup=lookup)
+
+        def _breakdown_rows(spec_key):
+            section_rows = []
+            by_metric = breakdown_results.get(spec_key, {})
             for mv_metric_def in selected_metrics:
-                # Filter metric values for this specific metric
-                metric_specific_mvs = metric_values.filter(metric_def=mv_metric_def)
-                if not metric_specific_mvs.exists():
-                    continue
-                demo_agg = aggregate_by_demographic(
-                    metric_specific_mvs, grouping_type, grouping_field, date_to,
-                )
-                for group_label, stats in demo_agg.items():
+                for group_label, stats in by_metric.get(mv_metric_def.pk, {}).items():
                     client_count = len(stats.get("client_ids", set()))
                     avg_val = round(stats["avg"], 1) if stats.get("avg") is not None else "N/A"
-                    demographic_aggregate_rows.append({
+                    section_rows.append({
                         "demographic_group": group_label,
                         "metric_name": mv_metric_def.name,
                         "clients_measured": suppress_small_cell(client_count, program),
@@ -487,95 +460,20 @@ def export_form(request):
                         "min": stats.get("min", "N/A"),
                         "max": stats.get("max", "N/A"),
                     })
+            return section_rows
+
+        # Build demographic breakdown if grouping is enabled
+        demographic_aggregate_rows = _breakdown_rows(grouping_spec.key) if grouping_spec else []
 
         # ── Report template multi-breakdown (overrides legacy group_by) ──
         report_template_breakdown_sections = []
-        if report_template:
-            breakdowns = DemographicBreakdown.objects.filter(
-                report_template=report_template,
-            ).select_related("custom_field").order_by("sort_order")
-
-            for bd in breakdowns:
-                section_rows = []
-                for mv_metric_def in selected_metrics:
-                    metric_specific_mvs = metric_values.filter(metric_def=mv_metric_def)
-                    if not metric_specific_mvs.exists():
-                        continue
-
-                    if bd.source_type == "age":
-                        custom_bins = bd.bins_json or None
-                        demo_agg = aggregate_by_demographic(
-                            metric_specific_mvs, "age_range", None, date_to,
-                        )
-                        # Re-aggregate with custom bins if provided
-                        if custom_bins:
-                            all_ids = set()
-                            client_mv_map = defaultdict(list)
-                            for mv in metric_specific_mvs:
-                                cid = mv.progress_note_target.progress_note.client_file_id
-                                all_ids.add(cid)
-                                client_mv_map[cid].append(mv)
-                            client_groups = group_clients_by_age(
-                                list(all_ids), date_to, custom_bins=custom_bins,
-                            )
-                            demo_agg = {}
-                            for gl, cids in client_groups.items():
-                                gvals = []
-                                for cid in cids:
-                                    gvals.extend(client_mv_map.get(cid, []))
-                                if gvals:
-                                    s = _stats_from_list(gvals)
-                                else:
-                                    s = {"count": 0, "valid_count": 0, "avg": None, "min": None, "max": None, "sum": None}
-                                s["client_ids"] = set(cids)
-                                demo_agg[gl] = s
-                    elif bd.source_type == "custom_field" and bd.custom_field:
-                        demo_agg = aggregate_by_demographic(
-                            metric_specific_mvs, "custom_field", bd.custom_field, date_to,
-                        )
-                        # Apply merge categories if provided
-                        if bd.merge_categories_json:
-                            all_ids = set()
-                            client_mv_map = defaultdict(list)
-                            for mv in metric_specific_mvs:
-                                cid = mv.progress_note_target.progress_note.client_file_id
-                                all_ids.add(cid)
-                                client_mv_map[cid].append(mv)
-                            client_groups = group_clients_by_custom_field(
-                                list(all_ids), bd.custom_field,
-                                merge_categories=bd.merge_categories_json,
-                            )
-                            demo_agg = {}
-                            for gl, cids in client_groups.items():
-                                gvals = []
-                                for cid in cids:
-                                    gvals.extend(client_mv_map.get(cid, []))
-                                if gvals:
-                                    s = _stats_from_list(gvals)
-                                else:
-                                    s = {"count": 0, "valid_count": 0, "avg": None, "min": None, "max": None, "sum": None}
-                                s["client_ids"] = set(cids)
-                                demo_agg[gl] = s
-                    else:
-                        continue
-
-                    for group_label, stats in demo_agg.items():
-                        client_count = len(stats.get("client_ids", set()))
-                        avg_val = round(stats["avg"], 1) if stats.get("avg") is not None else "N/A"
-                        section_rows.append({
-                            "demographic_group": group_label,
-                            "metric_name": mv_metric_def.name,
-                            "clients_measured": suppress_small_cell(client_count, program),
-                            "avg": avg_val,
-                            "min": stats.get("min", "N/A"),
-                            "max": stats.get("max", "N/A"),
-                        })
-
-                if section_rows:
-                    report_template_breakdown_sections.append({
-                        "label": bd.label,
-                        "rows": section_rows,
-                    })
+        for bd_spec in template_specs:
+            section_rows = _breakdown_rows(bd_spec.key)
+            if section_rows:
+                report_template_breakdown_sections.append({
+                    "label": bd_spec.label,
+                    "rows": section_rows,
+                })
 
         total_clients_display = suppress_small_cell(len(unique_clients), program)
 
@@ -25,3 +25,34 @@ def django_db_setup(django_db_blocker):
         # Create tables for both databases
         call_command("migrate", "--run-syncdb", verbosity=0)
         call_command("migrate", "--database=audit", "--run-syncdb", verbosity=0)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start every test with an empty cache.
+
+    Cached schemas, feeds and settings outlive the per-test transaction
+    rollback, so without this a value cached by one test leaks into the next.
+    """
+    from django.core.cache import caches
+
+    for cache in caches.all():
+        cache.clear()
+    yield
+
+
+@pytest.fixture
+def query_budget():
+    """Assert a query budget around a block of test code.
+
+        def test_client_list(client, query_budget):
+            with query_budget(20, max_duplicates=2, label="clients:client_list"):
+                client.get("/clients/")
+
+    Fails, listing the most repeated statements, when the block runs more
+    queries — or more repeats of the same query — than allowed. TestCase
+    tests can use konote.profiling.assert_query_budget directly.
+    """
+    from konote.profiling import assert_query_budget
+
+    return assert_query_budget
@@ -6,38 +6,36 @@ if [ -d ".git" ]; then
     git config core.hooksPath .githooks 2>/dev/null || true
 fi
 
-echo "Running migrations..."
-python manage.py migrate --noinput
-echo "Migrations complete."
-
-echo "Running audit migrations..."
-python manage.py migrate --database=audit --noinput
-echo "Audit migrations complete."
-
-echo "Locking down audit database permissions..."
-python manage.py lockdown_audit_db 2>&1 || echo "WARNING: Audit lockdown failed (see error above). Audit logs may not be write-protected."
-
-# Seed runs all sub-commands in the right order:
-# metrics, features, settings, event types, note templates, intake fields,
-# demo data (if DEMO_MODE), and demo client field values
-echo ""
-echo "Seeding data..."
-python manage.py seed 2>&1 || echo "WARNING: Seed failed (see error above). App will start but may be missing data."
+# One process runs every startup step, in order: migrations (default and
+# audit), audit lockdown, seed, expired-session sweep, translation check and
+# the security check. Steps whose inputs are unchanged since their last
+# successful run are skipped (see apps/admin_settings/management/commands/
+# startup.py); set STARTUP_FORCE=1 to run them all.
+# Migration and security-check failures stop startup (set -e). Set
+# KONOTE_MODE=demo to allow startup with security warnings (for evaluation).
+if [ "${STARTUP_FORCE:-0}" = "1" ]; then
+    python manage.py startup --force
+else
+    python manage.py startup
+fi
 
-# Translation check (non-blocking — logs issues but never prevents startup)
-echo ""
-echo "Checking translations..."
-python manage.py check_translations 2>&1 || echo "WARNING: Translation issues detected (non-blocking — app will start)"
+PORT=${PORT:-8000}
 
-# Security check before starting the application
-# Set KONOTE_MODE=demo to allow startup with security warnings (for evaluation)
-# Set KONOTE_MODE=production (default) to block startup if security checks fail
-echo ""
-echo "Running security checks..."
-python manage.py startup_check
-# If startup_check exits non-zero, the script stops here (set -e)
+# SERVER_MODE=asgi serves konote.asgi with uvicorn workers, so slow AI calls,
+# reminder sends and calendar polls wait on the event loop instead of
+# holding one of the two sync workers. Default stays WSGI.
+if [ "${SERVER_MODE:-wsgi}" = "asgi" ]; then
+    echo "Starting gunicorn (ASGI, uvicorn workers) on port $PORT"
+    exec gunicorn konote.asgi:application \
+        --worker-class uvicorn.workers.UvicornWorker \
+        --bind 0.0.0.0:$PORT \
+        --workers 2 \
+        --timeout 120 \
+        --log-level info \
+        --error-logfile - \
+        --access-logfile -
+fi
 
-PORT=${PORT:-8000}
 echo "Starting gunicorn on port $PORT"
 exec gunicorn konote.wsgi:application \
     --bind 0.0.0.0:$PORT \
@@ -7,9 +7,11 @@ program names, aggregate stats). Client PII never reaches this module.
 import json
 import logging
 
-import requests
 from django.conf import settings
 
+from konote.ai_cache import cache_key, cached_call
+from konote.transport import CircuitOpenError, get_breaker, http_post
+
 logger = logging.getLogger(__name__)
 
 OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
@@ -29,17 +31,33 @@ def is_ai_available():
     return bool(getattr(settings, "OPENROUTER_API_KEY", ""))
 
 
-def _call_openrouter(system_prompt, user_message, max_tokens=1024):
+def _call_openrouter(system_prompt, user_message, max_tokens=1024, cached=False, is_valid=None):
     """
     Low-level POST to OpenRouter.  Returns the response text, or None on
     any failure (network, auth, timeout, malformed response).
+
+    With cached=True, identical calls reuse a cached response and concurrent
+    ones share one request (see konote/ai_cache.py). is_valid(text) decides
+    whether a response is worth caching.
     """
     if not is_ai_available():
         return None
 
+    model = getattr(settings, "OPENROUTER_MODEL", "anthropic/claude-sonnet-4-20250514")
+    if not cached:
+        return _post_openrouter(model, system_prompt, user_message, max_tokens)
+    return cached_call(
+        cache_key(model, max_tokens, system_prompt, user_message),
+        lambda: _post_openrouter(model, system_prompt, user_message, max_tokens),
+        is_valid=is_valid,
+    )
+
+
+def _post_openrouter(model, system_prompt, user_message, max_tokens):
     try:
-        resp = requests.post(
-            OPENROUTER_URL,
+        resp = http_post(
+            getattr(settings, "OPENROUTER_URL", OPENROUTER_URL),
+            get_breaker("openrouter", health_channel="ai"),
             headers={
                 "Authorization": f"Bearer {settings.OPENROUTER_API_KEY}",
                 "Content-Type": "application/json",
@@ -47,7 +65,7 @@ def _call_openrouter(system_prompt, user_message, max_tokens=1024):
                 "X-Title": "KoNote",
             },
             json={
-                "model": getattr(settings, "OPENROUTER_MODEL", "anthropic/claude-sonnet-4-20250514"),
+                "model": model,
                 "messages": [
                     {"role": "system", "content": system_prompt + _SAFETY_FOOTER},
                     {"role": "user", "content": user_message},
@@ -56,13 +74,23 @@ def _call_openrouter(system_prompt, user_message, max_tokens=1024):
             },
             timeout=TIMEOUT_SECONDS,
         )
-        resp.raise_for_status()
         return resp.json()["choices"][0]["message"]["content"]
+    except CircuitOpenError:
+        logger.warning("OpenRouter call skipped — provider marked unavailable")
+        return None
     except Exception:
         logger.exception("OpenRouter API call failed")
         return None
 
 
+def _is_json(text):
+    try:
+        json.loads(text)
+    except (json.JSONDecodeError, TypeError):
+        return False
+    return True
+
+
 # ── Public functions ────────────────────────────────────────────────
 
 
@@ -89,7 +117,7 @@ def suggest_metrics(target_description, metric_catalogue):
         f"Target description: {target_description}\n\n"
         f"Available metrics:\n{json.dumps(metric_catalogue, indent=2)}"
     )
-    result = _call_openrouter(system, user_msg)
+    result = _call_openrouter(system, user_msg, cached=True, is_valid=_is_json)
     if result is None:
         return None
     try:
@@ -115,7 +143,7 @@ def improve_outcome(draft_text):
         "Time-bound). Rewrite the draft into a professional outcome statement. "
         "Return only the improved text, no explanation."
     )
-    return _call_openrouter(system, f"Draft outcome: {draft_text}")
+    return _call_openrouter(system, f"Draft outcome: {draft_text}", cached=True)
 
 
 def generate_narrative(program_name, date_range, aggregate_stats):
@@ -143,7 +171,7 @@ def generate_narrative(program_name, date_range, aggregate_stats):
         f"Period: {date_range}\n\n"
         f"Aggregate metrics:\n{json.dumps(aggregate_stats, indent=2)}"
     )
-    return _call_openrouter(system, user_msg, max_tokens=512)
+    return _call_openrouter(system, user_msg, max_tokens=512, cached=True)
 
 
 def _call_insights_api(system_prompt, user_message, max_tokens=2048):
@@ -165,8 +193,9 @@ def _call_insights_api(system_prompt, user_message, max_tokens=2048):
         if api_key:
             headers["Authorization"] = f"Bearer {api_key}"
         try:
-            resp = requests.post(
+            resp = http_post(
                 url,
+                get_breaker("insights", health_channel="ai"),
                 headers=headers,
                 json={
                     "model": model,
@@ -178,8 +207,10 @@ def _call_insights_api(system_prompt, user_message, max_tokens=2048):
                 },
                 timeout=60,  # Local models can be slower
             )
-            resp.raise_for_status()
             return resp.json()["choices"][0]["message"]["content"]
+        except CircuitOpenError:
+            logger.warning("Insights API call skipped — provider marked unavailable")
+            return None
         except Exception:
             logger.exception("Insights API call failed (custom provider)")
             return None
@@ -392,7 +423,7 @@ def suggest_note_structure(target_name, target_description, metric_names):
         f"Description: {target_description}\n"
         f"Metrics: {', '.join(metric_names)}"
     )
-    result = _call_openrouter(system, user_msg)
+    result = _call_openrouter(system, user_msg, cached=True, is_valid=_is_json)
     if result is None:
         return None
     try:
@@ -0,0 +1,87 @@
+"""Content-addressed cache for AI responses, with request coalescing.
+
+The suggestion endpoints (suggest metrics, improve outcome, narrative,
+note structure) send the same prompt again whenever staff click twice or
+reopen a form, and each call costs up to 30 seconds and an OpenRouter
+charge. Responses are cached in the "ai" cache under a hash of everything
+that shapes the answer: CACHE_VERSION, the model, max_tokens, the system
+prompt (so editing a prompt template retires its entries) and the user
+message. The key is only the hash, so prompt text never appears in it.
+
+Entries expire after AI_CACHE_SECONDS, and the cache drops the least
+recently used entries past AI_CACHE_MAX_ENTRIES (see settings). Failures
+and unusable responses are never cached.
+
+Identical calls that arrive while one is already in flight in the same
+process wait for it and share its result instead of calling out again.
+"""
+import hashlib
+import json
+import threading
+
+from django.core.cache import caches
+
+CACHE_ALIAS = "ai"
+
+# Bump to retire every cached response, e.g. when response parsing changes.
+CACHE_VERSION = 1
+
+# How long a coalesced call waits for the one in flight (the upstream
+# timeout is 30 seconds) before giving up and returning None.
+COALESCE_WAIT_SECONDS = 35
+
+
+class _Flight:
+    """One upstream call in progress, shared by identical callers."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+
+
+_in_flight = {}
+_in_flight_lock = threading.Lock()
+
+
+def cache_key(model, max_tokens, system_prompt, user_message):
+    """Cache key for one AI call."""
+    payload = json.dumps([CACHE_VERSION, model, max_tokens, system_prompt, user_message])
+    return "ai_response_" + hashlib.sha256(payload.encode()).hexdigest()
+
+
+def cached_call(key, call, is_valid=None):
+    """Return call()'s response text, cached under key.
+
+    call returns the response text, or None on failure. Responses that are
+    None, or that fail is_valid(text), are returned but not cached. While
+    one call for key is running, identical callers wait for its result.
+    """
+    cache = caches[CACHE_ALIAS]
+    result = cache.get(key)
+    if result is not None:
+        return result
+
+    with _in_flight_lock:
+        flight = _in_flight.get(key)
+        leader = flight is None
+        if leader:
+            flight = _in_flight[key] = _Flight()
+
+    if not leader:
+        flight.done.wait(COALESCE_WAIT_SECONDS)
+        return flight.result
+
+    try:
+        # A call that finished between the first get() and taking the
+        # lock has already cached its result.
+        result = cache.get(key)
+        if result is None:
+            result = call()
+            if result is not None and (is_valid is None or is_valid(result)):
+                cache.set(key, result)
+        flight.result = result
+        return result
+    finally:
+        with _in_flight_lock:
+            del _in_flight[key]
+        flight.done.set()
@@ -1,14 +1,20 @@
-"""AI-powered HTMX endpoints — all POST, all rate-limited, no PII."""
+"""AI-powered HTMX endpoints — all POST, all rate-limited, no PII.
+
+The views are async: under ASGI a slow OpenRouter call (up to 30 seconds)
+waits on the event loop instead of blocking a worker. Database work and
+the AI call itself live in sync helpers awaited through sync_to_async.
+"""
 from datetime import date
 
+from asgiref.sync import sync_to_async
 from django.contrib.auth.decorators import login_required
 from django.http import HttpResponseBadRequest, HttpResponseForbidden
 from django.shortcuts import render
 from django.utils import timezone
-from django_ratelimit.decorators import ratelimit
 
 from apps.admin_settings.models import FeatureToggle
 from konote import ai
+from konote.async_utils import async_ratelimit
 from konote.forms import (
     GenerateNarrativeForm,
     ImproveOutcomeForm,
@@ -16,6 +22,9 @@ from konote.forms import (
     SuggestNoteStructureForm,
 )
 
+# Rendering runs context processors, which query the database.
+_render = sync_to_async(render)
+
 
 def _ai_enabled():
     """Check both the feature toggle and the API key."""
@@ -24,83 +33,90 @@ def _ai_enabled():
     return FeatureToggle.get_all_flags().get("ai_assist", False)
 
 
+async def _ai_disabled_response():
+    """Return a 403 response if AI features are off, otherwise None."""
+    if not await sync_to_async(_ai_enabled)():
+        return HttpResponseForbidden("AI features are not enabled.")
+    return None
+
+
+def _program_access_denied(user, program):
+    """Return a 403 response if the user has no active role in the program (admin sees all)."""
+    from apps.programs.models import UserProgramRole
+
+    if program is None or user.is_admin:
+        return None
+    has_role = UserProgramRole.objects.filter(
+        user=user, program=program, status="active",
+    ).exists()
+    if not has_role:
+        return HttpResponseForbidden("You do not have access to this program.")
+    return None
+
+
 @login_required
-@ratelimit(key="user", rate="20/h", method="POST", block=True)
-def suggest_metrics_view(request):
+@async_ratelimit(key="user", rate="20/h", method="POST", block=True)
+async def suggest_metrics_view(request):
     """Suggest metrics for a plan target description."""
-    if not _ai_enabled():
-        return HttpResponseForbidden("AI features are not enabled.")
+    if denied := await _ai_disabled_response():
+        return denied
 
     form = SuggestMetricsForm(request.POST)
     if not form.is_valid():
-        return render(request, "ai/_error.html", {"message": "Please enter a target description first."})
+        return await _render(request, "ai/_error.html", {"message": "Please enter a target description first."})
     target_description = form.cleaned_data["target_description"]
 
     # Build catalogue from non-PII metric data
     from apps.plans.models import MetricDefinition
 
-    metrics = list(
+    metrics = await sync_to_async(list)(
         MetricDefinition.objects.filter(is_enabled=True, status="active").values(
             "id", "name", "definition", "category"
         )
     )
 
-    suggestions = ai.suggest_metrics(target_description, metrics)
+    suggestions = await sync_to_async(ai.suggest_metrics)(target_description, metrics)
     if suggestions is None:
-        return render(request, "ai/_error.html", {"message": "AI suggestion unavailable. Please try again later."})
+        return await _render(request, "ai/_error.html", {"message": "AI suggestion unavailable. Please try again later."})
 
-    return render(request, "ai/_metric_suggestions.html", {"suggestions": suggestions})
+    return await _render(request, "ai/_metric_suggestions.html", {"suggestions": suggestions})
 
 
 @login_required
-@ratelimit(key="user", rate="20/h", method="POST", block=True)
-def improve_outcome_view(request):
+@async_ratelimit(key="user", rate="20/h", method="POST", block=True)
+async def improve_outcome_view(request):
     """Improve a draft outcome statement."""
-    if not _ai_enabled():
-        return HttpResponseForbidden("AI features are not enabled.")
+    if denied := await _ai_disabled_response():
+        return denied
 
     form = ImproveOutcomeForm(request.POST)
     if not form.is_valid():
-        return render(request, "ai/_error.html", {"message": "Please enter a draft outcome first."})
+        return await _render(request, "ai/_error.html", {"message": "Please enter a draft outcome first."})
     draft_text = form.cleaned_data["draft_text"]
 
-    improved = ai.improve_outcome(draft_text)
+    improved = await sync_to_async(ai.improve_outcome)(draft_text)
     if improved is None:
-        return render(request, "ai/_error.html", {"message": "AI suggestion unavailable. Please try again later."})
+        return await _render(request, "ai/_error.html", {"message": "AI suggestion unavailable. Please try again later."})
 
-    return render(request, "ai/_improved_outcome.html", {"improved_text": improved, "original_text": draft_text})
+    return await _render(request, "ai/_improved_outcome.html", {"improved_text": improved, "original_text": draft_text})
 
 
-@login_required
-@ratelimit(key="user", rate="20/h", method="POST", block=True)
-def generate_narrative_view(request):
-    """Generate an outcome narrative from aggregate metrics."""
-    if not _ai_enabled():
-        return HttpResponseForbidden("AI features are not enabled.")
+def _narrative_inputs(request, program_id, date_from, date_to):
+    """Load the program and aggregate its metric values for the narrative.
 
+    Returns (error_response, program, aggregate_stats).
+    """
     from apps.notes.models import MetricValue
-    from apps.programs.models import Program, UserProgramRole
-
-    form = GenerateNarrativeForm(request.POST)
-    if not form.is_valid():
-        return render(request, "ai/_error.html", {"message": "Please select a program and date range."})
-
-    program_id = form.cleaned_data["program_id"]
-    date_from = form.cleaned_data["date_from"]
-    date_to = form.cleaned_data["date_to"]
+    from apps.programs.models import Program
 
     try:
         program = Program.objects.get(pk=program_id)
     except Program.DoesNotExist:
-        return HttpResponseBadRequest("Program not found.")
+        return HttpResponseBadRequest("Program not found."), None, None
 
     # Verify user has access to this program (admin sees all)
-    if not request.user.is_admin:
-        has_role = UserProgramRole.objects.filter(
-            user=request.user, program=program, status="active",
-        ).exists()
-        if not has_role:
-            return HttpResponseForbidden("You do not have access to this program.")
+    if denied := _program_access_denied(request.user, program):
+        return denied, None, None
 
     # Build aggregate stats from metric values — no PII, just numbers
     values = (
@@ -136,117 +152,114 @@ def generate_narrative_view(request):
         }
         for name, data in aggregates.items()
     ]
+    return None, program, aggregate_stats
+
+
+@login_required
+@async_ratelimit(key="user", rate="20/h", method="POST", block=True)
+async def generate_narrative_view(request):
+    """Generate an outcome narrative from aggregate metrics."""
+    if denied := await _ai_disabled_response():
+        return denied
+
+    form = GenerateNarrativeForm(request.POST)
+    if not form.is_valid():
+        return await _render(request, "ai/_error.html", {"message": "Please select a program and date range."})
+
+    date_from = form.cleaned_data["date_from"]
+    date_to = form.cleaned_data["date_to"]
+
+    error, program, aggregate_stats = await sync_to_async(_narrative_inputs)(
+        request, form.cleaned_data["program_id"], date_from, date_to,
+    )
+    if error is not None:
+        return error
 
     if not aggregate_stats:
-        return render(request, "ai/_error.html", {"message": "No metric data found for this period."})
+        return await _render(request, "ai/_error.html", {"message": "No metric data found for this period."})
 
     date_range = f"{date_from} to {date_to}"
-    narrative = ai.generate_narrative(program.name, date_range, aggregate_stats)
+    narrative = await sync_to_async(ai.generate_narrative)(program.name, date_range, aggregate_stats)
     if narrative is None:
-        return render(request, "ai/_error.html", {"message": "AI narrative unavailable. Please try again later."})
+        return await _render(request, "ai/_error.html", {"message": "AI narrative unavailable. Please try again later."})
 
-    return render(request, "ai/_narrative.html", {"narrative": narrative, "program_name": program.name})
+    return await _render(request, "ai/_narrative.html", {"narrative": narrative, "program_name": program.name})
 
 
-@login_required
-@ratelimit(key="user", rate="20/h", method="POST", block=True)
-def suggest_note_structure_view(request):
-    """Suggest a progress note structure for a plan target."""
-    if not _ai_enabled():
-        return HttpResponseForbidden("AI features are not enabled.")
+def _note_structure_inputs(request, target_id):
+    """Load the target and its active metric names.
 
+    Returns (error_response, target, metric_names).
+    """
     from apps.plans.models import PlanTarget
-    from apps.programs.models import UserProgramRole
-
-    form = SuggestNoteStructureForm(request.POST)
-    if not form.is_valid():
-        return render(request, "ai/_error.html", {"message": "No target selected."})
 
     try:
-        target = PlanTarget.objects.select_related("plan_section__program").get(
-            pk=form.cleaned_data["target_id"]
-        )
+        target = PlanTarget.objects.select_related("plan_section__program").get(pk=target_id)
     except PlanTarget.DoesNotExist:
-        return HttpResponseBadRequest("Target not found.")
+        return HttpResponseBadRequest("Target not found."), None, None
 
     # Verify user has access to the program that owns this target
     program = target.plan_section.program if target.plan_section else None
-    if program and not request.user.is_admin:
-        has_role = UserProgramRole.objects.filter(
-            user=request.user, program=program, status="active",
-        ).exists()
-        if not has_role:
-            return HttpResponseForbidden("You do not have access to this program.")
+    if denied := _program_access_denied(request.user, program):
+        return denied, None, None
 
     metric_names = list(target.metrics.filter(status="active").values_list("name", flat=True))
+    return None, target, metric_names
 
-    sections = ai.suggest_note_structure(target.name, target.description, metric_names)
+
+@login_required
+@async_ratelimit(key="user", rate="20/h", method="POST", block=True)
+async def suggest_note_structure_view(request):
+    """Suggest a progress note structure for a plan target."""
+    if denied := await _ai_disabled_response():
+        return denied
+
+    form = SuggestNoteStructureForm(request.POST)
+    if not form.is_valid():
+        return await _render(request, "ai/_error.html", {"message": "No target selected."})
+
+    error, target, metric_names = await sync_to_async(_note_structure_inputs)(
+        request, form.cleaned_data["target_id"],
+    )
+    if error is not None:
+        return error
+
+    sections = await sync_to_async(ai.suggest_note_structure)(target.name, target.description, metric_names)
     if sections is None:
-        return render(request, "ai/_error.html", {"message": "AI suggestion unavailable. Please try again later."})
+        return await _render(request, "ai/_error.html", {"message": "AI suggestion unavailable. Please try again later."})
 
-    return render(request, "ai/_note_structure.html", {"sections": sections, "target_name": target.name})
+    return await _render(request, "ai/_note_structure.html", {"sections": sections, "target_name": target.name})
 
 
-@login_required
-@ratelimit(key="user", rate="10/h", method="POST", block=True)
-def outcome_insights_view(request):
-    """Generate AI narrative draft from qualitative outcome data. HTMX POST.
+def _insights_inputs(request, program_id, dt_from, dt_to, cache_key, regenerate):
+    """Load everything outcome_insights_view needs before calling the AI.
 
-    Access control: user must have an active role (staff+) in the requested
-    program. Without this check, any authenticated user could POST with an
-    arbitrary program_id and receive AI-processed quotes from that program.
+    Returns a dict with either "response" (an early response, e.g. a 403),
+    "cached" (a stored InsightSummary) or "program", "structured" and
+    "scrubbed_quotes".
     """
-    if not _ai_enabled():
-        return HttpResponseForbidden("AI features are not enabled.")
-
-    from apps.programs.models import Program, UserProgramRole
+    from apps.programs.models import Program
     from apps.reports.insights import get_structured_insights, collect_quotes
-    from apps.reports.pii_scrub import scrub_pii
+    from apps.reports.pii_scrub import program_scrubber
     from apps.reports.models import InsightSummary
 
-    program_id = request.POST.get("program_id")
-    date_from_str = request.POST.get("date_from")
-    date_to_str = request.POST.get("date_to")
-    regenerate = request.POST.get("regenerate")
-
-    if not program_id or not date_from_str or not date_to_str:
-        return render(request, "reports/_insights_ai.html", {
-            "error": "Please select a program and date range first.",
-        })
-
     try:
         program = Program.objects.get(pk=program_id)
     except Program.DoesNotExist:
-        return HttpResponseBadRequest("Program not found.")
+        return {"response": HttpResponseBadRequest("Program not found.")}
 
     # Verify user has access to this program (admin sees all)
-    if not request.user.is_admin:
-        has_role = UserProgramRole.objects.filter(
-            user=request.user, program=program, status="active",
-        ).exists()
-        if not has_role:
-            return HttpResponseForbidden("You do not have access to this program.")
+    if denied := _program_access_denied(request.user, program):
+        return {"response": denied}
 
-    try:
-        dt_from = date.fromisoformat(date_from_str)
-        dt_to = date.fromisoformat(date_to_str)
-    except ValueError:
-        return HttpResponseBadRequest("Invalid date format.")
+    if dt_from is None:
+        return {"response": HttpResponseBadRequest("Invalid date format.")}
 
     # Check cache first (unless regenerating)
-    cache_key = f"insights:{program_id}:{dt_from}:{dt_to}"
     if not regenerate:
-        try:
-            cached = InsightSummary.objects.get(cache_key=cache_key)
-            return render(request, "reports/_insights_ai.html", {
-                "summary": cached.summary_json,
-                "program_id": program_id,
-                "date_from": date_from_str,
-                "date_to": date_to_str,
-                "generated_at": cached.generated_at,
-            })
-        except InsightSummary.DoesNotExist:
-            pass
+        cached = InsightSummary.objects.filter(cache_key=cache_key).first()
+        if cached is not None:
+            return {"cached": cached}
 
     # Collect data
     structured = get_structured_insights(program=program, date_from=dt_from, date_to=dt_to)
@@ -256,60 +269,97 @@ def outcome_insights_view(request):
     )
 
     if not quotes and structured["note_count"] < 20:
-        return render(request, "reports/_insights_ai.html", {
+        return {"response": render(request, "reports/_insights_ai.html", {
             "error": "Not enough data to generate a meaningful summary.",
-        })
-
-    # PII-scrub quotes before sending to AI
-    # Collect known names from clients in this program
-    from apps.clients.models import ClientFile, ClientProgramEnrolment
-    client_ids = (
-        ClientProgramEnrolment.objects.filter(program=program, status="enrolled")
-        .values_list("client_file_id", flat=True)
-    )
-    known_names = set()
-    for client in ClientFile.objects.filter(pk__in=client_ids):
-        for name in [client.first_name, client.last_name, client.preferred_name]:
-            if name and len(name) >= 2:
-                known_names.add(name)
-
-    # Also scrub staff names
-    from apps.auth_app.models import User
-    for user in User.objects.filter(is_active=True):
-        display = getattr(user, "display_name", "")
-        if display and len(display) >= 2:
-            known_names.add(display)
+        })}
 
+    # PII-scrub quotes before sending to AI. Known names (enrolled clients
+    # and active staff) are compiled once per program until they change.
+    scrubber = program_scrubber(program)
     scrubbed_quotes = []
     for q in quotes:
         # Data minimization: only send scrubbed text and target name to AI.
         # note_id is deliberately excluded — internal IDs should not reach
         # external services (prevents correlation if AI provider is breached).
         scrubbed_quotes.append({
-            "text": scrub_pii(q["text"], known_names),
+            "text": scrubber.scrub(q["text"]),
             "target_name": q.get("target_name", ""),
         })
 
-    date_range = f"{dt_from} to {dt_to}"
-    result = ai.generate_outcome_insights(
-        program.name, date_range, structured, scrubbed_quotes,
-    )
+    return {"program": program, "structured": structured, "scrubbed_quotes": scrubbed_quotes}
 
-    if result is None:
-        return render(request, "reports/_insights_ai.html", {
-            "error": "AI summary could not be verified. Showing data analysis only.",
-        })
 
-    # Cache the validated result
+def _store_insights(cache_key, result, user):
+    """Cache the validated result."""
+    from apps.reports.models import InsightSummary
+
     InsightSummary.objects.update_or_create(
         cache_key=cache_key,
         defaults={
             "summary_json": result,
-            "generated_by": request.user,
+            "generated_by": user,
         },
     )
 
-    return render(request, "reports/_insights_ai.html", {
+
+@login_required
+@async_ratelimit(key="user", rate="10/h", method="POST", block=True)
+async def outcome_insights_view(request):
+    """Generate AI narrative draft from qualitative outcome data. HTMX POST.
+
+    Access control: user must have an active role (staff+) in the requested
+    program. Without this check, any authenticated user could POST with an
+    arbitrary program_id and receive AI-processed quotes from that program.
+    """
+    if denied := await _ai_disabled_response():
+        return denied
+
+    program_id = request.POST.get("program_id")
+    date_from_str = request.POST.get("date_from")
+    date_to_str = request.POST.get("date_to")
+    regenerate = request.POST.get("regenerate")
+
+    if not program_id or not date_from_str or not date_to_str:
+        return await _render(request, "reports/_insights_ai.html", {
+            "error": "Please select a program and date range first.",
+        })
+
+    # Dates are validated after the program access check, as before
+    try:
+        dt_from = date.fromisoformat(date_from_str)
+        dt_to = date.fromisoformat(date_to_str)
+    except ValueError:
+        dt_from = dt_to = None
+
+    cache_key = f"insights:{program_id}:{dt_from}:{dt_to}"
+    inputs = await sync_to_async(_insights_inputs)(
+        request, program_id, dt_from, dt_to, cache_key, regenerate,
+    )
+    if "response" in inputs:
+        return inputs["response"]
+    if "cached" in inputs:
+        cached = inputs["cached"]
+        return await _render(request, "reports/_insights_ai.html", {
+            "summary": cached.summary_json,
+            "program_id": program_id,
+            "date_from": date_from_str,
+            "date_to": date_to_str,
+            "generated_at": cached.generated_at,
+        })
+
+    date_range = f"{dt_from} to {dt_to}"
+    result = await sync_to_async(ai.generate_outcome_insights)(
+        inputs["program"].name, date_range, inputs["structured"], inputs["scrubbed_quotes"],
+    )
+
+    if result is None:
+        return await _render(request, "reports/_insights_ai.html", {
+            "error": "AI summary could not be verified. Showing data analysis only.",
+        })
+
+    await sync_to_async(_store_insights)(cache_key, result, request.user)
+
+    return await _render(request, "reports/_insights_ai.html", {
         "summary": result,
         "program_id": program_id,
         "date_from": date_from_str,
@@ -0,0 +1,14 @@
+"""ASGI config for KoNote Web.
+
+Served by gunicorn with uvicorn workers when SERVER_MODE=asgi (see
+entrypoint.sh). Async views — AI endpoints, the calendar feed, reminder
+sending — then wait on slow upstream calls without holding a worker.
+"""
+import os
+
+from django.core.asgi import get_asgi_application
+
+from konote.settings import get_default_settings
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", get_default_settings())
+application = get_asgi_application()
@@ -0,0 +1,38 @@
+"""Helpers for async views (served natively when running under ASGI).
+
+Async views keep their database work and slow outbound calls (OpenRouter,
+SMTP, Twilio) in ordinary sync helpers and await them through
+sync_to_async. Under ASGI each request gets its own thread for those calls,
+so a 30-second AI request no longer ties up a whole worker.
+"""
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.utils.module_loading import import_string
+from django_ratelimit import ALL
+from django_ratelimit.core import is_ratelimited
+from django_ratelimit.exceptions import Ratelimited
+
+
+def async_ratelimit(group=None, key=None, rate=None, method=ALL, block=True):
+    """Async counterpart of django_ratelimit's @ratelimit decorator.
+
+    Same arguments and behaviour (including RATELIMIT_EXCEPTION_CLASS);
+    the cache lookup runs in a thread.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        async def _wrapped(request, *args, **kwargs):
+            old_limited = getattr(request, "limited", False)
+            ratelimited = await sync_to_async(is_ratelimited)(
+                request=request, group=group, fn=fn, key=key, rate=rate,
+                method=method, increment=True,
+            )
+            request.limited = ratelimited or old_limited
+            if ratelimited and block:
+                cls = getattr(settings, "RATELIMIT_EXCEPTION_CLASS", Ratelimited)
+                raise (import_string(cls) if isinstance(cls, str) else cls)()
+            return await fn(request, *args, **kwargs)
+        return _wrapped
+    return decorator
@@ -1,36 +1,24 @@
-"""Template context processors for terminology, features, and settings."""
+"""Template context processors for terminology, features, and settings.
+
+These run for every template rendered with a request, including HTMX
+partials that never show the nav. The nav badge counts are therefore
+lazy: the processors only decide whether a badge applies (from the roles
+already loaded for user_roles) and the count query runs when a template
+actually renders it, so partials that don't extend base.html skip it.
+"""
 from django.core.cache import cache
+from django.utils.functional import SimpleLazyObject
 from django.utils.translation import get_language
 
+from konote.routing import route_for
+
 
 def nav_active(request):
     """Auto-detect which nav item to highlight based on the URL path.
 
     Views that explicitly pass nav_active in their context will override this.
     """
-    path = request.path
-
-    # Order matters — more specific prefixes first
-    if path.startswith("/events/alerts/recommendations"):
-        section = "recommendations"
-    elif path.startswith("/reports/insights/"):
-        section = "insights"
-    elif path.startswith("/reports/"):
-        section = "reports"
-    elif path.startswith("/programs/"):
-        section = "programs"
-    elif path.startswith("/groups/"):
-        section = "groups"
-    elif path.startswith(("/admin/", "/erasure/", "/merge/")):
-        section = "admin"
-    elif path.startswith(("/clients/", "/plans/", "/notes/", "/events/")):
-        section = "clients"
-    elif path == "/":
-        section = "clients"
-    else:
-        section = ""
-
-    return {"nav_active": section}
+    return {"nav_active": route_for(request).nav_section}
 
 
 def terminology(request):
@@ -81,6 +69,35 @@ def instance_settings(request):
     return {"site": settings_dict}
 
 
+def _active_roles(request):
+    """[(program_id, role)] for the user's active roles, queried once per request."""
+    roles = getattr(request, "_active_program_roles", None)
+    if roles is None:
+        from apps.programs.models import UserProgramRole
+
+        roles = list(
+            UserProgramRole.objects.filter(user=request.user, status="active")
+            .values_list("program_id", "role")
+        )
+        request._active_program_roles = roles
+    return roles
+
+
+def _badge_count(cache_key, count):
+    """Nav badge count, cached 1 minute and only computed when rendered.
+
+    Resolves to None for zero so {% if %} hides the badge.
+    """
+    def resolve():
+        value = cache.get(cache_key)
+        if value is None:
+            value = count()
+            cache.set(cache_key, value, 60)  # 1 min cache
+        return value if value > 0 else None
+
+    return SimpleLazyObject(resolve)
+
+
 def user_roles(request):
     """Inject the user's role information into all templates.
 
@@ -88,8 +105,10 @@ def user_roles(request):
     - is_admin_only: admin with no program roles (cannot see client data)
     - is_executive_only: executive role with no other roles (dashboard only)
     - is_receptionist_only: all program roles are front desk (no group/clinical access)
-    - user_permissions: dict of permission keys (dots → underscores) to resolved levels
-      e.g. user_permissions.note_view, user_permissions.client_edit
+    - user_permissions: read-only mapping of permission keys (dots → underscores)
+      to whether the role has them, e.g. user_permissions.note_view
+    - permission_version: changes whenever the user's admin flag or roles do;
+      part of the cache key for the nav menu in base.html
     """
     if not hasattr(request, "user") or not request.user.is_authenticated:
         return {
@@ -98,15 +117,14 @@ def user_roles(request):
             "is_executive_only": False,
             "is_receptionist_only": False,
             "user_permissions": {},
+            "permission_version": "",
         }
 
     from apps.auth_app.constants import ROLE_RANK
-    from apps.auth_app.permissions import DENY, PERMISSIONS
+    from apps.auth_app.permissions import template_permissions
     from apps.programs.models import UserProgramRole
 
-    roles = set(
-        UserProgramRole.objects.filter(user=request.user, status="active").values_list("role", flat=True)
-    )
+    roles = {role for _program_id, role in _active_roles(request)}
     has_roles = bool(roles)
 
     # Export access: admins, program managers, and executives can create reports
@@ -119,15 +137,12 @@ def user_roles(request):
     # Front desk only: user has program roles but all of them are front desk
     is_receptionist_only = has_roles and roles == {"receptionist"}
 
-    # Build user_permissions dict using the user's highest role.
+    # user_permissions for the user's highest role, precompiled per role.
     # Keys use underscores so templates can access e.g. user_permissions.note_view
     user_permissions = {}
     if has_roles:
         highest_role = max(roles, key=lambda r: ROLE_RANK.get(r, 0))
-        role_perms = PERMISSIONS.get(highest_role, {})
-        for perm_key, level in role_perms.items():
-            template_key = perm_key.replace(".", "_")
-            user_permissions[template_key] = level != DENY
+        user_permissions = template_permissions(highest_role)
 
     return {
         "has_program_roles": has_roles,
@@ -136,6 +151,9 @@ def user_roles(request):
         "is_receptionist_only": is_receptionist_only,
         "has_export_access": has_export_access,
         "user_permissions": user_permissions,
+        # Permissions are compiled per role at import, so the admin flag and
+        # role set fully determine what the nav shows.
+        "permission_version": "{}:{}".format(int(request.user.is_admin), ",".join(sorted(roles))),
     }
 
 
@@ -154,7 +172,7 @@ def document_storage(request):
 def pending_submissions(request):
     """Inject pending registration submissions count for admin badge.
 
-    Only calculated for admin users to avoid unnecessary queries.
+    Only offered to admin users; the count is lazy (see _badge_count).
     """
     if not hasattr(request, "user") or not request.user.is_authenticated:
         return {}
@@ -162,55 +180,48 @@ def pending_submissions(request):
     if not request.user.is_admin:
         return {}
 
-    from apps.registration.models import RegistrationSubmission
+    def count():
+        from apps.registration.models import RegistrationSubmission
+
+        return RegistrationSubmission.objects.filter(status="pending").count()
 
-    count = cache.get("pending_submissions_count")
-    if count is None:
-        count = RegistrationSubmission.objects.filter(status="pending").count()
-        cache.set("pending_submissions_count", count, 60)  # 1 min cache
-    return {"pending_submissions_count": count if count > 0 else None}
+    return {"pending_submissions_count": _badge_count("pending_submissions_count", count)}
 
 
 def pending_erasures(request):
     """Inject pending erasure request count for admin/PM nav badge.
 
-    PMs see count for their programs; admins see all. Cached 1 minute.
+    PMs see count for their programs; admins see all. Cached 1 minute and
+    lazy (see _badge_count).
     """
     if not hasattr(request, "user") or not request.user.is_authenticated:
         return {}
 
-    from apps.programs.models import UserProgramRole
-
-    is_pm = UserProgramRole.objects.filter(
-        user=request.user, role="program_manager", status="active",
-    ).exists()
+    pm_program_ids = {
+        program_id for program_id, role in _active_roles(request)
+        if role == "program_manager"
+    }
 
-    if not request.user.is_admin and not is_pm:
+    if not request.user.is_admin and not pm_program_ids:
         return {}
 
-    cache_key = f"pending_erasure_count_{request.user.pk}"
-    count = cache.get(cache_key)
-    if count is None:
+    is_admin = request.user.is_admin
+
+    def count():
         from apps.clients.models import ErasureRequest
 
-        if request.user.is_admin:
-            count = ErasureRequest.objects.filter(status="pending").count()
-        else:
-            # PM-scoped: count requests where at least one required program is theirs
-            # Filters in Python — works on all DB backends (SQLite + PostgreSQL)
-            pm_program_ids = list(
-                UserProgramRole.objects.filter(
-                    user=request.user, role="program_manager", status="active",
-                ).values_list("program_id", flat=True)
-            )
-            pids_set = set(pm_program_ids)
-            pending = ErasureRequest.objects.filter(status="pending")
-            count = sum(
-                1 for r in pending
-                if pids_set & set(r.programs_required or [])
-            )
-        cache.set(cache_key, count, 60)  # 1 min cache
-    return {"pending_erasure_count": count if count > 0 else None}
+        if is_admin:
+            return ErasureRequest.objects.filter(status="pending").count()
+        # PM-scoped: count requests where at least one required program is theirs
+        # Filters in Python — works on all DB backends (SQLite + PostgreSQL)
+        pending = ErasureRequest.objects.filter(status="pending")
+        return sum(
+            1 for r in pending
+            if pm_program_ids & set(r.programs_required or [])
+        )
+
+    cache_key = f"pending_erasure_count_{request.user.pk}"
+    return {"pending_erasure_count": _badge_count(cache_key, count)}
 
 
 def pending_recommendations(request):
@@ -218,35 +229,32 @@ def pending_recommendations(request):
 
     Matrix-driven: finds programs where the user's role grants
     alert.review_cancel_recommendation, so changes to the permissions
-    matrix take effect automatically.
+    matrix take effect automatically. The count is lazy (see _badge_count).
     """
     if not hasattr(request, "user") or not request.user.is_authenticated:
         return {}
 
     from apps.auth_app.permissions import DENY, can_access
-    from apps.programs.models import UserProgramRole
 
     reviewer_program_ids = [
-        role_obj.program_id
-        for role_obj in UserProgramRole.objects.filter(
-            user=request.user, status="active",
-        )
-        if can_access(role_obj.role, "alert.review_cancel_recommendation") != DENY
+        program_id
+        for program_id, role in _active_roles(request)
+        if can_access(role, "alert.review_cancel_recommendation") != DENY
     ]
 
     if not reviewer_program_ids:
         return {}
 
-    cache_key = f"pending_recommendation_count_{request.user.pk}"
-    count = cache.get(cache_key)
-    if count is None:
+    def count():
         from apps.events.models import AlertCancellationRecommendation
-        count = AlertCancellationRecommendation.objects.filter(
+
+        return AlertCancellationRecommendation.objects.filter(
             status="pending",
             alert__author_program_id__in=reviewer_program_ids,
         ).count()
-        cache.set(cache_key, count, 60)  # 1 min cache
-    return {"pending_recommendation_count": count if count > 0 else None}
+
+    cache_key = f"pending_recommendation_count_{request.user.pk}"
+    return {"pending_recommendation_count": _badge_count(cache_key, count)}
 
 
 def portal_context(request):
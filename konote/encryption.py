@@ -26,13 +26,36 @@ Usage in models:
             self._name_encrypted = encrypt_field(value)
 """
 import logging
+import sys
+import time
 
 from cryptography.fernet import Fernet, InvalidToken, MultiFernet
 from django.conf import settings
 
+from konote.metrics import Counter, Histogram, metrics_enabled, register
+from konote.profiling import track_decrypt
+
 logger = logging.getLogger(__name__)
 
 _fernet = None
+_rotation_keys = []  # Individual keys behind a MultiFernet, newest first
+
+CALLS = register(Counter(
+    "konote_encryption_calls_total", "Field encrypt/decrypt calls.", ("op", "site"),
+))
+BYTES = register(Counter(
+    "konote_encryption_bytes_total", "Ciphertext bytes produced or decrypted.", ("op", "site"),
+))
+FAILURES = register(Counter(
+    "konote_encryption_failures_total", "Decryptions that failed with InvalidToken.", ("site",),
+))
+KEY_INDEX = register(Counter(
+    "konote_decryption_key_index_total",
+    "Successful decryptions by FIELD_ENCRYPTION_KEY position (0 = current key).", ("index",),
+))
+SECONDS = register(Histogram(
+    "konote_encryption_seconds", "Time spent in field encrypt/decrypt.", ("op", "site"),
+))
 
 
 def _get_fernet():
@@ -41,7 +64,7 @@ def _get_fernet():
     Supports comma-separated keys for rotation. The first key is used
     for encryption; all keys are tried for decryption.
     """
-    global _fernet
+    global _fernet, _rotation_keys
     if _fernet is None:
         key_string = settings.FIELD_ENCRYPTION_KEY
         if not key_string:
@@ -55,17 +78,76 @@ def _get_fernet():
         ]
         if len(fernet_instances) == 1:
             _fernet = fernet_instances[0]
+            _rotation_keys = []
         else:
             _fernet = MultiFernet(fernet_instances)
+            _rotation_keys = fernet_instances
     return _fernet
 
 
+def _call_site():
+    """Label for the code calling encrypt_field/decrypt_field.
+
+    Model properties have a qualified name like "ClientFile.first_name";
+    anything else is labelled module.function.
+    """
+    frame = sys._getframe(2)
+    code = frame.f_code
+    qualname = getattr(code, "co_qualname", code.co_name)
+    if "." in qualname and "<" not in qualname:
+        return qualname
+    return f"{frame.f_globals.get('__name__', '?')}.{code.co_name}"
+
+
+def _decrypt_with_key_index(f, ciphertext):
+    """Decrypt, returning (plaintext_bytes, index of the key that worked).
+
+    Tries rotation keys in the same order MultiFernet does.
+    """
+    if isinstance(f, MultiFernet) and _rotation_keys:
+        for index, key in enumerate(_rotation_keys):
+            try:
+                return key.decrypt(ciphertext), index
+            except InvalidToken:
+                continue
+        raise InvalidToken
+    return f.decrypt(ciphertext), 0
+
+
 def encrypt_field(plaintext):
     """Encrypt a string value. Returns bytes for storage in BinaryField."""
     if plaintext is None or plaintext == "":
         return b""
     f = _get_fernet()
-    return f.encrypt(plaintext.encode("utf-8"))
+    if not metrics_enabled():
+        return f.encrypt(plaintext.encode("utf-8"))
+
+    site = _call_site()
+    start = time.perf_counter()
+    token = f.encrypt(plaintext.encode("utf-8"))
+    SECONDS.observe(time.perf_counter() - start, "encrypt", site)
+    CALLS.inc("encrypt", site)
+    BYTES.inc("encrypt", site, amount=len(token))
+    return token
+
+
+def encrypt_many(plaintexts):
+    """Encrypt a batch of strings for bulk_create loaders.
+
+    Same result as [encrypt_field(p) for p in plaintexts], but looks the
+    cipher up once and records metrics once for the whole batch.
+    """
+    f = _get_fernet()
+    if not metrics_enabled():
+        return [f.encrypt(p.encode("utf-8")) if p else b"" for p in plaintexts]
+
+    site = _call_site()
+    start = time.perf_counter()
+    tokens = [f.encrypt(p.encode("utf-8")) if p else b"" for p in plaintexts]
+    SECONDS.observe(time.perf_counter() - start, "encrypt", site)
+    CALLS.inc("encrypt", site, amount=len(tokens))
+    BYTES.inc("encrypt", site, amount=sum(len(t) for t in tokens))
+    return tokens
 
 
 def decrypt_field(ciphertext):
@@ -73,13 +155,31 @@ def decrypt_field(ciphertext):
     if not ciphertext:
         return ""
     f = _get_fernet()
+    if isinstance(ciphertext, memoryview):
+        ciphertext = bytes(ciphertext)
+    if not metrics_enabled():
+        try:
+            with track_decrypt():  # Counted in the request profile, if one is active
+                return f.decrypt(ciphertext).decode("utf-8")
+        except InvalidToken:
+            logger.error("Decryption failed — possible key mismatch or data corruption")
+            return ""
+
+    site = _call_site()
+    CALLS.inc("decrypt", site)
+    BYTES.inc("decrypt", site, amount=len(ciphertext))
+    start = time.perf_counter()
     try:
-        if isinstance(ciphertext, memoryview):
-            ciphertext = bytes(ciphertext)
-        return f.decrypt(ciphertext).decode("utf-8")
+        with track_decrypt():
+            plaintext, key_index = _decrypt_with_key_index(f, ciphertext)
     except InvalidToken:
+        FAILURES.inc(site)
         logger.error("Decryption failed — possible key mismatch or data corruption")
         return ""
+    finally:
+        SECONDS.observe(time.perf_counter() - start, "decrypt", site)
+    KEY_INDEX.inc(str(key_index))
+    return plaintext.decode("utf-8")
 
 
 def generate_key():
@@ -0,0 +1,150 @@
+"""
+In-process metrics in the Prometheus text exposition format.
+
+A deliberately small registry — counters and histograms with labels —
+so the hot paths that report here (currently konote.encryption) don't
+need the prometheus_client package. Values are per worker process, and
+each scrape is answered by whichever worker gets the request, so every
+series carries a pid label: each worker's counters then only ever go up
+(a restarted worker starts a new series). Aggregate across workers in the
+query, e.g. sum without (pid) (rate(konote_encryption_calls_total[5m])).
+
+Collection is off unless METRICS_ENABLED is set. Instrumented code checks
+metrics_enabled() first, so the cost when nobody scrapes is one settings
+lookup per call. The /metrics endpoint requires "Authorization: Bearer
+<METRICS_TOKEN>", and returns 404 while disabled or while no token is
+set, so enabling collection never makes it publicly readable.
+"""
+import hmac
+import os
+import threading
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.views.decorators.http import require_GET
+
+# Bucket bounds in seconds — Fernet on short PII strings is microseconds
+DEFAULT_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.01)
+
+
+def metrics_enabled():
+    return getattr(settings, "METRICS_ENABLED", False)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    # Read at render time: gunicorn forks workers after this module is imported.
+    pairs.append(f'pid="{os.getpid()}"')
+    pairs += [f'{name}="{value}"' for name, value in extra]
+    return "{" + ",".join(pairs) + "}"
+
+
+class Counter:
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels):
+        return self._values.get(labels, 0)
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._values = {}  # labels -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[i] += 1
+                    break
+            entry[-2] += value
+            entry[-1] += 1
+
+    def count(self, *labels):
+        entry = self._values.get(labels)
+        return entry[-1] if entry else 0
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((labels, list(entry)) for labels, entry in self._values.items())
+        for labels, entry in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets, entry):
+                cumulative += n
+                le = _format_labels(self.labelnames, labels, extra=(("le", repr(bound)),))
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            le = _format_labels(self.labelnames, labels, extra=(("le", "+Inf"),))
+            lines.append(f"{self.name}_bucket{le} {entry[-1]}")
+            label_str = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_str} {entry[-2]}")
+            lines.append(f"{self.name}_count{label_str} {entry[-1]}")
+        return lines
+
+
+_registry = []
+
+
+def register(metric):
+    _registry.append(metric)
+    return metric
+
+
+def render_metrics():
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def reset_metrics():
+    for metric in _registry:
+        metric.reset()
+
+
+@require_GET
+def metrics_view(request):
+    """Prometheus scrape endpoint."""
+    token = getattr(settings, "METRICS_TOKEN", "")
+    if not metrics_enabled() or not token:
+        raise Http404
+    supplied = request.headers.get("Authorization", "").removeprefix("Bearer ")
+    if not hmac.compare_digest(supplied.encode(), token.encode()):
+        return HttpResponse("Unauthorized", status=401, content_type="text/plain")
+    return HttpResponse(render_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8")
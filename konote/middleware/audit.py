@@ -1,9 +1,10 @@
 """Audit logging middleware — logs state-changing requests and client views."""
 import logging
-import re
 
 from django.utils import timezone
+from django.utils.deprecation import MiddlewareMixin
 
+from konote.routing import route_for
 from konote.utils import get_client_ip
 
 logger = logging.getLogger(__name__)
@@ -11,16 +12,8 @@ logger = logging.getLogger(__name__)
 # HTTP methods that change state
 AUDITABLE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
 
-# URL patterns for client record views (GET requests to log for compliance)
-# Includes both main app and Django admin paths.
-CLIENT_VIEW_PATTERNS = [
-    re.compile(r"^/clients/(\d+)/?$"),                          # /clients/123/
-    re.compile(r"^/clients/(\d+)/"),                             # /clients/123/anything
-    re.compile(r"^/django-admin/clients/clientfile/(\d+)/"),     # Django admin client view
-]
 
-
-class AuditMiddleware:
+class AuditMiddleware(MiddlewareMixin):
     """
     Automatically log HTTP requests to the audit database.
 
@@ -31,14 +24,13 @@ class AuditMiddleware:
 
     Captures: user, action, path, IP address, timestamp, confidential context.
     Detailed field-level changes are logged via model signals in the audit app.
-    """
 
-    def __init__(self, get_response):
-        self.get_response = get_response
-
-    def __call__(self, request):
-        response = self.get_response(request)
+    Written as a MiddlewareMixin hook. Under ASGI, MiddlewareMixin awaits
+    the rest of the chain directly and runs the hook (and so the audit
+    write) through sync_to_async in a worker thread.
+    """
 
+    def process_response(self, request, response):
         # Log portal participant access
         if hasattr(request, "participant_user") and request.participant_user:
             if request.method in AUDITABLE_METHODS or request.path.startswith("/my/"):
@@ -48,8 +40,12 @@ class AuditMiddleware:
         if not hasattr(request, "user") or not request.user.is_authenticated:
             return response
 
+        # Client record views: /clients/<id>/... and the Django admin client
+        # view, from the shared routing table (konote.routing)
+        client_view_id = route_for(request).client_view_id
+
         # Log failed access attempts on client records (403) — DV audit signal
-        if response.status_code == 403 and self._is_client_view(request.path):
+        if response.status_code == 403 and client_view_id is not None:
             self._log_request(request, response, action="access_denied")
             return response
 
@@ -62,26 +58,11 @@ class AuditMiddleware:
             self._log_request(request, response, action=request.method.lower())
 
         # Log client record views for compliance (PIPEDA, healthcare regs)
-        elif request.method == "GET" and self._is_client_view(request.path):
+        elif request.method == "GET" and client_view_id is not None:
             self._log_request(request, response, action="view")
 
         return response
 
-    def _is_client_view(self, path):
-        """Check if path is a client record view."""
-        for pattern in CLIENT_VIEW_PATTERNS:
-            if pattern.match(path):
-                return True
-        return False
-
-    def _extract_client_id_from_path(self, path):
-        """Extract client ID from a client view URL pattern."""
-        for pattern in CLIENT_VIEW_PATTERNS:
-            match = pattern.match(path)
-            if match:
-                return int(match.group(1))
-        return None
-
     def _check_confidential_context(self, client_id):
         """Check if client is enrolled in any confidential program.
 
@@ -131,7 +112,7 @@ class AuditMiddleware:
             from apps.audit.models import AuditLog
 
             # Check confidential context for client views
-            client_id = self._extract_client_id_from_path(request.path)
+            client_id = route_for(request).client_view_id
             is_confidential, conf_program_id = self._check_confidential_context(client_id)
 
             # Get user role for audit accountability
@@ -0,0 +1,45 @@
+"""Profiling middleware — Server-Timing header and per-view performance stats."""
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.decorators import sync_and_async_middleware
+
+from konote.profiling import profile, record_view
+
+
+@sync_and_async_middleware
+def ProfilingMiddleware(get_response):
+    """
+    Profile each request (queries, repeated queries, DB time, decryption,
+    total latency) when PROFILING_ENABLED is on.
+
+    - Adds a Server-Timing header, which browser dev tools show under
+      Network > Timing.
+    - Adds the request to the per-view totals shown on the admin
+      performance report (/admin/settings/performance/).
+
+    Goes first in MIDDLEWARE so the total covers the whole stack. When
+    PROFILING_ENABLED is off the middleware removes itself at startup.
+    """
+    if not getattr(settings, "PROFILING_ENABLED", False):
+        raise MiddlewareNotUsed
+
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            with profile() as prof:
+                response = await get_response(request)
+            return _finish(request, response, prof)
+    else:
+        def middleware(request):
+            with profile() as prof:
+                response = get_response(request)
+            return _finish(request, response, prof)
+    return middleware
+
+
+def _finish(request, response, prof):
+    response["Server-Timing"] = prof.server_timing()
+    match = getattr(request, "resolver_match", None)
+    if match is not None:
+        record_view(match.view_name, prof)
+    return response
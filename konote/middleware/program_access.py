@@ -1,46 +1,14 @@
 """RBAC middleware enforcing program-scoped data access."""
-import re
-
 from django.shortcuts import redirect
 from django.template.response import TemplateResponse
+from django.utils.deprecation import MiddlewareMixin
 
 from apps.auth_app.constants import ROLE_RANK
-from apps.auth_app.permissions import DENY, can_access
-
-
-# URL patterns that require program-level access checks
-# Maps URL regex to the URL kwarg containing the client ID
-CLIENT_URL_PATTERNS = [
-    (re.compile(r"^/clients/(?P<client_id>\d+)"), "client_id"),
-    (re.compile(r"^/notes/client/(?P<client_id>\d+)"), "client_id"),
-    (re.compile(r"^/reports/client/(?P<client_id>\d+)"), "client_id"),
-    (re.compile(r"^/plans/client/(?P<client_id>\d+)"), "client_id"),
-    (re.compile(r"^/events/client/(?P<client_id>\d+)"), "client_id"),
-]
-
-# URL patterns for note-specific routes (look up client from note)
-NOTE_URL_PATTERNS = [
-    re.compile(r"^/notes/(?P<note_id>\d+)"),
-]
-
-# URLs that only admins can access (view decorators handle their own checks)
-ADMIN_ONLY_PATTERNS = [
-    re.compile(r"^/admin/"),
-]
-
-# Exceptions: URLs under /admin/ that have their own permission checks
-# and should NOT be blanket-blocked by the middleware.
-ADMIN_EXEMPT_PATTERNS = [
-    re.compile(r"^/admin/audit/"),            # audit.view: SCOPED for PMs
-    re.compile(r"^/admin/users/"),            # user.manage: SCOPED for PMs
-    re.compile(r"^/admin/templates/"),        # template.plan.manage: SCOPED for PMs
-    re.compile(r"^/admin/settings/note-templates/"),  # template.note.manage: SCOPED for PMs
-    re.compile(r"^/admin/registration/"),     # registration.manage: SCOPED for PMs
-    re.compile(r"^/admin/submissions/"),      # registration.manage: SCOPED for PMs
-]
-
-
-class ProgramAccessMiddleware:
+from apps.auth_app.permissions import all_client_permissions_denied
+from konote.routing import route_for
+
+
+class ProgramAccessMiddleware(MiddlewareMixin):
     """
     Check that the logged-in user has access to the requested resource
     based on their program assignments.
@@ -48,10 +16,14 @@ class ProgramAccessMiddleware:
     - Admin-only users (no program roles) cannot access client data.
     - Other users can only access clients enrolled in their assigned programs.
     - /admin/* routes are restricted to admin users.
-    """
 
-    def __init__(self, get_response):
-        self.get_response = get_response
+    Which paths are client-scoped, note-scoped or admin-only comes from the
+    shared routing table (konote.routing), classified once per request.
+
+    Implemented as a process_request hook (returning None lets the request
+    through). Under ASGI, MiddlewareMixin awaits the rest of the chain
+    directly and runs the hook itself through sync_to_async.
+    """
 
     # CONF9: Paths exempt from forced program selection redirect.
     # These either have their own access control or don't show client data.
@@ -67,10 +39,10 @@ class ProgramAccessMiddleware:
         "/reports/export/",
     )
 
-    def __call__(self, request):
+    def process_request(self, request):
         # Skip for unauthenticated users (login page handles that)
         if not hasattr(request, "user") or not request.user.is_authenticated:
-            return self.get_response(request)
+            return None
 
         path = request.path
 
@@ -82,21 +54,20 @@ class ProgramAccessMiddleware:
         else:
             request.active_program_ids = None
 
+        route = route_for(request)
+
         # Admin-only routes (checked BEFORE program selection — admin routes
         # have their own access control and don't need program context).
         # Some /admin/ sub-paths are exempt because they have their own
-        # @requires_permission decorator (e.g. /admin/audit/ checks audit.view).
-        for pattern in ADMIN_ONLY_PATTERNS:
-            if pattern.match(path):
-                # Check exemptions first — these views enforce their own perms
-                if any(ep.match(path) for ep in ADMIN_EXEMPT_PATTERNS):
-                    break  # fall through to normal request handling
-                if not request.user.is_admin:
-                    return self._forbidden_response(
-                        request,
-                        "Access denied. Admin privileges are required to view this page."
-                    )
-                return self.get_response(request)
+        # @requires_permission decorator (e.g. /admin/audit/ checks audit.view)
+        # and fall through to normal request handling.
+        if route.admin_only:
+            if not request.user.is_admin:
+                return self._forbidden_response(
+                    request,
+                    "Access denied. Admin privileges are required to view this page."
+                )
+            return None
 
         # CONF9: Force program selection for mixed-tier users without a selection.
         # Placed after admin-only check so admin routes aren't affected.
@@ -115,12 +86,8 @@ class ProgramAccessMiddleware:
         from apps.programs.models import UserProgramRole
 
         if self._all_client_permissions_denied(request.user):
-            for pattern, _ in CLIENT_URL_PATTERNS:
-                if pattern.match(path):
-                    return redirect("clients:executive_dashboard")
-            for pattern in NOTE_URL_PATTERNS:
-                if pattern.match(path):
-                    return redirect("clients:executive_dashboard")
+            if route.client_id is not None or route.note_id is not None:
+                return redirect("clients:executive_dashboard")
             # Block access to group views (contain individual member names)
             if path.startswith("/groups/"):
                 return redirect("clients:executive_dashboard")
@@ -129,76 +96,36 @@ class ProgramAccessMiddleware:
                 return redirect("clients:executive_dashboard")
 
         # Client-scoped routes — check program overlap (admins are NOT exempt)
-        for pattern, id_param in CLIENT_URL_PATTERNS:
-            match = pattern.match(path)
-            if match:
-                client_id = match.group("client_id")
-                # BUG-7: Allow immediate access to a just-created client.
-                # The enrollment may not be visible to the middleware query
-                # on the redirect request due to connection timing.
-                just_created = request.session.pop("_just_created_client_id", None)
-                if just_created is not None and str(just_created) == client_id:
-                    request.accessible_client_id = int(client_id)
-                    request.user_program_role = self._get_role_for_client(
-                        request.user, client_id,
-                    )
-                    break
+        if route.client_id is not None:
+            client_id = str(route.client_id)
+            # BUG-7: Allow immediate access to a just-created client.
+            # The enrollment may not be visible to the middleware query
+            # on the redirect request due to connection timing.
+            just_created = request.session.pop("_just_created_client_id", None)
+            if just_created is not None and str(just_created) == client_id:
+                request.accessible_client_id = route.client_id
+                request.user_program_role = self._get_role_for_client(
+                    request.user, client_id,
+                )
+            else:
                 if not self._user_can_access_client(request.user, client_id):
-                    if request.user.is_admin:
-                        return self._forbidden_response(
-                            request,
-                            "Administrators cannot access individual client records. "
-                            "Ask another admin to assign you a program role if you need client access."
-                        )
-                    return self._forbidden_response(
-                        request,
-                        "Access denied. You are not assigned to this client's program."
-                    )
+                    return self._client_denied_response(request)
                 # Store for use in views
-                request.accessible_client_id = int(client_id)
+                request.accessible_client_id = route.client_id
                 # Store user's highest role for this client's programs
                 request.user_program_role = self._get_role_for_client(request.user, client_id)
-                break
 
         # Note-scoped routes (no client_id in URL) — look up client from note
-        for pattern in NOTE_URL_PATTERNS:
-            match = pattern.match(path)
-            if match:
-                note_id = match.group("note_id")
-                client_id = self._get_client_id_from_note(note_id)
-                if client_id:
-                    if not self._user_can_access_client(request.user, client_id):
-                        if request.user.is_admin:
-                            return self._forbidden_response(
-                                request,
-                                "Administrators cannot access individual client records. "
-                                "Ask another admin to assign you a program role if you need client access."
-                            )
-                        return self._forbidden_response(
-                            request,
-                            "Access denied. You are not assigned to this client's program."
-                        )
-                    request.accessible_client_id = client_id
-                    request.user_program_role = self._get_role_for_client(request.user, client_id)
-                break
-
-        return self.get_response(request)
-
-
-    # Permission keys that represent individual client-scoped data access.
-    # If ALL of these are DENY for a user's highest role, that user cannot
-    # see individual client data and should be redirected to the exec dashboard.
-    _CLIENT_SCOPED_KEYS = (
-        "client.view_name", "client.view_contact", "client.view_safety",
-        "client.view_clinical", "client.edit", "client.create",
-        "note.view", "note.create", "note.edit",
-        "plan.view", "plan.edit",
-        "event.view", "event.create",
-        "alert.view", "alert.create",
-        "group.view_roster", "group.view_detail", "group.manage_members",
-        "consent.view", "consent.manage",
-        "intake.view", "intake.edit",
-    )
+        elif route.note_id is not None:
+            client_id = self._get_client_id_from_note(route.note_id)
+            if client_id:
+                if not self._user_can_access_client(request.user, client_id):
+                    return self._client_denied_response(request)
+                request.accessible_client_id = client_id
+                request.user_program_role = self._get_role_for_client(request.user, client_id)
+
+        return None
+
 
     def _all_client_permissions_denied(self, user):
         """Check if the user's highest role has DENY for all client-scoped resources.
@@ -218,10 +145,7 @@ class ProgramAccessMiddleware:
             return False
 
         highest_role = max(roles, key=lambda r: ROLE_RANK.get(r, 0))
-        return all(
-            can_access(highest_role, key) == DENY
-            for key in self._CLIENT_SCOPED_KEYS
-        )
+        return all_client_permissions_denied(highest_role)
 
     def _user_can_access_client(self, user, client_id):
         """Check if user shares at least one program with the client."""
@@ -270,6 +194,19 @@ class ProgramAccessMiddleware:
         except (ValueError, TypeError):
             return None
 
+    def _client_denied_response(self, request):
+        """403 for a client the user shares no program with."""
+        if request.user.is_admin:
+            return self._forbidden_response(
+                request,
+                "Administrators cannot access individual client records. "
+                "Ask another admin to assign you a program role if you need client access."
+            )
+        return self._forbidden_response(
+            request,
+            "Access denied. You are not assigned to this client's program."
+        )
+
     def _forbidden_response(self, request, message):
         """Render a styled 403 error page with the given message."""
         response = TemplateResponse(
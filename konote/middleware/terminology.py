@@ -1,9 +1,10 @@
 """Terminology middleware — makes term overrides available on request."""
 from django.core.cache import cache
+from django.utils.deprecation import MiddlewareMixin
 from django.utils.translation import get_language
 
 
-class TerminologyMiddleware:
+class TerminologyMiddleware(MiddlewareMixin):
     """
     Attach terminology lookup to request object so views can use
     request.get_term('target') to get the customised term.
@@ -11,13 +12,9 @@ class TerminologyMiddleware:
     The term is returned in the current language (from Django's i18n).
     """
 
-    def __init__(self, get_response):
-        self.get_response = get_response
-
-    def __call__(self, request):
+    def process_request(self, request):
         # Lazy-load terms (context processor handles template injection)
         request.get_term = self._get_term_func
-        return self.get_response(request)
 
     @staticmethod
     def _get_term_func(key, default=None, lang=None):
@@ -0,0 +1,249 @@
+"""
+Per-request performance profiling: queries, duplicate queries, DB time,
+field decryption and total latency.
+
+A Profile is active for the duration of profile(). While it is, every SQL
+statement (on any database alias, in any thread the request's context is
+copied to) and every decrypt_field() call is recorded against it. Nothing
+is recorded — and the cost is one ContextVar lookup — when no profile is
+active.
+
+Used by:
+- ProfilingMiddleware (konote/middleware/profiling.py), which adds a
+  Server-Timing header and aggregates per-view stats for the admin
+  performance report when PROFILING_ENABLED is on.
+- assert_query_budget(), which fails a test when a block of code runs more
+  queries (or more repeated queries) than allowed. Exposed to pytest as
+  the `query_budget` fixture in conftest.py.
+"""
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+_current = ContextVar("konote_profile", default=None)
+
+# Literals that vary between otherwise-identical queries. Parameters are
+# normally passed separately, but IN (...) lists still vary in length.
+_IN_LIST_RE = re.compile(r"IN \((?:%s|\?)(?:, (?:%s|\?))*\)")
+_NUMBER_RE = re.compile(r"\b\d+\b")
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+
+
+def fingerprint(sql):
+    """Normalise a SQL statement so N+1 repeats share one fingerprint."""
+    sql = _STRING_RE.sub("?", sql)
+    sql = _NUMBER_RE.sub("?", sql)
+    return _IN_LIST_RE.sub("IN (...)", sql)
+
+
+class Profile:
+    """Counters for one request (or one profiled block)."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.finished = None
+        self.query_count = 0
+        self.db_time = 0.0
+        self.fingerprints = Counter()
+        self.decrypt_count = 0
+        self.decrypt_time = 0.0
+        self._lock = threading.Lock()
+
+    def record_query(self, sql, duration):
+        with self._lock:
+            self.query_count += 1
+            self.db_time += duration
+            self.fingerprints[fingerprint(sql)] += 1
+
+    def record_decrypt(self, duration):
+        with self._lock:
+            self.decrypt_count += 1
+            self.decrypt_time += duration
+
+    def finish(self):
+        self.finished = time.perf_counter()
+
+    @property
+    def total_time(self):
+        return (self.finished or time.perf_counter()) - self.started
+
+    @property
+    def duplicates(self):
+        """{fingerprint: count} for statements run more than once."""
+        return {fp: n for fp, n in self.fingerprints.items() if n > 1}
+
+    @property
+    def duplicate_count(self):
+        """Number of executions that repeated an earlier statement."""
+        return sum(n - 1 for n in self.fingerprints.values())
+
+    def server_timing(self):
+        """Value for the Server-Timing response header (durations in ms)."""
+        return ", ".join([
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.query_count} queries, {self.duplicate_count} repeated"',
+            f'decrypt;dur={self.decrypt_time * 1000:.1f};desc="{self.decrypt_count} fields"',
+            f"total;dur={self.total_time * 1000:.1f}",
+        ])
+
+
+def active_profile():
+    return _current.get()
+
+
+@contextmanager
+def profile():
+    """Profile the enclosed block; yields the Profile."""
+    _install_query_hooks()
+    prof = Profile()
+    token = _current.set(prof)
+    try:
+        yield prof
+    finally:
+        prof.finish()
+        _current.reset(token)
+
+
+# -- Hooks ------------------------------------------------------------------
+
+def _record_query(execute, sql, params, many, context):
+    prof = _current.get()
+    if prof is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        prof.record_query(sql, time.perf_counter() - start)
+
+
+def _add_wrapper(connection):
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+def _on_connection_created(sender, connection, **kwargs):
+    _add_wrapper(connection)
+
+
+def _install_query_hooks():
+    """Make sure this thread's connections, and any opened later, are hooked."""
+    for conn in connections.all(initialized_only=True):
+        _add_wrapper(conn)
+
+
+connection_created.connect(_on_connection_created, dispatch_uid="konote_profiling")
+
+
+@contextmanager
+def track_decrypt():
+    """Time a field decryption against the active profile, if any."""
+    prof = _current.get()
+    if prof is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        prof.record_decrypt(time.perf_counter() - start)
+
+
+# -- Per-view aggregates (admin performance report) --------------------------
+
+class ViewStats:
+    """Running totals for one view in this worker process."""
+
+    def __init__(self):
+        self.requests = 0
+        self.queries = 0
+        self.max_queries = 0
+        self.duplicates = 0
+        self.db_time = 0.0
+        self.decrypts = 0
+        self.decrypt_time = 0.0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.top_duplicates = Counter()
+
+    def add(self, prof):
+        self.requests += 1
+        self.queries += prof.query_count
+        self.max_queries = max(self.max_queries, prof.query_count)
+        self.duplicates += prof.duplicate_count
+        self.db_time += prof.db_time
+        self.decrypts += prof.decrypt_count
+        self.decrypt_time += prof.decrypt_time
+        self.total_time += prof.total_time
+        self.max_time = max(self.max_time, prof.total_time)
+        self.top_duplicates.update(prof.duplicates)
+
+    def as_row(self, view_name):
+        n = self.requests or 1
+        return {
+            "view": view_name,
+            "requests": self.requests,
+            "avg_queries": round(self.queries / n, 1),
+            "max_queries": self.max_queries,
+            "avg_duplicates": round(self.duplicates / n, 1),
+            "avg_db_ms": round(self.db_time / n * 1000, 1),
+            "avg_decrypts": round(self.decrypts / n, 1),
+            "avg_decrypt_ms": round(self.decrypt_time / n * 1000, 1),
+            "avg_ms": round(self.total_time / n * 1000, 1),
+            "max_ms": round(self.max_time * 1000, 1),
+            "top_duplicates": self.top_duplicates.most_common(3),
+        }
+
+
+_view_stats = {}
+_view_stats_lock = threading.Lock()
+
+
+def record_view(view_name, prof):
+    with _view_stats_lock:
+        _view_stats.setdefault(view_name, ViewStats()).add(prof)
+
+
+def view_report():
+    """Per-view rows, slowest (by average latency) first."""
+    with _view_stats_lock:
+        rows = [stats.as_row(name) for name, stats in _view_stats.items()]
+    return sorted(rows, key=lambda r: r["avg_ms"], reverse=True)
+
+
+def reset_view_stats():
+    with _view_stats_lock:
+        _view_stats.clear()
+
+
+# -- Test helper --------------------------------------------------------------
+
+@contextmanager
+def assert_query_budget(max_queries, max_duplicates=None, label=""):
+    """Fail if the enclosed block runs more than max_queries statements.
+
+    max_duplicates, if given, caps repeated statements (the N+1 signature).
+    The failure message lists the most repeated fingerprints.
+    """
+    with profile() as prof:
+        yield prof
+    problems = []
+    if prof.query_count > max_queries:
+        problems.append(f"{prof.query_count} queries (budget {max_queries})")
+    if max_duplicates is not None and prof.duplicate_count > max_duplicates:
+        problems.append(f"{prof.duplicate_count} repeated queries (budget {max_duplicates})")
+    if problems:
+        repeats = "\n".join(
+            f"  {n}x {fp[:200]}"
+            for fp, n in Counter(prof.duplicates).most_common(5)
+        )
+        raise AssertionError(
+            f"Query budget exceeded{f' for {label}' if label else ''}: "
+            + "; ".join(problems)
+            + (f"\nMost repeated:\n{repeats}" if repeats else "")
+        )
@@ -0,0 +1,103 @@
+"""URL classification shared by middleware and context processors.
+
+Several layers need to know what kind of page a path is: program access
+checks (client- and note-scoped routes, admin-only routes), audit logging
+(client record views) and the nav highlight. Each used to run its own
+regex list or prefix chain, some of them twice per request. The rules now
+live here as two combined patterns compiled at import, and classify()
+runs them once per request; route_for() caches the result on the request
+(request.route_info).
+
+Order inside each pattern matters — the first matching alternative wins,
+so more specific routes come first.
+"""
+import re
+from dataclasses import dataclass
+
+# -- Access and audit rules -------------------------------------------------
+
+# Routes whose first numeric segment is a client ID (program access check)
+CLIENT_SCOPED_PREFIXES = ("clients", "notes/client", "reports/client", "plans/client", "events/client")
+
+# Under /admin/ but with their own @requires_permission checks, so the
+# middleware must not blanket-block them.
+ADMIN_EXEMPT_PREFIXES = (
+    "audit/",                   # audit.view: SCOPED for PMs
+    "users/",                   # user.manage: SCOPED for PMs
+    "templates/",               # template.plan.manage: SCOPED for PMs
+    "settings/note-templates/",  # template.note.manage: SCOPED for PMs
+    "registration/",            # registration.manage: SCOPED for PMs
+    "submissions/",             # registration.manage: SCOPED for PMs
+)
+
+_ROUTE_RE = re.compile(
+    r"^/(?:"
+    # Client record views, logged by AuditMiddleware: /clients/123 or /clients/123/...
+    r"clients/(?P<client_view_id>\d+)(?=/|$)"
+    # Django admin client view — audited, but not a program-scoped route
+    r"|django-admin/clients/clientfile/(?P<admin_client_view_id>\d+)/"
+    # Other client-scoped routes (prefix match, as the URL confs use)
+    r"|(?:" + "|".join(re.escape(p) for p in CLIENT_SCOPED_PREFIXES) + r")/(?P<client_id>\d+)"
+    # Note-scoped routes (client looked up from the note)
+    r"|notes/(?P<note_id>\d+)"
+    # Admin-only routes, with their exemptions
+    r"|(?P<admin>admin/)(?P<admin_exempt>" + "|".join(re.escape(p) for p in ADMIN_EXEMPT_PREFIXES) + r")?"
+    r")"
+)
+
+# -- Nav highlight ----------------------------------------------------------
+
+# One named group per nav section; the first match wins.
+_NAV_RE = re.compile(
+    r"(?P<recommendations>/events/alerts/recommendations)"
+    r"|(?P<insights>/reports/insights/)"
+    r"|(?P<reports>/reports/)"
+    r"|(?P<programs>/programs/)"
+    r"|(?P<groups>/groups/)"
+    r"|(?P<admin>/(?:admin|erasure|merge)/)"
+    r"|(?P<clients>/(?:clients|plans|notes|events)/|/\Z)"
+)
+
+
+@dataclass(frozen=True)
+class Route:
+    """What the access, audit and nav layers need to know about a path."""
+    client_id: int | None = None        # Client-scoped route (program access check)
+    note_id: int | None = None          # Note-scoped route
+    client_view_id: int | None = None   # Client record view (audit "view" / "access_denied")
+    admin_only: bool = False            # Under /admin/ and not exempt
+    admin_exempt: bool = False          # Under /admin/ with its own permission checks
+    nav_section: str = ""
+
+
+def _int(value):
+    return int(value) if value else None
+
+
+def classify(path):
+    """Classify a URL path against the routing table."""
+    nav = _NAV_RE.match(path)
+    nav_section = nav.lastgroup if nav else ""
+
+    m = _ROUTE_RE.match(path)
+    if m is None:
+        return Route(nav_section=nav_section)
+
+    groups = m.groupdict()
+    return Route(
+        # A client record view is also a client-scoped route
+        client_id=_int(groups["client_id"] or groups["client_view_id"]),
+        note_id=_int(groups["note_id"]),
+        client_view_id=_int(groups["client_view_id"] or groups["admin_client_view_id"]),
+        admin_only=bool(groups["admin"]) and not groups["admin_exempt"],
+        admin_exempt=bool(groups["admin_exempt"]),
+        nav_section=nav_section,
+    )
+
+
+def route_for(request):
+    """Return the Route for this request, classifying the path only once."""
+    route = getattr(request, "route_info", None)
+    if route is None:
+        route = request.route_info = classify(request.path)
+    return route
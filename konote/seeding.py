@@ -0,0 +1,113 @@
+"""Bulk seeding of default rows (metrics, toggles, templates, intake fields).
+
+Seed commands used to call get_or_create once per row: hundreds of queries
+on every container start and every test database setup. A command now
+describes the rows it wants as a SeedSpec, and seed() reads the existing
+rows for the table in one query, creates the missing ones with one
+bulk_create and fixes drifted values with one bulk_update.
+
+Rows are matched on the spec's key fields. As with get_or_create defaults,
+other fields are only written when a row is created, so an agency's edits
+to seeded rows survive. Fields listed in `sync` are owned by the seed and
+brought back in line with the definition on every run.
+
+bulk_create and bulk_update skip save() and model signals. A spec's
+`prepare` hook runs on each new object in place of save() logic (e.g.
+CustomFieldDefinition's validation-type detection), and seed() sends one
+post_save per changed table so the cache-invalidation receivers still run.
+"""
+from dataclasses import dataclass, field
+
+from django.db import models, transaction
+from django.db.models.signals import post_save
+
+
+@dataclass
+class SeedSpec:
+    """The rows a seed command wants in one table.
+
+    rows is a list of dicts of field values, each including the key fields.
+    Foreign keys can be given as model instances.
+    """
+
+    model: type
+    key: tuple
+    rows: list
+    sync: tuple = ()
+    prepare: object = None
+
+
+@dataclass
+class SeedResult:
+    created: list = field(default_factory=list)
+    updated: list = field(default_factory=list)
+    unchanged: list = field(default_factory=list)
+    # key tuple -> saved instance, for seeding child rows
+    objects: dict = field(default_factory=dict)
+
+    def summary(self, label):
+        return (
+            f"{label}: {len(self.created)} created, {len(self.updated)} updated, "
+            f"{len(self.unchanged)} unchanged."
+        )
+
+
+def _value(value):
+    return value.pk if isinstance(value, models.Model) else value
+
+
+def seed(spec):
+    """Create missing rows and sync owned fields for a SeedSpec."""
+    model = spec.model
+    meta = model._meta
+    attnames = {name: meta.get_field(name).attname for name in spec.key}
+
+    def row_key(row):
+        return tuple(_value(row[name]) for name in spec.key)
+
+    def obj_key(obj):
+        return tuple(getattr(obj, attnames[name]) for name in spec.key)
+
+    wanted = {}
+    for row in spec.rows:
+        wanted.setdefault(row_key(row), row)
+
+    # One query for every candidate row; narrowed on the first key field.
+    first = spec.key[0]
+    existing = {}
+    lookup = {f"{attnames[first]}__in": {key[0] for key in wanted}}
+    for obj in model.objects.filter(**lookup).order_by("pk"):
+        existing.setdefault(obj_key(obj), obj)  # Oldest wins, like get_or_create
+
+    result = SeedResult()
+    to_create = []
+    for key, row in wanted.items():
+        obj = existing.get(key)
+        if obj is None:
+            obj = model(**row)
+            if spec.prepare:
+                spec.prepare(obj)
+            to_create.append(obj)
+            result.created.append(obj)
+        elif any(getattr(obj, name) != row[name] for name in spec.sync):
+            for name in spec.sync:
+                setattr(obj, name, row[name])
+            result.updated.append(obj)
+        else:
+            result.unchanged.append(obj)
+        result.objects[key] = obj
+
+    changed = result.created or result.updated
+    if not changed:
+        return result
+
+    with transaction.atomic(using=model.objects.db):
+        if to_create:
+            model.objects.bulk_create(to_create)
+        if result.updated:
+            model.objects.bulk_update(result.updated, list(spec.sync))
+    post_save.send(
+        sender=model, instance=changed[0], created=bool(result.created),
+        update_fields=None, raw=False, using=model.objects.db,
+    )
+    return result
@@ -0,0 +1,155 @@
+"""
+Session engine: database sessions fronted by a cache, with lazy expiry writes.
+
+SESSION_SAVE_EVERY_REQUEST keeps the 30-minute idle timeout sliding, but
+with the plain database engine every page view — and every HTMX partial —
+UPDATEs django_session just to push expire_date forward. This engine:
+
+- Writes to the database straight away whenever session data changes
+  (login, program switch, recent clients, ...).
+- When only the expiry moved, skips the database write unless the stored
+  expire_date is more than SESSION_EXPIRY_SLACK_SECONDS behind. The
+  browser cookie is still refreshed on every request.
+- Serves reads from the session cache when that cache is shared between
+  workers (SESSION_CACHE_URL). The cache entry's own timeout is refreshed
+  on every request, so the idle timeout stays exact while the cache is warm.
+
+With a process-local cache (the default locmem), reads go to the database
+as before: a session deleted by logout on one worker must not live on in
+another worker's memory.
+
+Idle timeout guarantees: a session never outlives SESSION_COOKIE_AGE of
+inactivity. If the cache is cold it can end up to the slack early, because
+the stored expire_date may lag by that much. The expired-session sweep
+(clear_expired, run by `manage.py clearsessions`) waits out the same slack
+so it never removes a session that is still live in the cache, and deletes
+in batches so a large backlog does not hold one long lock.
+"""
+import logging
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.sessions.backends import cached_db
+from django.contrib.sessions.backends.db import SessionStore as DBStore
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EXPIRY_SLACK_SECONDS = 60
+SWEEP_BATCH_SIZE = 1000
+
+# Caches that live inside one worker process. Session reads are never
+# served from these — another worker may have deleted the session.
+PROCESS_LOCAL_CACHES = (LocMemCache, DummyCache)
+
+
+def get_expiry_slack():
+    return timedelta(seconds=getattr(settings, "SESSION_EXPIRY_SLACK_SECONDS", DEFAULT_EXPIRY_SLACK_SECONDS))
+
+
+class SessionStore(cached_db.SessionStore):
+    cache_key_prefix = "konote.sessions."
+
+    def __init__(self, session_key=None):
+        super().__init__(session_key)
+        self._serve_from_cache = not isinstance(self._cache, PROCESS_LOCAL_CACHES)
+        self._db_expiry = None  # expire_date as last written to the database
+        self._loaded_state = None  # Serialised data as loaded, to spot in-place edits
+
+    # -- Loading ------------------------------------------------------------
+
+    def load(self):
+        if self._serve_from_cache:
+            try:
+                entry = self._cache.get(self.cache_key)
+            except Exception:
+                # Some backends (e.g. memcache) raise on invalid keys; fall back to the DB.
+                entry = None
+            if entry is not None:
+                self._db_expiry = entry["db_expiry"]
+                return self._remember(entry["data"])
+
+        s = self._get_session_from_db()
+        if s is None:
+            self._db_expiry = None
+            return self._remember({})
+        data = self.decode(s.session_data)
+        self._db_expiry = s.expire_date
+        if self._serve_from_cache:
+            self._cache_set(data, self.get_expiry_age(expiry=s.expire_date))
+        return self._remember(data)
+
+    async def aload(self):
+        return await sync_to_async(self.load)()
+
+    def _remember(self, data):
+        self._loaded_state = self._serialise(data)
+        return data
+
+    def _serialise(self, data):
+        return self.serializer().dumps(data)
+
+    # -- Saving -------------------------------------------------------------
+
+    def save(self, must_create=False):
+        if self.session_key is None:
+            return self.create()
+        data = self._get_session(no_load=must_create)
+        if not must_create and not self._data_changed(data) and self._stored_expiry_is_fresh():
+            # Only the sliding expiry moved, and not by enough to be worth a write.
+            if self._serve_from_cache:
+                self._cache_set(data, self.get_expiry_age())
+            return
+        DBStore.save(self, must_create=must_create)
+        self._loaded_state = self._serialise(data)
+        if self._serve_from_cache:
+            self._cache_set(data, self.get_expiry_age())
+
+    async def asave(self, must_create=False):
+        return await sync_to_async(self.save)(must_create)
+
+    def create_model_instance(self, data):
+        obj = super().create_model_instance(data)
+        self._db_expiry = obj.expire_date
+        return obj
+
+    def _data_changed(self, data):
+        return self.modified or self._serialise(data) != self._loaded_state
+
+    def _stored_expiry_is_fresh(self):
+        if self._db_expiry is None:
+            return False
+        return self.get_expiry_date() - self._db_expiry < get_expiry_slack()
+
+    def _cache_set(self, data, timeout):
+        try:
+            self._cache.set(self.cache_key, {"data": data, "db_expiry": self._db_expiry}, timeout)
+        except Exception:
+            logger.exception("Error saving session to cache (%s)", self._cache)
+
+    # -- Sweeping -----------------------------------------------------------
+
+    @classmethod
+    def clear_expired(cls, batch_size=SWEEP_BATCH_SIZE):
+        """Delete sessions expired for longer than the slack, in batches.
+
+        Returns the number of sessions deleted.
+        """
+        model = cls.get_model_class()
+        cutoff = timezone.now() - get_expiry_slack()
+        deleted = 0
+        while True:
+            keys = list(
+                model.objects.filter(expire_date__lt=cutoff)
+                .values_list("session_key", flat=True)[:batch_size]
+            )
+            if not keys:
+                return deleted
+            deleted += model.objects.filter(session_key__in=keys).delete()[0]
+
+    @classmethod
+    async def aclear_expired(cls):
+        return await sync_to_async(cls.clear_expired)()
@@ -64,8 +64,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "konote.middleware.profiling.ProfilingMiddleware",  # First, to time the whole stack; off unless PROFILING_ENABLED
     "django.middleware.security.SecurityMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "konote.middleware.static.StaticFilesMiddleware",  # WhiteNoise, async-capable
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -82,14 +83,34 @@ MIDDLEWARE = [
     "csp.middleware.CSPMiddleware",
 ]
 
+# Per-request profiling: Server-Timing header plus the admin performance
+# report (/admin/settings/performance/). Exposes timings to every user, so
+# turn on for investigations rather than leaving it on.
+PROFILING_ENABLED = os.environ.get("PROFILING_ENABLED", "").lower() in ("1", "true", "yes")
+
+# Prometheus metrics (encryption counters) at /metrics. Off by default.
+# The endpoint stays 404 until METRICS_TOKEN is set too; scrapers must send
+# "Authorization: Bearer <token>".
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "").lower() in ("1", "true", "yes")
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+
 ROOT_URLCONF = "konote.urls"
 
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
         "DIRS": [BASE_DIR / "templates"],
-        "APP_DIRS": True,
         "OPTIONS": {
+            # Parse each template once per process. This matches Django's
+            # default for APP_DIRS, but is spelled out so the filesystem and
+            # app-directory loaders are never used uncached. runserver's
+            # autoreloader clears the cache when a template file changes.
+            "loaders": [
+                ("django.template.loaders.cached.Loader", [
+                    "django.template.loaders.filesystem.Loader",
+                    "django.template.loaders.app_directories.Loader",
+                ]),
+            ],
             "context_processors": [
                 "django.template.context_processors.debug",
                 "django.template.context_processors.request",
@@ -152,10 +173,35 @@ AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.NumericPasswordValidator"},
 ]
 
-# Sessions — server-side in database
-SESSION_ENGINE = "django.contrib.sessions.backends.db"
+# Sessions — server-side in database, fronted by a cache (see konote/sessions.py)
+SESSION_ENGINE = "konote.sessions"
 SESSION_COOKIE_AGE = 1800  # 30 minutes
 SESSION_SAVE_EVERY_REQUEST = True  # Reset timeout on activity
+# Expiry-only refreshes are written to the database at most this often
+SESSION_EXPIRY_SLACK_SECONDS = int(os.environ.get("SESSION_EXPIRY_SLACK_SECONDS", "60"))
+# Optional shared cache (Redis URL, requires the redis package) so session
+# reads skip the database. Without it, reads stay in the database.
+SESSION_CACHE_URL = os.environ.get("SESSION_CACHE_URL", "")
+# AI suggestion responses (konote/ai_cache.py) are reused for identical
+# prompts for AI_CACHE_SECONDS; past AI_CACHE_MAX_ENTRIES the least recently
+# used are dropped.
+AI_CACHE_SECONDS = int(os.environ.get("AI_CACHE_SECONDS", str(60 * 60 * 24)))
+AI_CACHE_MAX_ENTRIES = int(os.environ.get("AI_CACHE_MAX_ENTRIES", "500"))
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "ai": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "ai-responses",
+        "TIMEOUT": AI_CACHE_SECONDS,
+        "OPTIONS": {"MAX_ENTRIES": AI_CACHE_MAX_ENTRIES},
+    },
+}
+if SESSION_CACHE_URL:
+    CACHES["sessions"] = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": SESSION_CACHE_URL,
+    }
+    SESSION_CACHE_ALIAS = "sessions"
 SESSION_COOKIE_HTTPONLY = True
 SESSION_COOKIE_SAMESITE = "Lax"
 SESSION_COOKIE_SECURE = True
@@ -306,6 +352,14 @@ OPENROUTER_API_KEY = os.environ.get("OPENROUTER_API_KEY", "")
 OPENROUTER_MODEL = os.environ.get("OPENROUTER_MODEL", "anthropic/claude-sonnet-4-20250514")
 OPENROUTER_SITE_URL = os.environ.get("OPENROUTER_SITE_URL", "https://konote.app")
 
+# Outbound transport (konote/transport.py) — pooled connections to AI, Twilio
+# and SMTP providers. After N consecutive provider failures, calls are
+# refused for RESET_SECONDS so request threads don't queue behind timeouts.
+OUTBOUND_CIRCUIT_FAILURE_THRESHOLD = int(os.environ.get("OUTBOUND_CIRCUIT_FAILURE_THRESHOLD", "5"))
+OUTBOUND_CIRCUIT_RESET_SECONDS = int(os.environ.get("OUTBOUND_CIRCUIT_RESET_SECONDS", "60"))
+OUTBOUND_POOL_MAXSIZE = int(os.environ.get("OUTBOUND_POOL_MAXSIZE", "10"))
+SMTP_POOL_IDLE_SECONDS = int(os.environ.get("SMTP_POOL_IDLE_SECONDS", "60"))
+
 # Logging — errors to stderr so they appear in Railway logs
 LOGGING = {
     "version": 1,
@@ -0,0 +1,357 @@
+"""
+Shared outbound transport — pooled connections and circuit breakers.
+
+Every call to an external provider (OpenRouter, a local Ollama endpoint,
+Twilio, the SMTP relay) goes through this module so that:
+
+- HTTP connections are kept alive and reused per host instead of paying a
+  fresh TCP + TLS handshake on every request.
+- SMTP sessions are reused across messages (e.g. a batch of reminders)
+  instead of logging in to the relay once per email.
+- When a provider is down, a circuit breaker stops new calls for a short
+  cool-off period, so request threads fail fast instead of piling up
+  behind 30-second timeouts.
+
+Breaker state lives in process memory (one set per gunicorn worker).
+Breakers with a health channel also record to SystemHealthCheck, so an
+outage shows up on the same admin screens as messaging failures.
+"""
+import logging
+import smtplib
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_SECONDS = 60
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_SMTP_IDLE_SECONDS = 60
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider whose circuit breaker is open."""
+
+    def __init__(self, name):
+        super().__init__(f"{name} is temporarily unavailable (circuit open)")
+        self.name = name
+
+
+# ---------------------------------------------------------------------------
+# Circuit breaker
+# ---------------------------------------------------------------------------
+
+class CircuitBreaker:
+    """Classic closed → open → half-open breaker for one external provider.
+
+    - closed: calls go through; consecutive provider failures are counted.
+    - open: after `failure_threshold` failures in a row, calls are refused
+      (CircuitOpenError) until `reset_seconds` have passed.
+    - half-open: one trial call is let through. Success closes the circuit,
+      failure re-opens it for another cool-off period.
+
+    Thresholds are read from settings on each use so override_settings works
+    in tests.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name, health_channel=None):
+        self.name = name
+        self.health_channel = health_channel
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+    @property
+    def failure_threshold(self):
+        return getattr(settings, "OUTBOUND_CIRCUIT_FAILURE_THRESHOLD", DEFAULT_FAILURE_THRESHOLD)
+
+    @property
+    def reset_seconds(self):
+        return getattr(settings, "OUTBOUND_CIRCUIT_RESET_SECONDS", DEFAULT_RESET_SECONDS)
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._state == self.OPEN and self._cooled_off():
+                return self.HALF_OPEN
+            return self._state
+
+    def _cooled_off(self):
+        return time.monotonic() - self._opened_at >= self.reset_seconds
+
+    def allow(self):
+        """Return True if a call may be attempted right now."""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN:
+                if not self._cooled_off():
+                    return False
+                self._state = self.HALF_OPEN
+                self._trial_in_flight = False
+            # Half-open: only one trial call at a time
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self):
+        """The provider answered — close the circuit and reset the counter."""
+        with self._lock:
+            recovered = self._state != self.CLOSED
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+        if recovered:
+            logger.info("Outbound provider %s recovered — circuit closed", self.name)
+        self._record_health(success=True)
+
+    def record_failure(self, reason=""):
+        """The provider failed (timeout, connection error, 5xx)."""
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            tripped = (
+                self._state == self.HALF_OPEN
+                or self._failures >= self.failure_threshold
+            )
+            newly_open = tripped and self._state != self.OPEN
+            if tripped:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+        if newly_open:
+            logger.warning(
+                "Outbound provider %s marked unavailable for %ss after %s failures: %s",
+                self.name, self.reset_seconds, self._failures, reason,
+            )
+        self._record_health(success=False, reason=reason)
+
+    def reset(self):
+        """Force the breaker closed (used by tests and admin tooling)."""
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._opened_at = 0.0
+            self._trial_in_flight = False
+
+    def _record_health(self, success, reason=""):
+        if not self.health_channel:
+            return
+        from apps.communications.models import SystemHealthCheck
+
+        # Health bookkeeping must never turn a working call into a failure.
+        try:
+            if success:
+                SystemHealthCheck.record_success(self.health_channel)
+            else:
+                SystemHealthCheck.record_failure(self.health_channel, reason)
+        except Exception:
+            logger.exception("Could not record health for %s", self.health_channel)
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name, health_channel=None):
+    """Return the process-wide breaker for a provider, creating it on first use."""
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(name, health_channel=health_channel)
+            _breakers[name] = breaker
+        return breaker
+
+
+def reset_breakers():
+    """Close every breaker — for tests."""
+    with _breakers_lock:
+        for breaker in _breakers.values():
+            breaker.reset()
+
+
+def is_provider_failure(exc):
+    """Return True if an exception means the provider itself is unhealthy.
+
+    Client-side errors (invalid phone number, bad request, rejected
+    recipient) mean the provider is up and answering, so they must not
+    trip the breaker.
+    """
+    if isinstance(exc, (requests.ConnectionError, requests.Timeout)):
+        return True
+    if isinstance(exc, requests.HTTPError) and exc.response is not None:
+        status = exc.response.status_code
+        return status >= 500 or status == 429
+    if isinstance(exc, (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused)):
+        return False
+    # Twilio's TwilioRestException carries the HTTP status as `.status`
+    status = getattr(exc, "status", None)
+    if isinstance(status, int):
+        return status >= 500 or status == 429
+    return True
+
+
+# ---------------------------------------------------------------------------
+# HTTP — keep-alive session pool per host
+# ---------------------------------------------------------------------------
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def get_http_session(url):
+    """Return a keep-alive requests.Session shared by all calls to url's host."""
+    parts = urlsplit(url)
+    key = f"{parts.scheme}://{parts.netloc}"
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            pool_size = getattr(settings, "OUTBOUND_POOL_MAXSIZE", DEFAULT_POOL_MAXSIZE)
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+            session.mount(f"{parts.scheme}://", adapter)
+            _sessions[key] = session
+        return session
+
+
+def http_post(url, breaker, **kwargs):
+    """POST through the pooled session for url's host, guarded by breaker.
+
+    Raises CircuitOpenError without touching the network while the breaker
+    is open. Otherwise behaves like requests.post followed by
+    raise_for_status(), and returns the response.
+    """
+    if not breaker.allow():
+        raise CircuitOpenError(breaker.name)
+    try:
+        resp = get_http_session(url).post(url, **kwargs)
+        resp.raise_for_status()
+    except Exception as exc:
+        if is_provider_failure(exc):
+            breaker.record_failure(str(exc)[:255])
+        else:
+            breaker.record_success()
+        raise
+    breaker.record_success()
+    return resp
+
+
+# ---------------------------------------------------------------------------
+# Twilio — one client (and HTTP session) per credentials
+# ---------------------------------------------------------------------------
+
+_twilio_clients = {}
+_twilio_lock = threading.Lock()
+
+
+def get_twilio_client():
+    """Return a cached Twilio REST client for the configured account.
+
+    Raises ImportError if the twilio package is not installed.
+    """
+    from twilio.http.http_client import TwilioHttpClient
+    from twilio.rest import Client as TwilioClient
+
+    key = (settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN)
+    with _twilio_lock:
+        client = _twilio_clients.get(key)
+        if client is None:
+            client = TwilioClient(
+                settings.TWILIO_ACCOUNT_SID,
+                settings.TWILIO_AUTH_TOKEN,
+                http_client=TwilioHttpClient(pool_connections=True),
+            )
+            _twilio_clients[key] = client
+        return client
+
+
+# ---------------------------------------------------------------------------
+# SMTP — one reusable connection per thread
+# ---------------------------------------------------------------------------
+
+_smtp_local = threading.local()
+
+
+def _close_mail_connection():
+    conn = getattr(_smtp_local, "connection", None)
+    _smtp_local.connection = None
+    if conn is not None:
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+def get_mail_connection():
+    """Return this thread's open mail connection, reopening it when stale.
+
+    The connection is keyed by EMAIL_BACKEND so tests that swap the backend
+    get a fresh one. Connections idle longer than SMTP_POOL_IDLE_SECONDS are
+    closed first, since most relays drop idle sessions on their own.
+    """
+    from django.core.mail import get_connection
+
+    idle_limit = getattr(settings, "SMTP_POOL_IDLE_SECONDS", DEFAULT_SMTP_IDLE_SECONDS)
+    now = time.monotonic()
+    conn = getattr(_smtp_local, "connection", None)
+    if conn is not None and (
+        getattr(_smtp_local, "backend", None) != settings.EMAIL_BACKEND
+        or now - getattr(_smtp_local, "last_used", 0.0) > idle_limit
+    ):
+        _close_mail_connection()
+        conn = None
+    if conn is None:
+        conn = get_connection(fail_silently=False)
+        conn.open()
+        _smtp_local.connection = conn
+        _smtp_local.backend = settings.EMAIL_BACKEND
+    _smtp_local.last_used = now
+    return conn
+
+
+def send_pooled_mail(subject, message, from_email, recipient_list, html_message=None):
+    """Send one email over the pooled connection, guarded by the SMTP breaker.
+
+    If the relay has silently dropped the pooled session, the message is
+    retried once on a fresh connection.
+    """
+    from django.core.mail import EmailMultiAlternatives
+
+    breaker = get_breaker("smtp")
+    if not breaker.allow():
+        raise CircuitOpenError(breaker.name)
+
+    def _send(connection):
+        mail = EmailMultiAlternatives(
+            subject, message, from_email, recipient_list, connection=connection,
+        )
+        if html_message:
+            mail.attach_alternative(html_message, "text/html")
+        return mail.send()
+
+    try:
+        try:
+            sent = _send(get_mail_connection())
+        except smtplib.SMTPServerDisconnected:
+            _close_mail_connection()
+            sent = _send(get_mail_connection())
+    except Exception as exc:
+        _close_mail_connection()
+        if is_provider_failure(exc):
+            breaker.record_failure(str(exc)[:255])
+        else:
+            breaker.record_success()
+        raise
+    breaker.record_success()
+    return sent
@@ -12,6 +12,7 @@ from apps.audit.views import program_audit_log
 from apps.auth_app.views import switch_language
 from apps.events.views import calendar_feed
 from konote.error_views import permission_denied_view
+from konote.metrics import metrics_view
 from konote.page_views import help_view, privacy_view
 
 # Custom error handlers
@@ -47,6 +48,7 @@ urlpatterns = [
     path("", include("apps.clients.urls_home")),
     path("privacy/", privacy_view, name="privacy"),
     path("help/", help_view, name="help"),
+    path("metrics", metrics_view, name="metrics"),
     path("django-admin/", admin.site.urls),
     # Service worker — served from root so its scope covers all pages
     path(
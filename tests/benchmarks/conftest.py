@@ -0,0 +1,174 @@
+"""
+Pytest configuration for the performance benchmark suite.
+
+Benchmarks are opt-in — they build a large synthetic agency with the
+seed_load_test command, which takes a while. Run them on their own:
+
+    KONOTE_BENCHMARK=1 pytest tests/benchmarks
+
+Scale is set with environment variables (defaults in brackets):
+    KONOTE_BENCHMARK_CLIENTS   participants [2000]
+    KONOTE_BENCHMARK_NOTES     progress notes [10 per participant]
+    KONOTE_BENCHMARK_ROUNDS    timed rounds per benchmark [5]
+    KONOTE_BENCHMARK_DIR       where results are written [.benchmarks/]
+
+Each run writes one JSON file (timings, query counts, scale, git commit)
+and prints how each benchmark compares with the previous file in the
+same directory, so results can be tracked over time.
+"""
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+ENABLED = os.environ.get("KONOTE_BENCHMARK", "").lower() in ("1", "true", "yes")
+CLIENTS = int(os.environ.get("KONOTE_BENCHMARK_CLIENTS", "2000"))
+NOTES = int(os.environ.get("KONOTE_BENCHMARK_NOTES", str(CLIENTS * 10)))
+ROUNDS = int(os.environ.get("KONOTE_BENCHMARK_ROUNDS", "5"))
+RESULTS_DIR = Path(os.environ.get("KONOTE_BENCHMARK_DIR", ".benchmarks"))
+
+_results = []
+
+
+def pytest_collection_modifyitems(items):
+    """Mark all tests in this directory as benchmarks; skip unless enabled."""
+    skip = pytest.mark.skip(reason="Benchmarks are opt-in: set KONOTE_BENCHMARK=1")
+    for item in items:
+        if "benchmarks" in str(item.fspath):
+            item.add_marker(pytest.mark.benchmark)
+            if not ENABLED:
+                item.add_marker(skip)
+
+
+@pytest.fixture(scope="session")
+def load_agency(django_db_setup, django_db_blocker):
+    """Generate the synthetic agency once per session; return its key objects."""
+    from django.core.management import call_command
+    from django.test import override_settings
+
+    from apps.auth_app.models import User
+    from apps.groups.models import Group
+    from apps.programs.models import Program
+
+    with django_db_blocker.unblock(), override_settings(DEMO_MODE=True):
+        call_command(
+            "seed_load_test",
+            clients=CLIENTS, notes=NOTES, meetings=CLIENTS // 5,
+            audit_rows=CLIENTS * 2, groups=2, sessions=20, reset=True,
+        )
+        return {
+            "programs": list(Program.objects.filter(name__startswith="Load Test Program")),
+            "group": Group.objects.filter(name__startswith="Load Group").first(),
+            "manager": User.objects.get(username="loadtest-manager"),
+            "executive": User.objects.get(username="loadtest-executive"),
+            "admin": User.objects.get(username="loadtest-admin"),
+        }
+
+
+class Benchmark:
+    """Minimal stand-in for pytest-benchmark's `benchmark` fixture.
+
+        def test_search(benchmark):
+            result = benchmark(search, "smith")
+
+    Calls the target once to warm caches, then times ROUNDS calls. SQL
+    queries per call are recorded alongside the timings.
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+    def __call__(self, target, *args, **kwargs):
+        return self.pedantic(target, args=args, kwargs=kwargs, rounds=ROUNDS, warmup_rounds=1)
+
+    def pedantic(self, target, args=(), kwargs=None, rounds=1, warmup_rounds=0):
+        from konote.profiling import profile
+
+        kwargs = kwargs or {}
+        for _ in range(warmup_rounds):
+            target(*args, **kwargs)
+        timings = []
+        queries = []
+        for _ in range(rounds):
+            with profile() as prof:
+                start = time.perf_counter()
+                result = target(*args, **kwargs)
+                timings.append(time.perf_counter() - start)
+            queries.append(prof.query_count)
+        _results.append({
+            "name": self.name,
+            "stats": {
+                "min": min(timings),
+                "max": max(timings),
+                "mean": statistics.mean(timings),
+                "median": statistics.median(timings),
+                "stddev": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+                "rounds": rounds,
+                "queries": max(queries),
+            },
+        })
+        return result
+
+
+@pytest.fixture
+def benchmark(request):
+    return Benchmark(request.node.name)
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """Write this run's results and keep the previous run for comparison."""
+    if not _results:
+        return
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    previous = sorted(RESULTS_DIR.glob("*.json"))
+    now = datetime.now(timezone.utc)
+    commit = _git_commit()
+    path = RESULTS_DIR / f"{now:%Y%m%dT%H%M%SZ}-{commit or 'nogit'}.json"
+    path.write_text(json.dumps({
+        "datetime": now.isoformat(timespec="seconds"),
+        "commit": commit,
+        "machine": {"python": platform.python_version(), "platform": platform.platform()},
+        "scale": {"clients": CLIENTS, "notes": NOTES},
+        "benchmarks": _results,
+    }, indent=2))
+    session.config._konote_benchmark = (path, previous[-1] if previous else None)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    paths = getattr(config, "_konote_benchmark", None)
+    if not paths:
+        return
+    path, previous_path = paths
+    baseline = {}
+    if previous_path:
+        data = json.loads(previous_path.read_text())
+        baseline = {b["name"]: b["stats"] for b in data["benchmarks"]}
+
+    terminalreporter.section("benchmarks")
+    terminalreporter.write_line(f"{'name':<40} {'median ms':>10} {'queries':>8} {'vs previous':>12}")
+    for bench in _results:
+        stats = bench["stats"]
+        change = ""
+        before = baseline.get(bench["name"])
+        if before and before["median"]:
+            change = f"{(stats['median'] - before['median']) / before['median']:+.0%}"
+        terminalreporter.write_line(
+            f"{bench['name']:<40} {stats['median'] * 1000:>10.1f} {stats['queries']:>8} {change:>12}"
+        )
+    terminalreporter.write_line(f"Results written to {path}")
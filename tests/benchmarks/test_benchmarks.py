@@ -0,0 +1,87 @@
+"""Benchmarks for the slowest paths at large-agency scale.
+
+Opt-in: KONOTE_BENCHMARK=1 pytest tests/benchmarks (see conftest.py).
+"""
+from datetime import date, timedelta
+from io import StringIO
+
+import pytest
+from cryptography.fernet import Fernet
+from django.conf import settings
+from django.core.management import call_command
+from django.test import Client
+
+import konote.encryption as enc_module
+
+pytestmark = pytest.mark.django_db(databases=["default", "audit"])
+
+
+def _client_for(user):
+    http = Client()
+    http.force_login(user)
+    return http
+
+
+def _get_ok(http, url):
+    resp = http.get(url)
+    assert resp.status_code == 200, f"{url} returned {resp.status_code}"
+    return resp
+
+
+def test_client_search(benchmark, load_agency):
+    http = _client_for(load_agency["manager"])
+    benchmark(_get_ok, http, "/clients/search/?q=tremblay")
+
+
+def test_note_search(benchmark, load_agency):
+    from apps.clients.models import ClientFile
+
+    http = _client_for(load_agency["manager"])
+    client = ClientFile.objects.filter(record_id__startswith="LOAD-").order_by("pk").first()
+    benchmark(_get_ok, http, f"/notes/client/{client.pk}/?q=housing")
+
+
+def test_home_dashboard(benchmark, load_agency):
+    http = _client_for(load_agency["manager"])
+    benchmark(_get_ok, http, "/")
+
+
+def test_executive_dashboard(benchmark, load_agency):
+    http = _client_for(load_agency["executive"])
+    benchmark(_get_ok, http, "/clients/executive/")
+
+
+def test_funder_report(benchmark, load_agency):
+    from apps.reports.funder_report import generate_funder_report_data
+
+    today = date.today()
+    benchmark(
+        generate_funder_report_data,
+        load_agency["programs"][0], today - timedelta(days=365), today,
+        user=load_agency["manager"],
+    )
+
+
+def test_attendance_report(benchmark, load_agency):
+    http = _client_for(load_agency["manager"])
+    benchmark(_get_ok, http, f"/groups/{load_agency['group'].pk}/attendance/")
+
+
+def test_merge_scan(benchmark, load_agency):
+    from apps.clients.merge import find_merge_candidates
+
+    result = benchmark(find_merge_candidates, load_agency["admin"])
+    assert result["phone_count"] > 0
+
+
+def test_key_rotation(benchmark, load_agency):
+    # One round: rotation rewrites every encrypted row (rolled back after the test).
+    old_key = settings.FIELD_ENCRYPTION_KEY.split(",")[0]
+    new_key = Fernet.generate_key().decode()
+    try:
+        benchmark.pedantic(
+            call_command, args=("rotate_encryption_key",),
+            kwargs={"old_key": old_key, "new_key": new_key, "stdout": StringIO()},
+        )
+    finally:
+        enc_module._fernet = None
@@ -0,0 +1,130 @@
+"""Tests for the AI response cache (konote/ai_cache.py).
+
+Covers:
+- Identical suggestion calls reach OpenRouter once; changed inputs or model don't share
+- Failures and unparseable JSON responses are not cached
+- Concurrent identical calls are coalesced into one upstream call
+- The improve-outcome endpoint end to end against a local fake OpenRouter
+"""
+import threading
+import time
+
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+
+from apps.admin_settings.models import FeatureToggle
+from apps.auth_app.models import User
+from konote import ai, transport
+from konote.ai_cache import cached_call
+from tests.utils.fake_openrouter import FakeOpenRouter
+
+
+class AICacheTestMixin:
+    def setUp(self):
+        transport.reset_breakers()
+        self.addCleanup(transport.reset_breakers)
+
+    def serve(self, **kwargs):
+        """Start a fake OpenRouter and point konote.ai at it for this test."""
+        server = FakeOpenRouter(**kwargs)
+        self.enterContext(server)
+        self.enterContext(override_settings(**server.settings()))
+        return server
+
+
+class AIResponseCacheTest(AICacheTestMixin, TestCase):
+    def test_identical_calls_reach_openrouter_once(self):
+        server = self.serve(reply="Participant will find stable housing by June.")
+        first = ai.improve_outcome("Get housing")
+        second = ai.improve_outcome("Get housing")
+        self.assertEqual(first, "Participant will find stable housing by June.")
+        self.assertEqual(second, first)
+        self.assertEqual(len(server.requests), 1)
+
+    def test_different_input_or_model_calls_again(self):
+        server = self.serve(reply="Improved")
+        ai.improve_outcome("Get housing")
+        ai.improve_outcome("Find work")
+        with override_settings(OPENROUTER_MODEL="other/model"):
+            ai.improve_outcome("Get housing")
+        self.assertEqual(len(server.requests), 3)
+        self.assertEqual(server.requests[2]["model"], "other/model")
+
+    def test_failures_are_not_cached(self):
+        server = self.serve(status=500)
+        self.assertIsNone(ai.improve_outcome("Get housing"))
+        server.status = 200
+        server.reply = "Improved"
+        self.assertEqual(ai.improve_outcome("Get housing"), "Improved")
+        self.assertEqual(len(server.requests), 2)
+
+    def test_unparseable_json_is_not_cached(self):
+        server = self.serve(reply="Sorry, I can't help with that.")
+        self.assertIsNone(ai.suggest_note_structure("Housing", "Find a home", ["Stability"]))
+        server.reply = '[{"section": "Housing search", "prompt": "What happened?"}]'
+        self.assertEqual(
+            ai.suggest_note_structure("Housing", "Find a home", ["Stability"]),
+            [{"section": "Housing search", "prompt": "What happened?"}],
+        )
+        ai.suggest_note_structure("Housing", "Find a home", ["Stability"])
+        self.assertEqual(len(server.requests), 2)
+
+
+class CoalescingTest(SimpleTestCase):
+    def test_concurrent_identical_calls_share_one_upstream_call(self):
+        calls = []
+
+        def slow_call():
+            calls.append(1)
+            time.sleep(0.2)
+            return "answer"
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cached_call("ai_test_key", slow_call)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ["answer"] * 5)
+
+    def test_waiters_share_a_failure(self):
+        calls = []
+
+        def failing_call():
+            calls.append(1)
+            time.sleep(0.2)
+            return None
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cached_call("ai_fail_key", failing_call)))
+            for _ in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [None] * 3)
+        # Nothing cached, so the next call tries again.
+        cached_call("ai_fail_key", failing_call)
+        self.assertEqual(len(calls), 2)
+
+
+class ImproveOutcomeEndpointTest(AICacheTestMixin, TestCase):
+    def test_repeat_clicks_reuse_the_response(self):
+        server = self.serve(reply="Participant will find stable housing by June.")
+        User.objects.create_user(username="staff", password="pass", display_name="Staff")
+        FeatureToggle.objects.create(feature_key="ai_assist", is_enabled=True)
+        http = Client()
+        http.login(username="staff", password="pass")
+
+        for _ in range(2):
+            resp = http.post("/ai/improve-outcome/", {"draft_text": "Get housing"})
+            self.assertContains(resp, "stable housing by June")
+        self.assertEqual(len(server.requests), 1)
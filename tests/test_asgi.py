@@ -0,0 +1,106 @@
+"""Tests for ASGI serving — async-capable middleware and async views."""
+from unittest.mock import patch
+
+from asgiref.sync import iscoroutinefunction
+from cryptography.fernet import Fernet
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils.module_loading import import_string
+
+from apps.admin_settings.models import FeatureToggle
+from apps.auth_app.decorators import requires_permission
+from apps.auth_app.models import User
+from apps.events.models import CalendarFeedToken
+from apps.programs.models import Program, UserProgramRole
+import konote.encryption as enc_module
+
+
+TEST_KEY = Fernet.generate_key().decode()
+
+
+class AsgiSetupTest(TestCase):
+
+    def test_asgi_application(self):
+        from konote.asgi import application
+        self.assertIsInstance(application, ASGIHandler)
+
+    def test_every_middleware_is_async_capable(self):
+        # One sync-only middleware would push the rest of the stack
+        # through a thread on every request.
+        for path in settings.MIDDLEWARE:
+            with self.subTest(middleware=path):
+                self.assertTrue(getattr(import_string(path), "async_capable", False))
+
+
+@override_settings(FIELD_ENCRYPTION_KEY=TEST_KEY, OPENROUTER_API_KEY="test-key-123")
+class AsyncViewTest(TestCase):
+    """Requests through the full middleware stack in async mode."""
+
+    def setUp(self):
+        enc_module._fernet = None
+        self.user = User.objects.create_user(
+            username="staff", password="pass", display_name="Staff"
+        )
+        self.program = Program.objects.create(name="Housing")
+        UserProgramRole.objects.create(
+            user=self.user, program=self.program, role="staff", status="active"
+        )
+        FeatureToggle.objects.create(feature_key="ai_assist", is_enabled=True)
+
+    def tearDown(self):
+        enc_module._fernet = None
+
+    @patch("konote.ai.improve_outcome", return_value="Clients secure stable housing.")
+    async def test_ai_view_served_async(self, mock_improve):
+        await self.async_client.aforce_login(self.user)
+        resp = await self.async_client.post("/ai/improve-outcome/", {"draft_text": "get housing"})
+        self.assertEqual(resp.status_code, 200)
+        self.assertContains(resp, "Clients secure stable housing.")
+        mock_improve.assert_called_once_with("get housing")
+
+    async def test_ai_view_requires_login(self):
+        resp = await self.async_client.post("/ai/improve-outcome/", {"draft_text": "get housing"})
+        self.assertEqual(resp.status_code, 302)
+        self.assertIn("/auth/login", resp.url)
+
+    async def test_calendar_feed_served_async(self):
+        await CalendarFeedToken.objects.acreate(user=self.user, token="feed-token")
+        resp = await self.async_client.get("/calendar/feed-token/feed.ics")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp["Content-Type"], "text/calendar")
+
+
+@override_settings(FIELD_ENCRYPTION_KEY=TEST_KEY)
+class AsyncRequiresPermissionTest(TestCase):
+
+    def setUp(self):
+        enc_module._fernet = None
+        self.factory = RequestFactory()
+
+        async def view(request):
+            return HttpResponse("OK")
+
+        self.view = requires_permission("client.create")(view)
+        self.user = User.objects.create_user(username="staff", password="pass")
+
+    def tearDown(self):
+        enc_module._fernet = None
+
+    def test_wrapper_stays_async(self):
+        self.assertTrue(iscoroutinefunction(self.view))
+
+    async def test_denies_user_without_role(self):
+        request = self.factory.get("/")
+        request.user = self.user
+        resp = await self.view(request)
+        self.assertEqual(resp.status_code, 403)
+
+    async def test_allows_permitted_role(self):
+        program = await Program.objects.acreate(name="Housing")
+        await UserProgramRole.objects.acreate(user=self.user, program=program, role="staff", status="active")
+        request = self.factory.get("/")
+        request.user = self.user
+        resp = await self.view(request)
+        self.assertEqual(resp.status_code, 200)
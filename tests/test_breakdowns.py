@@ -0,0 +1,135 @@
+"""Tests for the single-pass demographic breakdown engine."""
+from datetime import date
+from unittest.mock import patch
+
+from cryptography.fernet import Fernet
+from django.test import TestCase, override_settings
+
+from apps.auth_app.models import User
+from apps.clients.models import ClientDetailValue, ClientFile, CustomFieldDefinition, CustomFieldGroup
+from apps.notes.models import MetricValue, ProgressNote, ProgressNoteTarget
+from apps.plans.models import MetricDefinition, PlanSection, PlanTarget
+from apps.reports.breakdowns import BreakdownSpec, DemographicLookup, aggregate_breakdowns
+from apps.reports.demographics import aggregate_by_demographic
+import konote.encryption as enc_module
+
+TEST_KEY = Fernet.generate_key().decode()
+
+
+@override_settings(FIELD_ENCRYPTION_KEY=TEST_KEY)
+class BreakdownEngineTest(TestCase):
+
+    def setUp(self):
+        enc_module._fernet = None
+        self.user = User.objects.create_user(username="worker", password="testpass123")
+        group = CustomFieldGroup.objects.create(title="Employment", sort_order=1)
+        self.field = CustomFieldDefinition.objects.create(
+            group=group, name="Employment Status", input_type="select", status="active",
+            options_json=[
+                {"value": "ft", "label": "Full-time"},
+                {"value": "pt", "label": "Part-time"},
+                {"value": "un", "label": "Unemployed"},
+            ],
+        )
+        self.mood = MetricDefinition.objects.create(name="Mood", definition="Mood", category="custom")
+        self.sleep = MetricDefinition.objects.create(name="Sleep", definition="Sleep", category="custom")
+        # (birth date, employment, mood, sleep)
+        people = [
+            ("2000-03-01", "ft", 4, 6),
+            ("1990-03-01", "pt", 6, 8),
+            ("1990-07-01", "un", 2, 5),
+            (None, None, 8, 7),
+        ]
+        self.clients = []
+        for i, (birth_date, employment, mood, sleep) in enumerate(people):
+            client = ClientFile.objects.create(record_id=f"BD-{i}")
+            if birth_date:
+                client.birth_date = birth_date
+                client.save()
+            if employment:
+                ClientDetailValue.objects.create(client_file=client, field_def=self.field, value=employment)
+            section = PlanSection.objects.create(client_file=client, name="Goals")
+            target = PlanTarget.objects.create(plan_section=section, client_file=client, name="Goal")
+            note = ProgressNote.objects.create(client_file=client, note_type="full", author=self.user)
+            pnt = ProgressNoteTarget.objects.create(progress_note=note, plan_target=target)
+            MetricValue.objects.create(progress_note_target=pnt, metric_def=self.mood, value=str(mood))
+            MetricValue.objects.create(progress_note_target=pnt, metric_def=self.sleep, value=str(sleep))
+            self.clients.append(client)
+
+    def tearDown(self):
+        enc_module._fernet = None
+
+    def _metric_values(self):
+        return MetricValue.objects.select_related("progress_note_target__progress_note")
+
+    def test_all_breakdowns_and_metrics_in_one_pass(self):
+        specs = [
+            BreakdownSpec("age", "age"),
+            BreakdownSpec("funder_age", "age", bins=[(0, 29, "Under 30"), (30, 999, "30+")]),
+            BreakdownSpec(
+                "employment", "custom_field", field=self.field,
+                merge_categories={"Employed": ["Full-time", "Part-time"]},
+            ),
+        ]
+        results = aggregate_breakdowns(self._metric_values(), specs, as_of_date=date(2025, 6, 1))
+
+        mood_by_age = results["age"][self.mood.pk]
+        self.assertEqual(list(mood_by_age), ["25-34", "35-44", "Unknown"])
+        self.assertEqual(mood_by_age["25-34"]["avg"], 3.0)  # 25 and 34 years old
+        self.assertEqual(results["funder_age"][self.sleep.pk]["30+"]["sum"], 13.0)
+
+        employment = results["employment"][self.mood.pk]
+        self.assertEqual(list(employment), ["Employed", "Other", "Unknown"])
+        self.assertEqual(employment["Employed"]["client_ids"], {self.clients[0].pk, self.clients[1].pk})
+        self.assertEqual(employment["Unknown"]["client_ids"], {self.clients[3].pk})
+
+    def test_age_bins_read_from_tokens_without_decryption(self):
+        # In 2026 neither birth year's two possible ages straddles a bin edge.
+        lookup = DemographicLookup([c.pk for c in self.clients], date(2026, 6, 1))
+        specs = [
+            BreakdownSpec("age", "age"),
+            BreakdownSpec("funder_age", "age", bins=[(0, 29, "Under 30"), (30, 999, "30+")]),
+        ]
+        with patch("apps.clients.models.decrypt_field", wraps=enc_module.decrypt_field) as decrypt:
+            aggregate_breakdowns(self._metric_values(), specs, lookup=lookup)
+            labels = lookup.labels_for(BreakdownSpec("again", "age"))
+        self.assertEqual(decrypt.call_count, 0)
+        self.assertEqual(labels[self.clients[0].pk], "25-34")
+        self.assertEqual(labels[self.clients[1].pk], "35-44")
+        self.assertEqual(labels[self.clients[3].pk], "Unknown")
+
+    def test_bin_edge_and_stale_tokens_fall_back_to_decryption(self):
+        # In 2025 a 2000 birth year could be 24 or 25, and 1990 could be 34
+        # or 35: the day decides the bin, so all three are decrypted.
+        lookup = DemographicLookup([c.pk for c in self.clients], date(2025, 6, 1))
+        with patch("apps.clients.models.decrypt_field", wraps=enc_module.decrypt_field) as decrypt:
+            labels = lookup.labels_for(BreakdownSpec("age", "age"))
+            lookup.labels_for(BreakdownSpec("again", "age", bins=[(0, 30, "Young"), (31, 999, "Older")]))
+        self.assertEqual(decrypt.call_count, 3)  # Once each, across both breakdowns
+        self.assertEqual(labels[self.clients[0].pk], "25-34")
+        self.assertEqual(labels[self.clients[1].pk], "35-44")
+        self.assertEqual(labels[self.clients[2].pk], "25-34")
+
+        ClientFile.objects.filter(pk=self.clients[1].pk).update(birth_year_token="stale")
+        lookup = DemographicLookup([self.clients[1].pk], date(2026, 6, 1))
+        with patch("apps.clients.models.decrypt_field", wraps=enc_module.decrypt_field) as decrypt:
+            labels = lookup.labels_for(BreakdownSpec("age", "age"))
+        self.assertEqual(decrypt.call_count, 1)
+        self.assertEqual(labels[self.clients[1].pk], "35-44")
+
+    def test_token_keyed_on_encryption_key_not_secret_key(self):
+        from apps.clients.birth_year import birth_year_token
+
+        token = birth_year_token("1990-04-15")
+        self.assertEqual(token, birth_year_token("1990-12-31"))  # Year only
+        with self.settings(SECRET_KEY="a-different-secret-key"):
+            self.assertEqual(birth_year_token("1990-04-15"), token)
+        with self.settings(FIELD_ENCRYPTION_KEY=Fernet.generate_key().decode()):
+            self.assertNotEqual(birth_year_token("1990-04-15"), token)
+
+    def test_aggregate_by_demographic_matches_engine(self):
+        grouped = aggregate_by_demographic(
+            MetricValue.objects.filter(metric_def=self.mood), "custom_field", self.field,
+        )
+        self.assertEqual(list(grouped), ["Full-time", "Part-time", "Unemployed", "Unknown"])
+        self.assertEqual(grouped["Unemployed"]["avg"], 2.0)
@@ -0,0 +1,138 @@
+"""Tests for the cached, conditional iCal calendar feed."""
+from datetime import timedelta
+from unittest.mock import patch
+
+from cryptography.fernet import Fernet
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.utils import timezone
+
+from apps.auth_app.models import User
+from apps.clients.models import ClientFile
+from apps.events.models import CalendarFeedToken, Event, EventType, Meeting
+import konote.encryption as enc_module
+
+TEST_KEY = Fernet.generate_key().decode()
+
+
+@override_settings(FIELD_ENCRYPTION_KEY=TEST_KEY)
+class CalendarFeedCacheTests(TestCase):
+    databases = {"default", "audit"}
+
+    def setUp(self):
+        enc_module._fernet = None
+        cache.clear()
+        self.http = Client()
+        self.user = User.objects.create_user(
+            username="feed_user", password="testpass123", display_name="Feed User",
+        )
+        self.feed_token = CalendarFeedToken.objects.create(user=self.user, token="feedtoken123")
+        self.client_file = ClientFile()
+        self.client_file.first_name = "Maria"
+        self.client_file.last_name = "Doe"
+        self.client_file.record_id = "R-100"
+        self.client_file.save()
+        event_type = EventType.objects.create(name="Meeting")
+        self.event = Event.objects.create(
+            client_file=self.client_file,
+            event_type=event_type,
+            start_timestamp=timezone.now() + timedelta(days=1),
+        )
+        self.meeting = Meeting.objects.create(event=self.event, location="Office")
+        self.meeting.attendees.add(self.user)
+        self.url = "/calendar/feedtoken123/feed.ics"
+
+    def tearDown(self):
+        enc_module._fernet = None
+        cache.clear()
+
+    def test_feed_contains_initials_only(self):
+        response = self.http.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        body = response.content.decode()
+        self.assertIn("Meeting MD (R-100)", body)
+        self.assertNotIn("Maria", body)
+        self.assertIn("ETag", response)
+        self.assertIn("Last-Modified", response)
+
+    def test_second_poll_served_from_cache(self):
+        self.http.get(self.url)
+        with patch("apps.events.calendar_feed.build_feed") as mock_build:
+            response = self.http.get(self.url)
+        mock_build.assert_not_called()
+        self.assertEqual(response.status_code, 200)
+
+    def test_if_none_match_returns_304(self):
+        etag = self.http.get(self.url)["ETag"]
+        response = self.http.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_meeting_change_invalidates_feed(self):
+        etag = self.http.get(self.url)["ETag"]
+        self.meeting.location = "Community Centre"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.meeting.save()
+        response = self.http.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Community Centre", response.content.decode())
+
+    def test_cancelled_meeting_drops_out(self):
+        self.http.get(self.url)
+        self.meeting.status = "cancelled"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.meeting.save()
+        response = self.http.get(self.url)
+        self.assertNotIn("R-100", response.content.decode())
+
+    def test_removed_attendee_invalidates_feed(self):
+        self.http.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.meeting.attendees.remove(self.user)
+        response = self.http.get(self.url)
+        self.assertNotIn("R-100", response.content.decode())
+
+    def test_rescheduled_event_invalidates_feed(self):
+        etag = self.http.get(self.url)["ETag"]
+        self.event.start_timestamp = self.event.start_timestamp + timedelta(days=2)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event.save()
+        response = self.http.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_version_stored_on_token(self):
+        # Shared by every worker process, unlike a local-memory cache entry.
+        self.feed_token.refresh_from_db()
+        before = self.feed_token.feed_version
+        with self.captureOnCommitCallbacks(execute=True):
+            self.meeting.save()
+        self.feed_token.refresh_from_db()
+        self.assertNotEqual(self.feed_token.feed_version, before)
+
+    def test_version_bumped_only_on_commit(self):
+        self.feed_token.refresh_from_db()
+        before = self.feed_token.feed_version
+        with self.captureOnCommitCallbacks(execute=False):
+            self.meeting.save()
+        self.feed_token.refresh_from_db()
+        self.assertEqual(self.feed_token.feed_version, before)
+
+    def test_token_not_in_cache_key(self):
+        self.http.get(self.url)
+        keys = list(cache._cache.keys())
+        self.assertTrue(any("calendar_feed_" in key for key in keys))
+        self.assertFalse(any("feedtoken123" in key for key in keys))
+
+    def test_last_accessed_written_once_per_window(self):
+        self.http.get(self.url)
+        self.feed_token.refresh_from_db()
+        first_access = self.feed_token.last_accessed_at
+        self.assertIsNotNone(first_access)
+        self.http.get(self.url)
+        self.feed_token.refresh_from_db()
+        self.assertEqual(self.feed_token.last_accessed_at, first_access)
+
+    def test_inactive_token_404(self):
+        self.feed_token.is_active = False
+        self.feed_token.save()
+        self.assertEqual(self.http.get(self.url).status_code, 404)
@@ -462,6 +462,68 @@ class CustomFieldTest(TestCase):
         self.assertEqual(cdv.value, "")
 
 
+@override_settings(FIELD_ENCRYPTION_KEY=TEST_KEY)
+class CustomFieldBulkTest(TestCase):
+    """Custom field values load and save in a fixed number of queries."""
+
+    def setUp(self):
+        enc_module._fernet = None
+        self.cf = ClientFile()
+        self.cf.first_name = "Jane"
+        self.cf.last_name = "Doe"
+        self.cf.save()
+        self.fields = []
+        for g in range(3):
+            group = CustomFieldGroup.objects.create(title=f"Group {g}", sort_order=g)
+            for i in range(10):
+                self.fields.append(CustomFieldDefinition.objects.create(
+                    group=group, name=f"Field {g}-{i}", input_type="text",
+                    sort_order=i, is_sensitive=(i % 2 == 0),
+                ))
+
+    def tearDown(self):
+        enc_module._fernet = None
+
+    def test_save_and_load_round_trip(self):
+        from apps.clients.custom_fields import load_custom_values, save_custom_values
+
+        values = {fd: f"value {fd.pk}" for fd in self.fields}
+        with self.assertNumQueries(2):  # read existing + one bulk insert
+            created, updated = save_custom_values(self.cf, values)
+        self.assertEqual((created, updated), (30, 0))
+        with self.assertNumQueries(1):
+            loaded = load_custom_values(self.cf, self.fields)
+        self.assertEqual(loaded, {fd.pk: f"value {fd.pk}" for fd in self.fields})
+        sensitive = ClientDetailValue.objects.get(client_file=self.cf, field_def=self.fields[0])
+        self.assertEqual(sensitive.value, "")
+
+    def test_unchanged_values_not_rewritten(self):
+        from apps.clients.custom_fields import save_custom_values
+
+        save_custom_values(self.cf, {fd: "same" for fd in self.fields})
+        changed = {fd: "same" for fd in self.fields}
+        changed[self.fields[1]] = "different"
+        self.assertEqual(save_custom_values(self.cf, changed), (0, 1))
+
+    def test_context_query_count_independent_of_field_count(self):
+        from apps.clients.views import _get_custom_fields_context
+
+        _get_custom_fields_context(self.cf, "staff")  # warm the schema cache
+        with self.assertNumQueries(2):  # schema version + values
+            ctx = _get_custom_fields_context(self.cf, "staff")
+        self.assertEqual(len(ctx["custom_data"]), 3)
+
+    def test_schema_cache_invalidated_on_field_change(self):
+        from apps.clients.custom_fields import get_field_schema
+
+        get_field_schema()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.fields[0].status = "archived"
+            self.fields[0].save()
+        active = [fd.pk for entry in get_field_schema() for fd in entry["fields"]]
+        self.assertNotIn(self.fields[0].pk, active)
+
+
 @override_settings(FIELD_ENCRYPTION_KEY=TEST_KEY)
 class SelectOtherFieldTest(TestCase):
     """Tests for the select_other input type (dropdown with free-text Other option)."""
@@ -576,6 +638,24 @@ class SelectOtherFieldTest(TestCase):
         self.assertEqual(resp.status_code, 200)
         self.assertContains(resp, "They/them")
 
+    def test_front_desk_restriction_applies_once_committed(self):
+        """Hiding a field from front desk takes effect on the next request, cached schema or not."""
+        receptionist = User.objects.create_user(username="frontdesk", password="testpass123")
+        UserProgramRole.objects.create(user=receptionist, program=self.program, role="receptionist")
+        cdv = ClientDetailValue.objects.create(client_file=self.cf, field_def=self.pronouns_field)
+        cdv.set_value("They/them")
+        cdv.save()
+        self.client.login(username="frontdesk", password="testpass123")
+        url = f"/clients/{self.cf.pk}/custom-fields/display/"
+        self.assertContains(self.client.get(url, HTTP_HX_REQUEST="true"), "They/them")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.pronouns_field.front_desk_access = "none"
+            self.pronouns_field.save()
+            # Other workers only see the edit once it commits.
+            self.assertContains(self.client.get(url, HTTP_HX_REQUEST="true"), "They/them")
+        self.assertNotContains(self.client.get(url, HTTP_HX_REQUEST="true"), "They/them")
+
 
 @override_settings(FIELD_ENCRYPTION_KEY=TEST_KEY)
 class ConsentRecordingTest(TestCase):
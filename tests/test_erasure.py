@@ -1058,8 +1058,10 @@ class ContextProcessorTests(TestCase):
         request.user = self.pm_b
 
         result = pending_erasures(request)
-        # PM-B has no pending requests in their programs
-        self.assertIsNone(result.get("pending_erasure_count"))
+        # PM-B has no pending requests in their programs. The count is
+        # lazy, so it resolves to None (no badge) when rendered.
+        self.assertFalse(result["pending_erasure_count"])
+        self.assertEqual(str(result["pending_erasure_count"]), "None")
 
     def test_staff_gets_no_count(self):
         from django.test import RequestFactory
@@ -8,7 +8,9 @@ Covers:
 """
 from datetime import date, timedelta
 
+from django.db import connection
 from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
 from cryptography.fernet import Fernet
 
 from apps.auth_app.models import User
@@ -134,9 +136,38 @@ class AttendanceReportTest(TestCase):
         self.assertEqual(resp.status_code, 200)
         self.assertEqual(resp["Content-Type"], "text/csv")
         self.assertIn("attachment", resp["Content-Disposition"])
-        content = resp.content.decode("utf-8")
+        content = b"".join(resp.streaming_content).decode("utf-8")
         self.assertIn("Jane Doe", content)
 
+    def test_attendance_report_rates_and_order(self):
+        """Rates come from the grouped counts; most-absent members sort first."""
+        absent_member = GroupMembership.objects.create(
+            group=self.group, member_name="Sam Lee", role="member",
+        )
+        GroupMembership.objects.create(
+            group=self.group, member_name="New Member", role="member",
+        )
+        earlier = GroupSession(
+            group=self.group, session_date=date.today() - timedelta(days=7),
+            facilitator=self.staff, group_vibe="solid",
+        )
+        earlier.save()
+        GroupSessionAttendance.objects.create(group_session=earlier, membership=self.member, present=False)
+        GroupSessionAttendance.objects.create(group_session=earlier, membership=absent_member, present=False)
+        GroupSessionAttendance.objects.create(group_session=self.session, membership=absent_member, present=False)
+
+        self.client.login(username="staff", password="testpass123")
+        resp = self.client.get(f"/groups/{self.group.pk}/attendance/")
+        rows = resp.context["rows"]
+        self.assertEqual([r["name"] for r in rows], ["Sam Lee", "Jane Doe", "New Member"])
+        self.assertEqual(rows[1]["sessions"], [False, True])  # Oldest session first
+        self.assertEqual((rows[1]["present"], rows[1]["total"], rows[1]["rate"]), (1, 2, 50))
+        self.assertIsNone(rows[2]["rate"])
+
+        resp = self.client.get(f"/groups/{self.group.pk}/attendance/?format=csv")
+        content = b"".join(resp.streaming_content).decode("utf-8")
+        self.assertIn("Jane Doe,No,Yes,1,2,50%", content)
+
     def test_attendance_report_date_filter(self):
         """Date filter excludes sessions outside range."""
         self.client.login(username="staff", password="testpass123")
@@ -309,6 +340,23 @@ class SessionLogHappyPathTest(TestCase):
         self.client.post(self._session_url(), data)
         self.assertEqual(GroupSessionHighlight.objects.count(), 0)
 
+    def test_session_log_writes_attendance_in_bulk(self):
+        """Query count does not grow with the number of members."""
+        self.client.login(username="staff", password="testpass123")
+        with CaptureQueriesContext(connection) as small:
+            self.client.post(self._session_url(), self._valid_post_data())
+        for i in range(5):
+            GroupMembership.objects.create(group=self.group, member_name=f"Extra {i}", role="member")
+        data = self._valid_post_data(session_date="2026-02-14")
+        for m in GroupMembership.objects.filter(group=self.group):
+            data[f"present_{m.pk}"] = "on"
+            data[f"highlight_{m.pk}"] = "Noted"
+        with CaptureQueriesContext(connection) as large:
+            self.client.post(self._session_url(), data)
+        self.assertEqual(len(small), len(large))
+        self.assertEqual(GroupSessionAttendance.objects.count(), 9)
+        self.assertEqual(GroupSessionHighlight.objects.count(), 8)
+
     def test_session_log_redirects_to_group_detail(self):
         """POST with valid data redirects (302) to the group detail page."""
         self.client.login(username="staff", password="testpass123")
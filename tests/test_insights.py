@@ -1,5 +1,5 @@
 """Tests for Outcome Insights — data collection, views, and AI validation."""
-from datetime import date, timedelta
+from datetime import date, datetime, time, timedelta
 from unittest.mock import patch
 
 from cryptography.fernet import Fernet
@@ -11,8 +11,10 @@ from django.utils import timezone
 import konote.encryption as enc_module
 from apps.clients.models import ClientFile, ClientProgramEnrolment
 from apps.notes.models import ProgressNote, ProgressNoteTarget
+from apps.notes.quote_index import WORDS_LONG, WORDS_SHORT
 from apps.plans.models import MetricDefinition, PlanSection, PlanTarget, PlanTargetMetric
 from apps.programs.models import Program
+from apps.reports.models import InsightMonth
 from apps.reports.insights import (
     MIN_PARTICIPANTS_FOR_QUOTES,
     collect_quotes,
@@ -234,6 +236,172 @@ class EffectiveDateInsightsTest(TestCase):
         self.assertGreaterEqual(len(result["descriptor_trend"]), 2)
 
 
+@override_settings(FIELD_ENCRYPTION_KEY=TEST_KEY)
+class InsightRollupTest(TestCase):
+    """Program insights read whole months from the InsightMonth rollup."""
+
+    def setUp(self):
+        enc_module._fernet = None
+        self.program = Program.objects.create(name="Rollup Program", status="active")
+        self.user = User.objects.create_user(username="worker", password="testpass123")
+        self.clients = []
+        for i in range(2):
+            client = ClientFile.objects.create(record_id=f"TEST-ROLLUP-{i}")
+            ClientProgramEnrolment.objects.create(
+                client_file=client, program=self.program, status="enrolled",
+            )
+            self.clients.append(client)
+        section = PlanSection.objects.create(
+            client_file=self.clients[0], name="Goals", program=self.program,
+        )
+        self.target = PlanTarget.objects.create(
+            plan_section=section, client_file=self.clients[0], name="Housing",
+        )
+
+    def tearDown(self):
+        enc_module._fernet = None
+
+    def _note(self, day, client=None, descriptor="", **kwargs):
+        note = ProgressNote.objects.create(
+            client_file=client or self.clients[0],
+            note_type="full",
+            author=self.user,
+            backdate=timezone.make_aware(datetime.combine(day, time(12))),
+            **kwargs,
+        )
+        if descriptor:
+            ProgressNoteTarget.objects.create(
+                progress_note=note, plan_target=self.target, progress_descriptor=descriptor,
+            )
+        return note
+
+    def _insights(self):
+        # 10 Jan is a partial month; February and March are whole months.
+        return get_structured_insights(
+            program=self.program, date_from=date(2025, 1, 10), date_to=date(2025, 3, 31),
+        )
+
+    def test_sums_whole_months_and_counts_edges_live(self):
+        self._note(date(2025, 1, 5), engagement_observation="engaged")  # before range
+        self._note(date(2025, 1, 20), descriptor="harder", engagement_observation="engaged")
+        self._note(date(2025, 2, 3), client=self.clients[1], engagement_observation="guarded")
+        self._note(date(2025, 3, 15), descriptor="shifting", suggestion_priority="important")
+        self._note(date(2025, 3, 16), status="cancelled")
+
+        result = self._insights()
+
+        self.assertEqual(result["note_count"], 3)
+        self.assertEqual(result["participant_count"], 2)
+        self.assertEqual(result["month_count"], 3)
+        self.assertEqual(result["engagement_distribution"], {"Engaged": 50.0, "Guarded but present": 50.0})
+        self.assertEqual(result["suggestion_total"], 1)
+        self.assertEqual(
+            [row["month"] for row in result["descriptor_trend"]], ["2025-01", "2025-03"],
+        )
+        self.assertEqual(
+            list(InsightMonth.objects.filter(program=self.program).values_list("month", flat=True)),
+            [date(2025, 2, 1), date(2025, 3, 1)],
+        )
+
+    def test_second_read_reuses_stored_months(self):
+        self._note(date(2025, 2, 3))
+        self._insights()
+        with patch("apps.reports.insight_rollup._rebuild") as rebuild:
+            result = self._insights()
+        rebuild.assert_not_called()
+        self.assertEqual(result["note_count"], 1)
+
+    def test_new_and_cancelled_notes_update_stored_month(self):
+        note = self._note(date(2025, 2, 3))
+        self.assertEqual(self._insights()["note_count"], 1)
+
+        self._note(date(2025, 2, 20), client=self.clients[1])
+        self.assertEqual(self._insights()["note_count"], 2)
+
+        note.status = "cancelled"
+        note.save()
+        result = self._insights()
+        self.assertEqual(result["note_count"], 1)
+        self.assertEqual(result["participant_count"], 1)
+
+    def test_descriptor_change_updates_stored_month(self):
+        self._note(date(2025, 2, 3), descriptor="harder")
+        self.assertEqual(self._insights()["descriptor_trend"][0]["harder"], 100.0)
+
+        entry = ProgressNoteTarget.objects.get()
+        entry.progress_descriptor = "good_place"
+        entry.save()
+        self.assertEqual(self._insights()["descriptor_trend"][0]["good_place"], 100.0)
+
+    def test_discharge_removes_client_from_stored_months(self):
+        self._note(date(2025, 2, 3), client=self.clients[1])
+        self.assertEqual(self._insights()["participant_count"], 1)
+
+        enrolment = ClientProgramEnrolment.objects.get(client_file=self.clients[1])
+        enrolment.status = "unenrolled"
+        enrolment.save()
+        self.assertEqual(self._insights()["participant_count"], 0)
+
+
+@override_settings(FIELD_ENCRYPTION_KEY=TEST_KEY)
+class QuoteIndexTest(TestCase):
+    """collect_quotes picks candidates from word buckets and hashes."""
+
+    LONG_QUOTE = "I finally feel like I have a plan for my future now"
+
+    def setUp(self):
+        enc_module._fernet = None
+        self.user = User.objects.create_user(username="worker", password="testpass123")
+        self.client_file = ClientFile.objects.create(record_id="TEST-QUOTES-001")
+        section = PlanSection.objects.create(client_file=self.client_file, name="Goals")
+        self.target = PlanTarget.objects.create(
+            plan_section=section, client_file=self.client_file, name="Employment",
+        )
+
+    def tearDown(self):
+        enc_module._fernet = None
+
+    def _entry(self, words):
+        note = ProgressNote.objects.create(
+            client_file=self.client_file, note_type="full", author=self.user,
+        )
+        entry = ProgressNoteTarget(progress_note=note, plan_target=self.target)
+        entry.client_words = words
+        entry.save()
+        return entry
+
+    def test_classified_at_write_time(self):
+        entry = self._entry(self.LONG_QUOTE)
+        duplicate = self._entry("  " + self.LONG_QUOTE.upper() + " ")
+        short = self._entry("Doing fine")
+        self.assertEqual(entry.client_words_bucket, WORDS_LONG)
+        self.assertEqual(entry.client_words_hash, duplicate.client_words_hash)
+        self.assertEqual(short.client_words_bucket, WORDS_SHORT)
+        self.assertNotIn("plan", entry.client_words_hash)
+
+    def test_decrypts_only_returned_quotes(self):
+        for _ in range(10):
+            self._entry("Doing fine")
+        self._entry(self.LONG_QUOTE)
+        self._entry(self.LONG_QUOTE.lower())
+        self._entry("The housing support has made a real difference in my life")
+
+        with patch("apps.notes.models.decrypt_field", wraps=enc_module.decrypt_field) as decrypt:
+            quotes = collect_quotes(client_file=self.client_file)
+
+        self.assertEqual(len(quotes), 2)
+        self.assertEqual(decrypt.call_count, 2)
+
+    def test_unclassified_rows_checked_by_decrypting(self):
+        short = self._entry("Doing fine")
+        long = self._entry(self.LONG_QUOTE)
+        ProgressNoteTarget.objects.filter(pk__in=[short.pk, long.pk]).update(
+            client_words_bucket=None, client_words_hash="",
+        )
+        quotes = collect_quotes(client_file=self.client_file)
+        self.assertEqual([q["text"] for q in quotes], [self.LONG_QUOTE])
+
+
 @override_settings(FIELD_ENCRYPTION_KEY=TEST_KEY, DEMO_MODE=True)
 class DemoModeQuotesTest(TestCase):
     """Test that DEMO_MODE bypasses the privacy gate for quotes."""
@@ -260,6 +260,60 @@ class SeedDemoDataTest(TestCase):
         self.assertIn("Canadian Community Fund", demo_template.description)
 
 
+@override_settings(FIELD_ENCRYPTION_KEY=TEST_KEY, DEMO_MODE=True)
+class SeedLoadTestTest(TestCase):
+    """Tests for the seed_load_test command (at a tiny scale)."""
+
+    databases = {"default", "audit"}
+
+    SMALL = {
+        "programs": 2, "clients": 40, "notes": 120, "groups": 1, "sessions": 3,
+        "meetings": 10, "audit_rows": 20, "stdout": io.StringIO(),
+    }
+
+    def setUp(self):
+        enc_module._fernet = None
+
+    def tearDown(self):
+        enc_module._fernet = None
+
+    def _snapshot(self):
+        from apps.clients.models import ClientFile
+
+        return [
+            (c.record_id, c.first_name, c.last_name, c.birth_date)
+            for c in ClientFile.objects.filter(record_id__startswith="LOAD-").order_by("record_id")
+        ]
+
+    def test_refuses_without_demo_mode(self):
+        from django.core.management.base import CommandError
+
+        with self.settings(DEMO_MODE=False), self.assertRaises(CommandError):
+            call_command("seed_load_test", **self.SMALL)
+
+    def test_generates_requested_scale(self):
+        from apps.audit.models import AuditLog
+        from apps.groups.models import GroupSessionAttendance
+        from apps.notes.models import MetricValue, ProgressNote
+
+        call_command("seed_load_test", **self.SMALL)
+        self.assertEqual(len(self._snapshot()), 40)
+        self.assertEqual(ProgressNote.objects.filter(client_file__record_id__startswith="LOAD-").count(), 120)
+        self.assertEqual(MetricValue.objects.count(), 120)
+        self.assertEqual(GroupSessionAttendance.objects.count(), 2 * 3 * 12)
+        self.assertEqual(AuditLog.objects.using("audit").filter(is_demo_context=True).count(), 20)
+
+    def test_reproducible_and_reset(self):
+        from django.core.management.base import CommandError
+
+        call_command("seed_load_test", **self.SMALL)
+        first = self._snapshot()
+        with self.assertRaises(CommandError):
+            call_command("seed_load_test", **self.SMALL)
+        call_command("seed_load_test", reset=True, **self.SMALL)
+        self.assertEqual(self._snapshot(), first)
+
+
 @override_settings(FIELD_ENCRYPTION_KEY=TEST_KEY, DEMO_MODE=False)
 class UpdateDemoClientFieldsTest(TestCase):
     """Tests for the update_demo_client_fields command."""
@@ -366,6 +420,60 @@ class StartupCheckTest(TestCase):
             self.assertEqual(ctx.exception.code, 1)
 
 
+@override_settings(FIELD_ENCRYPTION_KEY=TEST_KEY)
+class StartupTest(TestCase):
+    """Tests for the startup command (entrypoint.sh)."""
+
+    databases = {"default", "audit"}
+
+    def setUp(self):
+        enc_module._fernet = None
+        env = unittest.mock.patch.dict(os.environ, {"KONOTE_MODE": "demo"})
+        env.start()
+        self.addCleanup(env.stop)
+
+    def tearDown(self):
+        enc_module._fernet = None
+
+    def _startup(self, *args):
+        out = io.StringIO()
+        call_command("startup", *args, stdout=out, stderr=io.StringIO())
+        return out.getvalue()
+
+    def test_skips_unchanged_steps(self):
+        from apps.admin_settings.models import FeatureToggle, StartupFingerprint
+
+        output = self._startup()
+        self.assertIn("No migrations to apply", output)
+        self.assertIn("Seed complete.", output)
+        self.assertTrue(FeatureToggle.objects.exists())
+        self.assertEqual(
+            set(StartupFingerprint.objects.values_list("step", flat=True)),
+            {"seed", "check_translations"},  # lockdown_audit_db needs PostgreSQL
+        )
+
+        output = self._startup()
+        self.assertIn("seed: inputs unchanged", output)
+        self.assertIn("check_translations: inputs unchanged", output)
+        self.assertNotIn("Seed complete.", output)
+        self.assertIn("Running lockdown_audit_db", output)  # Never skipped
+        self.assertIn("Running clearsessions", output)
+        self.assertIn("Startup Security Check", output)
+
+    def test_changed_inputs_rerun_step(self):
+        self._startup()
+        with unittest.mock.patch.dict(os.environ, {"DEMO_EMAIL_BASE": "team@example.org"}):
+            output = self._startup()
+        self.assertIn("Seed complete.", output)
+        self.assertIn("check_translations: inputs unchanged", output)
+
+    def test_failed_security_check_blocks_startup(self):
+        with unittest.mock.patch.dict(os.environ, {"KONOTE_MODE": "invalid"}):
+            with self.assertRaises(SystemExit) as ctx:
+                self._startup()
+        self.assertEqual(ctx.exception.code, 1)
+
+
 # =========================================================================
 # Translation Commands
 # =========================================================================
@@ -528,6 +636,95 @@ class AlertExpiredRetentionTest(TestCase):
         self.assertIn("DRY RUN", output)
 
 
+@override_settings(FIELD_ENCRYPTION_KEY=TEST_KEY)
+class RefreshBirthYearsTest(TestCase):
+    """Tests for the refresh_birth_years command."""
+
+    def setUp(self):
+        enc_module._fernet = None
+
+    def tearDown(self):
+        enc_module._fernet = None
+
+    def test_backfills_missing_and_stale_tokens(self):
+        from apps.clients.birth_year import birth_year_token
+        from apps.clients.models import ClientFile
+
+        client = ClientFile()
+        client.birth_date = "1990-04-15"
+        client.save()
+        expected = client.birth_year_token
+        self.assertEqual(expected, birth_year_token("1990-01-01"))
+        self.assertNotIn("1990", expected)
+        ClientFile.objects.create()  # No birth date — nothing to do
+
+        ClientFile.objects.filter(pk=client.pk).update(birth_year_token="")
+        out = io.StringIO()
+        call_command("refresh_birth_years", stdout=out)
+        client.refresh_from_db()
+        self.assertEqual(client.birth_year_token, expected)
+        self.assertIn("Checked 1 birth date(s). Updated 1 token(s).", out.getvalue())
+
+        # After a key rotation (new key first) every token is stale
+        new_key = Fernet.generate_key().decode()
+        with self.settings(FIELD_ENCRYPTION_KEY=f"{new_key},{TEST_KEY}"):
+            enc_module._fernet = None
+            call_command("refresh_birth_years", stdout=out)
+            client.refresh_from_db()
+            self.assertEqual(client.birth_year_token, birth_year_token("1990-04-15"))
+        enc_module._fernet = None
+        self.assertNotEqual(client.birth_year_token, expected)
+
+
+@override_settings(FIELD_ENCRYPTION_KEY=TEST_KEY)
+class RefreshQuoteIndexTest(TestCase):
+    """Tests for the refresh_quote_index command."""
+
+    def setUp(self):
+        enc_module._fernet = None
+
+    def tearDown(self):
+        enc_module._fernet = None
+
+    def test_backfills_unclassified_and_rekeys_with_all(self):
+        from apps.auth_app.models import User
+        from apps.clients.models import ClientFile
+        from apps.notes.models import ProgressNote
+        from apps.notes.quote_index import WORDS_LONG, WORDS_MEDIUM, text_hash
+
+        note = ProgressNote(
+            client_file=ClientFile.objects.create(),
+            note_type="quick",
+            author=User.objects.create_user(username="worker", password="pass"),
+        )
+        note.participant_reflection = "It helps to talk things through with someone every week"
+        note.participant_suggestion = "Longer hours on Fridays please"
+        note.save()
+        expected_hash = note.reflection_hash
+        ProgressNote.objects.filter(pk=note.pk).update(
+            reflection_bucket=None, reflection_hash="",
+            suggestion_bucket=None, suggestion_hash="",
+        )
+
+        out = io.StringIO()
+        call_command("refresh_quote_index", stdout=out)
+        note.refresh_from_db()
+        self.assertEqual(note.reflection_bucket, WORDS_LONG)
+        self.assertEqual(note.reflection_hash, expected_hash)
+        self.assertEqual(note.suggestion_bucket, WORDS_MEDIUM)
+        self.assertIn("ProgressNote: checked 1 row(s). Updated 1.", out.getvalue())
+
+        # Classified rows are skipped unless --all (e.g. after a SECRET_KEY change)
+        with self.settings(SECRET_KEY="a-different-secret-key"):
+            call_command("refresh_quote_index", stdout=out)
+            note.refresh_from_db()
+            self.assertEqual(note.reflection_hash, expected_hash)
+            call_command("refresh_quote_index", "--all", stdout=out)
+            note.refresh_from_db()
+            self.assertEqual(note.reflection_hash, text_hash(note.participant_reflection))
+        self.assertNotEqual(note.reflection_hash, expected_hash)
+
+
 @override_settings(FIELD_ENCRYPTION_KEY=TEST_KEY)
 class MigratePhoneFieldTest(TestCase):
     """Tests for the migrate_phone_field command."""
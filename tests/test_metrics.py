@@ -0,0 +1,110 @@
+"""Tests for encryption metrics and the Prometheus /metrics endpoint."""
+import os
+
+from cryptography.fernet import Fernet
+from django.test import Client, TestCase, override_settings
+
+from apps.clients.models import ClientFile
+from konote import encryption, metrics
+from konote.encryption import decrypt_field, encrypt_field
+import konote.encryption as enc_module
+
+
+KEY_A = Fernet.generate_key().decode()
+KEY_B = Fernet.generate_key().decode()
+
+
+def _decrypt_here(token):
+    return decrypt_field(token)
+
+
+@override_settings(FIELD_ENCRYPTION_KEY=KEY_A, METRICS_ENABLED=True)
+class EncryptionMetricsTest(TestCase):
+
+    def setUp(self):
+        enc_module._fernet = None
+        metrics.reset_metrics()
+
+    def tearDown(self):
+        enc_module._fernet = None
+        metrics.reset_metrics()
+
+    def test_labelled_by_model_field(self):
+        client = ClientFile()
+        client.first_name = "Jane"
+        self.assertEqual(client.first_name, "Jane")
+        self.assertEqual(encryption.CALLS.value("encrypt", "ClientFile.first_name"), 1)
+        self.assertEqual(encryption.CALLS.value("decrypt", "ClientFile.first_name"), 1)
+        self.assertGreater(encryption.BYTES.value("decrypt", "ClientFile.first_name"), 0)
+        self.assertEqual(encryption.SECONDS.count("decrypt", "ClientFile.first_name"), 1)
+
+    def test_other_callers_labelled_by_function(self):
+        _decrypt_here(encrypt_field("x"))
+        self.assertEqual(encryption.CALLS.value("decrypt", f"{__name__}._decrypt_here"), 1)
+
+    def test_invalid_token_counted(self):
+        self.assertEqual(_decrypt_here(b"not-a-token"), "")
+        self.assertEqual(encryption.FAILURES.value(f"{__name__}._decrypt_here"), 1)
+
+    def test_rotation_key_index(self):
+        old_token = encrypt_field("old")
+        with self.settings(FIELD_ENCRYPTION_KEY=f"{KEY_B},{KEY_A}"):
+            enc_module._fernet = None
+            new_token = encrypt_field("new")
+            self.assertEqual(decrypt_field(old_token), "old")
+            self.assertEqual(decrypt_field(new_token), "new")
+        self.assertEqual(encryption.KEY_INDEX.value("1"), 1)
+        self.assertEqual(encryption.KEY_INDEX.value("0"), 1)
+
+    @override_settings(METRICS_ENABLED=False)
+    def test_nothing_recorded_when_disabled(self):
+        decrypt_field(encrypt_field("x"))
+        self.assertEqual(metrics.render_metrics().count("konote_encryption_calls_total{"), 0)
+
+
+@override_settings(FIELD_ENCRYPTION_KEY=KEY_A, METRICS_ENABLED=True, METRICS_TOKEN="scrape-secret")
+class MetricsEndpointTest(TestCase):
+
+    def setUp(self):
+        enc_module._fernet = None
+        metrics.reset_metrics()
+        self.http = Client()
+
+    def tearDown(self):
+        enc_module._fernet = None
+        metrics.reset_metrics()
+
+    def test_prometheus_text(self):
+        decrypt_field(encrypt_field("x"))
+        resp = self.http.get("/metrics", HTTP_AUTHORIZATION="Bearer scrape-secret")
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp["Content-Type"].startswith("text/plain; version=0.0.4"))
+        body = resp.content.decode()
+        self.assertIn("# TYPE konote_encryption_calls_total counter", body)
+        self.assertIn('konote_encryption_seconds_bucket{op="decrypt",', body)
+        self.assertIn('le="+Inf"', body)
+
+    def test_series_labelled_with_worker_pid(self):
+        # Each gunicorn worker keeps its own counters; the pid label keeps
+        # their series apart so Prometheus doesn't read a switch as a reset.
+        decrypt_field(encrypt_field("x"))
+        body = self.http.get("/metrics", HTTP_AUTHORIZATION="Bearer scrape-secret").content.decode()
+        series = [line for line in body.splitlines() if line.startswith("konote_encryption_")]
+        self.assertTrue(series)
+        for line in series:
+            self.assertIn(f'pid="{os.getpid()}"', line)
+
+    def test_token_required(self):
+        self.assertEqual(self.http.get("/metrics").status_code, 401)
+        resp = self.http.get("/metrics", HTTP_AUTHORIZATION="Bearer wrong")
+        self.assertEqual(resp.status_code, 401)
+
+    @override_settings(METRICS_ENABLED=False)
+    def test_404_when_disabled(self):
+        resp = self.http.get("/metrics", HTTP_AUTHORIZATION="Bearer scrape-secret")
+        self.assertEqual(resp.status_code, 404)
+
+    @override_settings(METRICS_TOKEN="")
+    def test_404_without_token(self):
+        # Enabled but no token configured: never served publicly.
+        self.assertEqual(self.http.get("/metrics").status_code, 404)
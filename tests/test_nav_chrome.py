@@ -0,0 +1,146 @@
+"""Tests for the cached template loader, lazy nav badge counts and the cached nav menu."""
+from cryptography.fernet import Fernet
+from django.core.cache import cache
+from django.db import connection
+from django.template import Context, RequestContext, Template, engines
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from apps.auth_app.models import User
+from apps.programs.models import Program, UserProgramRole
+from apps.registration.models import RegistrationLink, RegistrationSubmission
+import konote.encryption as enc_module
+
+TEST_KEY = Fernet.generate_key().decode()
+
+
+class TemplateLoaderTest(SimpleTestCase):
+
+    def test_templates_use_cached_loader(self):
+        from django.template.loaders.cached import Loader
+
+        loaders = engines["django"].engine.template_loaders
+        self.assertEqual(len(loaders), 1)
+        self.assertIsInstance(loaders[0], Loader)
+        self.assertEqual(
+            [type(loader).__module__ for loader in loaders[0].loaders],
+            ["django.template.loaders.filesystem", "django.template.loaders.app_directories"],
+        )
+
+
+@override_settings(FIELD_ENCRYPTION_KEY=TEST_KEY)
+class LazyBadgeCountTest(TestCase):
+    databases = {"default", "audit"}
+
+    def setUp(self):
+        enc_module._fernet = None
+        self.admin = User.objects.create_user(
+            username="admin", password="testpass123", is_admin=True,
+        )
+        self.program = Program.objects.create(name="Housing", colour_hex="#10B981")
+        link = RegistrationLink.objects.create(program=self.program, title="Intake", created_by=self.admin)
+        RegistrationSubmission.objects.create(registration_link=link, status="pending")
+        cache.clear()
+
+    def tearDown(self):
+        enc_module._fernet = None
+
+    def _request(self, user):
+        request = RequestFactory().get("/")
+        request.user = user
+        return request
+
+    def test_partial_without_badges_runs_no_count_queries(self):
+        request = self._request(self.admin)
+        with CaptureQueriesContext(connection) as ctx:
+            Template("{{ user.username }}").render(RequestContext(request, {}))
+        sql = " ".join(q["sql"] for q in ctx.captured_queries)
+        self.assertNotIn("registration_submissions", sql)
+        self.assertNotIn("erasure_requests", sql)
+        self.assertNotIn("alert_cancellation_recommendations", sql)
+
+    def test_badge_count_queries_when_rendered(self):
+        from konote.context_processors import pending_submissions
+
+        result = pending_submissions(self._request(self.admin))
+        rendered = Template(
+            "{% if pending_submissions_count %}[{{ pending_submissions_count }}]{% endif %}"
+        ).render(Context(result))
+        self.assertEqual(rendered, "[1]")
+        self.assertEqual(cache.get("pending_submissions_count"), 1)
+
+    def test_zero_count_hides_badge(self):
+        from konote.context_processors import pending_submissions
+
+        RegistrationSubmission.objects.update(status="approved")
+        result = pending_submissions(self._request(self.admin))
+        rendered = Template(
+            "{% if pending_submissions_count %}badge{% endif %}"
+        ).render(Context(result))
+        self.assertEqual(rendered, "")
+
+    def test_active_roles_queried_once_per_request(self):
+        from konote.context_processors import pending_erasures, pending_recommendations, user_roles
+
+        pm = User.objects.create_user(username="pm", password="testpass123")
+        UserProgramRole.objects.create(user=pm, program=self.program, role="program_manager")
+        request = self._request(pm)
+        with self.assertNumQueries(1):
+            user_roles(request)
+            erasures = pending_erasures(request)
+            recommendations = pending_recommendations(request)
+        self.assertIn("pending_erasure_count", erasures)
+        self.assertIn("pending_recommendation_count", recommendations)
+
+
+@override_settings(FIELD_ENCRYPTION_KEY=TEST_KEY)
+class CachedNavTest(TestCase):
+    databases = {"default", "audit"}
+
+    def setUp(self):
+        enc_module._fernet = None
+        self.program = Program.objects.create(name="Housing", colour_hex="#10B981")
+        self.user = User.objects.create_user(username="worker", password="testpass123")
+        self.role = UserProgramRole.objects.create(user=self.user, program=self.program, role="staff")
+        self.client.login(username="worker", password="testpass123")
+        cache.clear()
+
+    def tearDown(self):
+        enc_module._fernet = None
+
+    def test_repeat_page_load_uses_cached_nav(self):
+        first = self.client.get("/programs/")
+        with CaptureQueriesContext(connection) as ctx:
+            second = self.client.get("/programs/")
+        self.assertEqual(first.status_code, 200)
+        self.assertContains(second, 'id="nav-menu"')
+        self.assertContains(second, "/reports/insights/")
+        # The has_permission tags inside the fragment aren't re-run.
+        self.assertLess(len(ctx.captured_queries), self._queries_for_uncached_load())
+
+    def _queries_for_uncached_load(self):
+        cache.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get("/programs/")
+        return len(ctx.captured_queries)
+
+    def test_role_change_refreshes_nav(self):
+        response = self.client.get("/programs/")
+        self.assertNotContains(response, "/reports/export/")
+
+        self.role.role = "program_manager"
+        self.role.save()
+        response = self.client.get("/programs/")
+        self.assertContains(response, "/reports/export/")
+
+    def test_badge_updates_when_count_cache_cleared(self):
+        admin = User.objects.create_user(username="admin", password="testpass123", is_admin=True)
+        link = RegistrationLink.objects.create(program=self.program, title="Intake", created_by=admin)
+        submission = RegistrationSubmission.objects.create(registration_link=link, status="pending")
+        self.client.login(username="admin", password="testpass123")
+        badge = '{} <span class="badge badge-warning">1</span>'.format("Pending Submissions")
+
+        self.assertContains(self.client.get("/admin/settings/"), badge)
+        submission.status = "approved"
+        submission.save()  # Clears pending_submissions_count
+        self.assertNotContains(self.client.get("/admin/settings/"), badge)
@@ -1,5 +1,9 @@
 """Tests for Phase 4: Progress Notes views and forms."""
+from datetime import datetime, timedelta
+
+from django.db import connection
 from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from cryptography.fernet import Fernet
 
@@ -178,6 +182,73 @@ class NoteViewsTest(TestCase):
         self.assertEqual(resp.status_code, 200)
         self.assertContains(resp, "Test note")
 
+    def test_note_list_date_filter_uses_backdate(self):
+        """Backdated notes are filtered by the session date, not entry date."""
+        ProgressNote.objects.create(
+            client_file=self.client_file, note_type="quick",
+            notes_text="Backdated note", author=self.staff,
+            backdate=timezone.make_aware(datetime(2025, 3, 14, 10, 0)),
+        )
+        ProgressNote.objects.create(
+            client_file=self.client_file, note_type="quick",
+            notes_text="Today note", author=self.staff,
+        )
+        self.http.login(username="staff", password="pass")
+        resp = self.http.get(
+            f"/notes/client/{self.client_file.pk}/?date_from=2025-03-14&date_to=2025-03-14"
+        )
+        self.assertContains(resp, "Backdated note")
+        self.assertNotContains(resp, "Today note")
+
+    def test_note_list_show_more_continues_after_cursor(self):
+        """First page shows 25 notes; HTMX "Show more" returns the rest."""
+        base = timezone.now() - timedelta(days=60)
+        ProgressNote.objects.bulk_create([
+            ProgressNote(
+                client_file=self.client_file, note_type="quick", author=self.staff,
+                backdate=base + timedelta(days=i),
+            )
+            for i in range(30)
+        ])
+        self.http.login(username="staff", password="pass")
+        resp = self.http.get(f"/notes/client/{self.client_file.pk}/")
+        first_page = resp.context["notes"]
+        self.assertEqual(len(first_page), 25)
+        self.assertEqual(resp.context["total_count"], 30)
+        self.assertIsNotNone(resp.context["next_cursor"])
+
+        resp = self.http.get(
+            f"/notes/client/{self.client_file.pk}/",
+            {"cursor": resp.context["next_cursor"]},
+            HTTP_HX_REQUEST="true",
+        )
+        self.assertTemplateUsed(resp, "notes/_note_list_page.html")
+        second_page = resp.context["notes"]
+        self.assertEqual(len(second_page), 5)
+        self.assertIsNone(resp.context["next_cursor"])
+        self.assertFalse({n.pk for n in first_page} & {n.pk for n in second_page})
+        self.assertLess(second_page[0].effective_date, first_page[-1].effective_date)
+
+    def test_note_list_search_finds_match_past_first_batch(self):
+        """Search scans older batches until it finds matches."""
+        match = ProgressNote.objects.create(
+            client_file=self.client_file, note_type="quick",
+            notes_text="Talked about the bursary", author=self.staff,
+            backdate=timezone.now() - timedelta(days=365),
+        )
+        ProgressNote.objects.bulk_create([
+            ProgressNote(
+                client_file=self.client_file, note_type="quick",
+                notes_text="Routine check-in", author=self.staff,
+            )
+            for _ in range(120)
+        ])
+        self.http.login(username="staff", password="pass")
+        resp = self.http.get(f"/notes/client/{self.client_file.pk}/?q=bursary")
+        self.assertEqual([n.pk for n in resp.context["notes"]], [match.pk])
+        self.assertIsNone(resp.context["next_cursor"])
+        self.assertContains(resp, "bursary")
+
     # -- Full Notes --
 
     def test_full_note_create_with_targets_and_metrics(self):
@@ -377,6 +448,55 @@ class NoteViewsTest(TestCase):
         self.assertEqual(resp.status_code, 200)
         self.assertContains(resp, "Consent Required")
 
+    def _post_full_note(self, target_count, metrics_per_target=3):
+        section = PlanSection.objects.create(
+            client_file=self.client_file, name="Goals", program=self.prog,
+        )
+        metrics = [
+            MetricDefinition.objects.create(
+                name=f"Metric {i}", min_value=0, max_value=10,
+                definition="Test", category="general",
+            )
+            for i in range(metrics_per_target)
+        ]
+        data = {"interaction_type": "session", "consent_confirmed": True}
+        for t in range(target_count):
+            target = PlanTarget.objects.create(
+                plan_section=section, client_file=self.client_file, name=f"Target {t}",
+            )
+            data[f"target_{target.pk}-target_id"] = str(target.pk)
+            data[f"target_{target.pk}-notes"] = f"Notes {t}"
+            for metric in metrics:
+                PlanTargetMetric.objects.create(plan_target=target, metric_def=metric)
+                data[f"metric_{target.pk}_{metric.pk}-metric_def_id"] = str(metric.pk)
+                data[f"metric_{target.pk}_{metric.pk}-value"] = "5"
+        with CaptureQueriesContext(connection) as queries:
+            resp = self.http.post(f"/notes/client/{self.client_file.pk}/new/", data)
+        self.assertEqual(resp.status_code, 302)
+        return len(queries)
+
+    def test_full_note_query_count_does_not_grow_with_targets(self):
+        self.http.login(username="staff", password="pass")
+        small = self._post_full_note(target_count=2)
+        ProgressNote.objects.all().delete()
+        PlanTarget.objects.all().delete()
+        large = self._post_full_note(target_count=8)
+        self.assertEqual(small, large)
+        self.assertEqual(ProgressNoteTarget.objects.count(), 8)
+        self.assertEqual(MetricValue.objects.count(), 24)
+        pnt = ProgressNoteTarget.objects.order_by("plan_target_id").first()
+        self.assertEqual(pnt.notes, "Notes 0")
+
+    def test_template_defaults_refresh_when_template_changes(self):
+        from apps.notes.composition import get_template_defaults
+        from apps.notes.models import ProgressNoteTemplate
+
+        tmpl = ProgressNoteTemplate.objects.create(name="Phone check-in", default_interaction_type="phone")
+        self.assertEqual(get_template_defaults()[str(tmpl.pk)], "phone")
+        tmpl.default_interaction_type = "home_visit"
+        tmpl.save()
+        self.assertEqual(get_template_defaults()[str(tmpl.pk)], "home_visit")
+
 
 @override_settings(FIELD_ENCRYPTION_KEY=TEST_KEY)
 class QualitativeSummaryTest(TestCase):
@@ -467,3 +587,51 @@ class QualitativeSummaryTest(TestCase):
         self.http.login(username="recep", password="pass")
         resp = self.http.get(f"/notes/client/{self.client_file.pk}/qualitative/")
         self.assertEqual(resp.status_code, 403)
+
+
+class EffectiveDateTest(TestCase):
+    """ProgressNote.effective_date is stored and kept in sync on save."""
+
+    databases = {"default", "audit"}
+
+    def setUp(self):
+        enc_module._fernet = None
+        self.staff = User.objects.create_user(username="staff", password="pass")
+        self.client_file = ClientFile.objects.create()
+
+    def tearDown(self):
+        enc_module._fernet = None
+
+    def test_defaults_to_created_at(self):
+        note = ProgressNote.objects.create(
+            client_file=self.client_file, note_type="quick", author=self.staff,
+        )
+        note.refresh_from_db()
+        self.assertEqual(note.effective_date, note.created_at)
+
+    def test_follows_backdate_on_save(self):
+        note = ProgressNote.objects.create(
+            client_file=self.client_file, note_type="quick", author=self.staff,
+        )
+        backdate = timezone.now() - timedelta(days=30)
+        note.backdate = backdate
+        note.save()
+        note.refresh_from_db()
+        self.assertEqual(note.effective_date, backdate)
+
+        note.backdate = None
+        note.save()
+        note.refresh_from_db()
+        self.assertEqual(note.effective_date, note.created_at)
+
+    def test_set_by_bulk_create(self):
+        backdate = timezone.now() - timedelta(days=3)
+        ProgressNote.objects.bulk_create([
+            ProgressNote(client_file=self.client_file, note_type="quick", author=self.staff),
+            ProgressNote(
+                client_file=self.client_file, note_type="quick", author=self.staff,
+                backdate=backdate,
+            ),
+        ])
+        self.assertFalse(ProgressNote.objects.filter(effective_date__isnull=True).exists())
+        self.assertTrue(ProgressNote.objects.filter(effective_date=backdate).exists())
@@ -0,0 +1,157 @@
+"""Tests for the shared outbound transport layer (konote/transport.py).
+
+Covers:
+- CircuitBreaker state transitions (closed → open → half-open → closed)
+- Provider-failure classification (client errors never trip the breaker)
+- Breaker health feeding SystemHealthCheck
+- send_sms short-circuits while Twilio is down
+- send_email_message reuses one pooled mail connection
+- _call_openrouter returns None without calling out while the circuit is open
+"""
+from unittest.mock import MagicMock, patch
+
+import requests
+from django.core import mail
+from django.test import TestCase, override_settings
+
+from apps.communications.models import SystemHealthCheck
+from apps.communications.services import send_email_message, send_sms
+from konote import transport
+from konote.transport import CircuitBreaker, CircuitOpenError, is_provider_failure
+
+
+def _http_error(status):
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(response=response)
+
+
+@override_settings(OUTBOUND_CIRCUIT_FAILURE_THRESHOLD=2, OUTBOUND_CIRCUIT_RESET_SECONDS=60)
+class CircuitBreakerTests(TestCase):
+    def test_opens_after_threshold_failures(self):
+        breaker = CircuitBreaker("test")
+        breaker.record_failure("timeout")
+        self.assertTrue(breaker.allow())
+        breaker.record_failure("timeout")
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(breaker.allow())
+
+    def test_half_open_allows_single_trial(self):
+        breaker = CircuitBreaker("test")
+        breaker.record_failure("down")
+        breaker.record_failure("down")
+        with override_settings(OUTBOUND_CIRCUIT_RESET_SECONDS=0):
+            self.assertTrue(breaker.allow())
+            self.assertFalse(breaker.allow())
+            breaker.record_success()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+        self.assertTrue(breaker.allow())
+
+    def test_failed_trial_reopens(self):
+        breaker = CircuitBreaker("test")
+        breaker.record_failure("down")
+        breaker.record_failure("down")
+        with override_settings(OUTBOUND_CIRCUIT_RESET_SECONDS=0):
+            self.assertTrue(breaker.allow())
+        breaker.record_failure("still down")
+        self.assertFalse(breaker.allow())
+
+    def test_health_channel_records_failures(self):
+        breaker = CircuitBreaker("test", health_channel="ai")
+        breaker.record_failure("Connection refused")
+        health = SystemHealthCheck.objects.get(channel="ai")
+        self.assertEqual(health.consecutive_failures, 1)
+        breaker.record_success()
+        health.refresh_from_db()
+        self.assertEqual(health.consecutive_failures, 0)
+
+
+class ProviderFailureTests(TestCase):
+    def test_network_errors_are_provider_failures(self):
+        self.assertTrue(is_provider_failure(requests.ConnectionError()))
+        self.assertTrue(is_provider_failure(requests.Timeout()))
+
+    def test_server_errors_are_provider_failures(self):
+        self.assertTrue(is_provider_failure(_http_error(503)))
+        self.assertTrue(is_provider_failure(_http_error(429)))
+
+    def test_client_errors_are_not_provider_failures(self):
+        self.assertFalse(is_provider_failure(_http_error(400)))
+        bad_number = Exception("21211 invalid number")
+        bad_number.status = 400
+        self.assertFalse(is_provider_failure(bad_number))
+
+
+@override_settings(
+    SMS_ENABLED=True,
+    TWILIO_ACCOUNT_SID="AC_test",
+    TWILIO_AUTH_TOKEN="token",
+    TWILIO_FROM_NUMBER="+15550000000",
+    OUTBOUND_CIRCUIT_FAILURE_THRESHOLD=2,
+)
+class SendSmsBreakerTests(TestCase):
+    def setUp(self):
+        transport.reset_breakers()
+        self.addCleanup(transport.reset_breakers)
+
+    @patch("apps.communications.services.get_twilio_client")
+    def test_short_circuits_while_twilio_down(self, mock_client):
+        create = mock_client.return_value.messages.create
+        create.side_effect = requests.ConnectionError("Twilio unreachable")
+        send_sms("+15551234567", "Reminder")
+        send_sms("+15551234567", "Reminder")
+        self.assertEqual(create.call_count, 2)
+
+        ok, error = send_sms("+15551234567", "Reminder")
+        self.assertFalse(ok)
+        self.assertEqual(create.call_count, 2)  # no third upstream call
+        self.assertEqual(SystemHealthCheck.objects.get(channel="sms").consecutive_failures, 3)
+
+    @patch("apps.communications.services.get_twilio_client")
+    def test_invalid_number_does_not_trip_breaker(self, mock_client):
+        error = Exception("HTTP 400 error: 21211 invalid 'To' number")
+        error.status = 400
+        create = mock_client.return_value.messages.create
+        create.side_effect = error
+        for _ in range(3):
+            send_sms("+1555", "Reminder")
+        self.assertEqual(create.call_count, 3)
+
+
+class SendEmailPoolTests(TestCase):
+    def setUp(self):
+        transport.reset_breakers()
+        transport._close_mail_connection()
+        self.addCleanup(transport._close_mail_connection)
+
+    def test_batch_reuses_one_connection(self):
+        with patch("django.core.mail.get_connection", wraps=mail.get_connection) as spy:
+            for i in range(3):
+                ok, _ = send_email_message(f"client{i}@example.com", "Reminder", "Body")
+                self.assertTrue(ok)
+        self.assertEqual(spy.call_count, 1)
+        self.assertEqual(len(mail.outbox), 3)
+
+
+@override_settings(OPENROUTER_API_KEY="test-key", OUTBOUND_CIRCUIT_FAILURE_THRESHOLD=1)
+class OpenRouterBreakerTests(TestCase):
+    def setUp(self):
+        transport.reset_breakers()
+        self.addCleanup(transport.reset_breakers)
+
+    def test_open_circuit_skips_network(self):
+        from konote.ai import _call_openrouter
+
+        session = MagicMock()
+        session.post.side_effect = requests.Timeout("read timed out")
+        with patch("konote.transport.get_http_session", return_value=session):
+            self.assertIsNone(_call_openrouter("system", "user"))
+            self.assertIsNone(_call_openrouter("system", "user"))
+        self.assertEqual(session.post.call_count, 1)
+        self.assertEqual(SystemHealthCheck.objects.get(channel="ai").consecutive_failures, 1)
+
+    def test_http_post_raises_circuit_open(self):
+        breaker = CircuitBreaker("http-test")
+        breaker.record_failure("down")
+        with self.assertRaises(CircuitOpenError):
+            transport.http_post("https://openrouter.ai/api", breaker, json={})
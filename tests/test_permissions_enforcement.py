@@ -25,14 +25,18 @@ Matrix-enforced keys under /admin/ URL:
   audit.view — middleware exempts /admin/audit/, view uses @requires_permission
 """
 from cryptography.fernet import Fernet
-from django.test import TestCase, override_settings
+from django.test import SimpleTestCase, TestCase, override_settings
 
 from apps.auth_app.models import User
 from apps.auth_app.permissions import (
     ALLOW,
+    CLIENT_SCOPED_KEYS,
     DENY,
     PERMISSIONS,
+    all_client_permissions_denied,
     can_access,
+    is_allowed,
+    template_permissions,
 )
 from apps.clients.models import ClientFile, ClientProgramEnrolment
 from apps.events.models import Alert, Event, Meeting
@@ -412,3 +416,38 @@ class AdminPermissionTest(TestCase):
                         f"got {response.status_code}",
                     )
             self.client.logout()
+
+
+class CompiledPermissionsTest(SimpleTestCase):
+    """The import-time compiled matrix agrees with PERMISSIONS."""
+
+    def test_compiled_roles_match_matrix(self):
+        for role, role_perms in PERMISSIONS.items():
+            for key, level in role_perms.items():
+                with self.subTest(role=role, key=key):
+                    self.assertEqual(can_access(role, key), level)
+                    self.assertEqual(is_allowed(role, key), level != DENY)
+                    self.assertEqual(
+                        template_permissions(role)[key.replace(".", "_")], level != DENY,
+                    )
+
+    def test_all_client_permissions_denied(self):
+        for role, role_perms in PERMISSIONS.items():
+            with self.subTest(role=role):
+                self.assertEqual(
+                    all_client_permissions_denied(role),
+                    all(role_perms[key] == DENY for key in CLIENT_SCOPED_KEYS),
+                )
+        self.assertTrue(all_client_permissions_denied("executive"))
+        self.assertFalse(all_client_permissions_denied("staff"))
+
+    def test_unknown_role_or_key_is_denied(self):
+        self.assertEqual(can_access("volunteer", "note.view"), DENY)
+        self.assertFalse(is_allowed("volunteer", "note.view"))
+        self.assertFalse(is_allowed("staff", "no.such_key"))
+        self.assertEqual(dict(template_permissions("volunteer")), {})
+        self.assertTrue(all_client_permissions_denied("volunteer"))
+
+    def test_template_permissions_are_read_only(self):
+        with self.assertRaises(TypeError):
+            template_permissions("staff")["note_view"] = False
@@ -1,7 +1,16 @@
 """Tests for PII scrubbing — verifies name replacement and regex patterns."""
-from django.test import SimpleTestCase
+import re
 
-from apps.reports.pii_scrub import scrub_pii
+from cryptography.fernet import Fernet
+from django.test import SimpleTestCase, TestCase, override_settings
+
+import konote.encryption as enc_module
+from apps.auth_app.models import User
+from apps.clients.models import ClientFile, ClientProgramEnrolment
+from apps.programs.models import Program
+from apps.reports.pii_scrub import NameScrubber, program_scrubber, scrub_pii
+
+TEST_KEY = Fernet.generate_key().decode()
 
 
 class PiiScrubNameReplacementTest(SimpleTestCase):
@@ -145,3 +154,80 @@ class PiiScrubCombinedTest(SimpleTestCase):
         self.assertIn("[PHONE]", result)
         self.assertIn("[POSTAL CODE]", result)
         self.assertIn("[EMAIL]", result)
+
+
+class NameScrubberTest(SimpleTestCase):
+    """Test the compiled scrubber used for many texts at once."""
+
+    NAMES = ["Mary", "Mary-Jane", "Jo", "Joanne", "Lee", "Ann Lee"]
+
+    def _one_pattern_per_name(self, text):
+        """The original loop: one pattern per name, longest first."""
+        for name in sorted(self.NAMES, key=len, reverse=True):
+            text = re.sub(r"\b" + re.escape(name) + r"(?:'s)?\b", "[NAME]", text, flags=re.IGNORECASE)
+        return text
+
+    def test_matches_one_pattern_per_name(self):
+        scrubber = NameScrubber(self.NAMES)
+        texts = [
+            "Mary-Jane was doing well. Mary called later.",
+            "Joanne's sister Jo came in; JOANNE stayed home.",
+            "Ann Lee met Lee, and Mary-Janet waved.",
+            "Jolly people enjoy marylands and leeks.",
+        ]
+        for text in texts:
+            self.assertEqual(scrubber.scrub(text), self._one_pattern_per_name(text))
+
+    def test_scrubs_structured_pii_too(self):
+        scrubber = NameScrubber(["John"])
+        self.assertEqual(
+            scrubber.scrub("John: john@example.com, 613-555-1234"),
+            "[NAME]: [EMAIL], [PHONE]",
+        )
+
+    def test_no_names(self):
+        scrubber = NameScrubber([None, "", "A"])
+        self.assertEqual(scrubber.scrub("A note about Mary."), "A note about Mary.")
+        self.assertIsNone(scrubber.scrub(None))
+
+
+@override_settings(FIELD_ENCRYPTION_KEY=TEST_KEY)
+class ProgramScrubberTest(TestCase):
+    """program_scrubber() is reused until client, enrolment or staff data changes."""
+
+    def setUp(self):
+        enc_module._fernet = None
+        self.program = Program.objects.create(name="Scrub Program")
+        self._enrol("Priya")
+
+    def tearDown(self):
+        enc_module._fernet = None
+
+    def _enrol(self, first_name):
+        client = ClientFile()
+        client.first_name = first_name
+        client.save()
+        ClientProgramEnrolment.objects.create(client_file=client, program=self.program)
+
+    def test_reused_then_rebuilt_on_change(self):
+        scrubber = program_scrubber(self.program)
+        self.assertEqual(scrubber.scrub("Priya and Tomas"), "[NAME] and Tomas")
+        self.assertIs(program_scrubber(self.program), scrubber)
+
+        self._enrol("Tomas")
+        self.assertEqual(program_scrubber(self.program).scrub("Priya and Tomas"), "[NAME] and [NAME]")
+
+    def test_rebuilt_on_rename_without_cache(self):
+        # The stamp is read from the database, not from a (per-process) cache.
+        from django.core.cache import cache
+
+        program_scrubber(self.program)
+        client = ClientFile.objects.get()
+        client.first_name = "Anjali"
+        client.save()
+        cache.clear()
+        self.assertEqual(program_scrubber(self.program).scrub("Anjali visited"), "[NAME] visited")
+
+    def test_staff_names_included(self):
+        User.objects.create_user(username="worker", password="pass", display_name="Deshawn")
+        self.assertEqual(program_scrubber(self.program).scrub("Deshawn visited"), "[NAME] visited")
@@ -0,0 +1,147 @@
+"""Tests for request profiling, the performance report and query budgets."""
+import pytest
+from cryptography.fernet import Fernet
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+
+from apps.auth_app.models import User
+from apps.clients.models import ClientFile, ClientProgramEnrolment
+from apps.programs.models import Program, UserProgramRole
+from konote import profiling
+from konote.encryption import decrypt_field, encrypt_field
+from konote.profiling import assert_query_budget, fingerprint, profile
+import konote.encryption as enc_module
+
+
+TEST_KEY = Fernet.generate_key().decode()
+
+
+class FingerprintTest(SimpleTestCase):
+
+    def test_literals_and_in_lists_collapse(self):
+        a = fingerprint('SELECT * FROM "t" WHERE "id" IN (%s, %s, %s) LIMIT 21')
+        b = fingerprint('SELECT * FROM "t" WHERE "id" IN (%s) LIMIT 1')
+        self.assertEqual(a, b)
+        self.assertEqual(fingerprint("SELECT 'x' FROM t"), fingerprint("SELECT 'y' FROM t"))
+
+
+@override_settings(FIELD_ENCRYPTION_KEY=TEST_KEY)
+class ProfileTest(TestCase):
+
+    def setUp(self):
+        enc_module._fernet = None
+
+    def tearDown(self):
+        enc_module._fernet = None
+
+    def test_counts_queries_repeats_and_decryption(self):
+        token = encrypt_field("Jane")
+        with profile() as prof:
+            for _ in range(3):
+                User.objects.filter(username="nobody").exists()
+            Program.objects.count()
+            decrypt_field(token)
+        self.assertEqual(prof.query_count, 4)
+        self.assertEqual(prof.duplicate_count, 2)
+        self.assertEqual(prof.decrypt_count, 1)
+        self.assertIn("db;dur=", prof.server_timing())
+
+    def test_nothing_recorded_outside_profile(self):
+        with profile() as prof:
+            pass
+        User.objects.count()
+        self.assertEqual(prof.query_count, 0)
+
+    def test_budget_failure_lists_repeated_query(self):
+        with self.assertRaisesRegex(AssertionError, r"3 queries \(budget 2\)[\s\S]*3x SELECT"):
+            with assert_query_budget(2, label="test"):
+                for _ in range(3):
+                    User.objects.count()
+
+    def test_duplicate_budget(self):
+        with self.assertRaisesRegex(AssertionError, r"repeated queries \(budget 0\)"):
+            with assert_query_budget(10, max_duplicates=0):
+                User.objects.count()
+                User.objects.count()
+
+
+@override_settings(FIELD_ENCRYPTION_KEY=TEST_KEY, PROFILING_ENABLED=True)
+class ProfilingMiddlewareTest(TestCase):
+    databases = {"default", "audit"}
+
+    def setUp(self):
+        enc_module._fernet = None
+        profiling.reset_view_stats()
+        self.http = Client()
+        self.admin = User.objects.create_user(username="admin", password="pass", is_admin=True)
+        self.staff = User.objects.create_user(username="staff", password="pass")
+
+    def tearDown(self):
+        enc_module._fernet = None
+        profiling.reset_view_stats()
+
+    def test_server_timing_header_and_report(self):
+        self.http.login(username="admin", password="pass")
+        resp = self.http.get("/admin/settings/")
+        self.assertIn("total;dur=", resp["Server-Timing"])
+        resp = self.http.get("/admin/settings/performance/")
+        self.assertEqual(resp.status_code, 200)
+        self.assertContains(resp, "admin_settings:dashboard")
+
+    def test_report_is_admin_only(self):
+        self.http.login(username="staff", password="pass")
+        resp = self.http.get("/admin/settings/performance/")
+        self.assertEqual(resp.status_code, 403)
+
+    def test_reset(self):
+        self.http.login(username="admin", password="pass")
+        self.http.get("/admin/settings/")
+        self.http.post("/admin/settings/performance/")
+        views = {row["view"] for row in profiling.view_report()}
+        self.assertNotIn("admin_settings:dashboard", views)
+
+
+@override_settings(FIELD_ENCRYPTION_KEY=TEST_KEY)
+class ProfilingDisabledTest(TestCase):
+
+    def test_no_header_by_default(self):
+        resp = Client().get("/auth/login/")
+        self.assertNotIn("Server-Timing", resp)
+
+
+@override_settings(FIELD_ENCRYPTION_KEY=TEST_KEY)
+class ViewQueryBudgetTest(TestCase):
+    """Query budgets for list pages: constant in the number of rows."""
+
+    databases = {"default", "audit"}
+
+    def setUp(self):
+        enc_module._fernet = None
+        self.http = Client()
+        self.staff = User.objects.create_user(username="staff", password="pass")
+        self.program = Program.objects.create(name="Housing")
+        UserProgramRole.objects.create(user=self.staff, program=self.program, role="staff")
+        for i in range(12):
+            cf = ClientFile()
+            cf.first_name = f"Client{i}"
+            cf.last_name = "Test"
+            cf.status = "active"
+            cf.save()
+            ClientProgramEnrolment.objects.create(client_file=cf, program=self.program)
+        self.http.login(username="staff", password="pass")
+
+    def tearDown(self):
+        enc_module._fernet = None
+
+    def test_client_list(self):
+        self.http.get("/clients/")  # Warm per-process caches
+        with assert_query_budget(15, max_duplicates=4, label="clients:client_list"):
+            resp = self.http.get("/clients/")
+        self.assertEqual(resp.status_code, 200)
+
+
+@pytest.mark.django_db
+def test_query_budget_fixture(query_budget):
+    with pytest.raises(AssertionError, match="budget 1"):
+        with query_budget(1):
+            User.objects.count()
+            User.objects.count()
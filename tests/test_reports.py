@@ -391,7 +391,9 @@ class GetClientAchievementRateTest(TestCase):
         )
         if days_ago:
             backdated = timezone.now() - timedelta(days=days_ago)
-            ProgressNote.objects.filter(pk=note.pk).update(created_at=backdated)
+            ProgressNote.objects.filter(pk=note.pk).update(
+                created_at=backdated, effective_date=backdated,
+            )
             note.refresh_from_db()
         pnt = ProgressNoteTarget.objects.create(
             progress_note=note,
@@ -1542,6 +1544,99 @@ class GenerateFunderReportDataTests(TestCase):
         self.assertEqual(report_data["total_contacts"], 1)
 
 
+@override_settings(FIELD_ENCRYPTION_KEY=TEST_KEY)
+class FunderReportCacheTests(TestCase):
+    """Funder report sections are cached until the data they read changes."""
+
+    def setUp(self):
+        enc_module._fernet = None
+        self.program = Program.objects.create(name="Cached Program", status="active")
+        self.user = User.objects.create_user(username="worker", password="testpass123")
+        self.client_file = ClientFile.objects.create()
+        self.client_file.first_name = "Test"
+        self.client_file.birth_date = date(1990, 1, 1)
+        self.client_file.save()
+        ClientProgramEnrolment.objects.create(client_file=self.client_file, program=self.program)
+        self._add_note()
+
+    def tearDown(self):
+        enc_module._fernet = None
+
+    def _add_note(self):
+        ProgressNote.objects.create(client_file=self.client_file, note_type="quick", author=self.user)
+
+    def _generate(self):
+        from apps.reports.funder_report import generate_funder_report_data
+
+        today = timezone.localdate()
+        return generate_funder_report_data(
+            self.program, date_from=today - timedelta(days=30), date_to=today, user=self.user,
+        )
+
+    def test_unchanged_inputs_served_from_cache(self):
+        from konote.profiling import profile
+
+        first = self._generate()
+        with profile() as prof:
+            second = self._generate()
+        self.assertEqual(second["total_contacts"], first["total_contacts"])
+        self.assertEqual(second["age_demographics"], first["age_demographics"])
+        # One version read per section, plus instance settings
+        self.assertLessEqual(prof.query_count, 5)
+
+    def test_new_note_recomputes(self):
+        self.assertEqual(self._generate()["total_contacts"], 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            self._add_note()
+        self.assertEqual(self._generate()["total_contacts"], 2)
+
+    def test_version_bumped_only_on_commit(self):
+        from apps.reports.report_cache import data_version
+
+        before = data_version(["notes"])
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            self._add_note()
+        self.assertEqual(data_version(["notes"]), before)
+        for callback in callbacks:
+            callback()
+        self.assertNotEqual(data_version(["notes"]), before)
+
+    def test_version_shared_across_processes(self):
+        # Stamps live in the database, so clearing this process's cache
+        # (as if the write happened in another worker) changes nothing.
+        from django.core.cache import cache
+
+        from apps.reports.report_cache import data_version
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self._add_note()
+        version = data_version(["notes"])
+        cache.clear()
+        self.assertEqual(data_version(["notes"]), version)
+
+    def test_custom_field_bulk_save_bumps_clients(self):
+        from apps.clients.custom_fields import save_custom_values
+        from apps.clients.models import CustomFieldDefinition, CustomFieldGroup
+        from apps.reports.report_cache import data_version
+
+        group = CustomFieldGroup.objects.create(title="Demographics")
+        field_def = CustomFieldDefinition.objects.create(group=group, name="Language", input_type="text")
+        before = data_version(["clients"])
+        with self.captureOnCommitCallbacks(execute=True):
+            save_custom_values(self.client_file, {field_def: "French"})
+        self.assertNotEqual(data_version(["clients"]), before)
+
+    def test_client_change_keeps_outcomes_cached(self):
+        self._generate()
+        self.client_file.birth_date = date(2015, 1, 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client_file.save()
+        with patch("apps.reports.funder_report.get_achievement_summary") as summary:
+            report = self._generate()
+        summary.assert_not_called()
+        self.assertEqual(report["age_demographics"]["Child (0-12)"], 1)
+
+
 @override_settings(FIELD_ENCRYPTION_KEY=TEST_KEY)
 class GenerateFunderReportCSVRowsTests(TestCase):
     """Tests for the generate_funder_report_csv_rows function."""
@@ -72,6 +72,29 @@ class RotateEncryptionKeySuccessTest(TestCase):
         plaintext = new_fernet.decrypt(raw).decode("utf-8")
         self.assertEqual(plaintext, "rotate@example.com")
 
+    def test_birth_year_token_rekeyed(self):
+        """Birth-year tokens are recomputed under the new key, so reports can read them."""
+        from apps.clients.birth_year import decode_tokens
+        from apps.clients.models import ClientFile
+
+        client = ClientFile()
+        client.first_name = "Jane"
+        client.last_name = "Doe"
+        client.birth_date = "1990-06-15"
+        client.save()
+        old_token = client.birth_year_token
+
+        call_command(
+            "rotate_encryption_key",
+            old_key=OLD_KEY,
+            new_key=NEW_KEY,
+        )
+
+        client.refresh_from_db()
+        self.assertNotEqual(client.birth_year_token, old_token)
+        with override_settings(FIELD_ENCRYPTION_KEY=NEW_KEY):
+            self.assertEqual(decode_tokens()[client.birth_year_token], 1990)
+
 
 @override_settings(FIELD_ENCRYPTION_KEY=OLD_KEY)
 class RotateEncryptionKeyDryRunTest(TestCase):
@@ -0,0 +1,74 @@
+"""Tests for the shared URL routing table (konote.routing)."""
+from django.test import RequestFactory, SimpleTestCase
+
+from konote.context_processors import nav_active
+from konote.routing import Route, classify, route_for
+
+
+class ClassifyTest(SimpleTestCase):
+
+    def test_client_scoped_routes(self):
+        for path in ("/clients/5abc", "/notes/client/5/", "/reports/client/5/export/",
+                     "/plans/client/5/", "/events/client/5/"):
+            with self.subTest(path=path):
+                route = classify(path)
+                self.assertEqual(route.client_id, 5)
+                self.assertIsNone(route.client_view_id)
+
+    def test_client_record_view_is_also_client_scoped(self):
+        for path in ("/clients/7", "/clients/7/", "/clients/7/edit/"):
+            with self.subTest(path=path):
+                route = classify(path)
+                self.assertEqual(route.client_id, 7)
+                self.assertEqual(route.client_view_id, 7)
+
+    def test_django_admin_client_view_is_audited_only(self):
+        route = classify("/django-admin/clients/clientfile/9/change/")
+        self.assertEqual(route.client_view_id, 9)
+        self.assertIsNone(route.client_id)
+
+    def test_note_routes(self):
+        self.assertEqual(classify("/notes/12/edit/").note_id, 12)
+        self.assertIsNone(classify("/notes/client/12/").note_id)
+
+    def test_admin_routes_and_exemptions(self):
+        self.assertTrue(classify("/admin/settings/").admin_only)
+        for path in ("/admin/audit/", "/admin/users/3/", "/admin/settings/note-templates/"):
+            with self.subTest(path=path):
+                route = classify(path)
+                self.assertFalse(route.admin_only)
+                self.assertTrue(route.admin_exempt)
+        self.assertFalse(classify("/django-admin/").admin_only)
+
+    def test_unrelated_path(self):
+        self.assertEqual(classify("/auth/login/"), Route())
+
+    def test_nav_sections(self):
+        cases = {
+            "/": "clients",
+            "/clients/": "clients",
+            "/plans/client/1/": "clients",
+            "/events/alerts/recommendations/": "recommendations",
+            "/events/client/1/": "clients",
+            "/reports/insights/": "insights",
+            "/reports/funder-report/": "reports",
+            "/programs/": "programs",
+            "/groups/3/": "groups",
+            "/admin/users/": "admin",
+            "/erasure/": "admin",
+            "/merge/": "admin",
+            "/auth/login/": "",
+        }
+        for path, section in cases.items():
+            with self.subTest(path=path):
+                self.assertEqual(classify(path).nav_section, section)
+
+
+class RouteForTest(SimpleTestCase):
+
+    def test_classified_once_per_request(self):
+        request = RequestFactory().get("/clients/4/")
+        route = route_for(request)
+        self.assertIs(route_for(request), route)
+        self.assertIs(request.route_info, route)
+        self.assertEqual(nav_active(request), {"nav_active": "clients"})
@@ -0,0 +1,86 @@
+"""Tests for bulk seeding (konote/seeding.py) and the seed commands built on it."""
+import io
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.clients.custom_fields import schema_version
+from apps.clients.models import CustomFieldDefinition, CustomFieldGroup
+from apps.events.models import EventType
+from konote.seeding import SeedSpec, seed
+
+ROWS = [
+    {"name": "Intake", "description": "Client intake", "colour_hex": "#22C55E"},
+    {"name": "Crisis", "description": "Crisis event", "colour_hex": "#EF4444"},
+]
+
+
+class SeedTest(TestCase):
+    def test_creates_missing_rows_only(self):
+        EventType.objects.create(name="Intake", description="Agency wording", colour_hex="#000000")
+
+        result = seed(SeedSpec(EventType, key=("name",), rows=ROWS))
+
+        self.assertEqual([obj.name for obj in result.created], ["Crisis"])
+        self.assertEqual([obj.name for obj in result.unchanged], ["Intake"])
+        self.assertEqual(result.updated, [])
+        # Like get_or_create defaults, an existing row keeps the agency's edits.
+        self.assertEqual(EventType.objects.get(name="Intake").description, "Agency wording")
+        self.assertIsNotNone(result.objects[("Crisis",)].pk)
+
+    def test_sync_fields_are_updated(self):
+        EventType.objects.create(name="Intake", description="Old", colour_hex="#000000")
+
+        result = seed(SeedSpec(EventType, key=("name",), rows=ROWS, sync=("colour_hex",)))
+
+        self.assertEqual(len(result.updated), 1)
+        intake = EventType.objects.get(name="Intake")
+        self.assertEqual(intake.colour_hex, "#22C55E")
+        self.assertEqual(intake.description, "Old")
+        self.assertIn("0 updated, 2 unchanged", seed(
+            SeedSpec(EventType, key=("name",), rows=ROWS, sync=("colour_hex",)),
+        ).summary("Event types"))
+
+    def test_prepare_runs_on_new_objects(self):
+        group = CustomFieldGroup.objects.create(title="Contact")
+        seed(SeedSpec(
+            CustomFieldDefinition,
+            key=("group", "name"),
+            rows=[{"group": group, "name": "Home Postal Code"}],
+            prepare=CustomFieldDefinition.detect_validation_type,
+        ))
+        field = CustomFieldDefinition.objects.get(name="Home Postal Code")
+        self.assertEqual(field.group, group)
+        self.assertEqual(field.validation_type, "postal_code")
+
+    def test_unchanged_run_reads_once_and_writes_nothing(self):
+        seed(SeedSpec(EventType, key=("name",), rows=ROWS))
+        with CaptureQueriesContext(connection) as queries:
+            seed(SeedSpec(EventType, key=("name",), rows=ROWS))
+        self.assertEqual(len(queries), 1)
+
+
+class SeedIntakeFieldsBulkTest(TestCase):
+    databases = {"default", "audit"}
+
+    def test_runs_save_logic_and_invalidates_schema(self):
+        before = schema_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("seed_intake_fields", stdout=io.StringIO())
+
+        self.assertNotEqual(schema_version(), before)
+        phone = CustomFieldDefinition.objects.get(name="Primary Phone")
+        self.assertEqual(phone.validation_type, "phone")
+        self.assertEqual(
+            CustomFieldGroup.objects.get(title="Health & Safety").status, "archived",
+        )
+
+    def test_second_run_creates_nothing(self):
+        call_command("seed_intake_fields", stdout=io.StringIO())
+        field_count = CustomFieldDefinition.objects.count()
+        out = io.StringIO()
+        call_command("seed_intake_fields", stdout=out)
+        self.assertEqual(CustomFieldDefinition.objects.count(), field_count)
+        self.assertIn("0 groups and 0 fields created", out.getvalue())
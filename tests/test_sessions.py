@@ -0,0 +1,116 @@
+"""Tests for the cache-fronted session engine with lazy expiry writes."""
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.sessions.models import Session
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.auth_app.models import User
+from konote import sessions
+from konote.sessions import SessionStore
+
+
+@override_settings(SESSION_EXPIRY_SLACK_SECONDS=60, SESSION_COOKIE_AGE=1800)
+class LazyExpiryWriteTest(TestCase):
+
+    def _new_session(self, **data):
+        store = SessionStore()
+        store.update(data)
+        store.create()
+        return store.session_key
+
+    def _stored_expiry(self, key):
+        return Session.objects.get(session_key=key).expire_date
+
+    def test_expiry_refresh_within_slack_skips_database(self):
+        key = self._new_session(foo="bar")
+        before = self._stored_expiry(key)
+        store = SessionStore(key)
+        self.assertEqual(store["foo"], "bar")
+        with self.assertNumQueries(0):
+            store.save()
+        self.assertEqual(self._stored_expiry(key), before)
+
+    def test_expiry_refresh_after_slack_is_written(self):
+        key = self._new_session(foo="bar")
+        before = self._stored_expiry(key)
+        later = timezone.now() + timedelta(seconds=90)
+        with patch("django.utils.timezone.now", return_value=later):
+            store = SessionStore(key)
+            store.load()
+            store.save()
+        self.assertGreater(self._stored_expiry(key), before)
+
+    def test_data_change_is_written_immediately(self):
+        key = self._new_session(foo="bar")
+        store = SessionStore(key)
+        store["foo"] = "baz"
+        store.save()
+        self.assertEqual(SessionStore(key)["foo"], "baz")
+
+    def test_in_place_mutation_is_written(self):
+        key = self._new_session(recent=[1])
+        store = SessionStore(key)
+        store["recent"].append(2)  # Does not mark the session modified
+        store.save()
+        self.assertEqual(SessionStore(key)["recent"], [1, 2])
+
+    def test_idle_session_expires(self):
+        key = self._new_session(foo="bar")
+        later = timezone.now() + timedelta(seconds=1801)
+        with patch("django.utils.timezone.now", return_value=later):
+            store = SessionStore(key)
+            self.assertEqual(store.load(), {})
+
+    def test_login_and_logout_round_trip(self):
+        User.objects.create_user(username="staff", password="testpass123")
+        self.client.login(username="staff", password="testpass123")
+        key = self.client.session.session_key
+        self.assertTrue(Session.objects.filter(session_key=key).exists())
+        self.client.logout()
+        self.assertFalse(Session.objects.filter(session_key=key).exists())
+
+
+@override_settings(SESSION_EXPIRY_SLACK_SECONDS=60)
+@patch.object(sessions, "PROCESS_LOCAL_CACHES", ())
+class SharedCacheReadTest(TestCase):
+    """Treat the test cache as shared between workers."""
+
+    def test_reads_served_from_cache(self):
+        store = SessionStore()
+        store["foo"] = "bar"
+        store.create()
+        with self.assertNumQueries(0):
+            self.assertEqual(SessionStore(store.session_key)["foo"], "bar")
+
+    def test_flush_removes_cached_copy(self):
+        store = SessionStore()
+        store["foo"] = "bar"
+        store.create()
+        key = store.session_key
+        store.flush()
+        self.assertEqual(SessionStore(key).load(), {})
+
+
+@override_settings(SESSION_EXPIRY_SLACK_SECONDS=60)
+class ClearExpiredTest(TestCase):
+
+    def _session(self, expire_date):
+        store = SessionStore()
+        store.create()
+        Session.objects.filter(session_key=store.session_key).update(expire_date=expire_date)
+        return store.session_key
+
+    def test_sweeps_in_batches_and_respects_slack(self):
+        now = timezone.now()
+        expired = [self._session(now - timedelta(minutes=10)) for _ in range(5)]
+        within_slack = self._session(now - timedelta(seconds=30))
+        live = self._session(now + timedelta(minutes=10))
+
+        deleted = SessionStore.clear_expired(batch_size=2)
+
+        self.assertEqual(deleted, 5)
+        remaining = set(Session.objects.values_list("session_key", flat=True))
+        self.assertEqual(remaining, {within_slack, live})
+        self.assertFalse(remaining & set(expired))
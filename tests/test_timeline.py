@@ -0,0 +1,108 @@
+"""Tests for the SQL-merged, keyset-paginated client timeline."""
+from datetime import timedelta
+
+from cryptography.fernet import Fernet
+from django.db.models import Q
+from django.test import Client, TestCase, override_settings
+from django.utils import timezone
+
+from apps.auth_app.models import User
+from apps.clients.models import ClientFile, ClientProgramEnrolment
+from apps.communications.models import Communication
+from apps.events.models import Event
+from apps.events.timeline import decode_cursor, encode_cursor, get_timeline_page
+from apps.notes.models import ProgressNote
+from apps.programs.models import Program, UserProgramRole
+import konote.encryption as enc_module
+
+TEST_KEY = Fernet.generate_key().decode()
+
+
+@override_settings(FIELD_ENCRYPTION_KEY=TEST_KEY)
+class TimelinePaginationTest(TestCase):
+    databases = {"default", "audit"}
+
+    def setUp(self):
+        enc_module._fernet = None
+        self.http = Client()
+        self.staff = User.objects.create_user(username="staff", password="pass")
+        self.prog = Program.objects.create(name="Prog A")
+        UserProgramRole.objects.create(user=self.staff, program=self.prog, role="staff")
+        self.client_file = ClientFile.objects.create()
+        self.client_file.first_name = "Jane"
+        self.client_file.last_name = "Doe"
+        self.client_file.save()
+        ClientProgramEnrolment.objects.create(client_file=self.client_file, program=self.prog)
+        self.program_q = Q(author_program_id__in=[self.prog.pk]) | Q(author_program__isnull=True)
+
+        base = timezone.now() - timedelta(days=100)
+        for i in range(15):
+            Event.objects.create(
+                client_file=self.client_file, title=f"Event {i}",
+                start_timestamp=base + timedelta(days=i * 3),
+                author_program=self.prog,
+            )
+            note = ProgressNote.objects.create(
+                client_file=self.client_file, note_type="quick", author=self.staff,
+                author_program=self.prog, backdate=base + timedelta(days=i * 3 + 1),
+            )
+            note.notes_text = f"Note {i}"
+            note.save()
+            Communication.objects.create(
+                client_file=self.client_file, direction="outbound", channel="phone",
+                method="manual_log", logged_by=self.staff, author_program=self.prog,
+            )
+        # Same timestamp as an event — the tie must still page deterministically
+        Event.objects.create(
+            client_file=self.client_file, title="Tie event",
+            start_timestamp=base + timedelta(days=1), author_program=self.prog,
+        )
+
+    def tearDown(self):
+        enc_module._fernet = None
+
+    def _all_pages(self, filter_type="all"):
+        seen, cursor = [], None
+        while True:
+            entries, cursor = get_timeline_page(self.client_file, self.program_q, filter_type, cursor)
+            seen.extend(entries)
+            if cursor is None:
+                return seen
+            cursor = decode_cursor(cursor)
+
+    def test_pages_cover_every_entry_once_newest_first(self):
+        entries = self._all_pages()
+        self.assertEqual(len(entries), 46)
+        keys = [(e["type"], e["obj"].pk) for e in entries]
+        self.assertEqual(len(keys), len(set(keys)))
+        dates = [e["date"] for e in entries]
+        self.assertEqual(dates, sorted(dates, reverse=True))
+
+    def test_filter_pushdown(self):
+        entries = self._all_pages("notes")
+        self.assertEqual(len(entries), 15)
+        self.assertTrue(all(e["type"] == "note" for e in entries))
+
+    def test_first_page_query_count_is_bounded(self):
+        # One UNION for keys + one hydration query per entry type on the page
+        with self.assertNumQueries(4):
+            entries, cursor = get_timeline_page(self.client_file, self.program_q)
+        self.assertEqual(len(entries), 20)
+        self.assertIsNotNone(cursor)
+
+    def test_garbled_cursor_falls_back_to_first_page(self):
+        self.assertIsNone(decode_cursor("not-a-cursor"))
+        self.assertIsNone(decode_cursor("2026-01-01T00:00:00|bogus|1"))
+        now = timezone.now()
+        self.assertEqual(decode_cursor(encode_cursor(now, "note", 5)), (now, "note", 5))
+
+    def test_show_more_via_view(self):
+        self.http.login(username="staff", password="pass")
+        url = f"/events/client/{self.client_file.pk}/"
+        resp = self.http.get(url, {"filter": "all"}, HTTP_HX_REQUEST="true")
+        self.assertEqual(resp.status_code, 200)
+        next_cursor = resp.context["next_cursor"]
+        self.assertTrue(resp.context["has_more"])
+        resp = self.http.get(url, {"filter": "all", "cursor": next_cursor}, HTTP_HX_REQUEST="true")
+        self.assertTrue(resp.context["is_append"])
+        self.assertEqual(len(resp.context["timeline"]), 20)
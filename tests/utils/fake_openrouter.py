@@ -0,0 +1,76 @@
+"""
+A local stand-in for the OpenRouter chat completions API.
+
+Runs a real HTTP server on localhost so tests exercise the whole outbound
+path (pooled session, circuit breaker, response parsing, AI cache) without
+network access or an API key:
+
+    with FakeOpenRouter(reply="Improved outcome") as server:
+        with override_settings(**server.settings()):
+            ai.improve_outcome("draft")
+        server.requests  # JSON bodies received, in order
+
+reply can be a string or a callable taking the request body. Set status
+to make the server fail, and delay to slow every response down.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeOpenRouter:
+    def __init__(self, reply="OK", status=200, delay=0):
+        self.reply = reply
+        self.status = status
+        self.delay = delay
+        self.requests = []
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api/v1/chat/completions"
+
+    def settings(self):
+        """Settings that point konote.ai at this server."""
+        return {"OPENROUTER_URL": self.url, "OPENROUTER_API_KEY": "test-key"}
+
+    def __enter__(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                with fake._lock:
+                    fake.requests.append(body)
+                if fake.delay:
+                    time.sleep(fake.delay)
+                if fake.status != 200:
+                    payload = {"error": {"message": "fake failure"}}
+                else:
+                    content = fake.reply(body) if callable(fake.reply) else fake.reply
+                    payload = {"choices": [{"message": {"role": "assistant", "content": content}}]}
+                data = json.dumps(payload).encode()
+                self.send_response(fake.status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass  # Keep test output quiet
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()